@@ -0,0 +1,87 @@
+-- Обнаружение изменений при повторном обходе
+-- Выполните в SQL Editor Supabase (после add_parse_checkpoints.sql)
+-- Для каждого письма: hash распарсенной записи и ETag / Last-Modified страницы.
+-- Парсер шлёт условный HEAD и не открывает неизменённые страницы,
+-- а запись с тем же hash не перезаписывается.
+
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS last_modified TEXT;
+
+-- Пакетная запись (см. add_parse_checkpoints.sql) - теперь с hash и валидаторами HTTP
+CREATE OR REPLACE FUNCTION save_letters_batch(
+    p_volume_id BIGINT,
+    p_volume_number INTEGER,
+    p_letters JSONB,
+    p_page INTEGER,
+    p_last_aid BIGINT,
+    p_last_url TEXT
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    saved INTEGER;
+BEGIN
+    INSERT INTO letters (
+        volume_id, tom_hebrew, tom_number, letter_hebrew, letter_number, url, content,
+        date_parsed, full_date_hebrew, day_hebrew, month_hebrew, year_hebrew, year_number,
+        hebrew_date_key, gregorian_date, content_hash, etag, last_modified
+    )
+    -- DISTINCT ON: одно письмо дважды в пакете сломало бы ON CONFLICT
+    SELECT DISTINCT ON (l.letter_number)
+        p_volume_id, l.tom_hebrew, l.tom_number, l.letter_hebrew, l.letter_number, l.url, l.content,
+        l.date_parsed, l.full_date_hebrew, l.day_hebrew, l.month_hebrew, l.year_hebrew, l.year_number,
+        l.hebrew_date_key, l.gregorian_date, l.content_hash, l.etag, l.last_modified
+    FROM jsonb_to_recordset(p_letters) AS l(
+        tom_hebrew TEXT, tom_number INTEGER, letter_hebrew TEXT, letter_number INTEGER, url TEXT,
+        content TEXT, date_parsed BOOLEAN, full_date_hebrew TEXT, day_hebrew TEXT, month_hebrew TEXT,
+        year_hebrew TEXT, year_number INTEGER, hebrew_date_key INTEGER, gregorian_date DATE,
+        content_hash TEXT, etag TEXT, last_modified TEXT
+    )
+    ORDER BY l.letter_number
+    ON CONFLICT (volume_id, letter_number) DO UPDATE SET
+        tom_hebrew = EXCLUDED.tom_hebrew,
+        tom_number = EXCLUDED.tom_number,
+        letter_hebrew = EXCLUDED.letter_hebrew,
+        url = EXCLUDED.url,
+        content = EXCLUDED.content,
+        date_parsed = EXCLUDED.date_parsed,
+        full_date_hebrew = EXCLUDED.full_date_hebrew,
+        day_hebrew = EXCLUDED.day_hebrew,
+        month_hebrew = EXCLUDED.month_hebrew,
+        year_hebrew = EXCLUDED.year_hebrew,
+        year_number = EXCLUDED.year_number,
+        hebrew_date_key = EXCLUDED.hebrew_date_key,
+        gregorian_date = EXCLUDED.gregorian_date,
+        content_hash = EXCLUDED.content_hash,
+        etag = EXCLUDED.etag,
+        last_modified = EXCLUDED.last_modified,
+        updated_at = NOW()
+    -- та же запись - без перезаписи строки
+    WHERE letters.content_hash IS DISTINCT FROM EXCLUDED.content_hash;
+    GET DIAGNOSTICS saved = ROW_COUNT;
+
+    INSERT INTO parse_checkpoints (volume_number, volume_id, last_page, last_aid, last_url, letters_saved, status, updated_at)
+    VALUES (p_volume_number, p_volume_id, p_page, p_last_aid, p_last_url, saved, 'running', NOW())
+    ON CONFLICT (volume_number) DO UPDATE SET
+        volume_id = EXCLUDED.volume_id,
+        last_page = EXCLUDED.last_page,
+        last_aid = EXCLUDED.last_aid,
+        last_url = EXCLUDED.last_url,
+        letters_saved = parse_checkpoints.letters_saved + EXCLUDED.letters_saved,
+        status = 'running',
+        updated_at = NOW();
+
+    RETURN saved;
+END;
+$$;
+
+-- Комментарии
+COMMENT ON COLUMN letters.content_hash IS 'sha256 של הרשומה המפורסרת - זהה = לא השתנה';
+COMMENT ON COLUMN letters.etag IS 'ETag של דף המכתב לבקשה מותנית';
+COMMENT ON COLUMN letters.last_modified IS 'Last-Modified של דף המכתב לבקשה מותנית';
+
+-- Проверка
+SELECT COUNT(*) AS total, COUNT(content_hash) AS with_hash, COUNT(etag) AS with_etag, COUNT(last_modified) AS with_last_modified
+FROM letters;
@@ -0,0 +1,106 @@
+-- Проверка полноты томов по сохранённым данным (без браузера)
+-- Выполните в SQL Editor Supabase (после final_schema_correct.sql и add_parse_checkpoints.sql)
+-- Пропуски - разность generate_series(1, ожидаемое) и сохранённых letter_number,
+-- повторные aid и aid, идущие назад относительно предыдущего письма тома
+
+-- Кэш ожидаемого количества писем по томам
+CREATE TABLE IF NOT EXISTS volume_expected_counts (
+    volume_number INTEGER PRIMARY KEY,
+    expected INTEGER NOT NULL CHECK (expected >= 0),
+    source TEXT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Известные количества (tests/README_tests.md): том א - 4 страницы, 50+50+50+19
+INSERT INTO volume_expected_counts (volume_number, expected, source)
+VALUES (1, 169, 'known')
+ON CONFLICT (volume_number) DO NOTHING;
+
+-- Один проход по letters на том; без ожидаемого количества проверка идёт до максимального номера
+CREATE OR REPLACE FUNCTION audit_volume_completeness(p_volume_number INTEGER DEFAULT NULL)
+RETURNS TABLE (
+    volume_number INTEGER,
+    letters INTEGER,
+    expected INTEGER,
+    has_expected BOOLEAN,
+    missing JSONB,
+    duplicate_aids JSONB,
+    out_of_order JSONB
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH stored AS (
+        SELECT l.tom_number AS volume_number, l.letter_number,
+               substring(l.url FROM '/aid/([0-9]+)')::BIGINT AS aid
+        FROM letters l
+        WHERE p_volume_number IS NULL OR l.tom_number = p_volume_number
+    ),
+    bounds AS (
+        SELECT v.volume_number,
+               COALESCE(e.expected, MAX(s.letter_number), 0) AS expected,
+               e.expected IS NOT NULL AS has_expected,
+               COUNT(s.letter_number) AS letters
+        FROM (SELECT DISTINCT stored.volume_number FROM stored
+              UNION
+              SELECT c.volume_number FROM volume_expected_counts c
+              WHERE p_volume_number IS NULL OR c.volume_number = p_volume_number) v
+        LEFT JOIN volume_expected_counts e ON e.volume_number = v.volume_number
+        LEFT JOIN stored s ON s.volume_number = v.volume_number
+        GROUP BY v.volume_number, e.expected
+    ),
+    -- отсутствующие номера, свёрнутые в диапазоны (номер - порядковый номер = константа в диапазоне)
+    absent AS (
+        SELECT b.volume_number, n.number
+        FROM bounds b
+        CROSS JOIN LATERAL generate_series(1, b.expected) AS n(number)
+        EXCEPT
+        SELECT stored.volume_number, stored.letter_number FROM stored
+    ),
+    ranges AS (
+        SELECT numbered.volume_number, MIN(number) AS range_start, MAX(number) AS range_end
+        FROM (
+            SELECT absent.volume_number, number,
+                   number - ROW_NUMBER() OVER (PARTITION BY absent.volume_number ORDER BY number) AS grp
+            FROM absent
+        ) numbered
+        GROUP BY numbered.volume_number, grp
+    ),
+    repeated AS (
+        SELECT stored.volume_number, stored.aid, array_agg(DISTINCT stored.letter_number) AS letter_numbers
+        FROM stored
+        WHERE stored.aid IS NOT NULL
+        GROUP BY stored.volume_number, stored.aid
+        HAVING COUNT(DISTINCT stored.letter_number) > 1
+    ),
+    ordered AS (
+        SELECT stored.volume_number, stored.letter_number, stored.aid,
+               LAG(stored.letter_number) OVER w AS previous_letter,
+               LAG(stored.aid) OVER w AS previous_aid
+        FROM stored
+        WHERE stored.aid IS NOT NULL
+        WINDOW w AS (PARTITION BY stored.volume_number ORDER BY stored.letter_number, stored.aid)
+    )
+    SELECT
+        b.volume_number,
+        b.letters::INTEGER,
+        b.expected::INTEGER,
+        b.has_expected,
+        COALESCE((SELECT jsonb_agg(jsonb_build_array(r.range_start, r.range_end) ORDER BY r.range_start)
+                  FROM ranges r WHERE r.volume_number = b.volume_number), '[]'::JSONB),
+        COALESCE((SELECT jsonb_agg(jsonb_build_object('aid', d.aid, 'letters', d.letter_numbers) ORDER BY d.aid)
+                  FROM repeated d WHERE d.volume_number = b.volume_number), '[]'::JSONB),
+        COALESCE((SELECT jsonb_agg(jsonb_build_object('letter', o.letter_number, 'aid', o.aid,
+                                                      'previous_letter', o.previous_letter,
+                                                      'previous_aid', o.previous_aid) ORDER BY o.letter_number)
+                  FROM ordered o WHERE o.volume_number = b.volume_number AND o.aid < o.previous_aid), '[]'::JSONB)
+    FROM bounds b
+    ORDER BY b.volume_number;
+$$;
+
+-- Комментарии
+COMMENT ON TABLE volume_expected_counts IS 'מספר המכתבים הצפוי בכל כרך - לבדיקת שלמות בלי סריקה';
+COMMENT ON FUNCTION audit_volume_completeness(INTEGER) IS 'טווחים חסרים, aid כפול ו-aid בסדר הפוך לכל כרך';
+
+-- Проверка
+SELECT * FROM audit_volume_completeness();
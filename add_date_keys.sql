@@ -0,0 +1,41 @@
+-- Сортируемый ключ еврейской даты и григорианская дата
+-- Выполните в SQL Editor Supabase (после final_schema_correct.sql и fix_year_column.sql)
+-- Заполнение существующих строк: python backfill_date_keys.py --supabase
+
+-- Ключ: год*10000 + месяц*100 + день (תשרי=1 ... אלול=13), например 56880621
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS hebrew_date_key INTEGER;
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS gregorian_date DATE;
+
+-- Индексы
+CREATE INDEX IF NOT EXISTS idx_letters_tom_letter ON letters(tom_number, letter_number);
+CREATE INDEX IF NOT EXISTS idx_letters_date_key ON letters(hebrew_date_key) WHERE hebrew_date_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_letters_gregorian_date ON letters(gregorian_date) WHERE gregorian_date IS NOT NULL;
+
+-- Пакетное обновление для backfill: один вызов RPC на пакет строк
+-- updates: [{"id": 1, "hebrew_date_key": 56880621, "gregorian_date": "1928-03-13"}, ...]
+CREATE OR REPLACE FUNCTION backfill_letter_dates(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH changed AS (
+        UPDATE letters l
+        SET hebrew_date_key = u.hebrew_date_key,
+            gregorian_date = u.gregorian_date,
+            updated_at = NOW()
+        FROM jsonb_to_recordset(updates) AS u(id BIGINT, hebrew_date_key INTEGER, gregorian_date DATE)
+        WHERE l.id = u.id
+        RETURNING l.id
+    )
+    SELECT COUNT(*)::INTEGER FROM changed;
+$$;
+
+-- Комментарии
+COMMENT ON COLUMN letters.hebrew_date_key IS 'מפתח תאריך עברי למיון: שנה*10000 + חודש*100 + יום';
+COMMENT ON COLUMN letters.gregorian_date IS 'התאריך הלועזי של המכתב';
+
+-- Пример: все письма за אדר תרפ"ח (5688, месяц 6) - сканирование диапазона по индексу
+-- SELECT * FROM letters WHERE hebrew_date_key BETWEEN 56880600 AND 56880699 ORDER BY hebrew_date_key;
+
+-- Проверка
+SELECT COUNT(*) AS total, COUNT(hebrew_date_key) AS with_key, COUNT(gregorian_date) AS with_gregorian
+FROM letters;
@@ -0,0 +1,102 @@
+-- Полнотекстовый поиск по содержимому писем
+-- Выполните в SQL Editor Supabase (после final_schema_correct.sql)
+
+-- Нормализация иврита: макаф (U+05BE) разделяет слова, удаляем никуд/теамим
+-- (U+0591-U+05C7), гереш/гершаим и приводим конечные буквы (ך ם ן ף ץ) к обычным.
+-- Должна совпадать с normalize_hebrew() в database_setup.py
+CREATE OR REPLACE FUNCTION hebrew_normalize(input TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT translate(
+        regexp_replace(replace(coalesce(input, ''), U&'\05BE', ' '),
+                       '[\u0591-\u05BD\u05BF-\u05C7"''\u05F3\u05F4]', '', 'g'),
+        'ךםןףץ',
+        'כמנפצ'
+    );
+$$;
+
+-- Фрагмент из исходного текста (с никудом и конечными буквами): индекс хранит
+-- нормализованный текст, поэтому ts_headline по оригиналу слов не находит.
+-- Каждое слово оригинала нормализуется и сравнивается со словами запроса,
+-- окно max_words слов вокруг первого совпадения, совпадения в [скобках].
+CREATE OR REPLACE FUNCTION hebrew_snippet(p_content TEXT, q TEXT, max_words INTEGER DEFAULT 25)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    WITH terms AS (
+        SELECT DISTINCT term
+        FROM regexp_split_to_table(lower(hebrew_normalize(q)), '[^\u05D0-\u05EA0-9a-z]+') AS term
+        WHERE term <> ''
+    ),
+    words AS (
+        SELECT w.n, w.word,
+               EXISTS (SELECT 1
+                       FROM regexp_split_to_table(lower(hebrew_normalize(w.word)), '[^\u05D0-\u05EA0-9a-z]+') AS part
+                       JOIN terms ON terms.term = part) AS hit
+        FROM regexp_split_to_table(coalesce(p_content, ''), '\s+') WITH ORDINALITY AS w(word, n)
+        WHERE w.word <> ''
+    ),
+    bounds AS (
+        SELECT greatest(1, coalesce(MIN(n) FILTER (WHERE hit), 1) - max_words / 4) AS first_word,
+               MAX(n) AS last_word
+        FROM words
+    )
+    SELECT CASE WHEN b.first_word > 1 THEN '…' ELSE '' END
+           || string_agg(CASE WHEN w.hit THEN '[' || w.word || ']' ELSE w.word END, ' ' ORDER BY w.n)
+           || CASE WHEN b.first_word + max_words <= b.last_word THEN '…' ELSE '' END
+    FROM words w, bounds b
+    WHERE w.n BETWEEN b.first_word AND b.first_word + max_words - 1
+    GROUP BY b.first_word, b.last_word;
+$$;
+
+-- Колонка tsvector пересчитывается автоматически при INSERT/UPDATE
+ALTER TABLE letters ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', hebrew_normalize(content))) STORED;
+
+-- GIN-индекс для поиска
+CREATE INDEX IF NOT EXISTS idx_letters_content_tsv ON letters USING GIN (content_tsv);
+
+-- Пересчёт content_tsv для писем с макафом (раньше слова через макаф склеивались)
+UPDATE letters SET content = content WHERE content LIKE '%' || U&'\05BE' || '%';
+
+-- Поиск с ранжированием и фрагментами текста
+-- Пример: SELECT * FROM search_letters_content('שלום ברכה');
+CREATE OR REPLACE FUNCTION search_letters_content(q TEXT, max_results INTEGER DEFAULT 20)
+RETURNS TABLE (
+    id BIGINT,
+    tom_number INTEGER,
+    letter_number INTEGER,
+    letter_hebrew TEXT,
+    full_date_hebrew TEXT,
+    url TEXT,
+    rank REAL,
+    snippet TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('simple', hebrew_normalize(q)) AS tsq
+    ),
+    ranked AS (
+        -- фрагменты дорогие, поэтому считаем их только для лучших результатов
+        SELECT l.id, l.tom_number, l.letter_number, l.letter_hebrew, l.full_date_hebrew,
+               l.url, l.content, ts_rank(l.content_tsv, query.tsq) AS rank
+        FROM letters l, query
+        WHERE l.content_tsv @@ query.tsq
+        ORDER BY rank DESC
+        LIMIT max_results
+    )
+    SELECT r.id, r.tom_number, r.letter_number, r.letter_hebrew, r.full_date_hebrew, r.url, r.rank,
+           hebrew_snippet(r.content, q) AS snippet
+    FROM ranked r
+    ORDER BY r.rank DESC;
+$$;
+
+-- Комментарии
+COMMENT ON COLUMN letters.content_tsv IS 'אינדקס חיפוש מלא על תוכן המכתב (מנורמל)';
+COMMENT ON FUNCTION hebrew_snippet(TEXT, TEXT, INTEGER) IS 'קטע מהטקסט המקורי סביב מילות החיפוש';
+COMMENT ON FUNCTION search_letters_content(TEXT, INTEGER) IS 'חיפוש מלא בתוכן המכתבים עם דירוג וקטעי טקסט';
+
+-- Проверка
+SELECT id, letter_hebrew, rank, snippet FROM search_letters_content('שלום', 5);
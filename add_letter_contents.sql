@@ -0,0 +1,186 @@
+-- Полный текст писем, сжатый (zstd / gzip), в отдельной таблице letter_contents
+-- Выполните в SQL Editor Supabase (после add_change_detection.sql и add_fulltext_search.sql)
+-- Текст передаётся и хранится только сжатым; в letters.content копии текста больше нет,
+-- полный текст читается по одному письму через get_letter_content().
+-- Сервер не умеет распаковывать, поэтому для поиска клиент присылает различные
+-- нормализованные слова полного текста (search_terms) - из них строится content_tsv.
+-- Фрагменты для таких писем строит клиент (letter_content.search_content).
+
+CREATE TABLE IF NOT EXISTS letter_contents (
+    letter_id BIGINT PRIMARY KEY REFERENCES letters(id) ON DELETE CASCADE,
+    encoding TEXT NOT NULL CHECK (encoding IN ('zstd', 'gzip')),
+    content BYTEA NOT NULL,
+    content_length INTEGER,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Сжатые данные не сжимаются повторно TOAST-ом
+ALTER TABLE letter_contents ALTER COLUMN content SET STORAGE EXTERNAL;
+
+-- Поисковый индекс по полному тексту (раньше - только по превью в letters.content_tsv)
+ALTER TABLE letter_contents ADD COLUMN IF NOT EXISTS content_tsv tsvector;
+CREATE INDEX IF NOT EXISTS idx_letter_contents_tsv ON letter_contents USING GIN (content_tsv);
+
+-- Пакетная запись (см. add_change_detection.sql) - теперь и с полным текстом
+-- p_letters: [{..., "content_encoding": "gzip", "content_compressed": "<base64>", "content_length": 5120,
+--               "search_terms": "<различные нормализованные слова через пробел>"}]
+
+CREATE OR REPLACE FUNCTION save_letters_batch(
+    p_volume_id BIGINT,
+    p_volume_number INTEGER,
+    p_letters JSONB,
+    p_page INTEGER,
+    p_last_aid BIGINT,
+    p_last_url TEXT
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    saved INTEGER;
+BEGIN
+    INSERT INTO letters (
+        volume_id, tom_hebrew, tom_number, letter_hebrew, letter_number, url, content,
+        date_parsed, full_date_hebrew, day_hebrew, month_hebrew, year_hebrew, year_number,
+        hebrew_date_key, gregorian_date, content_hash, etag, last_modified
+    )
+    -- DISTINCT ON: одно письмо дважды в пакете сломало бы ON CONFLICT
+    SELECT DISTINCT ON (l.letter_number)
+        -- текст только в letter_contents; NULL стирает старое превью
+        p_volume_id, l.tom_hebrew, l.tom_number, l.letter_hebrew, l.letter_number, l.url, NULL,
+        l.date_parsed, l.full_date_hebrew, l.day_hebrew, l.month_hebrew, l.year_hebrew, l.year_number,
+        l.hebrew_date_key, l.gregorian_date, l.content_hash, l.etag, l.last_modified
+    FROM jsonb_to_recordset(p_letters) AS l(
+        tom_hebrew TEXT, tom_number INTEGER, letter_hebrew TEXT, letter_number INTEGER, url TEXT,
+        date_parsed BOOLEAN, full_date_hebrew TEXT, day_hebrew TEXT, month_hebrew TEXT,
+        year_hebrew TEXT, year_number INTEGER, hebrew_date_key INTEGER, gregorian_date DATE,
+        content_hash TEXT, etag TEXT, last_modified TEXT
+    )
+    ORDER BY l.letter_number
+    ON CONFLICT (volume_id, letter_number) DO UPDATE SET
+        tom_hebrew = EXCLUDED.tom_hebrew,
+        tom_number = EXCLUDED.tom_number,
+        letter_hebrew = EXCLUDED.letter_hebrew,
+        url = EXCLUDED.url,
+        content = EXCLUDED.content,
+        date_parsed = EXCLUDED.date_parsed,
+        full_date_hebrew = EXCLUDED.full_date_hebrew,
+        day_hebrew = EXCLUDED.day_hebrew,
+        month_hebrew = EXCLUDED.month_hebrew,
+        year_hebrew = EXCLUDED.year_hebrew,
+        year_number = EXCLUDED.year_number,
+        hebrew_date_key = EXCLUDED.hebrew_date_key,
+        gregorian_date = EXCLUDED.gregorian_date,
+        content_hash = EXCLUDED.content_hash,
+        etag = EXCLUDED.etag,
+        last_modified = EXCLUDED.last_modified,
+        updated_at = NOW()
+    -- та же запись - без перезаписи строки
+    WHERE letters.content_hash IS DISTINCT FROM EXCLUDED.content_hash;
+    GET DIAGNOSTICS saved = ROW_COUNT;
+
+    -- Полный текст - отдельной строкой, сжатый на клиенте (base64 -> BYTEA), и его поисковые слова
+    INSERT INTO letter_contents (letter_id, encoding, content, content_length, content_tsv, updated_at)
+    SELECT DISTINCT ON (l.letter_number)
+        letters.id, l.content_encoding, decode(l.content_compressed, 'base64'), l.content_length,
+        to_tsvector('simple', coalesce(l.search_terms, '')), NOW()
+    FROM jsonb_to_recordset(p_letters) AS l(
+        letter_number INTEGER, content_encoding TEXT, content_compressed TEXT, content_length INTEGER,
+        search_terms TEXT
+    )
+    JOIN letters ON letters.volume_id = p_volume_id AND letters.letter_number = l.letter_number
+    WHERE l.content_compressed IS NOT NULL
+    ORDER BY l.letter_number
+    ON CONFLICT (letter_id) DO UPDATE SET
+        encoding = EXCLUDED.encoding,
+        content = EXCLUDED.content,
+        content_length = EXCLUDED.content_length,
+        content_tsv = EXCLUDED.content_tsv,
+        updated_at = NOW()
+    WHERE letter_contents.content IS DISTINCT FROM EXCLUDED.content
+       OR letter_contents.content_tsv IS NULL;
+
+    INSERT INTO parse_checkpoints (volume_number, volume_id, last_page, last_aid, last_url, letters_saved, status, updated_at)
+    VALUES (p_volume_number, p_volume_id, p_page, p_last_aid, p_last_url, saved, 'running', NOW())
+    ON CONFLICT (volume_number) DO UPDATE SET
+        volume_id = EXCLUDED.volume_id,
+        last_page = EXCLUDED.last_page,
+        last_aid = EXCLUDED.last_aid,
+        last_url = EXCLUDED.last_url,
+        letters_saved = parse_checkpoints.letters_saved + EXCLUDED.letters_saved,
+        status = 'running',
+        updated_at = NOW();
+
+    RETURN saved;
+END;
+$$;
+
+-- Полный текст одного письма: сжатые байты в base64, распаковка на клиенте
+-- Пример: SELECT * FROM get_letter_content(42);
+CREATE OR REPLACE FUNCTION get_letter_content(p_letter_id BIGINT)
+RETURNS TABLE (encoding TEXT, content TEXT, content_length INTEGER)
+LANGUAGE sql STABLE
+AS $$
+    SELECT c.encoding, encode(c.content, 'base64'), c.content_length
+    FROM letter_contents c
+    WHERE c.letter_id = p_letter_id;
+$$;
+
+-- Поиск (замена версии из add_fulltext_search.sql): по полному тексту в letter_contents.content_tsv,
+-- а для писем, сохранённых до этого - по letters.content_tsv. Фрагмент - только если в letters
+-- ещё есть текст; иначе NULL, и клиент строит его из get_letter_content().
+CREATE OR REPLACE FUNCTION search_letters_content(q TEXT, max_results INTEGER DEFAULT 20)
+RETURNS TABLE (
+    id BIGINT,
+    tom_number INTEGER,
+    letter_number INTEGER,
+    letter_hebrew TEXT,
+    full_date_hebrew TEXT,
+    url TEXT,
+    rank REAL,
+    snippet TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('simple', hebrew_normalize(q)) AS tsq
+    ),
+    -- два поиска по GIN-индексам вместо COALESCE, который индекс не использует
+    matches AS (
+        SELECT c.letter_id, ts_rank(c.content_tsv, query.tsq) AS rank
+        FROM letter_contents c, query
+        WHERE c.content_tsv @@ query.tsq
+        UNION ALL
+        SELECT l.id, ts_rank(l.content_tsv, query.tsq)
+        FROM letters l, query
+        WHERE l.content_tsv @@ query.tsq
+          AND NOT EXISTS (SELECT 1 FROM letter_contents c
+                          WHERE c.letter_id = l.id AND c.content_tsv IS NOT NULL)
+    ),
+    ranked AS (
+        SELECT m.letter_id, m.rank
+        FROM matches m
+        ORDER BY m.rank DESC
+        LIMIT max_results
+    )
+    SELECT l.id, l.tom_number, l.letter_number, l.letter_hebrew, l.full_date_hebrew, l.url, r.rank,
+           CASE WHEN l.content IS NOT NULL THEN hebrew_snippet(l.content, q) END AS snippet
+    FROM ranked r
+    JOIN letters l ON l.id = r.letter_id
+    ORDER BY r.rank DESC;
+$$;
+
+-- Комментарии
+COMMENT ON TABLE letter_contents IS 'תוכן מלא של המכתבים, דחוס (zstd / gzip)';
+COMMENT ON COLUMN letter_contents.content_length IS 'אורך הטקסט המלא בתווים';
+COMMENT ON COLUMN letter_contents.content_tsv IS 'אינדקס חיפוש מלא על כל הטקסט (מהמילים המנורמלות שנשלחו)';
+COMMENT ON COLUMN letters.content IS 'ריק במכתבים שנשמרו עם letter_contents - הטקסט המלא שם';
+
+-- Проверка: экономия на сжатии и письма, у которых ещё осталось превью в letters
+SELECT COUNT(*) AS letters_with_full_text,
+       COUNT(*) FILTER (WHERE c.content_tsv IS NULL) AS without_search_terms,
+       SUM(c.content_length) AS total_chars,
+       SUM(octet_length(c.content)) AS compressed_bytes,
+       COUNT(l.content) AS letters_with_preview
+FROM letter_contents c
+JOIN letters l ON l.id = c.letter_id;
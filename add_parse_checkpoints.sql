@@ -0,0 +1,90 @@
+-- Контрольные точки парсинга по томам
+-- Выполните в SQL Editor Supabase (после final_schema_correct.sql, fix_year_column.sql и add_date_keys.sql)
+-- Возобновление идёт сразу с нужной страницы тома, без поиска последней строки по created_at
+
+CREATE TABLE IF NOT EXISTS parse_checkpoints (
+    volume_number INTEGER PRIMARY KEY,
+    volume_id BIGINT REFERENCES volumes(id) ON DELETE CASCADE,
+    last_page INTEGER NOT NULL DEFAULT 1,
+    last_aid BIGINT,
+    last_url TEXT,
+    letters_saved INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'done', 'failed')),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Пакетная запись писем страницы и контрольной точки - одна функция, одна транзакция:
+-- либо сохранены и письма, и точка, либо ничего
+-- p_letters: [{"letter_number": 12, "letter_hebrew": "יב", "url": "...", ...}, ...]
+-- p_last_url = NULL: страница начата, но ни одно письмо на ней ещё не сохранено
+CREATE OR REPLACE FUNCTION save_letters_batch(
+    p_volume_id BIGINT,
+    p_volume_number INTEGER,
+    p_letters JSONB,
+    p_page INTEGER,
+    p_last_aid BIGINT,
+    p_last_url TEXT
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    saved INTEGER;
+BEGIN
+    INSERT INTO letters (
+        volume_id, tom_hebrew, tom_number, letter_hebrew, letter_number, url, content,
+        date_parsed, full_date_hebrew, day_hebrew, month_hebrew, year_hebrew, year_number,
+        hebrew_date_key, gregorian_date
+    )
+    -- DISTINCT ON: одно письмо дважды в пакете сломало бы ON CONFLICT
+    SELECT DISTINCT ON (l.letter_number)
+        p_volume_id, l.tom_hebrew, l.tom_number, l.letter_hebrew, l.letter_number, l.url, l.content,
+        l.date_parsed, l.full_date_hebrew, l.day_hebrew, l.month_hebrew, l.year_hebrew, l.year_number,
+        l.hebrew_date_key, l.gregorian_date
+    FROM jsonb_to_recordset(p_letters) AS l(
+        tom_hebrew TEXT, tom_number INTEGER, letter_hebrew TEXT, letter_number INTEGER, url TEXT,
+        content TEXT, date_parsed BOOLEAN, full_date_hebrew TEXT, day_hebrew TEXT, month_hebrew TEXT,
+        year_hebrew TEXT, year_number INTEGER, hebrew_date_key INTEGER, gregorian_date DATE
+    )
+    ORDER BY l.letter_number
+    ON CONFLICT (volume_id, letter_number) DO UPDATE SET
+        tom_hebrew = EXCLUDED.tom_hebrew,
+        tom_number = EXCLUDED.tom_number,
+        letter_hebrew = EXCLUDED.letter_hebrew,
+        url = EXCLUDED.url,
+        content = EXCLUDED.content,
+        date_parsed = EXCLUDED.date_parsed,
+        full_date_hebrew = EXCLUDED.full_date_hebrew,
+        day_hebrew = EXCLUDED.day_hebrew,
+        month_hebrew = EXCLUDED.month_hebrew,
+        year_hebrew = EXCLUDED.year_hebrew,
+        year_number = EXCLUDED.year_number,
+        hebrew_date_key = EXCLUDED.hebrew_date_key,
+        gregorian_date = EXCLUDED.gregorian_date,
+        updated_at = NOW();
+    GET DIAGNOSTICS saved = ROW_COUNT;
+
+    INSERT INTO parse_checkpoints (volume_number, volume_id, last_page, last_aid, last_url, letters_saved, status, updated_at)
+    VALUES (p_volume_number, p_volume_id, p_page, p_last_aid, p_last_url, saved, 'running', NOW())
+    ON CONFLICT (volume_number) DO UPDATE SET
+        volume_id = EXCLUDED.volume_id,
+        last_page = EXCLUDED.last_page,
+        last_aid = EXCLUDED.last_aid,
+        last_url = EXCLUDED.last_url,
+        letters_saved = parse_checkpoints.letters_saved + EXCLUDED.letters_saved,
+        status = 'running',
+        updated_at = NOW();
+
+    RETURN saved;
+END;
+$$;
+
+-- Комментарии
+COMMENT ON TABLE parse_checkpoints IS 'נקודת חידוש לכל כרך: העמוד והמכתב האחרונים שנשמרו';
+COMMENT ON COLUMN parse_checkpoints.last_aid IS 'מזהה ה-aid של המכתב האחרון שנשמר בעמוד last_page';
+COMMENT ON COLUMN parse_checkpoints.status IS 'running / done / failed';
+
+-- Проверка
+SELECT volume_number, last_page, last_aid, letters_saved, status, updated_at
+FROM parse_checkpoints
+ORDER BY volume_number;
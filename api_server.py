@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+אגרות קודש - שרת API מקומי לקריאה בלבד
+מגיש שאילתות מבסיס הנתונים המקומי (IgrotKodeshDB) בעמודים, במקום קובץ api_data.json אחד
+"""
+
+import argparse
+import http.server
+import json
+import gzip
+import hashlib
+import os
+import queue
+import sys
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs
+
+from database_setup import IgrotKodeshDB
+from similarity_index import SimilarityIndex, DEFAULT_THRESHOLD
+
+MAX_PER_PAGE = 200
+GZIP_MIN_SIZE = 1024
+
+
+class ConnectionPool:
+    """מאגר חיבורי קריאה בלבד ל-SQLite - חיבור אחד לכל בקשה פעילה"""
+    
+    def __init__(self, db_file, size=4):
+        self.db_file = db_file
+        self._pool = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(IgrotKodeshDB(db_file, read_only=True))
+    
+    @contextmanager
+    def connection(self, timeout=10):
+        """השאלת חיבור מהמאגר והחזרתו בסיום"""
+        db = self._pool.get(timeout=timeout)
+        try:
+            yield db
+        finally:
+            self._pool.put(db)
+    
+    def close(self):
+        """סגירת כל החיבורים"""
+        while not self._pool.empty():
+            self._pool.get_nowait().conn.close()
+
+
+def _int_param(params, name, default=None):
+    """פרמטר מספרי מה-query string"""
+    try:
+        return int(params[name][0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def _str_param(params, name, default=None):
+    """פרמטר טקסט מה-query string"""
+    values = params.get(name)
+    return values[0].strip() if values and values[0].strip() else default
+
+
+class LettersAPIHandler(http.server.BaseHTTPRequestHandler):
+    """
+    נתיבי API:
+        /api/volumes                               - רשימת כרכים
+        /api/letters?page=1&per_page=50            - רשימת מכתבים בעמודים
+            &volume=1&year=5688&month=אדר          - סינון לפי כרך / שנה / חודש
+            &date_from=56880101&date_to=56881399   - טווח מפתחות תאריך
+        /api/letters/<כרך>/<מכתב>                  - מכתב יחיד כולל התוכן
+        /api/letters/<כרך>/<מכתב>/similar          - מכתבים דומים (similarity_index.py build)
+            &threshold=0.5&limit=10
+        /api/search?q=...&limit=20                 - חיפוש מלא בתוכן
+    / מציג את דפדפן המכתבים; מעבר לדפים שב-STATIC_PAGES לא מוגשים קבצים
+    (תיקיית העבודה מכילה את .env ואת קובץ בסיס הנתונים)
+    """
+    
+    pool = None
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path in STATIC_PAGES:
+            self._send_body(STATIC_PAGES[parsed.path].encode('utf-8'), 'text/html; charset=utf-8')
+            return
+        if not parsed.path.startswith('/api/'):
+            body = json.dumps({'error': 'נתיב לא נמצא'}, ensure_ascii=False).encode('utf-8')
+            self._send_body(body, 'application/json; charset=utf-8', 404)
+            return
+        
+        params = parse_qs(parsed.query)
+        parts = [p for p in parsed.path.split('/') if p][1:]
+        
+        try:
+            with self.pool.connection() as db:
+                if parts == ['volumes']:
+                    status, payload = 200, self._volumes(db)
+                elif parts == ['letters']:
+                    status, payload = 200, self._letters(db, params)
+                elif len(parts) == 3 and parts[0] == 'letters':
+                    status, payload = self._letter(db, parts[1], parts[2])
+                elif len(parts) == 4 and parts[0] == 'letters' and parts[3] == 'similar':
+                    status, payload = self._similar(db, parts[1], parts[2], params)
+                elif parts == ['search']:
+                    status, payload = self._search(db, params)
+                else:
+                    status, payload = 404, {'error': 'נתיב לא נמצא'}
+        except queue.Empty:
+            status, payload = 503, {'error': 'השרת עמוס, נסה שוב'}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send_body(body, 'application/json; charset=utf-8', status)
+    
+    def _volumes(self, db):
+        return {'volumes': [dict(row) for row in db.get_volumes()]}
+    
+    def _letters(self, db, params):
+        page = max(_int_param(params, 'page', 1), 1)
+        per_page = min(max(_int_param(params, 'per_page', 50), 1), MAX_PER_PAGE)
+        filters = {
+            'volume_number': _int_param(params, 'volume'),
+            'year': _int_param(params, 'year'),
+            'month': _str_param(params, 'month'),
+            'date_from': _int_param(params, 'date_from'),
+            'date_to': _int_param(params, 'date_to'),
+            'chronological': _str_param(params, 'sort') == 'date'
+        }
+        rows = db.search_letters(limit=per_page, offset=(page - 1) * per_page, **filters)
+        return {
+            'page': page,
+            'per_page': per_page,
+            'total': db.count_letters(**filters),
+            'letters': [db.letter_to_api(row) for row in rows]
+        }
+    
+    def _letter(self, db, volume_number, letter_number):
+        try:
+            row = db.get_letter(int(volume_number), int(letter_number))
+        except ValueError:
+            return 400, {'error': 'מספר כרך/מכתב לא תקין'}
+        if not row:
+            return 404, {'error': 'מכתב לא נמצא'}
+        return 200, db.letter_to_api(row, include_content=True)
+    
+    def _similar(self, db, volume_number, letter_number, params):
+        index = SimilarityIndex(db.conn, create=False)
+        if not index.exists():
+            return 404, {'error': 'אינדקס הדמיון לא נבנה - הרץ: python similarity_index.py build'}
+        try:
+            row = db.get_letter(int(volume_number), int(letter_number))
+        except ValueError:
+            return 400, {'error': 'מספר כרך/מכתב לא תקין'}
+        if not row:
+            return 404, {'error': 'מכתב לא נמצא'}
+        try:
+            threshold = float(params['threshold'][0])
+        except (KeyError, IndexError, ValueError):
+            threshold = DEFAULT_THRESHOLD
+        limit = min(max(_int_param(params, 'limit', 10), 1), MAX_PER_PAGE)
+        
+        similar = []
+        for letter_id, similarity in index.similar(row['id'], threshold=threshold, limit=limit):
+            letter = db.get_letter_by_id(letter_id)
+            if letter:
+                similar.append(dict(db.letter_to_api(letter), similarity=round(similarity, 3)))
+        return 200, {'letter': db.letter_to_api(row), 'similar': similar}
+    
+    def _search(self, db, params):
+        query = _str_param(params, 'q')
+        if not query:
+            return 400, {'error': 'חסר פרמטר q'}
+        limit = min(max(_int_param(params, 'limit', 20), 1), MAX_PER_PAGE)
+        return 200, {'query': query, 'results': db.search_content(query, limit=limit)}
+    
+    def _send_body(self, body, content_type, status=200):
+        """שליחת תשובה עם ETag (304 אם לא השתנה) ודחיסת gzip לפי הצורך"""
+        # לגרסה הדחוסה ETag משלה - אלה שני ייצוגים שונים של אותו משאב
+        use_gzip = len(body) >= GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = '"' + hashlib.sha1(body).hexdigest() + ('-gz"' if use_gzip else '"')
+        if status == 200 and etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+        
+        if use_gzip:
+            body = gzip.compress(body, compresslevel=5)
+        
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(db_file='igrot_kodesh.db', port=8000, pool_size=4, host='127.0.0.1'):
+    """יצירת שרת מרובה תהליכונים עם מאגר חיבורים (ברירת מחדל - המחשב המקומי בלבד)"""
+    handler = type('BoundLettersAPIHandler', (LettersAPIHandler,), {'pool': ConnectionPool(db_file, pool_size)})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+BROWSER_PAGE = """<!DOCTYPE html>
+<html dir="rtl" lang="he">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>אגרות קודש - דפדפן מכתבים</title>
+    <style>
+        body { font-family: 'Segoe UI', Arial, sans-serif; margin: 20px; background: #f8f9fa; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; }
+        .controls { display: flex; gap: 10px; flex-wrap: wrap; margin-bottom: 15px; }
+        input, select, button { padding: 8px; font-size: 14px; }
+        table { width: 100%; border-collapse: collapse; }
+        th, td { padding: 8px; border-bottom: 1px solid #eee; text-align: center; }
+        th { background: #3498db; color: white; }
+        .snippet { text-align: right; color: #555; }
+        .pager { margin-top: 15px; text-align: center; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📚 אגרות קודש - דפדפן מכתבים</h1>
+        <div class="controls">
+            <select id="volume"><option value="">כל הכרכים</option></select>
+            <input id="year" type="number" placeholder="שנה (5688)">
+            <input id="month" placeholder="חודש (אדר)">
+            <input id="q" placeholder="חיפוש בתוכן">
+            <button onclick="load(1)">הצג</button>
+        </div>
+        <p id="summary"></p>
+        <table>
+            <thead><tr><th>כרך</th><th>מכתב</th><th>תאריך</th><th>לועזי</th><th>קטע</th><th>קישור</th></tr></thead>
+            <tbody id="rows"></tbody>
+        </table>
+        <div class="pager">
+            <button id="prev" onclick="load(state.page - 1)">הקודם</button>
+            <span id="page"></span>
+            <button id="next" onclick="load(state.page + 1)">הבא</button>
+        </div>
+    </div>
+    <script>
+        const PER_PAGE = 50;
+        const state = { page: 1, pages: 1 };
+        const esc = s => String(s ?? '').replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+        
+        function row(l, snippet) {
+            return `<tr><td>${esc(l.volume_hebrew ?? l.volume.hebrew)}</td><td>${esc(l.letter_hebrew ?? l.letter.hebrew)}</td>` +
+                   `<td>${esc(l.full_date_hebrew ?? l.date.full_hebrew)}</td><td>${esc(l.date ? l.date.gregorian : '')}</td>` +
+                   `<td class="snippet">${esc(snippet)}</td><td><a href="${esc(l.url)}" target="_blank">פתח</a></td></tr>`;
+        }
+        
+        async function load(page) {
+            if (page < 1 || page > state.pages) return;
+            const q = document.getElementById('q').value.trim();
+            const tbody = document.getElementById('rows');
+            if (q) {
+                const data = await (await fetch('/api/search?limit=' + PER_PAGE + '&q=' + encodeURIComponent(q))).json();
+                tbody.innerHTML = (data.results || []).map(r => row(r, r.snippet)).join('');
+                state.page = state.pages = 1;
+                document.getElementById('summary').textContent = `נמצאו ${(data.results || []).length} תוצאות`;
+            } else {
+                const params = new URLSearchParams({ page, per_page: PER_PAGE });
+                for (const id of ['volume', 'year', 'month']) {
+                    const value = document.getElementById(id).value.trim();
+                    if (value) params.set(id, value);
+                }
+                const data = await (await fetch('/api/letters?' + params)).json();
+                tbody.innerHTML = data.letters.map(l => row(l, '')).join('');
+                state.page = data.page;
+                state.pages = Math.max(1, Math.ceil(data.total / data.per_page));
+                document.getElementById('summary').textContent = `סה"כ מכתבים: ${data.total}`;
+            }
+            document.getElementById('page').textContent = `עמוד ${state.page} מתוך ${state.pages}`;
+        }
+        
+        fetch('/api/volumes').then(r => r.json()).then(data => {
+            const select = document.getElementById('volume');
+            data.volumes.forEach(v => select.add(new Option(`כרך ${v.volume_hebrew} (${v.letters_count})`, v.volume_number)));
+        });
+        load(1);
+    </script>
+</body>
+</html>
+"""
+
+
+# הדפים הסטטיים היחידים שהשרת מגיש
+STATIC_PAGES = {
+    '/': BROWSER_PAGE,
+    '/index.html': BROWSER_PAGE
+}
+
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='אגרות קודש - שרת API מקומי')
+    parser.add_argument('--db', default='igrot_kodesh.db', help='קובץ בסיס הנתונים')
+    parser.add_argument('--host', default='127.0.0.1', help='כתובת האזנה (0.0.0.0 - כל הממשקים)')
+    parser.add_argument('--port', type=int, default=8001, help='פורט')
+    parser.add_argument('--pool-size', type=int, default=4, help='מספר חיבורים במאגר')
+    
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.db):
+        print(f"❌ בסיס הנתונים לא נמצא: {args.db}")
+        print("   הרץ קודם: python database_setup.py")
+        sys.exit(1)
+    
+    server = create_server(args.db, args.port, args.pool_size, args.host)
+    print(f"🌐 שרת API פועל בכתובת: http://{args.host}:{args.port}")
+    print(f"🗄️ בסיס נתונים: {args.db} ({args.pool_size} חיבורים)")
+    print("⏹️  ללחוץ Ctrl+C לעצירת השרת")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  השרת נעצר")
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.pool.close()
+
+
+if __name__ == "__main__":
+    main()
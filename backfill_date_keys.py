@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מילוי מפתח תאריך עברי ותאריך לועזי למכתבים קיימים
+SQLite מקומי או Supabase (אחרי הרצת add_date_keys.sql)
+"""
+
+import os
+import sys
+import argparse
+
+from hebrew_calendar import hebrew_date_key, hebrew_to_gregorian, hebrew_numeral_to_number, month_number
+
+
+def compute_date_columns(day_hebrew, month_hebrew, year_number):
+    """חישוב (מפתח תאריך, תאריך לועזי ISO) מהשדות העבריים ששמורים ב-Supabase"""
+    day = hebrew_numeral_to_number(day_hebrew)
+    month = month_number(month_hebrew)
+    key = hebrew_date_key(year_number, month, day)
+    if not key:
+        return None, None
+
+    try:
+        gregorian = hebrew_to_gregorian(year_number, month, day)
+    except ValueError:
+        gregorian = None
+    return key, gregorian.isoformat() if gregorian else None
+
+
+def backfill_sqlite(db_file):
+    """מילוי בבסיס הנתונים המקומי"""
+    from database_setup import IgrotKodeshDB
+
+    db = IgrotKodeshDB(db_file)
+    try:
+        return db.backfill_date_keys()
+    finally:
+        db.close()
+
+
+def backfill_supabase(url, key, batch_size=500):
+    """מילוי ב-Supabase - שליפה בעמודים ועדכון בקריאת RPC אחת לכל עמוד"""
+    from supabase import create_client
+
+    supabase = create_client(url, key)
+    updated = 0
+    last_id = 0
+
+    while True:
+        res = supabase.table('letters') \
+            .select('id,day_hebrew,month_hebrew,year_number') \
+            .is_('hebrew_date_key', 'null') \
+            .gt('id', last_id) \
+            .order('id') \
+            .limit(batch_size) \
+            .execute()
+        rows = res.data or []
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        updates = []
+        for row in rows:
+            date_key, gregorian = compute_date_columns(row.get('day_hebrew'), row.get('month_hebrew'), row.get('year_number'))
+            if date_key:
+                updates.append({'id': row['id'], 'hebrew_date_key': date_key, 'gregorian_date': gregorian})
+
+        if updates:
+            result = supabase.rpc('backfill_letter_dates', {'updates': updates}).execute()
+            updated += result.data or 0
+        print(f"📅 עובדו {len(rows)} מכתבים (עד id={last_id}), עודכנו עד כה: {updated}")
+
+    return updated
+
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='מילוי מפתחות תאריך למכתבים קיימים')
+    parser.add_argument('--sqlite', default=None, help='קובץ SQLite מקומי (למשל igrot_kodesh.db)')
+    parser.add_argument('--supabase', action='store_true', help='מילוי ב-Supabase (SUPABASE_URL, SUPABASE_ANON_KEY)')
+    parser.add_argument('--batch-size', type=int, default=500, help='גודל עמוד לעדכון')
+
+    args = parser.parse_args()
+
+    if not args.sqlite and not args.supabase:
+        parser.error('יש לבחור --sqlite או --supabase')
+
+    print("📅 מילוי מפתחות תאריך")
+    print("=" * 50)
+
+    if args.sqlite:
+        count = backfill_sqlite(args.sqlite)
+        print(f"✅ SQLite: עודכנו {count} מכתבים")
+
+    if args.supabase:
+        url = os.getenv('SUPABASE_URL', '')
+        key = os.getenv('SUPABASE_ANON_KEY', '')
+        if not url or not key:
+            print("❌ נא להגדיר משתני סביבה SUPABASE_URL ו-SUPABASE_ANON_KEY")
+            sys.exit(1)
+        count = backfill_supabase(url, key, args.batch_size)
+        print(f"✅ Supabase: עודכנו {count} מכתבים")
+
+
+if __name__ == "__main__":
+    main()
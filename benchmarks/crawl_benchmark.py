@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בנצ'מרק קצה-לקצה של הסריקה מול chabad.org מדומה
+מריץ את LettersDownloader, את FixedIgrotParser (עם Supabase מקומי בזיכרון) ואת מחולל הדוחות
+מול שרת מקומי, ומודד מכתבים לשנייה, p50/p95 של זמן טעינת דף ו-RSS מרבי.
+התוצאות נשמרות כ-JSON להשוואה בין ריצות (--compare).
+
+    python benchmarks/crawl_benchmark.py --volumes 2 --letters 40 --latency-ms 50 --skip-sleeps
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import types
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'main'))
+sys.path.append(os.path.join(ROOT, 'tests'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_chabad import MockChabadSite, number_to_hebrew
+from local_supabase import LocalSupabase
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+STAGES = ['downloader', 'parser', 'recrawl', 'reports']
+
+
+def percentile(values, pct):
+    """אחוזון (nearest-rank)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """RSS מרבי של התהליך ושל תהליכי הבן (Chrome/chromedriver) במגה-בייט"""
+    if not resource:
+        return None, None
+    # ru_maxrss: KB בלינוקס, בתים ב-macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(own / divisor, 1), round(children / divisor, 1)
+
+
+class TimedDriver:
+    """עטיפה ל-WebDriver שמודדת כל driver.get"""
+    
+    def __init__(self, driver, timings):
+        self._driver = driver
+        self._timings = timings
+    
+    def get(self, url):
+        start = time.perf_counter()
+        try:
+            return self._driver.get(url)
+        finally:
+            self._timings.append(time.perf_counter() - start)
+    
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+def time_driver_manager(manager, timings):
+    """כל דרייבר שה-DriverManager יוצר נעטף ב-TimedDriver (הנוכחי ממוחזר)"""
+    factory = manager.factory
+    manager.factory = lambda: TimedDriver(factory(), timings)
+    manager.recycle('benchmark')
+
+
+@contextmanager
+def skipped_sleeps(modules, enabled):
+    """ביטול time.sleep במודולים הנבדקים - מודד את הצנרת עצמה ולא את ההמתנות"""
+    if not enabled:
+        yield
+        return
+    originals = {}
+    for module in modules:
+        originals[module] = module.time
+        module.time = types.SimpleNamespace(**{**vars(time), 'sleep': lambda seconds: None})
+    try:
+        yield
+    finally:
+        for module, original in originals.items():
+            module.time = original
+
+
+def _stage_result(name, site, started, letters, timings, statuses_before):
+    elapsed = time.perf_counter() - started
+    own_rss, children_rss = peak_rss_mb()
+    errors = sum(count for status, count in site.statuses.items()
+                 if status >= 500) - sum(count for status, count in statuses_before.items() if status >= 500)
+    return {
+        'stage': name,
+        'elapsed_sec': round(elapsed, 3),
+        'letters': letters,
+        'letters_per_sec': round(letters / elapsed, 3) if elapsed else None,
+        'pages': len(timings),
+        'page_latency_p50_ms': round(percentile(timings, 50) * 1000, 1) if timings else None,
+        'page_latency_p95_ms': round(percentile(timings, 95) * 1000, 1) if timings else None,
+        'server_errors': errors,
+        'peak_rss_mb': own_rss,
+        'children_peak_rss_mb': children_rss
+    }
+
+
+def run_downloader(site, workdir, skip_sleeps):
+    """LettersDownloader.download_all_letters על כל האתר המדומה"""
+    import letters_downloader
+    from letters_downloader import LettersDownloader
+    
+    timings = []
+    statuses_before = site.statuses.copy()
+    download_dir = os.path.join(workdir, 'letters')
+    started = time.perf_counter()
+    with skipped_sleeps([letters_downloader], skip_sleeps):
+        downloader = LettersDownloader(download_dir=download_dir, headless=True)
+        time_driver_manager(downloader.driver_manager, timings)
+        downloader.download_all_letters(site.start_url)
+    result = _stage_result('downloader', site, started, downloader.saved_letters, timings, statuses_before)
+    result['stage_timings'] = downloader.timer.to_json()['stages']
+    result['driver'] = downloader.driver_manager.summary()
+    return result
+
+
+def run_parser(site, skip_sleeps, local=None, name='parser'):
+    """FixedIgrotParser.parse_volume לכל כרך, עם Supabase מקומי (local - מסד קיים לסריקה חוזרת)"""
+    import supabase_parser_fixed
+    from supabase_parser_fixed import FixedIgrotParser
+    
+    timings = []
+    
+    class BenchmarkParser(FixedIgrotParser):
+        def setup_driver(self):
+            driver = super().setup_driver()
+            return TimedDriver(driver, timings) if driver else None
+    
+    local = local or LocalSupabase()
+    statuses_before = site.statuses.copy()
+    started = time.perf_counter()
+    with skipped_sleeps([supabase_parser_fixed], skip_sleeps):
+        parser = BenchmarkParser('http://localhost', 'local', supabase_client=local)
+        parser.base_urls = {'main': site.start_url, 'volume_1': site.volume_url(1)}
+        for volume in range(1, site.volumes + 1):
+            parser.parse_volume(volume_hebrew=number_to_hebrew(volume), volume_number=volume,
+                                volume_url=site.volume_url(volume), max_letters=site.letters_per_volume,
+                                resume=False)
+        parser.close()
+    result = _stage_result(name, site, started, len(local.tables.get('letters', [])), timings, statuses_before)
+    result['supabase_calls'] = dict(local.calls)
+    result['letters_unchanged'] = parser.session_stats['letters_unchanged']
+    result['change_detection'] = parser.change_detector.summary()
+    result['stage_timings'] = parser.timer.to_json()['stages']
+    result['driver'] = parser.driver_manager.summary()
+    return result
+
+
+def run_recrawl(site, skip_sleeps):
+    """סריקה חוזרת על מסד מלא: רק הסריקה השנייה נמדדת - מכתבים שלא השתנו מדולגים"""
+    local = LocalSupabase()
+    run_parser(site, skip_sleeps, local)
+    local.calls.clear()
+    return run_parser(site, skip_sleeps, local, name='recrawl')
+
+
+def run_reports(site, skip_sleeps):
+    """LettersReportGenerator.generate_volume_report (HTML) לכרך הראשון - נכתב ל-reports/ בתיקיית העבודה"""
+    import letters_downloader
+    from generate_letters_report import LettersReportGenerator
+    
+    timings = []
+    statuses_before = site.statuses.copy()
+    started = time.perf_counter()
+    with skipped_sleeps([letters_downloader], skip_sleeps):
+        generator = LettersReportGenerator()
+        time_driver_manager(generator.downloader.driver_manager, timings)
+        report = generator.generate_volume_report('כרך א', 'html', start_url=site.start_url)
+    letters = site.letters_per_volume if report else 0
+    return _stage_result('reports', site, started, letters, timings, statuses_before)
+
+
+def compare(results, baseline_file, threshold):
+    """השוואה לריצה קודמת - מסמן ירידה בקצב או עלייה ב-p95 מעבר לסף"""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = {stage['stage']: stage for stage in json.load(f)['stages']}
+    
+    regressions = []
+    print(f"\n📊 השוואה ל-{baseline_file}:")
+    for stage in results['stages']:
+        base = baseline.get(stage['stage'])
+        if not base:
+            continue
+        for metric, higher_is_better in (('letters_per_sec', True), ('page_latency_p95_ms', False)):
+            old, new = base.get(metric), stage.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change < -threshold if higher_is_better else change > threshold
+            marker = '⚠️' if worse else '✅'
+            print(f"   {marker} {stage['stage']}.{metric}: {old} -> {new} ({change:+.1%})")
+            if worse:
+                regressions.append(f"{stage['stage']}.{metric}")
+    return regressions
+
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description="בנצ'מרק סריקה מול chabad.org מדומה")
+    parser.add_argument('--volumes', type=int, default=2, help='מספר כרכים באתר המדומה')
+    parser.add_argument('--letters', type=int, default=30, help='מכתבים בכל כרך')
+    parser.add_argument('--per-page', type=int, default=20, help='מכתבים בכל עמוד כרך')
+    parser.add_argument('--latency-ms', type=float, default=0, help='השהיה לכל בקשה')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='השהיה אקראית נוספת')
+    parser.add_argument('--failure-rate', type=float, default=0, help='שיעור תשובות 503 (0-1)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES, help='שלבים להרצה')
+    parser.add_argument('--skip-sleeps', action='store_true', help='ביטול time.sleep בקוד הנבדק')
+    parser.add_argument('--output', default=None, help='קובץ JSON לתוצאות')
+    parser.add_argument('--compare', default=None, help='קובץ JSON של ריצה קודמת להשוואה')
+    parser.add_argument('--threshold', type=float, default=0.1, help='סף רגרסיה יחסי (ברירת מחדל 10%%)')
+    
+    args = parser.parse_args()
+    
+    print("🏁 בנצ'מרק סריקה מול chabad.org מדומה")
+    print("=" * 50)
+    
+    site = MockChabadSite(volumes=args.volumes, letters_per_volume=args.letters, per_page=args.per_page,
+                          latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                          failure_rate=args.failure_rate)
+    results = {
+        'generated_at': datetime.now().isoformat(),
+        'config': vars(args),
+        'stages': []
+    }
+    
+    with site, tempfile.TemporaryDirectory() as workdir:
+        print(f"🌐 אתר מדומה: {site.start_url} ({site.total_letters} מכתבים)")
+        # הדאונלודר כותב לוגים ל-../logs - תיקיית עבודה זמנית משלו
+        os.makedirs(os.path.join(workdir, 'run'), exist_ok=True)
+        cwd = os.getcwd()
+        os.chdir(os.path.join(workdir, 'run'))
+        try:
+            for stage in args.stages:
+                print(f"\n▶️ שלב: {stage}")
+                if stage == 'downloader':
+                    result = run_downloader(site, workdir, args.skip_sleeps)
+                elif stage == 'parser':
+                    result = run_parser(site, args.skip_sleeps)
+                elif stage == 'recrawl':
+                    result = run_recrawl(site, args.skip_sleeps)
+                else:
+                    result = run_reports(site, args.skip_sleeps)
+                results['stages'].append(result)
+                print(f"   ✅ {result['letters']} מכתבים ב-{result['elapsed_sec']} שניות "
+                      f"({result['letters_per_sec']} מכתבים/שנייה), p50={result['page_latency_p50_ms']}ms "
+                      f"p95={result['page_latency_p95_ms']}ms, RSS={result['peak_rss_mb']}MB")
+        finally:
+            os.chdir(cwd)
+    
+    results['server'] = {
+        'requests': sum(site.statuses.values()),
+        'statuses': {str(k): v for k, v in site.statuses.items()},
+        'serve_p50_ms': round((percentile(site.serve_times, 50) or 0) * 1000, 1),
+        'serve_p95_ms': round((percentile(site.serve_times, 95) or 0) * 1000, 1)
+    }
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 תוצאות נשמרו: {output}")
+    
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"❌ רגרסיה: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
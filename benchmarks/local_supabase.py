@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+תחליף מקומי בזיכרון ללקוח Supabase - לבנצ'מרקים בלי רשת
+תומך בחלק מה-query builder שהפרסרים משתמשים בו:
+select / eq / gt / is_ / order / limit / insert / update / upsert / execute
+ו-RPC save_letters_batch (add_parse_checkpoints.sql, add_change_detection.sql, add_letter_contents.sql)
+ו-get_letter_content / search_letters_content (add_letter_contents.sql)
+"""
+
+import copy
+import threading
+from collections import Counter
+from datetime import datetime
+
+
+class LocalResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """בונה שאילתה על טבלה אחת"""
+    
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._columns = None
+        self._count = None
+        self._action = ('select', None)
+    
+    # ---- פעולות ----
+    
+    def select(self, columns='*', count=None):
+        self._columns = None if columns == '*' else [c.strip() for c in columns.split(',')]
+        self._count = count
+        return self
+    
+    def insert(self, data):
+        self._action = ('insert', data)
+        return self
+    
+    def update(self, data):
+        self._action = ('update', data)
+        return self
+    
+    def upsert(self, data, on_conflict=None):
+        self._action = ('upsert', (data, on_conflict))
+        return self
+    
+    # ---- סינון ----
+    
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+    
+    def gt(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+    
+    def is_(self, column, value):
+        expected = None if value in (None, 'null') else value
+        self._filters.append(lambda row: row.get(column) is expected)
+        return self
+    
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+    
+    def limit(self, count):
+        self._limit = count
+        return self
+    
+    # ---- ביצוע ----
+    
+    def _matching(self, rows):
+        return [row for row in rows if all(f(row) for f in self._filters)]
+    
+    def execute(self):
+        with self.client.lock:
+            self.client.calls[f'{self.table}.{self._action[0]}'] += 1
+            rows = self.client.tables.setdefault(self.table, [])
+            action, payload = self._action
+            
+            if action == 'insert':
+                return LocalResult([self.client.insert_row(self.table, item) for item in _as_list(payload)])
+            
+            if action == 'update':
+                matched = self._matching(rows)
+                for row in matched:
+                    row.update(copy.deepcopy(payload))
+                return LocalResult(copy.deepcopy(matched))
+            
+            if action == 'upsert':
+                data, on_conflict = payload
+                keys = [k.strip() for k in (on_conflict or 'id').split(',')]
+                result = []
+                for item in _as_list(data):
+                    existing = next((r for r in rows if all(r.get(k) == item.get(k) for k in keys)), None)
+                    if existing:
+                        existing.update(copy.deepcopy(item))
+                        result.append(copy.deepcopy(existing))
+                    else:
+                        result.append(self.client.insert_row(self.table, item))
+                return LocalResult(result)
+            
+            matched = self._matching(rows)
+            if self._order:
+                column, desc = self._order
+                matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+            count = len(matched) if self._count else None
+            if self._limit is not None:
+                matched = matched[:self._limit]
+            if self._columns:
+                matched = [{c: r.get(c) for c in self._columns} for r in matched]
+            return LocalResult(copy.deepcopy(matched), count)
+
+
+def _as_list(data):
+    return data if isinstance(data, list) else [data]
+
+
+class LocalSupabase:
+    """לקוח Supabase בזיכרון: client.table('letters').select('id').eq(...).execute()"""
+    
+    def __init__(self):
+        self.tables = {}
+        self.lock = threading.RLock()
+        self._ids = {}
+        self.calls = Counter()
+    
+    def table(self, name):
+        return LocalQuery(self, name)
+    
+    def insert_row(self, table, item):
+        row = copy.deepcopy(item)
+        if 'id' not in row:
+            self._ids[table] = self._ids.get(table, 0) + 1
+            row['id'] = self._ids[table]
+        row.setdefault('created_at', datetime.now().isoformat())
+        self.tables.setdefault(table, []).append(row)
+        return copy.deepcopy(row)
+    
+    def rpc(self, name, params=None):
+        handler = getattr(self, f'_rpc_{name}', None)
+        if handler is None:
+            raise NotImplementedError(f"RPC {name} לא נתמך בתחליף המקומי")
+        return LocalRpc(self, name, lambda: handler(**(params or {})))
+    
+    def _rpc_save_letters_batch(self, p_volume_id, p_volume_number, p_letters, p_page, p_last_aid, p_last_url):
+        """כמו save_letters_batch ב-add_letter_contents.sql: מכתבים, תוכן מלא ונקודת חידוש תחת נעילה אחת"""
+        letters = self.tables.setdefault('letters', [])
+        unique = {letter['letter_number']: letter for letter in p_letters}
+        saved = 0
+        for letter_number, letter in sorted(unique.items()):
+            letter = copy.deepcopy(letter)
+            contents = {'encoding': letter.pop('content_encoding', None),
+                        'content': letter.pop('content_compressed', None),
+                        'content_length': letter.pop('content_length', None),
+                        'content_tsv': letter.pop('search_terms', None)}
+            # הטקסט רק ב-letter_contents
+            letter['content'] = None
+            existing = next((r for r in letters
+                             if r.get('volume_id') == p_volume_id and r.get('letter_number') == letter_number), None)
+            if existing is None:
+                existing = self.insert_row('letters', dict(letter, volume_id=p_volume_id))
+                existing = next(r for r in letters if r['id'] == existing['id'])
+                saved += 1
+            # add_change_detection.sql: אותו content_hash - השורה לא נכתבת
+            elif existing.get('content_hash') is None or existing.get('content_hash') != letter.get('content_hash'):
+                existing.update(letter)
+                saved += 1
+            if contents['content'] is not None:
+                self._upsert_contents(existing['id'], contents)
+        
+        checkpoints = self.tables.setdefault('parse_checkpoints', [])
+        checkpoint = next((r for r in checkpoints if r['volume_number'] == p_volume_number), None)
+        if checkpoint is None:
+            checkpoint = {'volume_number': p_volume_number, 'letters_saved': 0}
+            checkpoints.append(checkpoint)
+        checkpoint.update({
+            'volume_id': p_volume_id,
+            'last_page': p_page,
+            'last_aid': p_last_aid,
+            'last_url': p_last_url,
+            'letters_saved': checkpoint['letters_saved'] + saved,
+            'status': 'running',
+            'updated_at': datetime.now().isoformat()
+        })
+        return saved
+    
+    def _upsert_contents(self, letter_id, contents):
+        """שורת letter_contents - התוכן הדחוס נשמר ב-base64 כפי שהגיע"""
+        rows = self.tables.setdefault('letter_contents', [])
+        row = next((r for r in rows if r['letter_id'] == letter_id), None)
+        if row is None:
+            rows.append(dict(contents, letter_id=letter_id))
+        else:
+            row.update(contents)
+    
+    def _rpc_get_letter_content(self, p_letter_id):
+        """כמו get_letter_content ב-add_letter_contents.sql"""
+        row = next((r for r in self.tables.get('letter_contents', []) if r['letter_id'] == p_letter_id), None)
+        if row is None:
+            return []
+        return [{'encoding': row['encoding'], 'content': row['content'], 'content_length': row['content_length']}]
+    
+    def _rpc_search_letters_content(self, q, max_results=20):
+        """כמו search_letters_content ב-add_letter_contents.sql - כל המילים, בלי דירוג וקטע מהשרת"""
+        from database_setup import query_terms
+        words = {part for word, _ in query_terms(q) for part in word.lower().split()}
+        letters = {row['id']: row for row in self.tables.get('letters', [])}
+        results = []
+        for row in self.tables.get('letter_contents', []):
+            if words and words <= set((row.get('content_tsv') or '').split()) and row['letter_id'] in letters:
+                letter = letters[row['letter_id']]
+                results.append({'id': letter['id'], 'tom_number': letter.get('tom_number'),
+                                'letter_number': letter.get('letter_number'), 'letter_hebrew': letter.get('letter_hebrew'),
+                                'full_date_hebrew': letter.get('full_date_hebrew'), 'url': letter.get('url'),
+                                'rank': 1.0, 'snippet': None})
+        return results[:max_results]
+
+
+class LocalRpc:
+    """קריאת RPC דחויה: client.rpc(name, params).execute()"""
+    
+    def __init__(self, client, name, call):
+        self.client = client
+        self.name = name
+        self.call = call
+    
+    def execute(self):
+        with self.client.lock:
+            self.client.calls[f'rpc.{self.name}'] += 1
+            return LocalResult(self.call())
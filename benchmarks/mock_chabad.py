@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+אתר chabad.org מדומה להרצת ביצועים מקומית
+דף כרכים, דפי כרך מחולקים לעמודים (/page/N ו-?page=N) ודפי מכתבים,
+עם ETag / 304 לבקשות מותנות, השהיה מוגדרת והזרקת שגיאות - כמו המבנה שהדאונלודר והפרסר מצפים לו.
+"""
+
+import hashlib
+import http.server
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+
+INDEX_AID = 4643797
+FIRST_LETTER_AID = 4645943
+
+HEBREW_MONTHS = ['תשרי', 'חשון', 'כסלו', 'טבת', 'שבט', 'אדר', 'ניסן', 'אייר', 'סיון', 'תמוז', 'מנחם אב', 'אלול']
+
+_ONES = ['', 'א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט']
+_TENS = ['', 'י', 'כ', 'ל', 'מ', 'נ', 'ס', 'ע', 'פ', 'צ']
+_HUNDREDS = ['', 'ק', 'ר', 'ש', 'ת', 'תק', 'תר', 'תש', 'תת', 'תתק']
+
+
+def number_to_hebrew(number, geresh=False):
+    """מספר לגימטריה (1-999), עם ט"ו/ט"ז ועם גרשיים לפי הצורך"""
+    number %= 1000
+    tail = number % 100
+    if tail in (15, 16):
+        letters = _HUNDREDS[number // 100] + ('טו' if tail == 15 else 'טז')
+    else:
+        letters = _HUNDREDS[number // 100] + _TENS[tail // 10] + _ONES[tail % 10]
+    if geresh and len(letters) > 1:
+        return letters[:-1] + '"' + letters[-1]
+    return letters
+
+
+def volume_aid(volume_number):
+    return 4643805 + (volume_number - 1) * 1000
+
+
+def letter_aid(volume_number, letter_number):
+    # כרך א: aid - 4645942 == מספר המכתב, כמו באתר האמיתי
+    return FIRST_LETTER_AID - 1 + (volume_number - 1) * 100000 + letter_number
+
+
+def page_path(aid):
+    return f"/therebbe/article_cdo/aid/{aid}/jewish/page.htm"
+
+
+def letter_date_line(volume_number, letter_number):
+    """שורת תאריך ראשונה בסגנון המכתבים: ב"ה, כ"א אדר, תרפ"ח"""
+    index = (volume_number - 1) * 1000 + letter_number
+    day = index % 29 + 1
+    month = HEBREW_MONTHS[index % len(HEBREW_MONTHS)]
+    year = 5688 + index // 40
+    return f'ב"ה, {number_to_hebrew(day, True)} {month}, {number_to_hebrew(year, True)}'
+
+
+LETTER_BODY = ('שלום וברכה! במענה על מכתבו, בו כותב אודות עניניו, הנה כבר ידוע מאמר רז"ל '
+               'שצריך להוסיף בכל ענייני תורה ומצוות, ובפרט בזמן הזה. ')
+
+
+class MockChabadHandler(http.server.BaseHTTPRequestHandler):
+    """מגיש את דפי האתר המדומה לפי הגדרות השרת"""
+    
+    def do_GET(self):
+        self._respond(send_body=True)
+    
+    def do_HEAD(self):
+        self._respond(send_body=False)
+    
+    def _respond(self, send_body):
+        site = self.server.site
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        
+        delay = site.latency + (site.random.uniform(0, site.jitter) if site.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        
+        if site.failure_rate and site.random.random() < site.failure_rate:
+            status, body = 503, '<html><body><h1>Service Unavailable</h1></body></html>'
+        else:
+            status, body = site.render(url.path, parse_qs(url.query))
+        
+        data = body.encode('utf-8')
+        # ETag לפי התוכן - בקשה מותנית עם אותו ETag מקבלת 304 בלי גוף
+        etag = f'"{hashlib.md5(data).hexdigest()[:16]}"' if status == 200 else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            status, data = 304, b''
+        # נרשם לפני השליחה - הלקוח רואה את המונה מעודכן ברגע שקיבל תשובה
+        site.record(status, time.perf_counter() - started)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class MockChabadSite:
+    """
+    אתר מדומה
+    
+    Args:
+        volumes: מספר כרכים
+        letters_per_volume: מכתבים בכל כרך
+        per_page: מכתבים בכל עמוד של דף הכרך
+        latency / jitter: השהיה קבועה ואקראית לכל בקשה (שניות)
+        failure_rate: שיעור תשובות 503
+        paragraphs: אורך כל מכתב בפסקאות
+    """
+    
+    def __init__(self, volumes=2, letters_per_volume=50, per_page=25, latency=0.0, jitter=0.0,
+                 failure_rate=0.0, paragraphs=8, seed=0, port=0):
+        self.volumes = volumes
+        self.letters_per_volume = letters_per_volume
+        self.per_page = per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.paragraphs = paragraphs
+        self.random = random.Random(seed)
+        self.port = port
+        self.statuses = Counter()
+        self.serve_times = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._routes = {page_path(INDEX_AID): ('index', None)}
+        for v in range(1, volumes + 1):
+            self._routes[page_path(volume_aid(v))] = ('volume', v)
+            for n in range(1, letters_per_volume + 1):
+                self._routes[page_path(letter_aid(v, n))] = ('letter', (v, n))
+    
+    # ---- שרת ----
+    
+    def start(self):
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', self.port), MockChabadHandler)
+        self._server.daemon_threads = True
+        self._server.site = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+    
+    @property
+    def start_url(self):
+        return self.base_url + page_path(INDEX_AID)
+    
+    def volume_url(self, volume_number):
+        return self.base_url + page_path(volume_aid(volume_number))
+    
+    def record(self, status, seconds):
+        with self._lock:
+            self.statuses[status] += 1
+            self.serve_times.append(seconds)
+    
+    @property
+    def total_letters(self):
+        return self.volumes * self.letters_per_volume
+    
+    # ---- דפים ----
+    
+    def render(self, path, query):
+        page = 1
+        if '/page/' in path:
+            path, _, number = path.rpartition('/page/')
+            page = int(number) if number.isdigit() else 0
+        elif 'page' in query:
+            page = int(query['page'][0]) if query['page'][0].isdigit() else 0
+        
+        kind, key = self._routes.get(path, (None, None))
+        if kind == 'index':
+            return 200, self._index_page()
+        if kind == 'volume':
+            pages = -(-self.letters_per_volume // self.per_page)
+            if 1 <= page <= pages:
+                return 200, self._volume_page(key, page, pages)
+        if kind == 'letter':
+            return 200, self._letter_page(*key)
+        return 404, '<html><head><title>404</title></head><body><h1>Page not found</h1></body></html>'
+    
+    def _page(self, title, body):
+        return (f'<!DOCTYPE html><html dir="rtl" lang="he"><head><meta charset="UTF-8"><title>{title}</title>'
+                f'<script>var tracking = true;</script><style>body {{ margin: 0; }}</style></head>'
+                f'<body><header><nav><a href="/">Home</a> <a href="/browse">Browse</a></nav></header>'
+                f'{body}<footer>© Chabad.org</footer></body></html>')
+    
+    def _index_page(self):
+        links = ''.join(
+            f'<li><a href="{page_path(volume_aid(v))}">אגרות קודש - כרך {number_to_hebrew(v)}</a></li>'
+            for v in range(1, self.volumes + 1)
+        )
+        return self._page('אגרות קודש', f'<h1>אגרות קודש</h1><ul class="volumes">{links}</ul>')
+    
+    def _volume_page(self, volume_number, page, pages):
+        first = (page - 1) * self.per_page + 1
+        last = min(page * self.per_page, self.letters_per_volume)
+        items = ''.join(
+            f'<div class="article-item"><a href="{page_path(letter_aid(volume_number, n))}">'
+            f'אגרות קודש - מכתב {number_to_hebrew(n)}</a><span class="date">{letter_date_line(volume_number, n)}</span></div>'
+            for n in range(first, last + 1)
+        )
+        base = page_path(volume_aid(volume_number))
+        pager = f'<a id="Paginator_NextPage" href="{base}/page/{page + 1}">Next</a>' if page < pages else ''
+        title = f'אגרות קודש - כרך {number_to_hebrew(volume_number)}'
+        return self._page(title, f'<h1>{title}</h1><div class="article-list">{items}</div><div class="pager">{pager}</div>')
+    
+    def _letter_page(self, volume_number, letter_number):
+        title = f'אגרות קודש - מכתב {number_to_hebrew(letter_number)}'
+        paragraphs = ''.join(f'<p>{LETTER_BODY * 3}</p>' for _ in range(self.paragraphs))
+        body = (f'<h1>{title}</h1><div class="article-body">'
+                f'<p>{letter_date_line(volume_number, letter_number)}</p>{paragraphs}</div>')
+        return self._page(title, body)
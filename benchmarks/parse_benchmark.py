@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מיקרו-בנצ'מרק לנתיבים החמים של הפרסור
+גימטריה, פרסור תאריכים, _extract_letters_from_page ו-extract_letter_content -
+כל פונקציה על fixtures מוקלטים ועל כל backend של BeautifulSoup שמותקן.
+התוצאות נשמרות כ-JSON ו---compare מסמן רגרסיה מול ריצה קודמת.
+
+    python benchmarks/parse_benchmark.py
+    python benchmarks/parse_benchmark.py --compare   # מול benchmarks/results/parse_baseline.json
+    python benchmarks/parse_benchmark.py --filter date --compare other_run.json
+    python benchmarks/parse_benchmark.py --record   # הקלטת דפי כרך ומכתב אמיתיים ל-fixtures
+
+ה-baseline תלוי במכונה ולכן לא נשמר ב-git: ריצת --compare ראשונה בלי baseline שומרת אותו
+מקומית, והריצות הבאות מושוות אליו. מקרי ה-HTML מושווים רק כשמקור ה-fixtures
+(recorded / mock) זהה לזה שב-baseline.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'main'))
+sys.path.append(os.path.join(ROOT, 'tests'))
+sys.path.append(BENCH_DIR)
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'parse_baseline.json')
+DATES_SAMPLE = os.path.join(ROOT, 'tests', 'test_dates_sample.csv')
+
+MANIFEST = os.path.join(FIXTURES_DIR, 'manifest.json')
+
+BACKENDS = ['html.parser', 'lxml', 'html5lib']
+# מקרים שנמדדים על דפי ה-fixtures
+HTML_GROUPS = ('soup/', 'extract_letters/', 'extract_content/')
+RECORD_URLS = {
+    'volume_page.html': 'https://www.chabad.org/therebbe/article_cdo/aid/4643805/jewish/page.htm',
+    'letter_page.html': 'https://www.chabad.org/therebbe/article_cdo/aid/4645943/jewish/page.htm'
+}
+
+CASES = []
+
+
+def case(group, name):
+    """
+    רישום מקרה בנצ'מרק
+    
+    הפונקציה המעוטרת מכינה את הנתונים ומחזירה (פונקציה, מספר פריטים לקריאה),
+    או None כשהתלות חסרה בסביבה הנוכחית.
+    """
+    def register(setup):
+        CASES.append((f"{group}/{name}", setup))
+        return setup
+    return register
+
+
+# ---- fixtures ----
+
+def first_lines():
+    """שורות ראשונות של מכתבים - מה-fixture ומ-test_dates_sample.csv"""
+    with open(os.path.join(FIXTURES_DIR, 'first_lines.txt'), encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f if line.strip()]
+    with open(DATES_SAMPLE, encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            if row['תאריך'] != 'לא נמצא':
+                lines.append(f'ב"ה, {row["תאריך"]}')
+    return lines
+
+
+def gematria_tokens():
+    """אסימוני יום/מספר מכתב כפי שהם מופיעים בדפים"""
+    tokens = []
+    for line in first_lines():
+        tokens.extend(word.strip(',.') for word in line.split()[1:])
+    return tokens + ['א', 'יא', 'טו', 'כ"ט', 'מט', 'נ']
+
+
+def load_html(name):
+    """דף מוקלט מ-fixtures, ואם לא הוקלט - דף מהאתר המדומה באותו מבנה"""
+    path = os.path.join(FIXTURES_DIR, name)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read(), 'recorded'
+    
+    from mock_chabad import MockChabadSite, page_path, volume_aid, letter_aid
+    site = MockChabadSite(volumes=1, letters_per_volume=100, per_page=100)
+    target = page_path(volume_aid(1)) if name == 'volume_page.html' else page_path(letter_aid(1, 1))
+    return site.render(target, {})[1], 'mock'
+
+
+def record_fixtures():
+    """הורדת דפי כרך ומכתב אמיתיים ל-fixtures, עם manifest.json (כתובת, מועד, sha256)"""
+    import hashlib
+    import requests
+    
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    manifest = {}
+    for name, url in RECORD_URLS.items():
+        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        manifest[name] = {
+            'url': url,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'sha256': hashlib.sha256(response.text.encode('utf-8')).hexdigest()
+        }
+        print(f"💾 {name}: {len(response.text):,} תווים מ-{url}")
+    with open(MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"💾 {MANIFEST} - יש לבצע commit לדפים ול-manifest ולהריץ מחדש את ה-baseline")
+
+
+def available_backends():
+    try:
+        from bs4 import BeautifulSoup, FeatureNotFound
+    except ImportError:
+        return []
+    backends = []
+    for backend in BACKENDS:
+        try:
+            BeautifulSoup('<p></p>', backend)
+            backends.append(backend)
+        except FeatureNotFound:
+            pass
+    return backends
+
+
+def _downloader():
+    """LettersDownloader בלי דפדפן - רק לשיטות הפרסור"""
+    from letters_downloader import LettersDownloader
+    downloader = LettersDownloader.__new__(LettersDownloader)
+    downloader.logger = logging.getLogger('parse_benchmark')
+    downloader.logger.setLevel(logging.WARNING)
+    return downloader
+
+
+# ---- מקרים ----
+
+@case('gematria', 'hebrew_calendar.hebrew_numeral_to_number')
+def _gematria_calendar():
+    from hebrew_calendar import hebrew_numeral_to_number
+    tokens = gematria_tokens()
+    return lambda: [hebrew_numeral_to_number(token) for token in tokens], len(tokens)
+
+
+@case('gematria', 'test_10_letters.hebrew_letter_to_number')
+def _gematria_letters():
+    try:
+        from test_10_letters import hebrew_letter_to_number
+    except ImportError:
+        return None
+    tokens = gematria_tokens()
+    return lambda: [hebrew_letter_to_number(token) for token in tokens], len(tokens)
+
+
+@case('gematria', 'FixedIgrotParser.hebrew_letter_to_number')
+def _gematria_parser():
+    try:
+        from supabase_parser_fixed import FixedIgrotParser
+    except ImportError:
+        return None
+    parser = FixedIgrotParser.__new__(FixedIgrotParser)
+    tokens = gematria_tokens()
+    return lambda: [parser.hebrew_letter_to_number(token) for token in tokens], len(tokens)
+
+
+@case('date', 'HebrewDateParser.extract_date_from_text')
+def _date_parser():
+    try:
+        from test_10_letters import HebrewDateParser
+    except ImportError:
+        return None
+    parser = HebrewDateParser()
+    lines = first_lines()
+    # הפרסר מדפיס כל שלב - הפלט הולך ל-devnull כדי למדוד את הפרסור ולא את הטרמינל
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    
+    def run():
+        with contextlib.redirect_stdout(devnull):
+            return [parser.extract_date_from_text(line) for line in lines]
+    return run, len(lines)
+
+
+@case('date', 'hebrew_calendar.hebrew_to_gregorian')
+def _date_gregorian():
+    from hebrew_calendar import hebrew_to_gregorian, hebrew_date_key
+    dates = [(5688 + i % 60, i % 13 + 1, i % 29 + 1) for i in range(200)]
+    
+    def run():
+        hebrew_to_gregorian.cache_clear()
+        return [(hebrew_date_key(*d), hebrew_to_gregorian(*d)) for d in dates]
+    return run, len(dates)
+
+
+def _soup_cases():
+    for backend in BACKENDS:
+        @case('soup', backend)
+        def _soup(backend=backend):
+            if backend not in available_backends():
+                return None
+            from bs4 import BeautifulSoup
+            html, _ = load_html('volume_page.html')
+            return lambda: BeautifulSoup(html, backend), 1
+        
+        @case('extract_letters', backend)
+        def _extract_letters(backend=backend):
+            if backend not in available_backends():
+                return None
+            try:
+                downloader = _downloader()
+            except ImportError:
+                return None
+            from bs4 import BeautifulSoup
+            html, _ = load_html('volume_page.html')
+            soup = BeautifulSoup(html, backend)
+            url = RECORD_URLS['volume_page.html']
+            return lambda: downloader._extract_letters_from_page(soup, url, 'אגרות קודש - כרך א', 1), 1
+        
+        @case('extract_content', backend)
+        def _extract_content(backend=backend):
+            if backend not in available_backends():
+                return None
+            try:
+                downloader = _downloader()
+            except ImportError:
+                return None
+            from bs4 import BeautifulSoup
+            html, _ = load_html('letter_page.html')
+            url = RECORD_URLS['letter_page.html']
+            # extract_letter_content מוחק אלמנטים מה-soup - כל קריאה כוללת פרסור מחדש
+            return lambda: downloader.extract_letter_content(BeautifulSoup(html, backend), url), 1
+
+
+_soup_cases()
+
+
+# ---- הרצה ----
+
+def time_case(func, items, min_time=0.2, rounds=5):
+    """
+    מדידת פונקציה כמו pytest-benchmark: כיול מספר הלולאות ואז כמה סבבים
+    
+    Returns:
+        dict: median/min/max במיקרו-שניות לפריט
+    """
+    func()  # חימום
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / rounds / 10 else 2
+    
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops / items * 1e6)
+    return {
+        'median_us': round(statistics.median(samples), 3),
+        'min_us': round(min(samples), 3),
+        'max_us': round(max(samples), 3),
+        'loops': loops,
+        'rounds': rounds,
+        'items': items
+    }
+
+
+def run_suite(name_filter=None, min_time=0.2, rounds=5):
+    """הרצת כל המקרים (או אלה שמכילים name_filter)"""
+    results = {}
+    for name, setup in CASES:
+        if name_filter and name_filter not in name:
+            continue
+        prepared = setup()
+        if prepared is None:
+            print(f"   ⏭️ {name}: תלות חסרה - דילוג")
+            continue
+        func, items = prepared
+        results[name] = time_case(func, items, min_time, rounds)
+        print(f"   ⏱️ {name}: {results[name]['median_us']:,.2f}µs לפריט (min {results[name]['min_us']:,.2f})")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """רשימת המקרים שה-median שלהם גדל ביותר מ-threshold מול ה-baseline"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = (result['median_us'] - old['median_us']) / old['median_us']
+        worse = change > threshold
+        print(f"   {'⚠️' if worse else '✅'} {name}: {old['median_us']:,.2f} -> {result['median_us']:,.2f}µs ({change:+.1%})")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def comparable_baseline(baseline_doc, sources):
+    """מקרי ה-baseline שאפשר להשוות - מקרי HTML רק כשמקור ה-fixtures זהה"""
+    cases = baseline_doc['cases']
+    if baseline_doc.get('fixtures') == sources:
+        return cases
+    print(f"   ⏭️ מקור ה-fixtures שונה מה-baseline ({baseline_doc.get('fixtures')}) - מקרי HTML לא מושווים")
+    return {name: result for name, result in cases.items() if not name.startswith(HTML_GROUPS)}
+
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description="מיקרו-בנצ'מרק לפרסור")
+    parser.add_argument('--filter', default=None, help='רק מקרים שהשם שלהם מכיל מחרוזת זו')
+    parser.add_argument('--min-time', type=float, default=0.2, help='זמן מדידה מינימלי לכל מקרה (שניות)')
+    parser.add_argument('--rounds', type=int, default=5, help='מספר סבבי מדידה')
+    parser.add_argument('--output', default=None, help='קובץ JSON לתוצאות')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, default=None,
+                        help='קובץ JSON של ריצה קודמת להשוואה (ברירת מחדל: results/parse_baseline.json, '
+                             'נוצר בריצה הראשונה)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='סף רגרסיה יחסי (ברירת מחדל 20%%)')
+    parser.add_argument('--record', action='store_true', help='הקלטת דפים אמיתיים ל-fixtures ויציאה')
+    
+    args = parser.parse_args()
+    
+    if args.record:
+        record_fixtures()
+        return
+    
+    print("⏱️ מיקרו-בנצ'מרק לפרסור")
+    print("=" * 50)
+    sources = {name: load_html(name)[1] for name in RECORD_URLS}
+    print(f"📄 fixtures: {sources}, backends: {available_backends() or 'אין (bs4 לא מותקן)'}")
+    
+    results = run_suite(args.filter, args.min_time, args.rounds)
+    output = args.output or os.path.join(RESULTS_DIR, f"parse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': datetime.now().isoformat(), 'fixtures': sources,
+                   'python': sys.version.split()[0], 'cases': results}, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 תוצאות נשמרו: {output}")
+    
+    if args.compare and not os.path.exists(args.compare):
+        # ריצה ראשונה במכונה הזו - התוצאות הן ה-baseline
+        shutil.copyfile(output, args.compare)
+        print(f"📌 אין baseline - נשמר {args.compare} מהריצה הנוכחית")
+    elif args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline_doc = json.load(f)
+        print(f"\n📊 השוואה ל-{args.compare}:")
+        baseline = comparable_baseline(baseline_doc, sources)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ רגרסיה: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+זיהוי שינויים בסריקה חוזרת - דילוג על מכתבים שלא השתנו
+לכל מכתב נשמרים hash של הרשומה המפורסרת ו-ETag / Last-Modified של הדף.
+לפני פתיחת דף של מכתב שמור נשלחת בקשת HEAD מותנית (If-None-Match / If-Modified-Since):
+304 או אותם מזהים - המכתב לא נפתח כלל; ואחרי פרסור, hash זהה - בלי כתיבה למסד
+(מלבד מזהי HTTP חדשים, כדי שבסריקה הבאה יתקבל 304). למכתב חדש אין HEAD - אין מה לדלג.
+
+    detector = ChangeDetector()
+    detector.load(rows)                  # url, content_hash, etag, last_modified מהמסד
+    changed, validators = detector.check(url)
+    if changed:
+        letter_data = ...                # פרסור מלא
+        letter_data['content_hash'] = record_hash(letter_data)
+        if detector.same_hash(url, letter_data['content_hash']):
+            ...                          # אין מה לכתוב
+"""
+
+import hashlib
+import json
+from collections import Counter
+
+try:
+    import requests
+except ImportError:  # בלי requests אין בקשות מותנות - רק השוואת hash
+    requests = None
+
+# השדות שנכנסים ל-hash: תוצר הפרסור בלבד, בלי מזהים, זמנים ומזהי HTTP
+HASH_FIELDS = [
+    'tom_hebrew', 'tom_number', 'letter_hebrew', 'letter_number', 'url', 'content',
+    'date_parsed', 'full_date_hebrew', 'day_hebrew', 'month_hebrew', 'year_hebrew', 'year_number',
+    'hebrew_date_key', 'gregorian_date'
+]
+FINGERPRINT_COLUMNS = 'url,content_hash,etag,last_modified'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def record_hash(letter_data):
+    """sha256 של שדות הרשומה המפורסרת, בסדר קבוע"""
+    payload = {field: letter_data.get(field) for field in HASH_FIELDS}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class ChangeDetector:
+    """
+    בדיקת שינוי לכל מכתב מול טביעות האצבע השמורות
+    
+    Args:
+        force: רענון מלא - בודק ואוסף מזהים, אבל לעולם לא מדלג
+        timeout: זמן המתנה לבקשת HEAD בשניות
+        session: requests.Session מוכן (ברירת מחדל - חדש, אם requests מותקן)
+    """
+    
+    def __init__(self, force=False, timeout=10, session=None):
+        self.force = force
+        self.timeout = timeout
+        self.session = session
+        if self.session is None and requests:
+            self.session = requests.Session()
+            self.session.headers['User-Agent'] = USER_AGENT
+        self.known = {}
+        self.stats = Counter()
+    
+    def load(self, rows):
+        """טביעות אצבע שמורות: שורות עם url, content_hash, etag, last_modified"""
+        for row in rows or []:
+            if row.get('url'):
+                self.known[row['url']] = row
+        return len(self.known)
+    
+    def check(self, url):
+        """
+        האם צריך לפתוח ולפרסר את המכתב
+        
+        Returns:
+            (changed, validators) - validators: {'etag', 'last_modified'} לשמירה עם המכתב
+        """
+        known = self.known.get(url) or {}
+        # מכתב שלא נשמר (או בלי hash) ממילא ייפרסר - בלי בקשה נוספת לכל מכתב בסריקה ראשונה
+        if self.session is None or not known.get('content_hash'):
+            return True, {}
+        
+        headers = {}
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+        except requests.RequestException:
+            self.stats['check_errors'] += 1
+            return True, {}
+        
+        validators = {
+            'etag': response.headers.get('ETag') or (known.get('etag') if response.status_code == 304 else None),
+            'last_modified': response.headers.get('Last-Modified') or (known.get('last_modified') if response.status_code == 304 else None)
+        }
+        unchanged = response.status_code == 304 or self._same_validators(known, validators)
+        if unchanged and known.get('content_hash') and not self.force:
+            self.stats['unchanged_http'] += 1
+            return False, validators
+        self.stats['changed'] += 1
+        return True, validators
+    
+    def same_hash(self, url, content_hash):
+        """הרשומה המפורסרת זהה לשמורה - אין צורך בכתיבה"""
+        if self.force:
+            return False
+        same = (self.known.get(url) or {}).get('content_hash') == content_hash
+        if same:
+            self.stats['unchanged_hash'] += 1
+        return same
+    
+    def new_validators(self, url, validators):
+        """
+        מזהי HTTP שיש לשמור גם כשהרשומה לא השתנתה (ריק - אין חדש)
+        
+        מכתב שנשמר בלי ETag / Last-Modified מקבל אותם בסריקה הבאה, ובזו שאחריה - 304.
+        """
+        known = self.known.get(url) or {}
+        if not any(value and value != known.get(key) for key, value in validators.items()):
+            return {}
+        known.update(validators)
+        self.stats['validators_updated'] += 1
+        return dict(validators)
+    
+    @staticmethod
+    def _same_validators(known, validators):
+        if known.get('etag') and validators['etag']:
+            return known['etag'] == validators['etag']
+        if known.get('last_modified') and validators['last_modified']:
+            return known['last_modified'] == validators['last_modified']
+        return False
+    
+    def summary(self):
+        """מונים: changed / unchanged_http / unchanged_hash / validators_updated / check_errors"""
+        return dict(self.stats)
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת שלמות הכרכים מתוך בסיס הנתונים - בלי דפדפן ובלי סריקה מחדש
+לכל כרך: טווחי מכתבים חסרים (עד המספר הצפוי), מספרי מכתב כפולים, aid שמופיע
+בכמה מכתבים ו-aid שיורד ביחס למכתב הקודם. המספרים הצפויים נשמרים בטבלה
+volume_expected_counts; כרך בלי מספר צפוי נבדק עד המכתב הגבוה שנשמר.
+
+    python completeness_audit.py                  # כל הכרכים
+    python completeness_audit.py --volume 1
+    python completeness_audit.py expect 1 169     # שמירת מספר צפוי
+"""
+
+import argparse
+import os
+import sys
+
+from database_setup import IgrotKodeshDB
+
+# מספרים ידועים (tests/README_tests.md): כרך א - 4 עמודים, 50+50+50+19
+KNOWN_EXPECTED = {1: 169}
+
+# מזהה ה-aid מתוך הכתובת (/aid/4645943/...) ב-SQL: CAST קורא את הספרות שבתחילת המחרוזת
+AID_SQL = "CASE WHEN instr(l.url, '/aid/') > 0 THEN CAST(substr(l.url, instr(l.url, '/aid/') + 5) AS INTEGER) END"
+
+
+def format_ranges(ranges):
+    """[(1, 3), (7, 7)] -> '1-3, 7'"""
+    return ', '.join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+class CompletenessAuditor:
+    """
+    בדיקת שלמות על טבלאות letters/volumes של IgrotKodeshDB
+    
+    Args:
+        conn: חיבור SQLite של IgrotKodeshDB
+        create: יצירת טבלת המספרים הצפויים אם חסרה (False בחיבור לקריאה בלבד)
+    """
+    
+    def __init__(self, conn, create=True):
+        self.conn = conn
+        if create:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS volume_expected_counts (
+                    volume_number INTEGER PRIMARY KEY,
+                    expected INTEGER NOT NULL,
+                    source TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            self.conn.executemany('''
+                INSERT OR IGNORE INTO volume_expected_counts (volume_number, expected, source)
+                VALUES (?, ?, 'known')
+            ''', KNOWN_EXPECTED.items())
+            self.conn.commit()
+    
+    def set_expected(self, volume_number, expected, source='manual'):
+        """שמירת המספר הצפוי של מכתבים בכרך (למשל מתוך דף הכרך)"""
+        self.conn.execute('''
+            INSERT INTO volume_expected_counts (volume_number, expected, source, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (volume_number) DO UPDATE SET
+                expected = excluded.expected,
+                source = excluded.source,
+                updated_at = excluded.updated_at
+        ''', (volume_number, expected, source))
+        self.conn.commit()
+    
+    def expected_counts(self):
+        """{volume_number: (expected, source)}"""
+        if not self._has_expected_table():
+            return {}
+        return {row[0]: (row[1], row[2]) for row in
+                self.conn.execute('SELECT volume_number, expected, source FROM volume_expected_counts')}
+    
+    def _has_expected_table(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'volume_expected_counts'"
+        ).fetchone() is not None
+    
+    def _load(self, volume_number):
+        """
+        סריקה אחת של letters לטבלה זמנית audit_letters - כל הבדיקות רצות עליה.
+        גבול הבדיקה: המספר הצפוי, או המכתב הגבוה שנשמר
+        """
+        expected = ('(SELECT e.expected FROM volume_expected_counts e WHERE e.volume_number = v.volume_number)'
+                    if self._has_expected_table() else 'NULL')
+        self.conn.execute('DROP TABLE IF EXISTS temp.audit_letters')
+        self.conn.execute(f'''
+            CREATE TEMP TABLE audit_letters AS
+            WITH bounds AS (
+                SELECT v.id AS volume_id, v.volume_number, v.volume_hebrew,
+                       COALESCE({expected}, MAX(l.letter_number), 0) AS expected,
+                       {expected} IS NOT NULL AS has_expected
+                FROM volumes v
+                LEFT JOIN letters l ON l.volume_id = v.id
+                WHERE ? IS NULL OR v.volume_number = ?
+                GROUP BY v.id
+            )
+            SELECT b.volume_number, b.volume_hebrew, b.expected, b.has_expected,
+                   l.id AS letter_id, l.letter_number, {AID_SQL} AS aid
+            FROM bounds b
+            LEFT JOIN letters l ON l.volume_id = b.volume_id
+        ''', (volume_number, volume_number))
+        # סדר המכתבים בכרך - חלונות ה-LEAD/LAG וה-GROUP BY נקראים מהאינדקס בלי מיון
+        self.conn.execute('CREATE INDEX temp.audit_letters_order ON audit_letters (volume_number, letter_number, aid)')
+    
+    def audit(self, volume_number=None):
+        """
+        בדיקת שלמות לכל הכרכים (או לכרך אחד)
+        
+        Returns:
+            list: דוח לכל כרך - letters, expected, missing (טווחים), duplicates,
+                  duplicate_aids, out_of_order, extra, complete
+        """
+        self._load(volume_number)
+        try:
+            reports = self._audit_loaded()
+        finally:
+            self.conn.execute('DROP TABLE IF EXISTS temp.audit_letters')
+        
+        # כרך עם מספר צפוי שעוד לא נשמר ממנו אף מכתב
+        for volume, (expected, _) in self.expected_counts().items():
+            if volume not in reports and volume_number in (None, volume):
+                reports[volume] = {
+                    'volume': volume, 'volume_hebrew': None, 'expected': expected, 'has_expected': True,
+                    'letters': 0, 'distinct': 0, 'extra': 0, 'missing': [(1, expected)] if expected else [],
+                    'duplicates': [], 'duplicate_aids': [], 'out_of_order': []
+                }
+        
+        for report in reports.values():
+            report['missing_count'] = sum(end - start + 1 for start, end in report['missing'])
+            report['complete'] = (report['has_expected'] and not report['missing'] and not report['duplicates']
+                                  and not report['duplicate_aids'] and not report['extra'])
+        return [reports[volume] for volume in sorted(reports)]
+    
+    def _audit_loaded(self):
+        """כל הבדיקות על audit_letters - דוח לכל כרך לפי מספרו"""
+        reports = {}
+        for row in self.conn.execute('''
+            SELECT volume_number, volume_hebrew, expected, has_expected,
+                   COUNT(letter_id), COUNT(DISTINCT letter_number),
+                   COUNT(DISTINCT CASE WHEN letter_number > expected THEN letter_number END),
+                   COUNT(CASE WHEN letter_number BETWEEN 1 AND expected THEN 1 END)
+            FROM audit_letters
+            GROUP BY volume_number
+        '''):
+            reports[row[0]] = {
+                'volume': row[0], 'volume_hebrew': row[1], 'expected': row[2], 'has_expected': bool(row[3]),
+                'letters': row[4], 'distinct': row[5], 'extra': row[6], 'in_range': row[7],
+                'missing': [], 'duplicates': [], 'duplicate_aids': [], 'out_of_order': []
+            }
+        
+        # טווחים חסרים: לפני המכתב הראשון, בין מכתב למכתב הבא, ואחרי האחרון עד expected
+        for volume, start, end in self.conn.execute('''
+            WITH steps AS (
+                SELECT volume_number, expected, letter_number,
+                       LEAD(letter_number) OVER w AS next_number,
+                       ROW_NUMBER() OVER w AS position
+                FROM audit_letters
+                WHERE letter_number BETWEEN 1 AND expected
+                WINDOW w AS (PARTITION BY volume_number ORDER BY letter_number)
+            )
+            SELECT volume_number, 1, letter_number - 1 FROM steps
+            WHERE position = 1 AND letter_number > 1
+            UNION ALL
+            SELECT volume_number, letter_number + 1, COALESCE(next_number, expected + 1) - 1 FROM steps
+            WHERE COALESCE(next_number, expected + 1) - letter_number > 1
+            ORDER BY 1, 2
+        '''):
+            reports[volume]['missing'].append((start, end))
+        for report in reports.values():
+            # אף מכתב בטווח - כל הכרך חסר
+            if report.pop('in_range') == 0 and report['expected']:
+                report['missing'] = [(1, report['expected'])]
+        
+        for volume, letter, count in self.conn.execute('''
+            SELECT volume_number, letter_number, COUNT(*)
+            FROM audit_letters
+            WHERE letter_number IS NOT NULL
+            GROUP BY volume_number, letter_number
+            HAVING COUNT(*) > 1
+            ORDER BY volume_number, letter_number
+        '''):
+            reports[volume]['duplicates'].append((letter, count))
+        
+        # aid שמופיע בכמה מכתבים, ו-aid שקטן מה-aid של המכתב הקודם בכרך
+        for volume, aid, letters in self.conn.execute('''
+            SELECT volume_number, aid, GROUP_CONCAT(DISTINCT letter_number)
+            FROM audit_letters
+            WHERE aid IS NOT NULL
+            GROUP BY volume_number, aid
+            HAVING COUNT(DISTINCT letter_number) > 1
+            ORDER BY volume_number, aid
+        '''):
+            reports[volume]['duplicate_aids'].append((aid, sorted(int(n) for n in letters.split(','))))
+        
+        for volume, letter, aid, previous_letter, previous_aid in self.conn.execute('''
+            WITH ordered AS (
+                SELECT volume_number, letter_number, aid,
+                       LAG(letter_number) OVER w AS previous_letter,
+                       LAG(aid) OVER w AS previous_aid
+                FROM audit_letters
+                WHERE aid IS NOT NULL
+                WINDOW w AS (PARTITION BY volume_number ORDER BY letter_number, aid)
+            )
+            SELECT volume_number, letter_number, aid, previous_letter, previous_aid
+            FROM ordered
+            WHERE aid < previous_aid
+            ORDER BY volume_number, letter_number
+        '''):
+            reports[volume]['out_of_order'].append((letter, aid, previous_letter, previous_aid))
+        return reports
+
+def audit_supabase(client, volume_number=None):
+    """
+    אותה בדיקה ב-Supabase - פונקציית audit_volume_completeness (add_completeness_audit.sql)
+    
+    Returns:
+        list: דוחות באותו מבנה של CompletenessAuditor.audit (בלי duplicates - UNIQUE בטבלה)
+    """
+    rows = client.rpc('audit_volume_completeness', {'p_volume_number': volume_number}).execute().data or []
+    reports = []
+    for row in rows:
+        missing = [tuple(pair) for pair in row['missing']]
+        missing_count = sum(end - start + 1 for start, end in missing)
+        reports.append({
+            'volume': row['volume_number'], 'volume_hebrew': None, 'expected': row['expected'],
+            'has_expected': row['has_expected'], 'letters': row['letters'], 'distinct': row['letters'],
+            # מכתבים מעבר ל-expected: כל מה שלא נכנס לטווח 1..expected
+            'extra': max(0, row['letters'] - (row['expected'] - missing_count)),
+            'missing': missing, 'missing_count': missing_count,
+            'duplicates': [],
+            'duplicate_aids': [(item['aid'], sorted(item['letters'])) for item in row['duplicate_aids']],
+            'out_of_order': [(item['letter'], item['aid'], item['previous_letter'], item['previous_aid'])
+                             for item in row['out_of_order']]
+        })
+    for report in reports:
+        report['complete'] = (report['has_expected'] and not report['missing']
+                              and not report['duplicate_aids'] and not report['extra'])
+    return reports
+
+
+def print_report(reports):
+    """הדפסת דוח השלמות"""
+    for report in reports:
+        name = f"כרך {report['volume_hebrew'] or report['volume']}"
+        expected = report['expected'] if report['has_expected'] else f"{report['expected']}?"
+        status = '✅' if report['complete'] else ('⚠️' if not report['has_expected'] and not report['missing'] else '❌')
+        print(f"{status} {name}: {report['distinct']}/{expected} מכתבים")
+        if report['missing']:
+            print(f"   📭 חסרים ({report['missing_count']}): {format_ranges(report['missing'])}")
+        if report['extra']:
+            print(f"   ➕ מעבר למספר הצפוי: {report['extra']}")
+        for letter, count in report['duplicates']:
+            print(f"   🔁 מכתב {letter} נשמר {count} פעמים")
+        for aid, letters in report['duplicate_aids']:
+            print(f"   🔗 aid {aid} במכתבים {', '.join(map(str, letters))}")
+        for letter, aid, previous_letter, previous_aid in report['out_of_order']:
+            print(f"   ↕️ מכתב {letter} (aid {aid}) לפני מכתב {previous_letter} (aid {previous_aid})")
+    complete = sum(1 for report in reports if report['complete'])
+    print(f"📊 כרכים שלמים: {complete}/{len(reports)}")
+
+
+def main():
+    """בדיקת שלמות ושמירת מספרים צפויים"""
+    parser = argparse.ArgumentParser(description='בדיקת שלמות הכרכים מתוך בסיס הנתונים')
+    parser.add_argument('--db', default='igrot_kodesh.db', help='קובץ בסיס הנתונים')
+    parser.add_argument('--volume', type=int, help='כרך אחד בלבד')
+    parser.add_argument('--supabase', action='store_true', help='בדיקה ב-Supabase (SUPABASE_URL, SUPABASE_ANON_KEY)')
+    sub = parser.add_subparsers(dest='command')
+    expect_parser = sub.add_parser('expect', help='שמירת מספר המכתבים הצפוי בכרך')
+    expect_parser.add_argument('volume_number', type=int, help='מספר כרך')
+    expect_parser.add_argument('expected', type=int, help='מספר המכתבים הצפוי')
+    args = parser.parse_args()
+    
+    if args.supabase:
+        url = os.getenv('SUPABASE_URL', '')
+        key = os.getenv('SUPABASE_ANON_KEY', '')
+        if not url or not key:
+            print("❌ נא להגדיר משתני סביבה SUPABASE_URL ו-SUPABASE_ANON_KEY")
+            sys.exit(1)
+        from supabase import create_client
+        print_report(audit_supabase(create_client(url, key), args.volume))
+        return
+    
+    db = IgrotKodeshDB(args.db)
+    try:
+        auditor = CompletenessAuditor(db.conn)
+        if args.command == 'expect':
+            auditor.set_expected(args.volume_number, args.expected)
+            print(f"✅ כרך {args.volume_number}: {args.expected} מכתבים צפויים")
+        else:
+            print_report(auditor.audit(args.volume))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
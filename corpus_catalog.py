@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+קטלוג הקורפוס - מניפסט SQLite קטן שמתעדכן בכל שמירת מכתב
+לכל תיקייה וכרך: מספר מכתבים, בייטים, טווח שנים ועדכון אחרון.
+סטטיסטיקה, ניקוי ובדיקות שלמות קוראים את הקטלוג במקום לסרוק תיקיות ולבדוק כל קובץ.
+
+    with CorpusCatalog() as catalog:
+        catalog.record('igrot_kodesh', 'א', 'פד', path, size, year=5688)
+        catalog.totals()  # {'letters': ..., 'bytes': ...}
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from hebrew_calendar import hebrew_numeral_to_number
+from letter_archive import LetterArchive, is_archive, INDEX_NAME
+
+# ליד הקוד ולא בתיקייה הנוכחית - אותו קטלוג מכל מקום שממנו מריצים
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_catalog.sqlite')
+
+# שנה בשורה הראשונה: תש"ה, תרפ"ח, ה'תשי"א
+YEAR_RE = re.compile(r'(?<![א-ת])(?:ה[\'׳]?)?(ת[רש][א-ת]["״]?[א-ת]|ת[רש]["״]?[א-ת])(?![א-ת])')
+# שם קובץ בפורמט הישן: אק - כרך א - מכתב פד.txt (אפשר עם _1)
+TXT_NAME_RE = re.compile(r'כרך\s+([א-ת]+)\s+-\s+מכתב\s+([א-ת]+(?:_\d+)?)')
+
+
+def content_year(content):
+    """שנה עברית (למשל 5705) מהשורה הראשונה של המכתב, או None"""
+    if not content:
+        return None
+    match = YEAR_RE.search(content.split('\n', 1)[0])
+    if not match:
+        return None
+    return 5000 + hebrew_numeral_to_number(match.group(1))
+
+
+class CorpusCatalog:
+    """
+    קטלוג מכתבים שהורדו, לפי תיקייה וכרך
+    
+    Args:
+        path: קובץ ה-SQLite (ברירת מחדל corpus_catalog.sqlite בתיקיית הפרויקט)
+    
+    תיקיות ונתיבים נשמרים כנתיבים מוחלטים.
+    """
+    
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                folder TEXT NOT NULL,
+                volume TEXT NOT NULL,
+                letter TEXT NOT NULL,
+                path TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                year INTEGER,
+                saved_at TEXT,
+                PRIMARY KEY (folder, volume, letter)
+            );
+            CREATE TABLE IF NOT EXISTS volumes (
+                folder TEXT NOT NULL,
+                volume TEXT NOT NULL,
+                letters INTEGER NOT NULL DEFAULT 0,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                first_year INTEGER,
+                last_year INTEGER,
+                updated_at TEXT,
+                PRIMARY KEY (folder, volume)
+            );''')
+        self.db.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.db.close()
+    
+    # ---- עדכון ----
+    
+    def record(self, folder, volume, letter, path, size, year=None, commit=True):
+        """
+        רישום מכתב שנשמר - עדכון השורה שלו ומוני הכרך בטרנזקציה אחת
+        
+        שמירה חוזרת של אותו מכתב מעדכנת את הגודל ולא נספרת פעמיים.
+        """
+        folder = os.path.abspath(folder)
+        path = os.path.abspath(path)
+        now = datetime.now().isoformat()
+        with self._lock:
+            old = self.db.execute('SELECT bytes FROM entries WHERE folder = ? AND volume = ? AND letter = ?',
+                                  (folder, volume, letter)).fetchone()
+            self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (folder, volume, letter, path, size, year, now))
+            self.db.execute('''
+                INSERT INTO volumes VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (folder, volume) DO UPDATE SET
+                    letters = letters + ?,
+                    bytes = bytes + ?,
+                    first_year = MIN(COALESCE(first_year, excluded.first_year), COALESCE(excluded.first_year, first_year)),
+                    last_year = MAX(COALESCE(last_year, excluded.last_year), COALESCE(excluded.last_year, last_year)),
+                    updated_at = excluded.updated_at''',
+                            (folder, volume, size, year, year, now,
+                             0 if old else 1, size - (old[0] if old else 0)))
+            if commit:
+                self.db.commit()
+    
+    def forget(self, folder=None):
+        """מחיקת הרישומים (של תיקייה אחת או של הכל) - אחרי ניקוי קבצים"""
+        with self._lock:
+            for table in ('entries', 'volumes'):
+                if folder is None:
+                    self.db.execute(f'DELETE FROM {table}')
+                else:
+                    self.db.execute(f'DELETE FROM {table} WHERE folder = ?', (os.path.abspath(folder),))
+            self.db.commit()
+    
+    def forget_paths(self, paths):
+        """מחיקת הרישומים של קבצים מסוימים וחישוב מחדש של מוני הכרכים שלהם"""
+        paths = [os.path.abspath(path) for path in paths]
+        with self._lock:
+            keys = set()
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                marks = ', '.join('?' * len(chunk))
+                keys.update(self.db.execute(f'SELECT DISTINCT folder, volume FROM entries WHERE path IN ({marks})',
+                                            chunk).fetchall())
+                self.db.execute(f'DELETE FROM entries WHERE path IN ({marks})', chunk)
+            for folder, volume in keys:
+                self.db.execute('DELETE FROM volumes WHERE folder = ? AND volume = ?', (folder, volume))
+                self.db.execute('''
+                    INSERT INTO volumes
+                    SELECT folder, volume, COUNT(*), SUM(bytes), MIN(year), MAX(year), MAX(saved_at)
+                    FROM entries WHERE folder = ? AND volume = ?
+                    GROUP BY folder, volume''', (folder, volume))
+            self.db.commit()
+    
+    def rebuild(self, folders):
+        """
+        סריקה חד-פעמית של תיקיות שהורדו לפני שהיה קטלוג
+        
+        Returns:
+            int: מספר המכתבים שנרשמו
+        """
+        recorded = 0
+        for folder in folders:
+            if is_archive(folder):
+                with LetterArchive(folder) as archive:
+                    rows = archive.db.execute('SELECT volume, letter, pack, length FROM letters').fetchall()
+                    for volume, letter, pack, length in rows:
+                        content = archive.get(volume, letter)
+                        self.record(folder, volume, letter, os.path.join(folder, pack), length,
+                                    content_year(content), commit=False)
+                        recorded += 1
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                match = TXT_NAME_RE.search(name)
+                if not name.endswith('.txt') or not match:
+                    continue
+                path = os.path.join(folder, name)
+                with open(path, encoding='utf-8', errors='replace') as f:
+                    f.readline()
+                    f.readline()
+                    first_line = f.readline()
+                self.record(folder, match.group(1), match.group(2), path, os.path.getsize(path),
+                            content_year(first_line), commit=False)
+                recorded += 1
+        with self._lock:
+            self.db.commit()
+        return recorded
+    
+    # ---- קריאה ----
+    
+    def volumes(self, folder=None):
+        """שורות הכרכים: [{'folder', 'volume', 'letters', 'bytes', 'first_year', 'last_year', 'updated_at'}]"""
+        query = 'SELECT folder, volume, letters, bytes, first_year, last_year, updated_at FROM volumes'
+        params = ()
+        if folder is not None:
+            query += ' WHERE folder = ?'
+            params = (os.path.abspath(folder),)
+        columns = ('folder', 'volume', 'letters', 'bytes', 'first_year', 'last_year', 'updated_at')
+        with self._lock:
+            rows = self.db.execute(query + ' ORDER BY folder, updated_at', params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def letter_count(self, folder, volume):
+        """מכתבים שנשמרו בכרך - לבדיקת שלמות מול המספר הצפוי"""
+        with self._lock:
+            row = self.db.execute('SELECT letters FROM volumes WHERE folder = ? AND volume = ?',
+                                  (os.path.abspath(folder), volume)).fetchone()
+        return row[0] if row else 0
+    
+    def totals(self):
+        """סך הכל מכתבים ובייטים"""
+        with self._lock:
+            letters, size = self.db.execute('SELECT COALESCE(SUM(letters), 0), COALESCE(SUM(bytes), 0) FROM volumes').fetchone()
+        return {'letters': letters, 'bytes': size}
+    
+    def files(self, folder=None):
+        """קבצים על הדיסק שהקטלוג מכיר (קבצי .txt, קבצי pack ואינדקס הארכיון)"""
+        query = 'SELECT DISTINCT folder, path FROM entries'
+        params = ()
+        if folder is not None:
+            query += ' WHERE folder = ?'
+            params = (os.path.abspath(folder),)
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+        paths = set()
+        for entry_folder, path in rows:
+            paths.add(path)
+            if not path.endswith('.txt'):
+                for suffix in ('', '-wal', '-shm'):
+                    paths.add(os.path.join(entry_folder, INDEX_NAME + suffix))
+        return sorted(paths)
+    
+    def letter_text_files(self):
+        """קבצי .txt של מכתבים בלבד - בלי ארכיונים ובלי קבצים מצורפים של DownloadManager (כרך '')"""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT path FROM entries WHERE volume != '' AND path LIKE '%.txt' ORDER BY path").fetchall()
+        return [row[0] for row in rows]
@@ -7,20 +7,162 @@
 import sqlite3
 import csv
 import json
+import re
 from datetime import datetime
 import os
 
+from hebrew_calendar import HEBREW_MONTHS, hebrew_date_key, hebrew_to_gregorian, hebrew_numeral_to_number, month_key_range, month_number
+
+# ניקוד וטעמים (U+0591-U+05C7, בלי המקף U+05BE) וגרש/גרשיים - מוסרים לפני האינדוקס והחיפוש
+HEBREW_MARKS_RE = re.compile('[\u0591-\u05BD\u05BF-\u05C7"\'\u05F3\u05F4]')
+
+# מקף עברי - מפריד מילים (בית־הכנסת -> בית הכנסת)
+HEBREW_MAQAF = '\u05BE'
+
+# מילה בטקסט המקורי (לקטעי תוצאות): אותיות וניקוד, גרש/גרשיים רק בתוך מילה (כ"א)
+SOURCE_WORD_RE = re.compile('[\\w\u0591-\u05BD\u05BF-\u05C7]+(?:["\'\u05F3\u05F4][\\w\u0591-\u05BD\u05BF-\u05C7]+)*')
+
+# גרסת הנרמול שבה נבנה אינדקס החיפוש (PRAGMA user_version) - שינוי בנרמול מחייב בנייה מחדש
+FTS_NORMALIZATION_VERSION = 1
+
+# אורך קטע התוצאה במילים
+SNIPPET_WORDS = 12
+
+# אותיות סופיות -> אותיות רגילות
+HEBREW_FINAL_LETTERS = str.maketrans('ךםןףץ', 'כמנפצ')
+
+# מכתב אחד לכל (כרך, מספר מכתב) - עליו נשען ה-INSERT OR REPLACE, ולכן אינו נמחק בטעינה מרוכזת
+LETTER_UNIQUE_INDEX = 'CREATE UNIQUE INDEX IF NOT EXISTS idx_letters_volume_letter ON letters (volume_id, letter_number)'
+
+# אינדקסים על טבלת המכתבים - נבנים מחדש אחרי טעינה מרוכזת
+LETTER_INDEXES = {
+    'idx_letters_date_key': 'CREATE INDEX IF NOT EXISTS idx_letters_date_key ON letters (hebrew_date_key)'
+}
+
+FTS_INSERT_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS letters_fts_insert AFTER INSERT ON letters BEGIN
+        INSERT INTO letters_fts (rowid, content)
+        VALUES (new.id, hebrew_normalize(new.content));
+    END
+'''
+
+# עמודות הטבלה לפי סדר ה-INSERT של add_letter ושל הטעינה המרוכזת
+LETTER_INSERT_SQL = '''
+    INSERT OR REPLACE INTO letters
+    (volume_id, letter_number, letter_hebrew, day_numeric, day_hebrew,
+     month_hebrew, year_numeric, year_hebrew, full_date_hebrew, url, content,
+     hebrew_date_key, gregorian_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# מיפוי כותרות ה-CSV (דוחות הבדיקה) לשדות המכתב
+CSV_COLUMNS = {
+    'volume_number': "מס' כרך",
+    'volume_hebrew': 'כרך',
+    'letter_number': "מס' מכתב",
+    'letter_hebrew': 'מכתב',
+    'day_numeric': 'יום מספר',
+    'day_hebrew': 'יום עברי',
+    'month_hebrew': 'חודש',
+    'year_numeric': 'שנה מספר',
+    'year_hebrew': 'שנה עברית',
+    'full_date_hebrew': 'תאריך מלא',
+    'url': 'קישור',
+    'content': 'תוכן'
+}
+
+
+def normalize_hebrew(text):
+    """נרמול טקסט עברי לחיפוש - הסרת ניקוד ואיחוד אותיות סופיות"""
+    if not text:
+        return ''
+    return HEBREW_MARKS_RE.sub('', text.replace(HEBREW_MAQAF, ' ')).translate(HEBREW_FINAL_LETTERS)
+
+
+def query_terms(query):
+    """מילות השאילתה מנורמלות - [(מילה, קידומת?)]; * בסוף מילה - חיפוש קידומת"""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = normalize_hebrew(word.rstrip('*')).strip()
+        if word:
+            terms.append((word, prefix))
+    return terms
+
+
+def text_snippet(content, terms, size=SNIPPET_WORDS):
+    """
+    קטע מהטקסט המקורי (עם ניקוד ואותיות סופיות) סביב המילים שנמצאו
+    
+    האינדקס שומר טקסט מנורמל, ולכן ההתאמה נעשית כאן מילה-מילה: כל מילה במקור
+    מנורמלת ומושווית למילות השאילתה (query_terms). נבחר החלון עם מירב ההתאמות,
+    [מילה] מסומנת ו-… בקצוות.
+    """
+    exact, prefixes = set(), []
+    for word, prefix in terms:
+        for part in normalize_hebrew(word).lower().split():
+            if prefix:
+                prefixes.append(part)
+            else:
+                exact.add(part)
+    
+    words = list(SOURCE_WORD_RE.finditer(content or ''))
+    if not words:
+        return ''
+    hits = []
+    for match in words:
+        word = normalize_hebrew(match.group()).lower()
+        hits.append(word in exact or any(word.startswith(part) for part in prefixes))
+    
+    # חלון נע: מירב ההתאמות, ובשוויון - הראשון
+    start = best = count = best_count = 0
+    for end, hit in enumerate(hits):
+        count += hit
+        if end - start + 1 > size:
+            count -= hits[start]
+            start += 1
+        if count > best_count:
+            best, best_count = start, count
+    end = min(best + size, len(words))
+    
+    parts = ['…' if best else '']
+    position = words[best].start()
+    for match, hit in zip(words[best:end], hits[best:end]):
+        parts.append(content[position:match.start()])
+        parts.append(f'[{match.group()}]' if hit else match.group())
+        position = match.end()
+    parts.append('…' if end < len(words) else '')
+    return ''.join(parts)
+
+
 class IgrotKodeshDB:
-    def __init__(self, db_file='igrot_kodesh.db'):
-        """אתחול בסיס הנתונים"""
+    def __init__(self, db_file='igrot_kodesh.db', read_only=False):
+        """
+        אתחול בסיס הנתונים
+        
+        Args:
+            db_file (str): קובץ SQLite
+            read_only (bool): חיבור לקריאה בלבד לבסיס קיים (לשרת ה-API), ללא יצירת טבלאות
+        """
         self.db_file = db_file
         self.conn = None
-        self.setup_database()
+        if read_only:
+            self.connect_read_only()
+        else:
+            self.setup_database()
+    
+    def connect_read_only(self):
+        """חיבור לקריאה בלבד - ניתן לשימוש מכמה תהליכונים (אחד בכל פעם)"""
+        self.conn = sqlite3.connect(f'file:{self.db_file}?mode=ro', uri=True, check_same_thread=False)
+        self.conn.create_function('hebrew_normalize', 1, normalize_hebrew, deterministic=True)
     
     def setup_database(self):
         """יצירת בסיס הנתונים וטבלאות"""
         self.conn = sqlite3.connect(self.db_file)
         self.conn.execute('PRAGMA foreign_keys = ON')
+        # טריגר המחיקה של האינדקס צריך לפעול גם ב-INSERT OR REPLACE
+        self.conn.execute('PRAGMA recursive_triggers = ON')
+        self.conn.create_function('hebrew_normalize', 1, normalize_hebrew, deterministic=True)
         
         # טבלת כרכים
         self.conn.execute('''
@@ -50,6 +192,8 @@ class IgrotKodeshDB:
                 url TEXT,
                 content TEXT,
                 parsed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                hebrew_date_key INTEGER,
+                gregorian_date TEXT,
                 FOREIGN KEY (volume_id) REFERENCES volumes (id)
             )
         ''')
@@ -78,9 +222,94 @@ class IgrotKodeshDB:
             )
         ''')
         
+        self.migrate_date_columns()
+        self.setup_indexes()
+        self.setup_fulltext_index()
+        
         self.conn.commit()
         print("✅ בסיס הנתונים הוגדר בהצלחה")
     
+    def migrate_date_columns(self):
+        """הוספת עמודות מפתח תאריך ותאריך לועזי לבסיסי נתונים ישנים"""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(letters)')}
+        added = False
+        if 'hebrew_date_key' not in columns:
+            self.conn.execute('ALTER TABLE letters ADD COLUMN hebrew_date_key INTEGER')
+            added = True
+        if 'gregorian_date' not in columns:
+            self.conn.execute('ALTER TABLE letters ADD COLUMN gregorian_date TEXT')
+            added = True
+        if added:
+            # מילוי מיידי - אחרת מכתבים ישנים נעלמים מסינון לפי שנה וחודש
+            self.backfill_date_keys()
+    
+    def setup_indexes(self):
+        """אינדקסים לשליפה לפי כרך/מכתב ולפי סדר כרונולוגי"""
+        self.migrate_unique_letters()
+        for index_sql in LETTER_INDEXES.values():
+            self.conn.execute(index_sql)
+    
+    def migrate_unique_letters(self):
+        """
+        הפיכת האינדקס (volume_id, letter_number) לייחודי בבסיסים ישנים -
+        קודם מחיקת מכתבים כפולים (נשאר האחרון שנשמר), אחרת יבוא חוזר מכפיל את המכתבים
+        """
+        unique = {row[1]: row[2] for row in self.conn.execute('PRAGMA index_list(letters)')}
+        if unique.get('idx_letters_volume_letter'):
+            return
+        
+        removed = self.conn.execute('''
+            DELETE FROM letters
+            WHERE volume_id IS NOT NULL AND letter_number IS NOT NULL
+              AND id NOT IN (SELECT MAX(id) FROM letters
+                             WHERE volume_id IS NOT NULL AND letter_number IS NOT NULL
+                             GROUP BY volume_id, letter_number)
+        ''').rowcount
+        if removed:
+            print(f"🧹 נמחקו {removed} מכתבים כפולים")
+        self.conn.execute('DROP INDEX IF EXISTS idx_letters_volume_letter')
+        self.conn.execute(LETTER_UNIQUE_INDEX)
+    
+    def setup_fulltext_index(self):
+        """יצירת אינדקס חיפוש מלא (FTS5) על תוכן המכתבים"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'letters_fts'"
+        ).fetchone()
+        
+        # הטקסט מנורמל ב-Python לפני האינדוקס: unicode61 מתייחס לניקוד כמפריד מילים
+        self.conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS letters_fts
+            USING fts5(content, tokenize = 'unicode61 remove_diacritics 2')
+        ''')
+        
+        # סנכרון האינדקס עם טבלת המכתבים
+        self.conn.execute(FTS_INSERT_TRIGGER)
+        self.conn.executescript('''
+            CREATE TRIGGER IF NOT EXISTS letters_fts_delete AFTER DELETE ON letters BEGIN
+                DELETE FROM letters_fts WHERE rowid = old.id;
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS letters_fts_update AFTER UPDATE OF content ON letters BEGIN
+                DELETE FROM letters_fts WHERE rowid = old.id;
+                INSERT INTO letters_fts (rowid, content)
+                VALUES (new.id, hebrew_normalize(new.content));
+            END;
+        ''')
+        
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if not exists or version < FTS_NORMALIZATION_VERSION:
+            self.rebuild_fulltext_index()
+            self.conn.execute(f'PRAGMA user_version = {FTS_NORMALIZATION_VERSION}')
+    
+    def rebuild_fulltext_index(self):
+        """בנייה מחדש של אינדקס החיפוש מכל המכתבים הקיימים"""
+        self.conn.execute('DELETE FROM letters_fts')
+        self.conn.execute('''
+            INSERT INTO letters_fts (rowid, content)
+            SELECT id, hebrew_normalize(content) FROM letters
+        ''')
+        self.conn.commit()
+    
     def add_volume(self, volume_number, volume_hebrew, total_letters=0, total_pages=0):
         """הוספת כרך חדש"""
         try:
@@ -99,24 +328,7 @@ class IgrotKodeshDB:
     def add_letter(self, volume_id, letter_data):
         """הוספת מכתב חדש"""
         try:
-            self.conn.execute('''
-                INSERT OR REPLACE INTO letters 
-                (volume_id, letter_number, letter_hebrew, day_numeric, day_hebrew,
-                 month_hebrew, year_numeric, year_hebrew, full_date_hebrew, url, content)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                volume_id,
-                letter_data.get('letter_number'),
-                letter_data.get('letter_hebrew'),
-                letter_data.get('day_numeric'),
-                letter_data.get('day_hebrew'),
-                letter_data.get('month_hebrew'),
-                letter_data.get('year_numeric'),
-                letter_data.get('year_hebrew'),
-                letter_data.get('full_date_hebrew'),
-                letter_data.get('url'),
-                letter_data.get('content', '')
-            ))
+            self.conn.execute(LETTER_INSERT_SQL, self._letter_params(volume_id, letter_data))
             self.conn.commit()
             print(f"✅ נוסף מכתב {letter_data.get('letter_hebrew')}")
             return True
@@ -124,43 +336,214 @@ class IgrotKodeshDB:
             print(f"❌ שגיאה בהוספת מכתב: {e}")
             return False
     
+    def _letter_params(self, volume_id, letter_data):
+        """ערכי שורה עבור LETTER_INSERT_SQL"""
+        return (
+            volume_id,
+            letter_data.get('letter_number'),
+            letter_data.get('letter_hebrew'),
+            letter_data.get('day_numeric'),
+            letter_data.get('day_hebrew'),
+            letter_data.get('month_hebrew'),
+            letter_data.get('year_numeric'),
+            letter_data.get('year_hebrew'),
+            letter_data.get('full_date_hebrew'),
+            letter_data.get('url'),
+            letter_data.get('content', ''),
+            *self._date_columns(letter_data)
+        )
+    
+    def _date_columns(self, letter_data):
+        """חישוב (מפתח תאריך, תאריך לועזי ISO) מנתוני מכתב"""
+        day = letter_data.get('day_numeric') or hebrew_numeral_to_number(letter_data.get('day_hebrew'))
+        month = letter_data.get('month') or month_number(letter_data.get('month_hebrew'))
+        year = letter_data.get('year_numeric')
+        
+        key = hebrew_date_key(year, month, day)
+        if not key:
+            return None, None
+        
+        try:
+            gregorian = hebrew_to_gregorian(year, month, day)
+        except ValueError:
+            gregorian = None
+        return key, gregorian.isoformat() if gregorian else None
+    
+    def backfill_date_keys(self, batch_size=1000):
+        """מילוי מפתח תאריך ותאריך לועזי למכתבים שנשמרו לפני ההגירה"""
+        rows = self.conn.execute('''
+            SELECT id, day_numeric, day_hebrew, month_hebrew, year_numeric
+            FROM letters
+            WHERE hebrew_date_key IS NULL
+        ''').fetchall()
+        
+        updates = []
+        for letter_id, day_numeric, day_hebrew, month_hebrew, year_numeric in rows:
+            key, gregorian = self._date_columns({
+                'day_numeric': day_numeric,
+                'day_hebrew': day_hebrew,
+                'month_hebrew': month_hebrew,
+                'year_numeric': year_numeric
+            })
+            if key:
+                updates.append((key, gregorian, letter_id))
+        
+        for start in range(0, len(updates), batch_size):
+            self.conn.executemany(
+                'UPDATE letters SET hebrew_date_key = ?, gregorian_date = ? WHERE id = ?',
+                updates[start:start + batch_size]
+            )
+            self.conn.commit()
+        
+        print(f"📅 עודכנו מפתחות תאריך ל-{len(updates)} מתוך {len(rows)} מכתבים")
+        return len(updates)
+    
+    def _get_or_create_volume(self, volume_number, volume_hebrew):
+        """מזהה כרך קיים, או יצירת כרך חדש"""
+        row = self.conn.execute('SELECT id FROM volumes WHERE volume_number = ?', (volume_number,)).fetchone()
+        if row:
+            return row[0]
+        return self.add_volume(volume_number, volume_hebrew)
+    
+    def _tune_for_bulk_load(self):
+        """הגדרות SQLite לטעינה מרוכזת"""
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.execute('PRAGMA cache_size = -65536')  # 64MB
+        self.conn.execute('PRAGMA temp_store = MEMORY')
+    
+    def bulk_import_letters(self, letters, batch_size=5000):
+        """
+        טעינה מרוכזת של מכתבים - executemany, טרנזקציה אחת לכל אצווה,
+        ובניית האינדקסים ואינדקס החיפוש פעם אחת בסוף
+        
+        Args:
+            letters: רשימה/איטרטור של מילוני מכתב, כל אחד עם volume_number ו-volume_hebrew
+            batch_size (int): מספר שורות לטרנזקציה
+        
+        Returns:
+            int: מספר המכתבים שנטענו
+        """
+        self._tune_for_bulk_load()
+        self.conn.commit()
+        
+        max_id_before = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM letters').fetchone()[0]
+        
+        # דחיית בניית האינדקסים לסוף הטעינה (מלבד הייחודי - הוא שמחליף מכתב שנטען שוב)
+        self.conn.execute('DROP TRIGGER IF EXISTS letters_fts_insert')
+        for index_name in LETTER_INDEXES:
+            self.conn.execute(f'DROP INDEX IF EXISTS {index_name}')
+        self.conn.commit()
+        
+        volume_ids = {}
+        count = 0
+        batch = []
+        try:
+            for letter_data in letters:
+                volume_number = letter_data.get('volume_number') or 1
+                if volume_number not in volume_ids:
+                    volume_ids[volume_number] = self._get_or_create_volume(
+                        volume_number, letter_data.get('volume_hebrew') or ''
+                    )
+                batch.append(self._letter_params(volume_ids[volume_number], letter_data))
+                
+                if len(batch) >= batch_size:
+                    with self.conn:
+                        self.conn.executemany(LETTER_INSERT_SQL, batch)
+                    count += len(batch)
+                    batch = []
+            
+            if batch:
+                with self.conn:
+                    self.conn.executemany(LETTER_INSERT_SQL, batch)
+                count += len(batch)
+        finally:
+            with self.conn:
+                self.setup_indexes()
+                self.conn.execute(FTS_INSERT_TRIGGER)
+                # אינדוקס רק של השורות החדשות
+                self.conn.execute('''
+                    INSERT INTO letters_fts (rowid, content)
+                    SELECT id, hebrew_normalize(content) FROM letters WHERE id > ?
+                ''', (max_id_before,))
+        
+        print(f"📥 נטענו {count} מכתבים ב-{len(volume_ids)} כרכים")
+        return count
+    
+    def _letter_from_row(self, row):
+        """המרת שורת CSV/Parquet למילון מכתב - כותרות בעברית או שמות שדות באנגלית"""
+        def value(field):
+            if field in row:
+                return row[field]
+            return row.get(CSV_COLUMNS[field])
+        
+        def number(field):
+            raw = value(field)
+            try:
+                return int(raw) if raw not in (None, '') else 0
+            except (TypeError, ValueError):
+                return 0
+        
+        return {
+            'volume_number': number('volume_number') or 1,
+            'volume_hebrew': value('volume_hebrew') or 'א',
+            'letter_number': number('letter_number'),
+            'letter_hebrew': value('letter_hebrew') or '',
+            'day_numeric': number('day_numeric'),
+            'day_hebrew': value('day_hebrew') or '',
+            'month_hebrew': value('month_hebrew') or '',
+            'year_numeric': number('year_numeric'),
+            'year_hebrew': value('year_hebrew') or '',
+            'full_date_hebrew': value('full_date_hebrew') or '',
+            'url': value('url') or '',
+            'content': value('content') or ''
+        }
+    
     def import_from_csv(self, csv_file):
         """יבוא נתונים מקובץ CSV"""
         try:
             with open(csv_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f, delimiter=';')
-                
-                # יצירת כרך א'
-                volume_id = self.add_volume(1, 'א')
-                
-                count = 0
-                for row in reader:
-                    letter_data = {
-                        'letter_number': int(row.get('מס\' מכתב', 0)),
-                        'letter_hebrew': row.get('מכתב', ''),
-                        'day_numeric': int(row.get('יום מספר', 0)),
-                        'day_hebrew': row.get('יום עברי', ''),
-                        'month_hebrew': row.get('חודש', ''),
-                        'year_numeric': int(row.get('שנה מספר', 0)),
-                        'year_hebrew': row.get('שנה עברית', ''),
-                        'full_date_hebrew': row.get('תאריך מלא', ''),
-                        'url': row.get('קישור', '')
-                    }
-                    
-                    if self.add_letter(volume_id, letter_data):
-                        count += 1
-                
-                print(f"📊 יובאו {count} מכתבים מקובץ {csv_file}")
-                self.update_statistics()
-                return True
-                
+                count = self.bulk_import_letters(self._letter_from_row(row) for row in reader)
+            
+            print(f"📊 יובאו {count} מכתבים מקובץ {csv_file}")
+            self.update_statistics()
+            return True
+            
         except Exception as e:
             print(f"❌ שגיאה ביבוא מ-CSV: {e}")
             return False
     
+    def import_from_parquet(self, parquet_file):
+        """יבוא נתונים מקובץ Parquet"""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("❌ חסר pyarrow. התקן: pip install pyarrow")
+            return False
+        
+        try:
+            table = pq.read_table(parquet_file)
+            
+            def rows():
+                for record_batch in table.to_batches():
+                    yield from record_batch.to_pylist()
+            
+            count = self.bulk_import_letters(self._letter_from_row(row) for row in rows())
+            
+            print(f"📊 יובאו {count} מכתבים מקובץ {parquet_file}")
+            self.update_statistics()
+            return True
+            
+        except Exception as e:
+            print(f"❌ שגיאה ביבוא מ-Parquet: {e}")
+            return False
+    
     def get_all_letters(self):
         """קבלת כל המכתבים"""
-        cursor = self.conn.execute('''
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('''
             SELECT l.*, v.volume_hebrew, v.volume_number
             FROM letters l
             JOIN volumes v ON l.volume_id = v.id
@@ -168,8 +551,8 @@ class IgrotKodeshDB:
         ''')
         return cursor.fetchall()
     
-    def search_letters(self, **kwargs):
-        """חיפוש מכתבים לפי קריטריונים"""
+    def _letter_filters(self, **kwargs):
+        """בניית תנאי WHERE ופרמטרים מקריטריוני חיפוש"""
         conditions = []
         params = []
         
@@ -177,26 +560,189 @@ class IgrotKodeshDB:
             conditions.append("v.volume_hebrew = ?")
             params.append(kwargs['volume'])
         
-        if kwargs.get('year'):
-            conditions.append("l.year_numeric = ?")
-            params.append(kwargs['year'])
+        if kwargs.get('volume_number'):
+            conditions.append("v.volume_number = ?")
+            params.append(kwargs['volume_number'])
+        
+        if kwargs.get('year') and month_number(kwargs.get('month')):
+            condition, condition_params = self._month_condition(kwargs['year'], kwargs['month'])
+            conditions.append(condition)
+            params.extend(condition_params)
+        else:
+            if kwargs.get('year'):
+                conditions.append("l.year_numeric = ?")
+                params.append(kwargs['year'])
+            
+            if kwargs.get('month'):
+                conditions.append("l.month_hebrew LIKE ?")
+                params.append(f"%{kwargs['month']}%")
         
-        if kwargs.get('month'):
-            conditions.append("l.month_hebrew LIKE ?")
-            params.append(f"%{kwargs['month']}%")
+        if kwargs.get('date_from'):
+            conditions.append("l.hebrew_date_key >= ?")
+            params.append(kwargs['date_from'])
+        
+        if kwargs.get('date_to'):
+            conditions.append("l.hebrew_date_key <= ?")
+            params.append(kwargs['date_to'])
+        
+        if kwargs.get('text'):
+            fts_query = self._build_fts_query(kwargs['text'])
+            if fts_query:
+                conditions.append("l.id IN (SELECT rowid FROM letters_fts WHERE letters_fts MATCH ?)")
+                params.append(fts_query)
+            else:
+                # רק סימני פיסוק - אין מילה לחפש, ואין התאמות
+                conditions.append("0")
         
         where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
+    
+    def _month_condition(self, year, month):
+        """
+        תנאי חודש ושנה - סריקת טווח על אינדקס מפתח התאריך,
+        ולמכתבים ללא מפתח (תאריך שלא פוענח) התנאי הישן על השדות העבריים
+        """
+        if isinstance(month, str):
+            month_clause, month_params = "l.month_hebrew LIKE ?", [f"%{month.strip()}%"]
+        else:
+            names = [name for name, number in HEBREW_MONTHS.items() if number == month]
+            month_clause = f"l.month_hebrew IN ({', '.join('?' * len(names))})"
+            month_params = names
+        
+        condition = (f"(l.hebrew_date_key BETWEEN ? AND ? OR "
+                     f"(l.hebrew_date_key IS NULL AND l.year_numeric = ? AND {month_clause}))")
+        return condition, [*month_key_range(year, month), year, *month_params]
+    
+    def search_letters(self, limit=None, offset=0, **kwargs):
+        """חיפוש מכתבים לפי קריטריונים"""
+        where_clause, params = self._letter_filters(**kwargs)
+        
+        order_by = "l.hebrew_date_key, v.volume_number, l.letter_number" if kwargs.get('chronological') \
+            else "v.volume_number, l.letter_number"
+        
+        page_clause = ""
+        if limit is not None:
+            page_clause = "LIMIT ? OFFSET ?"
+            params = params + [limit, offset]
         
-        cursor = self.conn.execute(f'''
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(f'''
             SELECT l.*, v.volume_hebrew, v.volume_number
             FROM letters l
             JOIN volumes v ON l.volume_id = v.id
             WHERE {where_clause}
-            ORDER BY v.volume_number, l.letter_number
+            ORDER BY {order_by}
+            {page_clause}
         ''', params)
         
         return cursor.fetchall()
     
+    def count_letters(self, **kwargs):
+        """מספר המכתבים שעונים על הקריטריונים"""
+        where_clause, params = self._letter_filters(**kwargs)
+        return self.conn.execute(f'''
+            SELECT COUNT(*)
+            FROM letters l
+            JOIN volumes v ON l.volume_id = v.id
+            WHERE {where_clause}
+        ''', params).fetchone()[0]
+    
+    def get_letter(self, volume_number, letter_number):
+        """מכתב יחיד לפי מספר כרך ומספר מכתב"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('''
+            SELECT l.*, v.volume_hebrew, v.volume_number
+            FROM letters l
+            JOIN volumes v ON l.volume_id = v.id
+            WHERE v.volume_number = ? AND l.letter_number = ?
+            ORDER BY l.id DESC
+            LIMIT 1
+        ''', (volume_number, letter_number))
+        return cursor.fetchone()
+    
+    def get_letter_by_id(self, letter_id):
+        """מכתב יחיד לפי מזהה השורה"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('''
+            SELECT l.*, v.volume_hebrew, v.volume_number
+            FROM letters l
+            JOIN volumes v ON l.volume_id = v.id
+            WHERE l.id = ?
+        ''', (letter_id,))
+        return cursor.fetchone()
+    
+    def get_volumes(self):
+        """רשימת הכרכים עם מספר המכתבים השמורים בכל אחד"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('''
+            SELECT v.volume_number, v.volume_hebrew, COUNT(l.id) AS letters_count
+            FROM volumes v
+            LEFT JOIN letters l ON l.volume_id = v.id
+            GROUP BY v.id
+            ORDER BY v.volume_number
+        ''')
+        return cursor.fetchall()
+    
+    def letters_in_month(self, year, month):
+        """כל המכתבים מחודש ושנה נתונים (month - שם או מספר), בסדר כרונולוגי"""
+        if not month_number(month):
+            return []
+        
+        condition, params = self._month_condition(year, month)
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(f'''
+            SELECT l.*, v.volume_hebrew, v.volume_number
+            FROM letters l
+            JOIN volumes v ON l.volume_id = v.id
+            WHERE {condition}
+            ORDER BY l.hebrew_date_key, v.volume_number, l.letter_number
+        ''', params)
+        return cursor.fetchall()
+    
+    def _build_fts_query(self, query):
+        """המרת שאילתת משתמש לביטוי FTS5 - כל מילה מנורמלת ומצוטטת, * בסוף מילה לחיפוש קידומת"""
+        return ' '.join(f'"{word}"*' if prefix else f'"{word}"' for word, prefix in query_terms(query))
+    
+    def search_content(self, query, limit=20):
+        """חיפוש מלא בתוכן המכתבים - מחזיר תוצאות מדורגות עם קטעי טקסט"""
+        terms = query_terms(query)
+        fts_query = self._build_fts_query(query)
+        if not fts_query:
+            return []
+        
+        # האינדקס מנורמל - הקטע נבנה מהטקסט המקורי ב-letters.content
+        cursor = self.conn.execute('''
+            SELECT l.id, v.volume_number, v.volume_hebrew, l.letter_number, l.letter_hebrew,
+                   l.full_date_hebrew, l.url, l.content,
+                   bm25(letters_fts) AS rank
+            FROM letters_fts
+            JOIN letters l ON l.id = letters_fts.rowid
+            JOIN volumes v ON l.volume_id = v.id
+            WHERE letters_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (fts_query, limit))
+        
+        results = []
+        for row in cursor.fetchall():
+            results.append({
+                'id': row[0],
+                'volume_number': row[1],
+                'volume_hebrew': row[2],
+                'letter_number': row[3],
+                'letter_hebrew': row[4],
+                'full_date_hebrew': row[5],
+                'url': row[6],
+                'snippet': text_snippet(row[7], terms),
+                'rank': row[8]
+            })
+        return results
+    
     def update_statistics(self):
         """עדכון סטטיסטיקות"""
         # ספירת כרכים
@@ -229,17 +775,19 @@ class IgrotKodeshDB:
         json_data = []
         for letter in letters:
             json_data.append({
-                'volume_number': letter[12],
-                'volume_hebrew': letter[11],
-                'letter_number': letter[2],
-                'letter_hebrew': letter[3],
-                'day_numeric': letter[4],
-                'day_hebrew': letter[5],
-                'month_hebrew': letter[6],
-                'year_numeric': letter[7],
-                'year_hebrew': letter[8],
-                'full_date_hebrew': letter[9],
-                'url': letter[10]
+                'volume_number': letter['volume_number'],
+                'volume_hebrew': letter['volume_hebrew'],
+                'letter_number': letter['letter_number'],
+                'letter_hebrew': letter['letter_hebrew'],
+                'day_numeric': letter['day_numeric'],
+                'day_hebrew': letter['day_hebrew'],
+                'month_hebrew': letter['month_hebrew'],
+                'year_numeric': letter['year_numeric'],
+                'year_hebrew': letter['year_hebrew'],
+                'full_date_hebrew': letter['full_date_hebrew'],
+                'hebrew_date_key': letter['hebrew_date_key'],
+                'gregorian_date': letter['gregorian_date'],
+                'url': letter['url']
             })
         
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -248,6 +796,34 @@ class IgrotKodeshDB:
         print(f"✅ יוצא ל-JSON: {output_file}")
         return output_file
     
+    def letter_to_api(self, letter, include_content=False):
+        """המרת שורת מכתב למבנה ה-API"""
+        api_letter = {
+            'id': letter['id'],
+            'volume': {
+                'number': letter['volume_number'],
+                'hebrew': letter['volume_hebrew']
+            },
+            'letter': {
+                'number': letter['letter_number'],
+                'hebrew': letter['letter_hebrew']
+            },
+            'date': {
+                'day_numeric': letter['day_numeric'],
+                'day_hebrew': letter['day_hebrew'],
+                'month_hebrew': letter['month_hebrew'],
+                'year_numeric': letter['year_numeric'],
+                'year_hebrew': letter['year_hebrew'],
+                'full_hebrew': letter['full_date_hebrew'],
+                'key': letter['hebrew_date_key'],
+                'gregorian': letter['gregorian_date']
+            },
+            'url': letter['url']
+        }
+        if include_content:
+            api_letter['content'] = letter['content']
+        return api_letter
+    
     def create_web_api_endpoint(self):
         """יצירת endpoint לAPI"""
         letters = self.get_all_letters()
@@ -262,26 +838,7 @@ class IgrotKodeshDB:
         }
         
         for letter in letters:
-            api_data['letters'].append({
-                'id': letter[0],
-                'volume': {
-                    'number': letter[12],
-                    'hebrew': letter[11]
-                },
-                'letter': {
-                    'number': letter[2],
-                    'hebrew': letter[3]
-                },
-                'date': {
-                    'day_numeric': letter[4],
-                    'day_hebrew': letter[5],
-                    'month_hebrew': letter[6],
-                    'year_numeric': letter[7],
-                    'year_hebrew': letter[8],
-                    'full_hebrew': letter[9]
-                },
-                'url': letter[10]
-            })
+            api_data['letters'].append(self.letter_to_api(letter))
         
         with open('api_data.json', 'w', encoding='utf-8') as f:
             json.dump(api_data, f, ensure_ascii=False, indent=2)
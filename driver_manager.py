@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ניהול מחזור החיים של WebDriver לסריקות ארוכות
+דרייבר חם אחד שממשיך בין כרכים, מיחזור אחרי N דפים או מעל סף RSS,
+בדיקת תקינות, והפעלה מחדש שקופה כשהדפדפן נתקע או קורס (WebDriverException).
+
+    manager = DriverManager(create_driver, max_pages=300, max_rss_mb=1500)
+    driver = manager.get(url)      # ניווט דרך המנהל
+    html = driver.page_source
+    manager.quit()
+"""
+
+import logging
+import os
+from collections import Counter
+
+try:
+    from selenium.common.exceptions import WebDriverException
+except ImportError:  # בלי selenium אין דרייברים אמיתיים - המנהל עדיין שמיש עם factory אחר
+    WebDriverException = Exception
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_MAX_PAGES = 300
+DEFAULT_MAX_RSS_MB = 1500
+RSS_CHECK_EVERY = 10
+HEALTH_CHECK_EVERY = 25
+
+
+def process_tree_rss_mb(pid):
+    """RSS של תהליך וכל צאצאיו (chromedriver -> chrome -> renderers) במגה-בייט"""
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return None
+    
+    if not os.path.isdir('/proc'):
+        return None
+    # בלי psutil: מעבר על /proc (לינוקס)
+    children = {}
+    rss_kb = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/status', encoding='utf-8') as f:
+                fields = dict(line.split(':', 1) for line in f if ':' in line)
+        except OSError:
+            continue
+        process_id = int(entry)
+        children.setdefault(int(fields.get('PPid', '0').strip()), []).append(process_id)
+        rss_kb[process_id] = int(fields.get('VmRSS', '0 kB').split()[0])
+    if pid not in rss_kb:
+        return None
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss_kb.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total / 1024
+
+
+class DriverManager:
+    """
+    דרייבר מנוהל
+    
+    Args:
+        factory: פונקציה שיוצרת דרייבר חדש (או מחזירה None בכישלון)
+        max_pages: מיחזור אחרי מספר דפים זה
+        max_rss_mb: מיחזור כשהדפדפן ותהליכיו עוברים סף זיכרון זה
+        health_check_every: בדיקת תקינות כל N דפים
+        logger: לוגר לדיווח (ברירת מחדל - לוגר המודול)
+        timer: StageTimer אופציונלי - driver_start / navigate
+    """
+    
+    def __init__(self, factory, max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB,
+                 health_check_every=HEALTH_CHECK_EVERY, logger=None, timer=None):
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.health_check_every = health_check_every
+        self.logger = logger or logging.getLogger(__name__)
+        self.timer = timer
+        self.stats = Counter()
+        self.pages = 0
+        self._driver = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.quit()
+    
+    # ---- מחזור חיים ----
+    
+    @property
+    def driver(self):
+        """הדרייבר הנוכחי, נוצר בפעם הראשונה שמבקשים אותו (None אם ההפעלה נכשלה)"""
+        if self._driver is None:
+            self.start()
+        return self._driver
+    
+    def start(self):
+        if self.timer:
+            with self.timer.stage('driver_start'):
+                self._driver = self.factory()
+        else:
+            self._driver = self.factory()
+        self.pages = 0
+        if self._driver is not None:
+            self.stats['starts'] += 1
+            if self.stats['starts'] > 1:
+                self.logger.info(f"🔄 דרייבר הופעל מחדש (הפעלה {self.stats['starts']})")
+        return self._driver
+    
+    def quit(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception as e:
+            self.logger.warning(f"⚠️ שגיאה בסגירת דרייבר: {e}")
+        self._driver = None
+    
+    def recycle(self, reason):
+        """סגירת הדרייבר הנוכחי - חדש ייווצר בשימוש הבא"""
+        self.logger.info(f"♻️ מיחזור דרייבר: {reason} (אחרי {self.pages} דפים)")
+        self.stats[f'recycle_{reason}'] += 1
+        self.quit()
+    
+    # ---- בריאות ----
+    
+    def rss_mb(self):
+        """זיכרון הדפדפן ותהליכיו, או None כשאי אפשר למדוד"""
+        service = getattr(self._driver, 'service', None)
+        process = getattr(service, 'process', None)
+        pid = getattr(process, 'pid', None)
+        return process_tree_rss_mb(pid) if pid else None
+    
+    def is_healthy(self):
+        """בדיקת תקינות: הדפדפן עונה ל-JavaScript פשוט"""
+        if self._driver is None:
+            return False
+        try:
+            return self._driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+    
+    def _before_page(self):
+        """מיחזור לפי מספר דפים, זיכרון ובדיקת תקינות - לפני כל ניווט"""
+        if self._driver is None:
+            return
+        if self.max_pages and self.pages >= self.max_pages:
+            self.recycle('pages')
+            return
+        if self.max_rss_mb and self.pages and self.pages % RSS_CHECK_EVERY == 0:
+            rss = self.rss_mb()
+            if rss and rss > self.max_rss_mb:
+                self.logger.info(f"🧠 זיכרון הדפדפן {rss:.0f}MB מעל {self.max_rss_mb}MB")
+                self.recycle('rss')
+                return
+        if self.health_check_every and self.pages and self.pages % self.health_check_every == 0:
+            if not self.is_healthy():
+                self.stats['health_failures'] += 1
+                self.recycle('health')
+    
+    # ---- ניווט ----
+    
+    def get(self, url):
+        """
+        ניווט ל-url; בכישלון של הדפדפן - הפעלה מחדש וניסיון נוסף אחד
+        
+        Returns:
+            הדרייבר שטען את הדף (יכול להיות חדש אחרי הפעלה מחדש)
+        """
+        self._before_page()
+        for attempt in (1, 2):
+            driver = self.driver
+            if driver is None:
+                raise WebDriverException("לא ניתן להפעיל WebDriver")
+            try:
+                if self.timer:
+                    with self.timer.stage('navigate'):
+                        driver.get(url)
+                else:
+                    driver.get(url)
+                self.pages += 1
+                self.stats['pages'] += 1
+                return driver
+            except WebDriverException as e:
+                if attempt == 2:
+                    raise
+                self.logger.warning(f"⚠️ הדפדפן נכשל ב-{url}: {str(e).splitlines()[0] if str(e) else e}")
+                self.stats['restarts'] += 1
+                self.recycle('error')
+    
+    def summary(self):
+        """מונים: דפים, הפעלות, מיחזורים לפי סיבה, הפעלות מחדש אחרי שגיאה"""
+        return dict(self.stats)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+לוח עברי - מפתח תאריך למיון והמרה לתאריך לועזי
+מספור החודשים זהה ל-HebrewDateParser: תשרי=1 ... אדר (א)=6, אדר ב=7, ניסן=8 ... אלול=13
+"""
+
+from datetime import date
+from functools import lru_cache
+
+HEBREW_MONTHS = {
+    'תשרי': 1, 'חשון': 2, 'חשוון': 2, 'מרחשון': 2, 'כסלו': 3, 'טבת': 4, 'שבט': 5, 'אדר': 6,
+    'אדר א': 6, 'אדר ב': 7, 'אד"ר': 6, 'אד"ש': 7, 'אדר ראשון': 6, 'אדר שני': 7,
+    'ניסן': 8, 'אייר': 9, 'סיון': 10, 'סיוון': 10,
+    'תמוז': 11, 'אב': 12, 'מנחם אב': 12, 'מנ"א': 12, 'אלול': 13
+}
+
+HEBREW_LETTER_VALUES = {
+    'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8, 'ט': 9,
+    'י': 10, 'כ': 20, 'ך': 20, 'ל': 30, 'מ': 40, 'ם': 40, 'נ': 50, 'ן': 50, 'ס': 60,
+    'ע': 70, 'פ': 80, 'ף': 80, 'צ': 90, 'ץ': 90, 'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400
+}
+
+# יום קבוע (RD, כמו date.toordinal) של א' תשרי שנה 1
+HEBREW_EPOCH = -1373427
+
+
+def month_number(month_hebrew):
+    """מספר החודש (תשרי=1) משם החודש בעברית"""
+    if isinstance(month_hebrew, int):
+        return month_hebrew
+    if not month_hebrew:
+        return None
+    month_hebrew = month_hebrew.strip()
+    return HEBREW_MONTHS.get(month_hebrew) or HEBREW_MONTHS.get(month_hebrew.replace('"', '').replace("'", ''))
+
+
+def hebrew_numeral_to_number(text):
+    """המרת מספר בגימטריה (כא, כ"א, ט"ו) למספר"""
+    if not text:
+        return 0
+    return sum(HEBREW_LETTER_VALUES.get(ch, 0) for ch in text)
+
+
+def hebrew_date_key(year, month, day):
+    """מפתח ממוין: שנה*10000 + חודש*100 + יום (למשל 56880621)"""
+    if not year or not month:
+        return None
+    return year * 10000 + month * 100 + (day or 0)
+
+
+def month_key_range(year, month):
+    """
+    טווח מפתחות לכל החודש - לשאילתת BETWEEN על האינדקס (month - שם או מספר)
+    "אדר" סתם כולל תמיד את אדר א ואדר ב - גם בשנה פשוטה יש מקורות שכתוב בהם "אדר ב"
+    """
+    plain_adar = isinstance(month, str) and month.strip() == 'אדר'
+    start = hebrew_date_key(year, month_number(month), 0)
+    if plain_adar:
+        return start, hebrew_date_key(year, HEBREW_MONTHS['אדר ב'], 0) + 99
+    return start, start + 99
+
+
+def _is_leap_year(year):
+    return (7 * year + 1) % 19 < 7
+
+
+def _elapsed_days(year):
+    """ימים מהמולד הראשון עד ראש השנה (כולל דחיית מולד זקן / לא אד"ו)"""
+    months_elapsed = (235 * year - 234) // 19
+    parts_elapsed = 12084 + 13753 * months_elapsed
+    days = 29 * months_elapsed + parts_elapsed // 25920
+    if (3 * (days + 1)) % 7 < 3:
+        days += 1
+    return days
+
+
+def _new_year_delay(year):
+    """דחיות גטר"ד ובטו תקפט"""
+    ny0 = _elapsed_days(year - 1)
+    ny1 = _elapsed_days(year)
+    ny2 = _elapsed_days(year + 1)
+    if ny2 - ny1 == 356:
+        return 2
+    if ny1 - ny0 == 382:
+        return 1
+    return 0
+
+
+@lru_cache(maxsize=None)
+def _new_year(year):
+    return HEBREW_EPOCH + _elapsed_days(year) + _new_year_delay(year)
+
+
+def _days_in_year(year):
+    return _new_year(year + 1) - _new_year(year)
+
+
+def _days_in_month(standard_month, year):
+    """ימים בחודש - לפי מספור סטנדרטי (ניסן=1 ... אדר=12, אדר ב=13)"""
+    if standard_month in (2, 4, 6, 10, 13):
+        return 29
+    if standard_month == 12 and not _is_leap_year(year):
+        return 29
+    if standard_month == 8 and _days_in_year(year) % 10 != 5:
+        return 29
+    if standard_month == 9 and _days_in_year(year) % 10 == 3:
+        return 29
+    return 30
+
+
+def _to_standard_month(month, year):
+    """המרה מהמספור של הפרסר (תשרי=1) למספור הסטנדרטי (ניסן=1)"""
+    if month <= 5:
+        return month + 6
+    if month == 6:
+        return 12
+    if month == 7:
+        return 13 if _is_leap_year(year) else 12
+    return month - 7
+
+
+@lru_cache(maxsize=8192)
+def hebrew_to_gregorian(year, month, day):
+    """המרת תאריך עברי (מספור הפרסר) לתאריך לועזי"""
+    if not year or not month or not day:
+        return None
+
+    standard_month = _to_standard_month(month, year)
+    last_month = 13 if _is_leap_year(year) else 12
+
+    ordinal = _new_year(year) + day - 1
+    if standard_month < 7:
+        for m in range(7, last_month + 1):
+            ordinal += _days_in_month(m, year)
+        for m in range(1, standard_month):
+            ordinal += _days_in_month(m, year)
+    else:
+        for m in range(7, standard_month):
+            ordinal += _days_in_month(m, year)
+
+    return date.fromordinal(ordinal)
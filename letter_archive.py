@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ארכיון מכתבים ארוז - קובץ pack אחד לכל כרך במקום אלפי קבצי .txt קטנים
+כל רשומה נכתבת לסוף קובץ הכרך (append-only): שורת כותרת JSON ואחריה גוף המכתב.
+אינדקס SQLite ממפה (כרך, מכתב) להיסט ולאורך - קריאה אקראית היא חיפוש אחד ו-seek אחד,
+וסטטיסטיקות הן שאילתה אחת במקום סריקת תיקיות.
+
+    with LetterArchive('igrot_kodesh') as archive:
+        archive.put('א', 'פד', content, title='אגרות קודש - כרך א - מכתב פד')
+        text = archive.get('א', 'פד')
+    
+    python letter_archive.py stats igrot_kodesh
+    python letter_archive.py export igrot_kodesh out_txt [--volume א]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+INDEX_NAME = 'index.sqlite'
+PACK_SUFFIX = '.pack'
+
+
+def _pack_name(volume):
+    return 'volume_' + re.sub(r'[^\w]', '_', volume) + PACK_SUFFIX
+
+
+def is_archive(path):
+    """האם בתיקייה יש ארכיון מכתבים"""
+    return os.path.exists(os.path.join(path, INDEX_NAME))
+
+
+class LetterArchive:
+    """
+    ארכיון מכתבים ארוז לפי כרך
+    
+    Args:
+        root: תיקיית הארכיון (נוצרת אם אינה קיימת)
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, INDEX_NAME))
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS letters (
+                volume TEXT NOT NULL,
+                letter TEXT NOT NULL,
+                title TEXT,
+                pack TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                saved_at TEXT,
+                PRIMARY KEY (volume, letter)
+            )''')
+        self.db.commit()
+        self._writers = {}
+        self._readers = {}
+        self.recover()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        for handle in list(self._writers.values()) + list(self._readers.values()):
+            handle.close()
+        self._writers.clear()
+        self._readers.clear()
+        self.db.close()
+    
+    # ---- כתיבה ----
+    
+    def put(self, volume, letter, content, title=None):
+        """
+        הוספת מכתב לסוף קובץ הכרך
+        
+        מכתב זהה שכבר קיים לא נכתב שוב; מכתב אחר עם אותו מפתח נשמר כ-letter_1, letter_2...
+        (כמו שמות הקבצים הכפולים בעבר).
+        
+        Returns:
+            str: מפתח המכתב שנשמר, או None אם מכתב זהה כבר בארכיון
+        """
+        key = letter
+        counter = 1
+        while True:
+            row = self.db.execute('SELECT 1 FROM letters WHERE volume = ? AND letter = ?', (volume, key)).fetchone()
+            if not row:
+                break
+            if self.get(volume, key) == content:
+                return None
+            key = f"{letter}_{counter}"
+            counter += 1
+        
+        body = content.encode('utf-8')
+        header = json.dumps({'volume': volume, 'letter': key, 'title': title, 'length': len(body)},
+                            ensure_ascii=False).encode('utf-8') + b'\n'
+        pack = _pack_name(volume)
+        writer = self._writer(pack)
+        offset = writer.tell() + len(header)
+        writer.write(header + body)
+        writer.flush()
+        self.db.execute('INSERT INTO letters VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (volume, key, title, pack, offset, len(body), datetime.now().isoformat()))
+        self.db.commit()
+        return key
+    
+    def pack_path(self, volume):
+        """נתיב קובץ ה-pack של הכרך"""
+        return os.path.join(self.root, _pack_name(volume))
+    
+    def _writer(self, pack):
+        if pack not in self._writers:
+            self._writers[pack] = open(os.path.join(self.root, pack), 'ab')
+        return self._writers[pack]
+    
+    # ---- קריאה ----
+    
+    def get(self, volume, letter):
+        """תוכן המכתב (None אם אינו בארכיון) - חיפוש באינדקס ו-seek אחד"""
+        row = self.db.execute('SELECT pack, offset, length FROM letters WHERE volume = ? AND letter = ?',
+                              (volume, letter)).fetchone()
+        if not row:
+            return None
+        pack, offset, length = row
+        if pack in self._writers:
+            self._writers[pack].flush()
+        if pack not in self._readers:
+            self._readers[pack] = open(os.path.join(self.root, pack), 'rb')
+        reader = self._readers[pack]
+        reader.seek(offset)
+        return reader.read(length).decode('utf-8')
+    
+    def entries(self, volume=None):
+        """(כרך, מכתב, כותרת) לפי סדר השמירה"""
+        query = 'SELECT volume, letter, title FROM letters'
+        params = ()
+        if volume is not None:
+            query += ' WHERE volume = ?'
+            params = (volume,)
+        return self.db.execute(query + ' ORDER BY pack, offset', params).fetchall()
+    
+    def stats(self):
+        """מכתבים ובייטים לכל כרך: [{'volume', 'letters', 'bytes'}]"""
+        rows = self.db.execute('SELECT volume, COUNT(*), SUM(length) FROM letters GROUP BY volume ORDER BY MIN(saved_at)')
+        return [{'volume': volume, 'letters': count, 'bytes': size or 0} for volume, count, size in rows]
+    
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM letters').fetchone()[0]
+    
+    # ---- שחזור ----
+    
+    def recover(self):
+        """
+        השלמת האינדקס מזנב קבצי ה-pack אחרי קריסה בין הכתיבה לאינדקס,
+        וקיצוץ רשומה אחרונה שנכתבה חלקית
+        
+        Returns:
+            int: מספר הרשומות שנוספו לאינדקס
+        """
+        recovered = 0
+        for pack in sorted(os.listdir(self.root)):
+            if not pack.endswith(PACK_SUFFIX):
+                continue
+            path = os.path.join(self.root, pack)
+            end = self.db.execute('SELECT MAX(offset + length) FROM letters WHERE pack = ?', (pack,)).fetchone()[0] or 0
+            size = os.path.getsize(path)
+            if size <= end:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(end)
+                good_end = end
+                while True:
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        header = json.loads(line)
+                    except ValueError:
+                        break
+                    offset = f.tell()
+                    if len(f.read(header['length'])) < header['length']:
+                        break
+                    self.db.execute('INSERT OR REPLACE INTO letters VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                    (header['volume'], header['letter'], header.get('title'), pack,
+                                     offset, header['length'], datetime.now().isoformat()))
+                    good_end = f.tell()
+                    recovered += 1
+            if good_end < size:
+                os.truncate(path, good_end)
+        self.db.commit()
+        return recovered
+    
+    # ---- ייצוא ----
+    
+    def export(self, out_dir, volume=None):
+        """
+        ייצוא לקבצי .txt בפורמט הישן ("אק - כרך א - מכתב פד.txt")
+        
+        Returns:
+            int: מספר הקבצים שנכתבו
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        written = 0
+        for entry_volume, letter, title in self.entries(volume):
+            name = re.sub(r'[<>:"/\\|?*]', '_', f"אק - כרך {entry_volume} - מכתב {letter}")[:190]
+            with open(os.path.join(out_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"{title or name}\n\n")
+                f.write(self.get(entry_volume, letter))
+            written += 1
+        return written
+
+
+def main():
+    """סטטיסטיקה וייצוא לקבצים מתוך ארכיון"""
+    parser = argparse.ArgumentParser(description='ארכיון מכתבים ארוז - סטטיסטיקה וייצוא ל-.txt')
+    sub = parser.add_subparsers(dest='command', required=True)
+    stats_parser = sub.add_parser('stats', help='מכתבים וגודל לכל כרך')
+    stats_parser.add_argument('archive', help='תיקיית הארכיון')
+    export_parser = sub.add_parser('export', help='ייצוא לקבצי .txt')
+    export_parser.add_argument('archive', help='תיקיית הארכיון')
+    export_parser.add_argument('out_dir', help='תיקיית היעד')
+    export_parser.add_argument('--volume', help='כרך אחד בלבד (למשל א)')
+    args = parser.parse_args()
+    
+    if not is_archive(args.archive):
+        print(f"❌ לא נמצא ארכיון ב-{args.archive}")
+        return
+    
+    with LetterArchive(args.archive) as archive:
+        if args.command == 'stats':
+            for row in archive.stats():
+                print(f"📂 כרך {row['volume']}: {row['letters']} מכתבים ({row['bytes']//1024} קב)")
+            print(f"📝 כל המכתבים: {len(archive)}")
+        else:
+            count = archive.export(args.out_dir, args.volume)
+            print(f"✅ יוצאו {count} קבצים ל-{args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
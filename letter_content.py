@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+תוכן מלא של מכתבים - דחוס, בטבלה נפרדת letter_contents
+הטקסט נשלח ונשמר רק דחוס (zstd אם מותקן, אחרת gzip) ונפתח רק כשמבקשים מכתב אחד;
+בשורת letters אין עותק של הטקסט. לחיפוש נשלחות המילים המנורמלות השונות של הטקסט
+המלא (search_terms) - מהן נבנה letter_contents.content_tsv, והטקסט עצמו לא נשמר פעמיים.
+
+    row = pack_letter(letter_data)                 # content_encoding + content_compressed + search_terms
+    text = fetch_content(supabase, letter_id)      # RPC get_letter_content ופתיחת הדחיסה
+    results = search_content(supabase, 'שלום')     # RPC search_letters_content + קטעים מהטקסט המלא
+"""
+
+import base64
+import gzip
+import re
+
+from database_setup import normalize_hebrew, query_terms, text_snippet
+
+try:
+    import zstandard
+except ImportError:  # בלי zstandard - gzip מהספרייה הסטנדרטית
+    zstandard = None
+
+ZSTD_LEVEL = 19
+GZIP_LEVEL = 9
+
+
+def compress_content(text, encoding=None):
+    """
+    דחיסת טקסט המכתב
+    
+    Returns:
+        tuple: (encoding, bytes) - 'zstd' או 'gzip'
+    """
+    encoding = encoding or ('zstd' if zstandard else 'gzip')
+    raw = text.encode('utf-8')
+    if encoding == 'zstd':
+        return encoding, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    # mtime=0 - אותו טקסט נותן אותם בייטים
+    return 'gzip', gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def decompress_content(encoding, data):
+    """פתיחת דחיסה; data - bytes, base64 או hex של bytea (\\x...) כפי שמגיע מ-PostgREST"""
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:]) if data.startswith('\\x') else base64.b64decode(data)
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("❌ חסר zstandard. התקן: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    return gzip.decompress(data).decode('utf-8')
+
+
+def search_terms(text):
+    """
+    המילים המנורמלות השונות בטקסט, מופרדות ברווח - גם טקסט חוקי של tsvector
+    
+    החיפוש ב-Supabase מתבסס עליהן: השרת לא יכול לפתוח את הדחיסה, והטקסט המלא לא נשלח.
+    """
+    return ' '.join(sorted(set(re.findall(r'[^\W_]+', normalize_hebrew(text).lower()))))
+
+
+def pack_letter(letter_data):
+    """
+    רשומת letters לשליחה: הטקסט המלא דחוס ב-base64 ומילות החיפוש שלו, בלי content
+    
+    content_hash מחושב לפני כן על הטקסט המלא, כך שכל שינוי בטקסט מזוהה.
+    """
+    packed = dict(letter_data)
+    content = packed.pop('content', None) or ''
+    encoding, data = compress_content(content)
+    packed.update({
+        'content_length': len(content),
+        'content_encoding': encoding,
+        'content_compressed': base64.b64encode(data).decode('ascii'),
+        'search_terms': search_terms(content)
+    })
+    return packed
+
+
+def split_packed(packed):
+    """פיצול רשומה ארוזה: (שורת letters, שורת letter_contents בלי letter_id)"""
+    row = dict(packed)
+    # content ריק - מוחק תקציר ישן שנשמר לפני letter_contents
+    row['content'] = None
+    contents = {
+        'encoding': row.pop('content_encoding'),
+        'content': '\\x' + base64.b64decode(row.pop('content_compressed')).hex(),
+        'content_length': row.pop('content_length'),
+        'content_tsv': row.pop('search_terms')
+    }
+    return row, contents
+
+
+def fetch_content(client, letter_id):
+    """הטקסט המלא של מכתב אחד (None אם לא נשמר) - בקשה אחת, פתיחה בצד הלקוח"""
+    result = client.rpc('get_letter_content', {'p_letter_id': letter_id}).execute()
+    rows = result.data or []
+    if isinstance(rows, dict):
+        rows = [rows]
+    if not rows:
+        return None
+    return decompress_content(rows[0]['encoding'], rows[0]['content'])
+
+
+def search_content(client, query, limit=20):
+    """
+    חיפוש מלא ב-Supabase (RPC search_letters_content) עם קטעי טקסט
+    
+    לשורות שנשמרו עם letter_contents השרת לא מחזיר קטע (אין בו טקסט פתוח) -
+    הקטע נבנה כאן מהטקסט המלא, רק עבור התוצאות שהוחזרו.
+    """
+    result = client.rpc('search_letters_content', {'q': query, 'max_results': limit}).execute()
+    rows = result.data or []
+    terms = query_terms(query)
+    for row in rows:
+        if row.get('snippet') is None:
+            row['snippet'] = text_snippet(fetch_content(client, row['id']) or '', terms)
+    return rows
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+השלמת מכתבים חסרים בלי לסרוק את הכרך כולו
+פערים (כרך, מספר מכתב) - מבדיקת השלמות, מרשימה ידנית או מכתובות שנכשלו ב-parse_logs -
+מתורגמים לכתובות: קודם לפי ה-aid של המכתבים השמורים משני צדי הפער (aid רצופים),
+ורק מה שלא נפתר כך - מעמוד רשימה אחד של הכרך (העמוד שבו המכתב אמור להופיע).
+כך 5 מכתבים חסרים עולים בערך 5 טעינות דף, ולא מאות.
+
+    python supabase_parser_fixed.py --refetch 1:12 1:50-52
+    python supabase_parser_fixed.py --refetch-gaps          # מתוך audit_volume_completeness
+    python supabase_parser_fixed.py --refetch-failed        # כתובות שנכשלו ב-parse_logs
+"""
+
+import re
+
+# כרך א: 169 מכתבים ב-4 עמודים (50+50+50+19)
+LETTERS_PER_PAGE = 50
+
+AID_RE = re.compile(r'/aid/(\d+)')
+TARGET_RE = re.compile(r'^(\d+):(\d+)(?:-(\d+))?$')
+
+
+def letter_aid(url: str | None) -> int | None:
+    """מזהה ה-aid של מכתב מתוך ה-URL שלו (/aid/4645943/...)"""
+    match = AID_RE.search(url or '')
+    return int(match.group(1)) if match else None
+
+
+def with_aid(url: str, aid: int) -> str:
+    """אותה כתובת עם aid אחר"""
+    return AID_RE.sub(f'/aid/{aid}', url, count=1)
+
+
+def parse_targets(specs) -> list:
+    """
+    ['1:12', '1:50-52', '2:7,9'] -> [(1, 12), (1, 50), (1, 51), (1, 52), (2, 7), (2, 9)]
+    """
+    targets = []
+    for spec in specs:
+        volume, _, letters = spec.partition(':')
+        for part in letters.split(','):
+            match = TARGET_RE.match(f"{volume}:{part}")
+            if not match:
+                raise ValueError(f"פער לא תקין: {spec} (צורה: כרך:מכתב או כרך:מ-עד)")
+            start = int(match.group(2))
+            end = int(match.group(3) or start)
+            targets.extend((int(volume), number) for number in range(start, end + 1))
+    return sorted(set(targets))
+
+
+def gap_targets(reports) -> list:
+    """פערים מדוחות completeness_audit (audit / audit_supabase)"""
+    return sorted((report['volume'], number)
+                  for report in reports
+                  for start, end in report['missing']
+                  for number in range(start, end + 1))
+
+
+def listing_page(letter_number: int, per_page: int = LETTERS_PER_PAGE) -> int:
+    """עמוד הרשימה של הכרך שבו המכתב אמור להופיע"""
+    return (letter_number - 1) // per_page + 1
+
+
+def interpolate_urls(wanted, stored: dict) -> dict:
+    """
+    כתובות למכתבים חסרים לפי המכתבים השמורים משני צדי הפער
+    
+    מכתב n בין lo ל-hi השמורים נפתר רק כשה-aid רצופים (aid(hi) - aid(lo) == hi - lo),
+    כלומר אין באמצע מאמר שאינו מכתב - אחרת עדיף עמוד הרשימה.
+    
+    Args:
+        wanted: מספרי מכתבים חסרים בכרך
+        stored: {letter_number: url} של המכתבים השמורים בכרך
+    
+    Returns:
+        dict: {letter_number: url} למכתבים שנפתרו
+    """
+    numbers = sorted(number for number, url in stored.items() if letter_aid(url))
+    resolved = {}
+    for number in wanted:
+        lower = max((n for n in numbers if n < number), default=None)
+        upper = min((n for n in numbers if n > number), default=None)
+        if lower is None or upper is None:
+            continue
+        lower_aid, upper_aid = letter_aid(stored[lower]), letter_aid(stored[upper])
+        if upper_aid - lower_aid == upper - lower:
+            resolved[number] = with_aid(stored[lower], lower_aid + number - lower)
+    return resolved
+
+
+def match_listing(links, wanted, stored: dict) -> dict:
+    """
+    כתובות למכתבים חסרים מתוך עמוד רשימה של הכרך
+    
+    מכתב מזוהה לפי מספרו בטקסט הקישור ("מכתב יב"), או לפי מיקומו: הקישור שאחרי
+    המכתב הקודם, כשאינו מכתב ידוע אחר וה-aid שלו צמוד או שאחריו בא מכתב ידוע.
+    
+    Args:
+        links: [{url, number_guess}] מ-find_volume_letters_on_page
+        wanted: מספרי מכתבים חסרים
+        stored: {letter_number: url} של המכתבים השמורים בכרך
+    
+    Returns:
+        dict: {letter_number: url}
+    """
+    stored_numbers = {url: number for number, url in stored.items()}
+    numbered = [[link.get('number_guess') or stored_numbers.get(link['url']), link['url']] for link in links]
+    by_number = {number: url for number, url in numbered if number}
+    
+    resolved = {}
+    for number in sorted(wanted):
+        if number in by_number:
+            resolved[number] = by_number[number]
+            continue
+        for index, (previous, candidate) in enumerate(zip(numbered, numbered[1:])):
+            if previous[0] != number - 1 or candidate[0] not in (None, number) or candidate[1] in stored_numbers:
+                continue
+            # הקישור הבא הוא המכתב הזה רק כשה-aid שלו צמוד לקודם, או שאחריו בא מכתב ידוע
+            following = numbered[index + 2][0] if index + 2 < len(numbered) else None
+            adjacent = letter_aid(previous[1]) and letter_aid(candidate[1]) == letter_aid(previous[1]) + 1
+            if adjacent or (following and following > number):
+                # מכתב שנפתר לפי מיקום משמש עוגן למכתב שאחריו (פער של כמה מכתבים)
+                candidate[0] = number
+                resolved[number] = candidate[1]
+                break
+    return resolved
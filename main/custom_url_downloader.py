@@ -17,6 +17,8 @@ def main():
                        help='Запуск браузера в скрытом режиме (по умолчанию)')
     parser.add_argument('--visible', action='store_false', dest='headless',
                        help='Показать браузер при работе')
+    parser.add_argument('--download-workers', type=int, default=4,
+                       help='Параллельные скачивания файлов (по умолчанию: 4)')
     
     args = parser.parse_args()
     
@@ -28,7 +30,8 @@ def main():
     print("=" * 50)
     
     try:
-        downloader = SeleniumTextDownloader(args.url, args.output_dir, args.headless)
+        downloader = SeleniumTextDownloader(args.url, args.output_dir, args.headless,
+                                            download_workers=args.download_workers)
         downloader.run(extract_content=True, download_files=True)
         
         print("\n✅ Готово! Проверьте папку с результатами.")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Менеджер скачивания файлов (PDF, DOC, TXT...) для загрузчиков
+Потоковая запись на диск кусками, пул соединений, несколько файлов параллельно,
+докачка частичных файлов через HTTP Range и пропуск файлов, у которых не изменились
+размер или ETag. Память на файл - один кусок, независимо от размера файла.
+
+    manager = DownloadManager("downloaded_texts", workers=4)
+    results = manager.download_all(urls)
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from corpus_catalog import CorpusCatalog
+
+CHUNK_SIZE = 256 * 1024
+DEFAULT_WORKERS = 4
+MANIFEST_NAME = '.downloads.json'
+PART_SUFFIX = '.part'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class DownloadManager:
+    def __init__(self, download_dir, session=None, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE,
+                 timeout=30, logger=None, catalog_path=None):
+        """
+        Инициализация менеджера скачивания
+        
+        Args:
+            download_dir (str): Директория для сохранения файлов
+            session (requests.Session): Готовая сессия (заголовки, cookies); по умолчанию - новая
+            workers (int): Количество параллельных скачиваний
+            chunk_size (int): Размер куска при потоковой записи
+            timeout (int): Таймаут соединения и чтения
+            logger (logging.Logger): Логгер загрузчика
+            catalog_path (str): Каталог корпуса, обновляемый после каждого файла (None - без каталога)
+        """
+        self.download_dir = download_dir
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        
+        self.session = session or requests.Session()
+        if session is None:
+            self.session.headers['User-Agent'] = USER_AGENT
+        # Пул соединений на каждого работника - keep-alive между файлами
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        os.makedirs(self.download_dir, exist_ok=True)
+        self.manifest_path = os.path.join(self.download_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self.catalog = CorpusCatalog(catalog_path) if catalog_path else None
+    
+    # ---- манифест: url -> имя файла, размер, ETag, Last-Modified ----
+    
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _update_manifest(self, url, **fields):
+        with self._lock:
+            self.manifest.setdefault(url, {}).update(fields)
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+    
+    def target_path(self, url, filename=None):
+        """
+        Постоянный путь файла для URL (нужен для докачки и пропуска)
+        
+        Returns:
+            str: Путь в download_dir; имя, занятое другим URL, получает суффикс _1, _2...
+        """
+        with self._lock:
+            entry = self.manifest.get(url)
+            if entry and entry.get('filename'):
+                return os.path.join(self.download_dir, entry['filename'])
+            
+            if not filename:
+                filename = os.path.basename(urlparse(url).path) or f"file_{int(time.time())}.txt"
+            filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+            taken = {e.get('filename') for u, e in self.manifest.items() if u != url}
+            name, ext = os.path.splitext(filename)
+            counter = 1
+            while filename in taken or os.path.exists(os.path.join(self.download_dir, filename)):
+                filename = f"{name}_{counter}{ext}"
+                counter += 1
+            self.manifest.setdefault(url, {})['filename'] = filename
+            return os.path.join(self.download_dir, filename)
+    
+    # ---- скачивание ----
+    
+    def _is_unchanged(self, url, entry, path):
+        """Файл уже скачан и на сервере не изменился (304, тот же ETag или тот же размер)"""
+        if not entry.get('complete') or not os.path.exists(path):
+            return False
+        headers = {'Accept-Encoding': 'identity'}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+        except requests.RequestException:
+            return False
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+        etag = response.headers.get('ETag')
+        if etag and entry.get('etag'):
+            return etag == entry['etag']
+        length = response.headers.get('Content-Length')
+        return length is not None and int(length) == os.path.getsize(path) == entry.get('size')
+    
+    def download(self, url, filename=None):
+        """
+        Скачивание одного файла потоком на диск
+        
+        Args:
+            url (str): URL файла
+            filename (str): Имя файла для сохранения (опционально)
+        
+        Returns:
+            dict: {url, path, status: downloaded/resumed/skipped/failed, bytes}
+        """
+        path = self.target_path(url, filename)
+        part_path = path + PART_SUFFIX
+        entry = dict(self.manifest.get(url, {}))
+        result = {'url': url, 'path': path, 'status': 'failed', 'bytes': 0}
+        
+        if self._is_unchanged(url, entry, path):
+            self.logger.info(f"⏭️ קובץ לא השתנה: {os.path.basename(path)}")
+            result['status'] = 'skipped'
+            self.stats['skipped'] += 1
+            return result
+        
+        # Докачка: только если есть валидатор, что на сервере тот же файл (If-Range)
+        headers = {'Accept-Encoding': 'identity'}
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = entry.get('etag') or entry.get('last_modified')
+        if offset and validator:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = validator
+        else:
+            offset = 0
+        
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 416 and offset:
+                    # Часть уже содержит весь файл
+                    total = offset
+                else:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        offset = 0
+                    length = response.headers.get('Content-Length')
+                    total = offset + int(length) if length is not None else None
+                    self._update_manifest(url, etag=response.headers.get('ETag'),
+                                          last_modified=response.headers.get('Last-Modified'),
+                                          size=total, complete=False)
+                    with open(part_path, 'ab' if offset else 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            result['bytes'] += len(chunk)
+            
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise IOError(f"קובץ חלקי: {size}/{total} בייטים")
+            os.replace(part_path, path)
+            self._update_manifest(url, size=size, complete=True)
+            if self.catalog:
+                # Файлы вне томов - пустой том, ключ - имя файла
+                self.catalog.record(self.download_dir, '', os.path.basename(path), path, size)
+            
+            result['status'] = 'resumed' if offset else 'downloaded'
+            self.stats[result['status']] += 1
+            self.stats['bytes'] += result['bytes']
+            action = f"הורדה הושלמה מ-{offset} בייטים" if offset else "קובץ נורד"
+            self.logger.info(f"{action}: {os.path.basename(path)} ({size} בייטים)")
+        
+        except (requests.RequestException, IOError) as e:
+            self.stats['failed'] += 1
+            self.logger.error(f"שגיאה בהורדת {url}: {e}")
+        
+        return result
+    
+    def download_all(self, urls):
+        """
+        Параллельное скачивание списка файлов
+        
+        Args:
+            urls (iterable): URL файлов (дубликаты скачиваются один раз)
+        
+        Returns:
+            list: Результаты download() в порядке urls
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as pool:
+            return list(pool.map(self.download, urls))
+    
+    def close(self):
+        """Закрытие каталога корпуса"""
+        if self.catalog:
+            self.catalog.close()
+            self.catalog = None
+    
+    def summary(self):
+        """Счётчики: downloaded / resumed / skipped / failed / bytes"""
+        return dict(self.stats)
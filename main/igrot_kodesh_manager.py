@@ -4,9 +4,16 @@
 Главный интерфейс для управления скачиванием писем Аврат Кодеш
 """
 
+import argparse
 import os
 import sys
-from letters_downloader import LettersDownloader
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from profiling import add_profile_arguments, letter_limit, profiled
+from corpus_catalog import CorpusCatalog
+
+# מגבלת מכתבים לכל הורדה (נקבעת ב---profile)
+LETTER_LIMIT = None
 
 
 def print_header():
@@ -78,6 +85,8 @@ def download_single_volume():
         sys.argv = ['single_volume_downloader.py', '--volume', volume, '--output-dir', output_dir]
         if show_browser:
             sys.argv.append('--visible')
+        if LETTER_LIMIT:
+            sys.argv.extend(['--max-letters', str(LETTER_LIMIT)])
         single_main()
     except Exception as e:
         print(f"❌ שגיאה: {e}")
@@ -109,42 +118,49 @@ def download_all_letters():
         return
     
     try:
-        downloader = LettersDownloader(download_dir=output_dir, headless=not show_browser)
+        # Selenium ו-BeautifulSoup נטענים רק לפעולות הורדה - לא לסטטיסטיקה, ניקוי ועזרה
+        from letters_downloader import LettersDownloader
+        downloader = LettersDownloader(download_dir=output_dir, headless=not show_browser, max_letters=LETTER_LIMIT)
         start_url = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
         downloader.download_all_letters(start_url)
     except Exception as e:
         print(f"❌ שגיאה: {e}")
 
 
+def _legacy_folders():
+    """תיקיות ההורדה הידועות - לבניית הקטלוג מהורדות שקדמו לו"""
+    folders = ["igrot_kodesh", "igrot_kodesh_all", "igrot_kodesh_single", "downloaded_texts"]
+    for vol in ['א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט', 'י', 'יא', 'יב', 'יג', 'יד', 'טו', 'טז', 'יז', 'יח', 'יט', 'כ', 'כא', 'כב', 'כג']:
+        folders.append(f"igrot_kodesh_volume_{vol}")
+    return folders
+
+
+def _open_catalog():
+    """פתיחת קטלוג הקורפוס; בפעם הראשונה - סריקה חד-פעמית של התיקיות הקיימות"""
+    catalog = CorpusCatalog()
+    if not catalog.totals()['letters']:
+        recorded = catalog.rebuild(_legacy_folders())
+        if recorded:
+            print(f"📇 הקטלוג נבנה מהתיקיות הקיימות: {recorded} מכתבים")
+    return catalog
+
+
 def show_statistics():
-    """Показ статистики скачанных файлов"""
+    """Показ статистики скачанных файлов (из каталога, без обхода папок)"""
     print("\n📊 סטטיסטיקה של קבצי הורדה")
     print("-" * 50)
     
-    # חיפוש תיקיות מכתבי הורדה
-    folders_to_check = [
-        "igrot_kodesh",
-        "igrot_kodesh_all", 
-        "igrot_kodesh_single",
-        "downloaded_texts"
-    ]
-    
-    # גם חיפוש תיקיות מספרי הכרכים
-    for vol in ['א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט', 'י', 'יא', 'יב', 'יג', 'יד', 'טו', 'טז', 'יז', 'יח', 'יט', 'כ', 'כא', 'כב', 'כג']:
-        folders_to_check.append(f"igrot_kodesh_volume_{vol}")
-    
-    total_files = 0
-    total_size = 0
-    
-    for folder in folders_to_check:
-        if os.path.exists(folder):
-            files = [f for f in os.listdir(folder) if f.endswith('.txt')]
-            if files:
-                folder_size = sum(os.path.getsize(os.path.join(folder, f)) for f in files)
-                print(f"📂 {folder}: {len(files)} קבצים ({folder_size//1024} קב)")
-                total_files += len(files)
-                total_size += folder_size
+    with _open_catalog() as catalog:
+        for row in catalog.volumes():
+            years = ""
+            if row['first_year']:
+                years = f", שנים {row['first_year']}-{row['last_year']}"
+            volume = f" / כרך {row['volume']}" if row['volume'] else ""
+            print(f"📂 {row['folder']}{volume}: {row['letters']} קבצים ({row['bytes']//1024} קב{years})")
+        totals = catalog.totals()
     
+    total_files = totals['letters']
+    total_size = totals['bytes']
     if total_files > 0:
         print("-" * 50)
         print(f"📝 כל המכתבים: {total_files}")
@@ -154,9 +170,10 @@ def show_statistics():
 
 
 def clean_folders():
-    """Очистка папок с письмами"""
+    """Очистка папок с письмами - только .txt писем из каталога (архивы и вложения остаются)"""
     print("\n🗑️  ניקוי תיקיות מכתבי הורדה")
-    print("⚠️  זה ימחק את כל המכתבים שהורדו!")
+    print("⚠️  זה ימחק את כל קבצי הטקסט (.txt) של המכתבים שהורדו!")
+    print("   ארכיונים ארוזים (.pack) וקבצים מצורפים (PDF וכו') לא נמחקים.")
     
     # הצגת מה יורד
     show_statistics()
@@ -166,26 +183,22 @@ def clean_folders():
         print("ביטול.")
         return
     
-    folders_to_clean = [
-        "igrot_kodesh", "igrot_kodesh_all", "igrot_kodesh_single", "downloaded_texts"
-    ]
-    
-    # הוספת תיקיות כרכים
-    for vol in ['א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט', 'י', 'יא', 'יב', 'יג', 'יד', 'טו', 'טז', 'יז', 'יח', 'יט', 'כ', 'כא', 'כב', 'כג']:
-        folders_to_clean.append(f"igrot_kodesh_volume_{vol}")
-    
-    deleted_files = 0
-    for folder in folders_to_clean:
-        if os.path.exists(folder):
-            files = [f for f in os.listdir(folder) if f.endswith('.txt')]
-            for file in files:
-                try:
-                    os.remove(os.path.join(folder, file))
-                    deleted_files += 1
-                except:
-                    pass
+    removed = []
+    with _open_catalog() as catalog:
+        for path in catalog.letter_text_files():
+            try:
+                os.remove(path)
+                removed.append(path)
+            except FileNotFoundError:
+                removed.append(path)
+            except OSError as e:
+                print(f"⚠️ לא נמחק: {path} ({e})")
+        catalog.forget_paths(removed)
+        kept = catalog.totals()['letters']
     
-    print(f"✅ נמחק קבצים: {deleted_files}")
+    print(f"✅ נמחק קבצים: {len(removed)}")
+    if kept:
+        print(f"ℹ️  נשארו {kept} רשומות בקטלוג (ארכיונים וקבצים מצורפים)")
 
 
 def show_help():
@@ -207,8 +220,9 @@ def show_help():
     print("   3. גיט כל הכרכים - גיט מלא (שעות)")
     print()
     print("📂 תוצאות:")
-    print("  מכתבי הורדה נשמרים בקבצי טקסט (.txt)")
-    print("  כל קובץ מכיל מכתב אחד עם נתוני מטא-נתונים")
+    print("  מכתבי הורדה נשמרים בקבצי טקסט (.txt) - כל קובץ מכיל מכתב אחד עם נתוני מטא-נתונים")
+    print("  עם --storage archive: ארכיון ארוז - קובץ .pack לכל כרך ואינדקס index.sqlite")
+    print("  לייצוא ארכיון לקבצי טקסט: python ../letter_archive.py export <תיקייה> <תיקיית יעד>")
     print()
     print("⚠️  חשוב:")
     print("   - השתמש בתוכנה בזהירות")
@@ -218,6 +232,19 @@ def show_help():
 
 def main():
     """Главная функция"""
+    global LETTER_LIMIT
+    
+    parser = argparse.ArgumentParser(description='מנהל מכתבי אגרות קודש')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    LETTER_LIMIT = letter_limit(args)
+    
+    with profiled(args.profile, 'igrot_kodesh_manager', output_dir='../logs'):
+        run_menu()
+
+
+def run_menu():
+    """Цикл меню"""
     print_header()
     
     while True:
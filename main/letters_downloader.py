@@ -4,34 +4,46 @@
 Загрузчик всех писем Аврат Кодеш (Священных писем) с chabad.org
 """
 
+import argparse
 import time
 import os
+import sys
 import logging
 import re
 from urllib.parse import urljoin, urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from stage_timer import StageTimer
+from driver_manager import DriverManager, DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB
+from letter_archive import LetterArchive
+from corpus_catalog import CorpusCatalog, CATALOG_PATH, content_year
+from page_cache import PageCache
+
 
 class LettersDownloader:
-    def __init__(self, download_dir="igrot_kodesh", headless=True):
+    def __init__(self, download_dir="igrot_kodesh", headless=True, max_letters=None,
+                 recycle_pages=DEFAULT_MAX_PAGES, recycle_rss_mb=DEFAULT_MAX_RSS_MB, storage='txt',
+                 catalog_path=CATALOG_PATH, page_cache=None):
         """
         אתחול מטעין המכתבים
         
         Args:
             download_dir (str): תיקייה לשמירת המכתבים
             headless (bool): להפעיל את הדפדפן במצב headless
+            max_letters (int): עצירה אחרי מספר מכתבים שנשמרו (למשל בפרופיילינג)
+            recycle_pages (int): מיחזור הדפדפן אחרי מספר דפים זה
+            recycle_rss_mb (int): מיחזור הדפדפן מעל סף זיכרון זה
+            storage (str): 'txt' - קובץ לכל מכתב (ברירת מחדל), 'archive' - ארכיון ארוז לכל כרך (letter_archive)
+            catalog_path (str): קטלוג הקורפוס שמתעדכן בכל שמירה (None - בלי קטלוג)
+            page_cache (PageCache): מטמון דפים משותף (ברירת מחדל - לפי IGROT_PAGE_CACHE בסביבה)
         """
         self.download_dir = download_dir
         self.headless = headless
-        self.driver = None
+        self.max_letters = max_letters
         self.processed_urls = set()
         self.saved_letters = 0
+        self.timer = StageTimer()
         
         # שינוי תצורת הלוגים עם force=True לשינוי
         for handler in logging.root.handlers[:]:
@@ -53,12 +65,29 @@ class LettersDownloader:
         
         # יצירת תיקייה למכתבים
         os.makedirs(self.download_dir, exist_ok=True)
+        self.storage = storage
+        self.archive = None
+        self.catalog = CorpusCatalog(catalog_path) if catalog_path else None
+        self.page_cache = page_cache if page_cache is not None else PageCache.from_env()
         
-        # אתחול דרייבר
-        self._init_driver()
+        # דרייבר מנוהל - Chrome עולה רק בטעינת הדף הראשונה (עם מטמון - בהחטאה הראשונה,
+        # במצב replay - אף פעם), וממוחזר אחרי recycle_pages דפים או מעל recycle_rss_mb
+        self.driver_manager = DriverManager(self._create_driver, max_pages=recycle_pages,
+                                            max_rss_mb=recycle_rss_mb, logger=self.logger, timer=self.timer)
+        if self.page_cache:
+            self.logger.info(f"מטמון דפים: {self.page_cache.cache_dir} ({self.page_cache.mode})")
+    
+    @property
+    def driver(self):
+        """הדרייבר הנוכחי של המנהל"""
+        return self.driver_manager.driver
     
-    def _init_driver(self):
-        """אתחול דרייבר Chrome WebDriver"""
+    def _create_driver(self):
+        """יצירת דרייבר Chrome WebDriver חדש"""
+        # Selenium נטען רק כשבאמת צריך דפדפן
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         try:
             chrome_options = Options()
             
@@ -78,33 +107,54 @@ class LettersDownloader:
             # User-Agent ממשקלי ממשקל
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
             
             # מחיקת סמל האוטומציה
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             self.logger.info("Chrome WebDriver נטען בהצלחה")
+            return driver
             
         except Exception as e:
             self.logger.error(f"שגיאה באתחול דרייבר WebDriver: {e}")
             raise
     
     def get_page_with_selenium(self, url, wait_time=10):
-        """קבלת דף עם עזרת Selenium"""
+        """קבלת דף עם עזרת Selenium (או מהמטמון, אם הוגדר)"""
+        if self.page_cache:
+            html = self.page_cache.get(url)
+            if html is not None:
+                with self.timer.stage('soup_parse'):
+                    soup = BeautifulSoup(html, 'html.parser')
+                self.logger.info(f"דף מהמטמון: {url} ({len(html)} תווים)")
+                return soup
+            if self.page_cache.offline:
+                self.logger.error(f"דף לא נמצא במטמון (replay): {url}")
+                return None
+        
         try:
-            self.logger.info(f"טוען דף: {url}")
-            self.driver.get(url)
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
             
-            # המתן לטעינת הדף
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            self.logger.info(f"טוען דף: {url}")
+            driver = self.driver_manager.get(url)
             
-            # המנהלת תפוסה נוספת לטעינה מלאה
-            time.sleep(2)
+            with self.timer.stage('wait'):
+                # המתן לטעינת הדף
+                WebDriverWait(driver, wait_time).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                
+                # המנהלת תפוסה נוספת לטעינה מלאה
+                time.sleep(2)
             
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+            with self.timer.stage('page_source'):
+                html = driver.page_source
+            with self.timer.stage('soup_parse'):
+                soup = BeautifulSoup(html, 'html.parser')
+            if self.page_cache:
+                self.page_cache.put(url, html)
             
             self.logger.info(f"דף נטען ({len(html)} תווים)")
             return soup
@@ -182,7 +232,8 @@ class LettersDownloader:
                         break
                 
                 # חיפוש מכתבים בדף הנוכחי
-                page_letters = self._extract_letters_from_page(page_soup, page_url, volume_title, current_page)
+                with self.timer.stage('extraction'):
+                    page_letters = self._extract_letters_from_page(page_soup, page_url, volume_title, current_page)
                 
                 if page_letters:
                     all_letters.extend(page_letters)
@@ -370,6 +421,22 @@ class LettersDownloader:
             # פורמט: אגרות קודש - כרך א - מכתב פד
             file_header = f"אגרות קודש - {volume_part} - {letter_part}"
             
+            if self.storage == 'archive':
+                # ארכיון ארוז: הוספה לסוף קובץ הכרך, בלי קובץ ובלי בדיקות קיום
+                if self.archive is None:
+                    self.archive = LetterArchive(self.download_dir)
+                volume_key = volume_part.split()[-1]
+                letter_key = letter_part.split()[-1]
+                key = self.archive.put(volume_key, letter_key, content, title=file_header)
+                if key is None:
+                    self.logger.info(f"מכתב כבר בארכיון: {file_header}")
+                else:
+                    self.logger.info(f"מכתב נשמר בארכיון: כרך {volume_key} - מכתב {key} ({len(content)} תווים)")
+                    self._catalog(volume_key, key, self.archive.pack_path(volume_key),
+                                  len(content.encode('utf-8')), content)
+                self.saved_letters += 1
+                return True
+            
             # יצירת שם קובץ עם שמות קצרים
             # פורמט: אק - כרך א - מכתב פד
             filename_base = f"אק - {volume_part} - {letter_part}"
@@ -399,6 +466,10 @@ class LettersDownloader:
                 f.write(content)
             
             self.logger.info(f"מכתב נשמר: {os.path.basename(file_path)} ({len(content)} תווים)")
+            letter_key = letter_part.split()[-1]
+            if file_path != original_path:
+                letter_key += os.path.splitext(file_path)[0][len(os.path.splitext(original_path)[0]):]
+            self._catalog(volume_part.split()[-1], letter_key, file_path, os.path.getsize(file_path), content)
             self.saved_letters += 1
             return True
             
@@ -406,6 +477,10 @@ class LettersDownloader:
             self.logger.error(f"שגיאה בשמירת המכתב: {e}")
             return False
     
+    def letter_limit_reached(self):
+        """האם הגענו למגבלת המכתבים של הריצה"""
+        return bool(self.max_letters) and self.saved_letters >= self.max_letters
+    
     def download_letters_from_volume(self, volume_info):
         """הורדת כל המכתבים מכרך אחד"""
         self.logger.info(f"מתחילים טיפול בכרך: {volume_info['title']}")
@@ -420,6 +495,10 @@ class LettersDownloader:
         
         downloaded_count = 0
         for i, letter_info in enumerate(letter_links, 1):
+            if self.letter_limit_reached():
+                self.logger.info(f"⏹️ הגענו למגבלה של {self.max_letters} מכתבים")
+                break
+            
             if letter_info['url'] in self.processed_urls:
                 continue
                 
@@ -430,9 +509,12 @@ class LettersDownloader:
             # קבלת תוכן המכתב
             letter_soup = self.get_page_with_selenium(letter_info['url'])
             if letter_soup:
-                content = self.extract_letter_content(letter_soup, letter_info['url'])
+                with self.timer.stage('extraction'):
+                    content = self.extract_letter_content(letter_soup, letter_info['url'])
                 if content:
-                    if self.save_letter(content, letter_info):
+                    with self.timer.stage('file_write'):
+                        saved = self.save_letter(content, letter_info)
+                    if saved:
                         downloaded_count += 1
                 else:
                     self.logger.warning(f"לא ניתן להוציא תוכן: {letter_info['title']}")
@@ -470,6 +552,9 @@ class LettersDownloader:
                 letters_count = self.download_letters_from_volume(volume_info)
                 total_letters += letters_count
                 
+                if self.letter_limit_reached():
+                    break
+                
                 # המנהלת תפוסה בין כרכים
                 if i < len(volume_links):
                     self.logger.info("⏳ המנהלת תפוסה 5 שניות בין כרכים...")
@@ -482,19 +567,36 @@ class LettersDownloader:
             self.logger.error(f"שגיאה קריטית: {e}")
         finally:
             self.close()
+            self.timer.print_summary()
+    
+    def _catalog(self, volume, letter, path, size, content):
+        """עדכון קטלוג הקורפוס אחרי שמירה"""
+        if self.catalog:
+            self.catalog.record(self.download_dir, volume, letter, path, size, content_year(content))
     
     def close(self):
-        """סגירת הדפדפן"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                self.logger.info("WebDriver נסגר")
-            except Exception as e:
-                self.logger.error(f"שגיאה בסגירת WebDriver: {e}")
+        """סגירת הדפדפן, הארכיון והקטלוג"""
+        self.driver_manager.quit()
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.catalog:
+            self.catalog.close()
+            self.catalog = None
+        if self.page_cache:
+            self.logger.info(f"מטמון דפים: {self.page_cache.summary()}")
+        self.logger.info(f"WebDriver נסגר ({self.driver_manager.summary()})")
 
 
 def main():
     """שיטה ראשית"""
+    parser = argparse.ArgumentParser(description='הורדת כל מכתבי אגרות קודש')
+    parser.add_argument('--storage', choices=['txt', 'archive'], default='txt',
+                        help='קובץ .txt לכל מכתב (ברירת מחדל) או ארכיון ארוז לכל כרך')
+    parser.add_argument('--metrics-prom', help='קובץ לייצוא זמני השלבים בפורמט Prometheus')
+    parser.add_argument('--metrics-json', help='קובץ לייצוא זמני השלבים כפרופיל JSON')
+    args = parser.parse_args()
+    
     start_url = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
     
     print("📚 מטעין מכתבי אגרות קודש")
@@ -505,12 +607,15 @@ def main():
     print("=" * 50)
     
     try:
-        downloader = LettersDownloader(download_dir="igrot_kodesh", headless=True)
+        downloader = LettersDownloader(download_dir="igrot_kodesh", headless=True, storage=args.storage)
         downloader.download_all_letters(start_url)
+        downloader.timer.export(prom_file=args.metrics_prom, json_file=args.metrics_json)
         
         print("\n✅ התהליך סיים!")
         print("📋 בדוק את קובץ הלוג '../logs/letters_downloader.log' לפרטים")
         print("📂 המכתבים נמצאים בתיקייה 'igrot_kodesh'")
+        if args.storage == 'archive':
+            print("📄 לייצוא לקבצי .txt: python ../letter_archive.py export igrot_kodesh igrot_kodesh_txt")
         
     except Exception as e:
         print(f"❌ שגיאה: {e}")
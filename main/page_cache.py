@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Кэш страниц на диске для тестов и отчётов (запись / воспроизведение)
+Одна страница - один gzip-файл с именем по хэшу канонического URL; запись атомарная
+(tmp + os.replace), поэтому один каталог безопасно делят параллельные процессы.
+
+    record  - из кэша, если страница уже есть; иначе браузер и запись в кэш
+    replay  - только из кэша, без браузера и сети (промах - страница не загружена)
+
+Загрузчик берёт настройки из окружения, так что тестовые скрипты не меняются:
+
+    IGROT_PAGE_CACHE=tests/.page_cache IGROT_PAGE_CACHE_MODE=replay python test_volume_quick.py
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import Counter
+
+from url_frontier import normalize_url
+
+CACHE_ENV = 'IGROT_PAGE_CACHE'
+MODE_ENV = 'IGROT_PAGE_CACHE_MODE'
+MODES = ('record', 'replay')
+
+
+class PageCache:
+    def __init__(self, cache_dir, mode='record'):
+        """
+        Инициализация кэша страниц
+        
+        Args:
+            cache_dir (str): Каталог кэша (общий для всех процессов)
+            mode (str): 'record' - дописывать промахи, 'replay' - только чтение, без браузера
+        """
+        if mode not in MODES:
+            raise ValueError(f"מצב מטמון לא מוכר: {mode}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @classmethod
+    def from_env(cls):
+        """Кэш из IGROT_PAGE_CACHE / IGROT_PAGE_CACHE_MODE (None, если не задан)"""
+        cache_dir = os.environ.get(CACHE_ENV)
+        if not cache_dir:
+            return None
+        return cls(cache_dir, os.environ.get(MODE_ENV, 'record'))
+    
+    @property
+    def offline(self):
+        """Режим без браузера"""
+        return self.mode == 'replay'
+    
+    def path(self, url):
+        """Файл страницы: одинаковые URL с разным порядком параметров/фрагментом - один файл"""
+        key = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + '.html.gz')
+    
+    def get(self, url):
+        """HTML страницы из кэша или None"""
+        try:
+            with gzip.open(self.path(url), 'rt', encoding='utf-8') as f:
+                html = f.read()
+        except (OSError, EOFError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+        with self._lock:
+            self.stats['hits'] += 1
+        return html
+    
+    def put(self, url, html):
+        """Запись страницы (в режиме replay - ничего не делает)"""
+        if self.offline:
+            return
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats['stored'] += 1
+    
+    def summary(self):
+        """Счётчики: hits / misses / stored"""
+        return dict(self.stats)
@@ -32,6 +32,14 @@ def main():
                        action='store_false',
                        dest='extract_content',
                        help='Отключить извлечение содержимого со страниц')
+    parser.add_argument('--page-workers', 
+                       type=int, 
+                       default=4,
+                       help='Параллельная загрузка страниц одного уровня (по умолчанию: 4)')
+    parser.add_argument('--download-workers', 
+                       type=int, 
+                       default=4,
+                       help='Параллельные скачивания файлов (по умолчанию: 4)')
     
     args = parser.parse_args()
     
@@ -46,11 +54,12 @@ def main():
     print("=" * 60)
     
     # Создание экземпляра загрузчика
-    downloader = TextFileDownloader(args.url, args.output_dir)
+    downloader = TextFileDownloader(args.url, args.output_dir, download_workers=args.download_workers)
     
     try:
         # Запуск процесса
-        downloader.crawl_and_download(max_depth=args.max_depth, delay=args.delay, extract_page_content=args.extract_content)
+        downloader.crawl_and_download(max_depth=args.max_depth, delay=args.delay, extract_page_content=args.extract_content,
+                                      page_workers=args.page_workers)
         print("\n✅ Процесс успешно завершен!")
         print(f"📋 Проверьте лог-файл '../logs/downloader.log' для подробностей")
         print(f"📂 Скачанные файлы находятся в: {args.output_dir}")
@@ -16,11 +16,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
-import requests
+
+from download_manager import DownloadManager, DEFAULT_WORKERS
+from corpus_catalog import CATALOG_PATH
 
 
 class SeleniumTextDownloader:
-    def __init__(self, base_url, download_dir="downloaded_texts", headless=True):
+    def __init__(self, base_url, download_dir="downloaded_texts", headless=True, download_workers=DEFAULT_WORKERS):
         """
         Инициализация загрузчика с Selenium
         
@@ -28,6 +30,7 @@ class SeleniumTextDownloader:
             base_url (str): Базовый URL для скачивания
             download_dir (str): Директория для сохранения файлов
             headless (bool): Запускать браузер в headless режиме
+            download_workers (int): Количество параллельных скачиваний файлов
         """
         self.base_url = base_url
         self.download_dir = download_dir
@@ -51,6 +54,10 @@ class SeleniumTextDownloader:
         # Создание директории для скачивания
         os.makedirs(self.download_dir, exist_ok=True)
         
+        # Файлы скачиваются без браузера: потоком на диск, с пулом соединений
+        self.download_manager = DownloadManager(self.download_dir, workers=download_workers, logger=self.logger,
+                                                catalog_path=CATALOG_PATH)
+        
         # Инициализация драйвера
         self._init_driver()
     
@@ -235,47 +242,30 @@ class SeleniumTextDownloader:
         Returns:
             int: Количество скачанных файлов
         """
-        downloaded_count = 0
         text_extensions = ['.txt', '.pdf', '.doc', '.docx', '.rtf']
         
         try:
-            # Поиск ссылок на файлы
+            # Поиск ссылок на файлы (остальные ссылки - без задержки)
+            file_urls = []
             for link in soup.find_all('a', href=True):
-                href = link['href']
-                full_url = urljoin(base_url, href)
-                
-                # Проверка расширения файла
+                full_url = urljoin(base_url, link['href'])
                 if any(full_url.lower().endswith(ext) for ext in text_extensions):
-                    try:
-                        self.logger.info(f"נמצא קישור לקובץ: {full_url}")
-                        
-                        # Попытка скачать файл
-                        response = requests.get(full_url, timeout=30, headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        })
-                        response.raise_for_status()
-                        
-                        # Сохранение файла
-                        filename = os.path.basename(urlparse(full_url).path)
-                        if not filename:
-                            filename = f"file_{int(time.time())}{os.path.splitext(full_url)[1]}"
-                        
-                        file_path = os.path.join(self.download_dir, filename)
-                        with open(file_path, 'wb') as f:
-                            f.write(response.content)
-                        
-                        self.logger.info(f"קובץ נשמר: {filename}")
-                        downloaded_count += 1
-                        
-                    except Exception as e:
-                        self.logger.error(f"שגיאה בטעינת קובץ {full_url}: {e}")
-                
-                time.sleep(1)  # Задержка между скачиваниями
+                    self.logger.info(f"נמצא קישור לקובץ: {full_url}")
+                    file_urls.append(full_url)
+            
+            if not file_urls:
+                return 0
+            
+            # Cookies браузера - чтобы сервер пустил и без Selenium
+            for cookie in self.driver.get_cookies() if self.driver else []:
+                self.download_manager.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+            
+            results = self.download_manager.download_all(file_urls)
+            return sum(1 for result in results if result['status'] != 'failed')
         
         except Exception as e:
             self.logger.error(f"שגיאה בחיפוש קבצים: {e}")
-        
-        return downloaded_count
+            return 0
     
     def process_url(self, url, extract_content=True, download_files=True):
         """
@@ -358,7 +348,8 @@ class SeleniumTextDownloader:
             self.close()
     
     def close(self):
-        """Закрытие браузера"""
+        """Закрытие браузера и каталога корпуса"""
+        self.download_manager.close()
         if self.driver:
             try:
                 self.driver.quit()
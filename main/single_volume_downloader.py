@@ -5,8 +5,13 @@
 """
 
 import argparse
+import os
+import sys
 from letters_downloader import LettersDownloader
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from profiling import add_profile_arguments, letter_limit, profiled
+
 
 def main():
     parser = argparse.ArgumentParser(description='Скачивание писем из конкретного тома')
@@ -16,6 +21,11 @@ def main():
                        help='Папка для сохранения (по умолчанию: igrot_kodesh_single)')
     parser.add_argument('--visible', action='store_true',
                        help='Показать браузер при работе')
+    parser.add_argument('--max-letters', type=int,
+                       help='Максимальное количество писем')
+    parser.add_argument('--storage', choices=['txt', 'archive'], default='txt',
+                       help='.txt на каждое письмо (по умолчанию) или упакованный архив тома')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -29,8 +39,15 @@ def main():
     # URL главной страницы
     start_url = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
     
+    with profiled(args.profile, 'single_volume_downloader', output_dir='../logs'):
+        download_volume(args, start_url)
+
+
+def download_volume(args, start_url):
+    """Скачивание писем выбранного тома"""
     try:
-        downloader = LettersDownloader(download_dir=args.output_dir, headless=not args.visible)
+        downloader = LettersDownloader(download_dir=args.output_dir, headless=not args.visible,
+                                       max_letters=letter_limit(args, args.max_letters), storage=args.storage)
         
         # Получаем главную страницу
         soup = downloader.get_page_with_selenium(start_url)
@@ -11,16 +11,22 @@ import time
 import logging
 from urllib.parse import urljoin, urlparse
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from download_manager import DownloadManager, DEFAULT_WORKERS
+from corpus_catalog import CATALOG_PATH
+from url_frontier import UrlFrontier, normalize_url
 
 
 class TextFileDownloader:
-    def __init__(self, base_url, download_dir="downloaded_texts"):
+    def __init__(self, base_url, download_dir="downloaded_texts", download_workers=DEFAULT_WORKERS):
         """
         Инициализация загрузчика текстовых файлов
         
         Args:
             base_url (str): Базовый URL для скачивания
             download_dir (str): Директория для сохранения файлов
+            download_workers (int): Количество параллельных скачиваний файлов
         """
         self.base_url = base_url
         self.download_dir = download_dir
@@ -58,6 +64,11 @@ class TextFileDownloader:
         # Создание директории для скачивания
         os.makedirs(self.download_dir, exist_ok=True)
         
+        # Файлы - потоком на диск, через ту же сессию с пулом соединений
+        self.download_manager = DownloadManager(self.download_dir, session=self.session,
+                                                workers=download_workers, logger=self.logger,
+                                                catalog_path=CATALOG_PATH)
+        
     def is_text_file(self, url):
         """
         Проверка, является ли файл текстовым
@@ -258,126 +269,83 @@ class TextFileDownloader:
     
     def download_file(self, url, filename=None):
         """
-        Скачивание файла
+        Скачивание файла (потоком на диск, с докачкой и пропуском неизменённых)
         
         Args:
             url (str): URL файла
             filename (str): Имя файла для сохранения (опционально)
             
         Returns:
-            bool: True если файл успешно скачан
+            bool: True если файл скачан или уже актуален
         """
-        try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Определение имени файла
-            if not filename:
-                parsed_url = urlparse(url)
-                filename = os.path.basename(parsed_url.path)
-                if not filename:
-                    filename = f"file_{int(time.time())}.txt"
-            
-            # Создание безопасного имени файла
-            safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-            file_path = os.path.join(self.download_dir, safe_filename)
-            
-            # Проверка, не существует ли файл уже
-            counter = 1
-            original_path = file_path
-            while os.path.exists(file_path):
-                name, ext = os.path.splitext(original_path)
-                file_path = f"{name}_{counter}{ext}"
-                counter += 1
-            
-            # Сохранение файла
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            self.logger.info(f"קובץ נורה: {safe_filename} ({len(response.content)} בייטים)")
-            return True
-            
-        except requests.RequestException as e:
-            self.logger.error(f"שגיאה בהורדת {url}: {e}")
-            return False
-        except Exception as e:
-            self.logger.error(f"שגיאה לא צפויה בהורדת {url}: {e}")
-            return False
+        return self.download_manager.download(url, filename)['status'] != 'failed'
     
-    def crawl_and_download(self, max_depth=2, delay=1, extract_page_content=True):
+    def crawl_and_download(self, max_depth=2, delay=1, extract_page_content=True, page_workers=4):
         """
         Основной метод для поиска и скачивания текстовых файлов
         
         Args:
             max_depth (int): Максимальная глубина обхода страниц
-            delay (int): Задержка между запросами (в секундах)
+            delay (int): Задержка между запросами одного работника (в секундах)
             extract_page_content (bool): Извлекать ли текст прямо со страниц
+            page_workers (int): Количество страниц одного уровня, загружаемых параллельно
         """
-        visited_urls = set()
-        urls_to_visit = [self.base_url]
+        # BFS по уровням: канонические URL, проверка "уже видели" за O(1)
+        allowed_netloc = urlparse(normalize_url(self.base_url)).netloc
+        frontier = UrlFrontier(max_depth, allowed_netloc=allowed_netloc)
+        frontier.add(self.base_url, 0)
         downloaded_files = set()
         saved_pages = set()
         
         self.logger.info(f"נתחיל חיפוש קבצי טקסט ב-{self.base_url}")
         self.logger.info(f"הוצאת תוכן דפים: {'כולל' if extract_page_content else 'מושמץ'}")
         
+        def fetch(url):
+            soup = self.get_page_content(url)
+            time.sleep(delay)  # Вежливая задержка между страницами
+            return soup
+        
         for depth in range(max_depth):
-            if not urls_to_visit:
+            level_urls = frontier.pop_level(depth)
+            if not level_urls:
                 break
-                
-            self.logger.info(f"מעבר עומק {depth + 1}, דפים: {len(urls_to_visit)}")
-            current_level_urls = urls_to_visit.copy()
-            urls_to_visit = []
             
-            for url in current_level_urls:
-                if url in visited_urls:
-                    continue
+            self.logger.info(f"מעבר עומק {depth + 1}, דפים: {len(level_urls)}")
+            
+            # Страницы уровня загружаются параллельно, обрабатываются по порядку
+            with ThreadPoolExecutor(max_workers=max(1, min(page_workers, len(level_urls)))) as pool:
+                for url, soup in zip(level_urls, pool.map(fetch, level_urls)):
+                    if not soup:
+                        continue
                     
-                visited_urls.add(url)
-                
-                # Получение содержимого страницы
-                soup = self.get_page_content(url)
-                if not soup:
-                    continue
-                
-                # Извлечение и сохранение текстового содержимого страницы
-                if extract_page_content and url not in saved_pages:
-                    page_text = self.extract_page_text(soup, url)
-                    if page_text:
-                        if self.save_text_content(page_text, url):
-                            saved_pages.add(url)
-                
-                # Извлечение ссылок на текстовые файлы
-                text_links = self.extract_text_links(soup, url)
-                
-                # Скачивание найденных текстовых файлов
-                for text_url in text_links:
-                    if text_url not in downloaded_files:
-                        if self.download_file(text_url):
-                            downloaded_files.add(text_url)
-                        time.sleep(delay)  # Вежливая задержка
-                
-                # Добавление новых страниц для обхода (только с того же домена)
-                if depth < max_depth - 1:
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        full_url = urljoin(url, href)
-                        
-                        # Проверка, что ссылка ведет на тот же домен
-                        if (urlparse(full_url).netloc == urlparse(self.base_url).netloc and 
-                            full_url not in visited_urls and 
-                            full_url not in urls_to_visit and
-                            not self.is_text_file(full_url)):
-                            urls_to_visit.append(full_url)
-                
-                time.sleep(delay)  # Вежливая задержка между страницами
+                    # Извлечение и сохранение текстового содержимого страницы
+                    if extract_page_content and url not in saved_pages:
+                        page_text = self.extract_page_text(soup, url)
+                        if page_text:
+                            if self.save_text_content(page_text, url):
+                                saved_pages.add(url)
+                    
+                    # Извлечение ссылок на текстовые файлы
+                    text_links = self.extract_text_links(soup, url)
+                    
+                    # Скачивание найденных текстовых файлов - параллельно
+                    new_links = {normalize_url(text_url) for text_url in text_links} - downloaded_files
+                    for result in self.download_manager.download_all(sorted(new_links)):
+                        if result['status'] != 'failed':
+                            downloaded_files.add(result['url'])
+                    
+                    # Добавление новых страниц для обхода (только с того же домена)
+                    if depth < max_depth - 1:
+                        for link in soup.find_all('a', href=True):
+                            full_url = urljoin(url, link['href'])
+                            if not self.is_text_file(full_url):
+                                frontier.add(full_url, depth + 1)
         
         total_items = len(downloaded_files) + len(saved_pages)
         self.logger.info(f"הסתיים. קובצים נורים: {len(downloaded_files)}, דפים נשמרים: {len(saved_pages)}")
         self.logger.info(f"סהכ פריטים: {total_items}")
         self.logger.info(f"קבצים נשמרים בתיקיית: {self.download_dir}")
 
-
 def main():
     """Основная функция"""
     # URL להורדה
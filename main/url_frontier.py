@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Граница обхода (frontier) для BFS по страницам
+Канонизация URL (фрагмент, порядок параметров, регистр хоста, порт по умолчанию,
+кодировка пути), проверка "уже видели" за O(1) и отдельная очередь на каждую глубину.
+
+    frontier = UrlFrontier(max_depth=2, allowed_netloc='www.chabad.org')
+    frontier.add(start_url, depth=0)
+    for depth in range(max_depth):
+        for url in frontier.pop_level(depth):
+            ...
+            frontier.add(link, depth + 1)
+"""
+
+import re
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Параметры отслеживания не меняют страницу
+TRACKING_PREFIXES = ('utm_',)
+PATH_SAFE = "/:@!$&'()*+,;=-._~"
+
+
+def normalize_url(url):
+    """
+    Канонический вид URL: одна и та же страница - одна и та же строка
+    
+    Args:
+        url (str): Абсолютный URL
+    
+    Returns:
+        str: URL без фрагмента, с отсортированными параметрами, хостом в нижнем регистре,
+             без порта по умолчанию и с единообразной percent-кодировкой пути
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    path = quote(unquote(path), safe=PATH_SAFE)
+    
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+              if not key.lower().startswith(TRACKING_PREFIXES)]
+    query = urlencode(sorted(params))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+class UrlFrontier:
+    def __init__(self, max_depth, allowed_netloc=None):
+        """
+        Инициализация границы обхода
+        
+        Args:
+            max_depth (int): Количество уровней (глубины 0..max_depth-1)
+            allowed_netloc (str): Обходить только этот домен (None - любой)
+        """
+        self.max_depth = max_depth
+        self.allowed_netloc = allowed_netloc.lower() if allowed_netloc else None
+        self.levels = [deque() for _ in range(max_depth)]
+        self.seen = set()
+    
+    def add(self, url, depth):
+        """
+        Добавление страницы в очередь глубины depth
+        
+        Returns:
+            bool: True если URL новый и поставлен в очередь
+        """
+        if depth >= self.max_depth:
+            return False
+        canonical = normalize_url(url)
+        if self.allowed_netloc and urlsplit(canonical).netloc != self.allowed_netloc:
+            return False
+        if canonical in self.seen:
+            return False
+        self.seen.add(canonical)
+        self.levels[depth].append(canonical)
+        return True
+    
+    def pop_level(self, depth):
+        """Все страницы глубины depth (очередь уровня опустошается)"""
+        if depth >= self.max_depth:
+            return []
+        level = self.levels[depth]
+        urls = list(level)
+        level.clear()
+        return urls
+    
+    def __contains__(self, url):
+        return normalize_url(url) in self.seen
+    
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+פרופיילינג לנקודות הכניסה של הסורק - דגל --profile אחד
+cProfile (דטרמיניסטי, בלי תלות) או pyinstrument (דגימה), מוגבל ל-N מכתבים,
+והפלט נכתב ליד הלוגים בפורמט שכלי flamegraph קוראים:
+    cProfile     -> .prof (snakeviz / flameprof / gprof2dot) + סיכום טקסט
+    pyinstrument -> .speedscope.json (speedscope.app) + .html
+"""
+
+import cProfile
+import io
+import os
+import pstats
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILERS = ['cprofile', 'pyinstrument']
+DEFAULT_PROFILE_LETTERS = 20
+TOP_FUNCTIONS = 30
+
+
+def add_profile_arguments(parser, default_letters=DEFAULT_PROFILE_LETTERS):
+    """הוספת --profile ו---profile-letters ל-ArgumentParser"""
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILERS,
+                        help='הרצה תחת פרופיילר (ברירת מחדל: cprofile)')
+    parser.add_argument('--profile-letters', type=int, default=default_letters,
+                        help=f'מספר מכתבים מרבי בריצת פרופיילינג (ברירת מחדל: {default_letters})')
+
+
+def letter_limit(args, limit=None):
+    """מגבלת המכתבים לריצה: בפרופיילינג - הקטנה מבין limit ו---profile-letters"""
+    if not getattr(args, 'profile', None):
+        return limit
+    return min(limit, args.profile_letters) if limit else args.profile_letters
+
+
+def _write_cprofile(profiler, base):
+    profiler.dump_stats(f"{base}.prof")
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    stats.sort_stats('tottime').print_stats(TOP_FUNCTIONS)
+    with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+        f.write(stream.getvalue())
+    print(f"💾 פרופיל נשמר: {base}.prof (סיכום: {base}.txt)")
+    print(f"   🔥 flamegraph: flameprof {base}.prof > {base}.svg  |  snakeviz {base}.prof")
+
+
+def _write_pyinstrument(profiler, base):
+    from pyinstrument.renderers import SpeedscopeRenderer
+    
+    with open(f"{base}.speedscope.json", 'w', encoding='utf-8') as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+    with open(f"{base}.html", 'w', encoding='utf-8') as f:
+        f.write(profiler.output_html())
+    print(f"💾 פרופיל נשמר: {base}.speedscope.json (https://www.speedscope.app) + {base}.html")
+
+
+@contextmanager
+def profiled(mode, name, output_dir='logs'):
+    """
+    הרצת בלוק תחת פרופיילר; כש-mode ריק - בלי שום תקורה
+    
+    Args:
+        mode: None / 'cprofile' / 'pyinstrument'
+        name: שם נקודת הכניסה לשם הקובץ
+        output_dir: תיקיית הלוגים של נקודת הכניסה
+    """
+    if not mode:
+        yield None
+        return
+    
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("❌ חסר pyinstrument. התקן: pip install pyinstrument")
+            print("↩️ ממשיך עם cProfile")
+            mode = 'cprofile'
+    
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"profile_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    print(f"🔬 פרופיילינג ({mode}) -> {base}.*")
+    
+    if mode == 'pyinstrument':
+        profiler = Profiler(interval=0.001)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            _write_pyinstrument(profiler, base)
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            _write_cprofile(profiler, base)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מחולל דוחות HTML משותף - תבניות מהודרות מראש, כתיבה זורמת לקובץ ודפים מחולקים
+דוח גדול מתחלק לקבצים של rows_per_page שורות. קובץ אינדקס JS קטן (רשימת הדפים) נטען
+עם כל דף, וקובץ החיפוש בכל הדפים נטען רק כשהמשתמש מחפש.
+"""
+
+import json
+import os
+from datetime import datetime
+from html import escape
+from string import Template
+
+ROWS_PER_PAGE = 1000
+
+PAGE_HEAD = Template("""<!DOCTYPE html>
+<html lang="he" dir="rtl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f5f5f5; direction: rtl; }
+        .container { max-width: 1400px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #2c3e50; text-align: center; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        .summary { background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin-bottom: 20px; display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
+        .search-box { margin-bottom: 20px; padding: 10px; background-color: #e8f6f3; border-radius: 5px; display: flex; gap: 1%; }
+        .search-box input { flex: 1; padding: 8px; border: 1px solid #bdc3c7; border-radius: 4px; font-size: 14px; }
+        .pager { text-align: center; margin: 10px 0; }
+        .pager a, .pager span { margin: 0 4px; }
+        .matches a { margin: 0 6px; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; font-size: 14px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: center; }
+        th { background-color: #3498db; color: white; font-weight: bold; position: sticky; top: 0; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        tr:hover { background-color: #e8f4f8; }
+        .letter-link { color: #2980b9; text-decoration: none; font-weight: bold; }
+        .letter-link:hover { text-decoration: underline; }
+        .volume-header { background-color: #2c3e50 !important; color: white !important; }
+        .hebrew-number { font-weight: bold; color: #8e44ad; }
+        .arabic-number { font-weight: bold; color: #27ae60; }
+        .letter-number { font-weight: bold; color: #8e44ad; }
+        .date-cell { background-color: #fff3cd; font-weight: bold; }
+        .footer { margin-top: 30px; text-align: center; color: #7f8c8d; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>$title</h1>
+        
+        <div class="summary">
+$summary
+        </div>
+        
+        <div class="search-box">
+$filters
+        </div>
+        <div class="matches" id="matches"></div>
+        <div class="pager" id="pager">עמוד $page</div>
+        
+        <table id="indexTable">
+            <thead>
+                <tr>
+$headers
+                </tr>
+            </thead>
+            <tbody>
+""")
+
+PAGE_TAIL = Template("""            </tbody>
+        </table>
+        
+        <div class="pager">$nav</div>
+        
+        <div class="footer">
+$footer
+        </div>
+    </div>
+    <script src="$index_file"></script>
+    <script>
+        // חיפוש בדף הנוכחי + ספירת התאמות בשאר הדפים מקובץ החיפוש (נטען בחיפוש הראשון)
+        const PAGE = $page;
+        let searchLoading = false;
+        function loadSearch() {
+            if (searchLoading) return;
+            searchLoading = true;
+            const script = document.createElement('script');
+            script.src = '$search_file';
+            script.onload = searchTable;
+            document.head.appendChild(script);
+        }
+        function searchTable() {
+            const inputs = [...document.querySelectorAll('.search-box input')].map(i => i.value.toLowerCase());
+            const match = texts => inputs.every((value, i) => !value || texts[i].indexOf(value) > -1);
+            for (const tr of document.querySelectorAll('#indexTable tbody tr')) {
+                if (tr.classList.contains('volume-header')) continue;
+                tr.style.display = match(JSON.parse(tr.dataset.search)) ? '' : 'none';
+            }
+            const counts = {};
+            if (inputs.some(Boolean) && window.REPORT_INDEX && REPORT_INDEX.pages.length > 1) {
+                if (!window.REPORT_SEARCH) return loadSearch();
+                REPORT_SEARCH.forEach(row => { if (row[0] !== PAGE && match(row.slice(1))) counts[row[0]] = (counts[row[0]] || 0) + 1; });
+            }
+            document.getElementById('matches').innerHTML = Object.entries(counts)
+                .map(([page, count]) => `<a href="$${REPORT_INDEX.pages[page - 1].file}">עמוד $${page} ($${count})</a>`).join('');
+        }
+        if (window.REPORT_INDEX) {
+            document.getElementById('pager').innerHTML = REPORT_INDEX.pages.map((p, i) => i + 1 === PAGE
+                ? `<span>$${i + 1}</span>` : `<a href="$${p.file}" title="$${p.first} - $${p.last}">$${i + 1}</a>`).join('');
+        }
+    </script>
+</body>
+</html>
+""")
+
+
+def page_filename(filename, page):
+    """שם הקובץ של דף מספר page (הדף הראשון הוא הקובץ המקורי)"""
+    if page == 1:
+        return filename
+    base, ext = os.path.splitext(filename)
+    return f"{base}_p{page}{ext}"
+
+
+def cell_text(value):
+    """טקסט התא - None ריק, 0 נשאר 0"""
+    return '' if value is None else str(value)
+
+
+def remove_stale_pages(filename, pages):
+    """מחיקת דפים מריצה קודמת שהייתה ארוכה יותר (name_p{pages+1}.html ...)"""
+    page = pages + 1
+    while os.path.exists(page_filename(filename, page)):
+        os.remove(page_filename(filename, page))
+        page += 1
+
+
+class ReportRenderer:
+    """
+    דוח HTML בדפים
+    
+    Args:
+        title: כותרת הדוח
+        columns: רשימת (כותרת, שדה, class) או (כותרת, שדה, class, טקסט קישור) לעמודת קישור
+        filters: רשימת (placeholder, [שדות]) לתיבות החיפוש
+        footer: שורות טקסט לתחתית הדף
+        group_by / group_label: שורת כותרת (למשל לכל כרך) כשערך השדה מתחלף
+        rows_per_page: מספר שורות מרבי בדף
+    """
+    
+    def __init__(self, title, columns, filters=(), footer=(), group_by=None, group_label=None,
+                 rows_per_page=ROWS_PER_PAGE):
+        self.title = title
+        self.filters = list(filters)
+        self.footer = list(footer)
+        self.group_by = group_by
+        self.group_label = group_label
+        self.rows_per_page = rows_per_page
+        self.columns = columns
+        
+        # תבנית השורה נבנית פעם אחת - כל שורה היא format אחד
+        cells = []
+        for i, column in enumerate(columns):
+            css = f' class="{column[2]}"' if column[2] else ''
+            if len(column) > 3:
+                cells.append(f'<td{css}><a href="{{{i}}}" class="letter-link" target="_blank">{escape(column[3])}</a></td>')
+            else:
+                cells.append(f'<td{css}>{{{i}}}</td>')
+        self._row_format = '                <tr data-search="{search}">' + ''.join(cells) + '</tr>\n'
+        self._headers = '\n'.join(f'                    <th>{escape(column[0])}</th>' for column in columns)
+        self._filters_html = '\n'.join(
+            f'            <input type="text" onkeyup="searchTable()" placeholder="{escape(placeholder)}">'
+            for placeholder, _ in self.filters
+        )
+        self._footer_html = '\n'.join(f'            <p>{escape(line)}</p>' for line in self.footer)
+        self._group_colspan = len(columns)
+    
+    def _search_texts(self, row):
+        return [' '.join(cell_text(row.get(field)) for field in fields).lower() for _, fields in self.filters]
+    
+    def _render_row(self, row, search_texts):
+        values = [escape(cell_text(row.get(column[1]))) for column in self.columns]
+        return self._row_format.format(*values, search=escape(json.dumps(search_texts, ensure_ascii=False)))
+    
+    def _render_group(self, row):
+        label = escape(self.group_label.format(**row))
+        return f'                <tr class="volume-header"><td colspan="{self._group_colspan}">{label}</td></tr>\n'
+    
+    def _label(self, row):
+        return ' '.join(cell_text(row.get(column[1])) for column in self.columns[:4] if len(column) == 3)
+    
+    def render(self, rows, filename, summary=()):
+        """
+        כתיבת הדוח לדיסק תוך כדי מעבר על השורות (גם מ-generator)
+        
+        Args:
+            rows: מילוני שורות
+            filename: קובץ הדף הראשון; דפים נוספים: name_p2.html ...
+                      (דפים עודפים מדוח קודם ארוך יותר נמחקים)
+            summary: רשימת (תווית, ערך) לתיבת הסיכום
+        
+        Returns:
+            list: קבצי הדפים שנכתבו
+        """
+        directory = os.path.dirname(filename)
+        base = os.path.basename(filename)
+        index_file = f"{os.path.splitext(base)[0]}_index.js"
+        search_file = f"{os.path.splitext(base)[0]}_search.js"
+        summary_html = '\n'.join(f'            <div><strong>{escape(str(label))}:</strong> {escape(str(value))}</div>'
+                                 for label, value in summary)
+        
+        pages = []
+        total = 0
+        out = None
+        in_page = 0
+        current_group = None
+        
+        def open_page(page):
+            f = open(os.path.join(directory, page_filename(base, page)), 'w', encoding='utf-8')
+            f.write(PAGE_HEAD.substitute(title=escape(self.title), summary=summary_html, filters=self._filters_html,
+                                         headers=self._headers, page=page))
+            return f
+        
+        def close_page(f, page, has_next):
+            nav = []
+            if page > 1:
+                nav.append(f'<a href="{page_filename(base, page - 1)}">→ הקודם</a>')
+            nav.append(f'<span>עמוד {page}</span>')
+            if has_next:
+                nav.append(f'<a href="{page_filename(base, page + 1)}">הבא ←</a>')
+            f.write(PAGE_TAIL.substitute(nav=' '.join(nav), footer=self._footer_html, index_file=index_file,
+                                         search_file=search_file, page=page))
+            f.close()
+        
+        # שורות החיפוש נכתבות תוך כדי - [דף, טקסטי חיפוש...]
+        search = open(os.path.join(directory, search_file), 'w', encoding='utf-8')
+        search.write('window.REPORT_SEARCH = [')
+        
+        for row in rows:
+            if out is None or in_page >= self.rows_per_page:
+                if out is not None:
+                    close_page(out, len(pages), has_next=True)
+                pages.append({'file': page_filename(base, len(pages) + 1), 'count': 0, 'first': self._label(row)})
+                out = open_page(len(pages))
+                in_page = 0
+                current_group = None
+            
+            if self.group_by and row.get(self.group_by) != current_group:
+                current_group = row.get(self.group_by)
+                out.write(self._render_group(row))
+            
+            search_texts = self._search_texts(row)
+            out.write(self._render_row(row, search_texts))
+            search.write((',\n' if total else '\n') + json.dumps([len(pages)] + search_texts, ensure_ascii=False))
+            total += 1
+            pages[-1]['count'] += 1
+            pages[-1]['last'] = self._label(row)
+            in_page += 1
+        
+        if out is None:
+            pages.append({'file': base, 'count': 0, 'first': '', 'last': ''})
+            out = open_page(1)
+        close_page(out, len(pages), has_next=False)
+        search.write('\n];\n')
+        search.close()
+        remove_stale_pages(filename, len(pages))
+        
+        index = {
+            'title': self.title,
+            'generated_at': datetime.now().isoformat(),
+            'total': total,
+            'pages': pages
+        }
+        with open(os.path.join(directory, index_file), 'w', encoding='utf-8') as f:
+            f.write('window.REPORT_INDEX = ')
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+            f.write(';\n')
+        
+        return [os.path.join(directory, page['file']) for page in pages]
@@ -14,6 +14,8 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), 'main'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'tests'))
 
+from profiling import add_profile_arguments, letter_limit, profiled
+
 def main():
     """הפעלה ראשית של הפרסר המקומי"""
     parser = argparse.ArgumentParser(description='אגרות קודש - פרסר מקומי')
@@ -23,6 +25,7 @@ def main():
     parser.add_argument('--output', default='reports', help='תיקיית פלט')
     parser.add_argument('--format', choices=['csv', 'html', 'both'], default='both',
                        help='פורמט הדוח')
+    add_profile_arguments(parser, default_letters=10)
     
     args = parser.parse_args()
     
@@ -39,12 +42,13 @@ def main():
     os.makedirs('logs', exist_ok=True)
     
     try:
-        if args.mode == 'test':
-            run_test_mode(args)
-        elif args.mode == 'single':
-            run_single_volume(args)
-        elif args.mode == 'full':
-            run_full_parsing(args)
+        with profiled(args.profile, f'run_local_parser_{args.mode}'):
+            if args.mode == 'test':
+                run_test_mode(args)
+            elif args.mode == 'single':
+                run_single_volume(args)
+            elif args.mode == 'full':
+                run_full_parsing(args)
             
     except KeyboardInterrupt:
         print("\n⏹️ הפרסינג הופסק על ידי המשתמש")
@@ -61,7 +65,7 @@ def run_test_mode(args):
         from test_10_letters import test_10_letters
         
         # הרצת המבחן
-        test_10_letters()
+        test_10_letters(letter_limit(args, 10))
         
         # יצירת דוח HTML מקומי
         create_local_html_report(args.output, "test")
@@ -81,7 +85,7 @@ def run_single_volume(args):
         from letters_downloader import LettersDownloader
         from test_10_letters import HebrewDateParser, hebrew_letter_to_number
         
-        downloader = LettersDownloader(download_dir="temp_parse", headless=True)
+        downloader = LettersDownloader(download_dir="temp_parse", headless=True, max_letters=letter_limit(args))
         date_parser = HebrewDateParser()
         
         # כאן יהיה הקוד לפרסינג כרך יחיד
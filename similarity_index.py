@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+אינדקס דמיון בין מכתבים - MinHash על shingles של התוכן ודליים של LSH
+אותו מכתב תחת כמה כתובות, או הדפסה חוזרת עם שינויים קלים בכרך אחר, נמצאים בלי
+להשוות כל זוג מכתבים: חתימת MinHash לכל מכתב נחתכת לרצועות, וכל רצועה נשמרת כדלי
+בטבלה עם אינדקס. מועמדים הם רק מכתבים שחולקים דלי, והדמיון מאומת מהחתימות.
+
+    python similarity_index.py build                      # מכתבים חדשים בלבד
+    python similarity_index.py similar 1 12               # מכתבים דומים לכרך 1 מכתב 12
+    python similarity_index.py duplicates --threshold 0.8
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import zlib
+from array import array
+
+from database_setup import IgrotKodeshDB, normalize_hebrew
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# מילים ברצף לכל shingle
+SHINGLE_WORDS = 3
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+DEFAULT_THRESHOLD = 0.5
+DUPLICATE_THRESHOLD = 0.8
+
+# פרמוטציות קבועות - אותן חתימות בכל הרצה
+_rng = random.Random(20240814)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+WORD_RE = re.compile(r'\w+')
+
+
+def shingles(text, size=SHINGLE_WORDS):
+    """קבוצת hash-ים (32 ביט) של רצפי size מילים בטקסט המנורמל"""
+    words = WORD_RE.findall(normalize_hebrew(text or ''))
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_hashes):
+    """חתימת MinHash: המינימום של כל פרמוטציה (a*x+b mod p)"""
+    if not shingle_hashes:
+        return array('I', [MAX_HASH] * NUM_PERM)
+    return array('I', [min((a * h + b) % MERSENNE_PRIME for h in shingle_hashes) & MAX_HASH
+                       for a, b in PERMUTATIONS])
+
+
+def signature_similarity(first, second):
+    """הערכת דמיון Jaccard: חלק הפרמוטציות שבהן המינימום זהה"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def band_buckets(signature):
+    """מפתח דלי (64 ביט, עם סימן - כמו INTEGER של SQLite) לכל רצועה"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+class SimilarityIndex:
+    """
+    חתימות ודליים בטבלאות letter_minhash ו-lsh_buckets של בסיס הנתונים המקומי
+    
+    Args:
+        conn: חיבור SQLite של IgrotKodeshDB
+        create: יצירת הטבלאות אם חסרות (False בחיבור לקריאה בלבד)
+    """
+    
+    def __init__(self, conn, create=True):
+        self.conn = conn
+        if create and not self.exists():
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS letter_minhash (
+                    letter_id INTEGER PRIMARY KEY,
+                    signature BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    letter_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets_bucket ON lsh_buckets(band, bucket);
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets_letter ON lsh_buckets(letter_id);
+                -- תוכן שהשתנה - החתימה נמחקת ו-update() הבא מחשב אותה מחדש
+                CREATE TRIGGER IF NOT EXISTS letter_minhash_stale AFTER UPDATE OF content ON letters BEGIN
+                    DELETE FROM letter_minhash WHERE letter_id = old.id;
+                    DELETE FROM lsh_buckets WHERE letter_id = old.id;
+                END;
+            ''')
+    
+    def exists(self):
+        """האם טבלאות האינדקס קיימות"""
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lsh_buckets'"
+        ).fetchone() is not None
+    
+    # ---- בנייה ----
+    
+    def add(self, letter_id, content, commit=True):
+        """חישוב ושמירה של חתימת מכתב אחד (מחליף חתימה קודמת)"""
+        shingle_hashes = shingles(content)
+        signature = minhash(shingle_hashes)
+        self.conn.execute('DELETE FROM lsh_buckets WHERE letter_id = ?', (letter_id,))
+        self.conn.execute('INSERT OR REPLACE INTO letter_minhash VALUES (?, ?)', (letter_id, signature.tobytes()))
+        # מכתב בלי תוכן לא נכנס לדליים - אחרת כל המכתבים הריקים "זהים"
+        if shingle_hashes:
+            self.conn.executemany('INSERT INTO lsh_buckets VALUES (?, ?, ?)',
+                                  [(band, bucket, letter_id) for band, bucket in enumerate(band_buckets(signature))])
+        if commit:
+            self.conn.commit()
+    
+    def update(self, rebuild=False, batch_size=500):
+        """
+        אינדוקס מכתבים שעדיין אין להם חתימה, והסרת מכתבים שנמחקו
+        
+        Args:
+            rebuild: חישוב מחדש לכל המכתבים (אחרי שינוי תוכן)
+        
+        Returns:
+            int: מספר המכתבים שאונדקסו
+        """
+        if rebuild:
+            self.conn.execute('DELETE FROM letter_minhash')
+            self.conn.execute('DELETE FROM lsh_buckets')
+        self.conn.execute('DELETE FROM letter_minhash WHERE letter_id NOT IN (SELECT id FROM letters)')
+        self.conn.execute('DELETE FROM lsh_buckets WHERE letter_id NOT IN (SELECT id FROM letters)')
+        
+        rows = self.conn.execute('''
+            SELECT l.id, l.content
+            FROM letters l
+            LEFT JOIN letter_minhash m ON m.letter_id = l.id
+            WHERE m.letter_id IS NULL
+        ''').fetchall()
+        for i, (letter_id, content) in enumerate(rows, 1):
+            self.add(letter_id, content, commit=False)
+            if i % batch_size == 0:
+                self.conn.commit()
+        self.conn.commit()
+        return len(rows)
+    
+    # ---- שאילתות ----
+    
+    def _signature(self, letter_id):
+        row = self.conn.execute('SELECT signature FROM letter_minhash WHERE letter_id = ?', (letter_id,)).fetchone()
+        if not row:
+            return None
+        signature = array('I')
+        signature.frombytes(row[0])
+        return signature
+    
+    def similar(self, letter_id, threshold=DEFAULT_THRESHOLD, limit=10):
+        """
+        מכתבים דומים למכתב letter_id - רק מועמדים שחולקים איתו דלי
+        
+        Returns:
+            list: [(letter_id, similarity)] מהדומה ביותר
+        """
+        signature = self._signature(letter_id)
+        if signature is None:
+            return []
+        candidates = self.conn.execute('''
+            SELECT DISTINCT other.letter_id
+            FROM lsh_buckets own
+            JOIN lsh_buckets other ON other.band = own.band AND other.bucket = own.bucket
+            WHERE own.letter_id = ? AND other.letter_id != ?
+        ''', (letter_id, letter_id)).fetchall()
+        
+        results = []
+        for (candidate,) in candidates:
+            similarity = signature_similarity(signature, self._signature(candidate))
+            if similarity >= threshold:
+                results.append((candidate, similarity))
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+    
+    def duplicates(self, threshold=DUPLICATE_THRESHOLD):
+        """
+        זוגות כמעט-זהים בכל הקורפוס - מתוך דליים משותפים בלבד
+        
+        Returns:
+            list: [(letter_id_a, letter_id_b, similarity)] מהדומה ביותר
+        """
+        pairs = self.conn.execute('''
+            SELECT DISTINCT a.letter_id, b.letter_id
+            FROM lsh_buckets a
+            JOIN lsh_buckets b ON b.band = a.band AND b.bucket = a.bucket AND b.letter_id > a.letter_id
+        ''').fetchall()
+        
+        signatures = {}
+        results = []
+        for first, second in pairs:
+            for letter_id in (first, second):
+                if letter_id not in signatures:
+                    signatures[letter_id] = self._signature(letter_id)
+            similarity = signature_similarity(signatures[first], signatures[second])
+            if similarity >= threshold:
+                results.append((first, second, similarity))
+        results.sort(key=lambda item: (-item[2], item[0], item[1]))
+        return results
+
+
+def _describe(db, letter_id):
+    row = db.conn.execute('''
+        SELECT v.volume_number, l.letter_number, l.url
+        FROM letters l JOIN volumes v ON l.volume_id = v.id
+        WHERE l.id = ?
+    ''', (letter_id,)).fetchone()
+    return f"כרך {row[0]} מכתב {row[1]} ({row[2]})" if row else f"מכתב {letter_id}"
+
+
+def main():
+    """בניית האינדקס וחיפוש מכתבים דומים / כפולים"""
+    parser = argparse.ArgumentParser(description='אינדקס דמיון (MinHash/LSH) בין מכתבים')
+    parser.add_argument('--db', default='igrot_kodesh.db', help='קובץ בסיס הנתונים')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_parser = sub.add_parser('build', help='אינדוקס מכתבים חדשים')
+    build_parser.add_argument('--rebuild', action='store_true', help='חישוב מחדש לכל המכתבים')
+    similar_parser = sub.add_parser('similar', help='מכתבים דומים למכתב')
+    similar_parser.add_argument('volume', type=int, help='מספר כרך')
+    similar_parser.add_argument('letter', type=int, help='מספר מכתב')
+    similar_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    duplicates_parser = sub.add_parser('duplicates', help='מכתבים כמעט זהים בכל הקורפוס')
+    duplicates_parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+    
+    db = IgrotKodeshDB(args.db)
+    index = SimilarityIndex(db.conn)
+    try:
+        if args.command == 'build':
+            count = index.update(rebuild=args.rebuild)
+            print(f"✅ אונדקסו {count} מכתבים")
+        elif args.command == 'similar':
+            row = db.get_letter(args.volume, args.letter)
+            if not row:
+                print("❌ מכתב לא נמצא")
+                return
+            for letter_id, similarity in index.similar(row['id'], threshold=args.threshold):
+                print(f"📄 {_describe(db, letter_id)}: {similarity:.0%}")
+        else:
+            pairs = index.duplicates(threshold=args.threshold)
+            for first, second, similarity in pairs:
+                print(f"🔁 {_describe(db, first)} ≈ {_describe(db, second)}: {similarity:.0%}")
+            print(f"📝 זוגות כפולים: {len(pairs)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מדידת זמנים לפי שלב בסריקה - היסטוגרמות קלות לכל שלב
+(הפעלת דרייבר, ניווט, המתנה, page_source, פרסור soup, חילוץ, פרסור תאריך, כתיבה למסד)
+סיכום בסוף כל ריצה, ויצוא אופציונלי בפורמט הטקסט של Prometheus או כפרופיל JSON.
+
+    timer = StageTimer()
+    with timer.stage('navigate'):
+        driver.get(url)
+    timer.print_summary()
+    timer.export(prom_file='logs/stages.prom', json_file='logs/stages.json')
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# גבולות הדליים בשניות - מכסים גם פרסור תאריך (מיקרו-שניות) וגם טעינת דף (עשרות שניות)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# סדר ההצגה בסיכום - שלבים אחרים מופיעים אחריהם לפי שם
+STAGE_ORDER = ['driver_start', 'navigate', 'wait', 'page_source', 'soup_parse', 'extraction', 'date_parse', 'db_write']
+
+
+class Histogram:
+    """היסטוגרמה בדליים קבועים, כמו histogram של Prometheus"""
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # הדלי האחרון הוא +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+    
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+    
+    def merge(self, other):
+        """הוספת היסטוגרמה עם אותם דליים (למשל מתהליך עובד)"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    def quantile(self, q):
+        """הערכת אחוזון מהדליים (אינטרפולציה ליניארית, כמו histogram_quantile)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                value = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(max(value, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+
+class StageTimer:
+    """אוסף היסטוגרמות לפי שם שלב - בטוח לשימוש מכמה threads"""
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def stage(self, name):
+        """מדידת בלוק קוד כשלב name (גם כשהוא זורק חריגה)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+    
+    def merge(self, histograms):
+        """מיזוג היסטוגרמות של StageTimer אחר (timer.histograms) - לאיחוד תהליכים עובדים"""
+        with self._lock:
+            for name, other in histograms.items():
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram(other.buckets)
+                histogram.merge(other)
+    
+    def stages(self):
+        order = {name: i for i, name in enumerate(STAGE_ORDER)}
+        return sorted(self.histograms, key=lambda name: (order.get(name, len(order)), name))
+    
+    def to_json(self):
+        """פרופיל JSON: לכל שלב מספר, סכום, ממוצע, p50/p95/p99, מינימום/מקסימום ודליים"""
+        total = sum(h.sum for h in self.histograms.values())
+        stages = {}
+        for name in self.stages():
+            h = self.histograms[name]
+            stages[name] = {
+                'count': h.count,
+                'total_sec': round(h.sum, 6),
+                'share': round(h.sum / total, 4) if total else 0,
+                'mean_ms': round(h.sum / h.count * 1000, 3),
+                'p50_ms': round(h.quantile(0.5) * 1000, 3),
+                'p95_ms': round(h.quantile(0.95) * 1000, 3),
+                'p99_ms': round(h.quantile(0.99) * 1000, 3),
+                'min_ms': round(h.min * 1000, 3),
+                'max_ms': round(h.max * 1000, 3),
+                'buckets': {str(le): c for le, c in zip(list(h.buckets) + ['+Inf'], h.counts)}
+            }
+        return {
+            'started_at': self.started_at.isoformat(),
+            'generated_at': datetime.now().isoformat(),
+            'stages': stages
+        }
+    
+    def to_prometheus(self, metric='igrot_stage_duration_seconds'):
+        """היסטוגרמות בפורמט הטקסט של Prometheus (ל-node_exporter textfile או ל-pushgateway)"""
+        lines = [f'# HELP {metric} Time spent in each crawl stage.', f'# TYPE {metric} histogram']
+        for name in self.stages():
+            h = self.histograms[name]
+            cumulative = 0
+            for le, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {h.sum:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {h.count}')
+        return '\n'.join(lines) + '\n'
+    
+    def summary_lines(self):
+        profile = self.to_json()['stages']
+        if not profile:
+            return ["⏱️ לא נמדדו שלבים"]
+        lines = [f"{'שלב':<14}{'פעמים':>8}{'סה״כ(ש)':>10}{'חלק':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}"]
+        for name, s in profile.items():
+            lines.append(f"{name:<14}{s['count']:>8}{s['total_sec']:>10.2f}{s['share']:>7.0%}"
+                         f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}")
+        return lines
+    
+    def print_summary(self):
+        """הדפסת טבלת זמנים לפי שלב"""
+        print("⏱️ זמנים לפי שלב:")
+        for line in self.summary_lines():
+            print(f"   {line}")
+    
+    def export(self, prom_file=None, json_file=None):
+        """כתיבת הפרופיל לקבצים (כל אחד אופציונלי)"""
+        if prom_file:
+            os.makedirs(os.path.dirname(os.path.abspath(prom_file)), exist_ok=True)
+            with open(prom_file, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            print(f"💾 מדדי Prometheus נשמרו: {prom_file}")
+        if json_file:
+            os.makedirs(os.path.dirname(os.path.abspath(json_file)), exist_ok=True)
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+            print(f"💾 פרופיל JSON נשמר: {json_file}")
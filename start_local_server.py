@@ -155,6 +155,9 @@ def create_index_page():
                 <div class="command" onclick="navigator.clipboard.writeText(this.innerText)">
                     python start_local_server.py
                 </div>
+                <div class="command" onclick="navigator.clipboard.writeText(this.innerText)">
+                    python api_server.py --db igrot_kodesh.db --port 8001
+                </div>
                 <p><small>💡 לחץ על פקודה כדי להעתיק אותה</small></p>
             </div>
             
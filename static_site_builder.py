@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+אגרות קודש - בניית API סטטי מפוצל ל-GitHub Pages
+במקום קובץ JSON אחד: קובץ לכל כרך, אינדקס לכל שנה ואינדקס מילים מפוצל לפי תחילית.
+שמות הקבצים כוללים hash של התוכן ו-manifest.json מצביע עליהם,
+כך שהדפדפן מוריד רק את מה שצריך ובנייה חוזרת כותבת רק קבצים שהשתנו.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+
+from database_setup import normalize_hebrew
+from hebrew_calendar import hebrew_date_key, hebrew_numeral_to_number, month_number
+
+MANIFEST_FILE = 'manifest.json'
+WORD_PREFIX_LENGTH = 2
+MIN_WORD_LENGTH = 2
+HASH_LENGTH = 10
+
+WORD_RE = re.compile('[א-ת]+')
+
+# שדות המכתב שנכנסים לקבצי הכרך והשנה (ללא התוכן המלא)
+LETTER_FIELDS = [
+    'volume_number', 'volume_hebrew', 'letter_number', 'letter_hebrew',
+    'day_numeric', 'month_hebrew', 'year_numeric', 'full_date_hebrew',
+    'hebrew_date_key', 'gregorian_date', 'url'
+]
+
+
+def _letter_entry(letter):
+    """מכתב בפורמט הקבצים הסטטיים - השלמת מספרי כרך/מכתב ומפתח תאריך לפי הצורך"""
+    entry = {field: letter.get(field) for field in LETTER_FIELDS}
+    if not entry['volume_number']:
+        entry['volume_number'] = hebrew_numeral_to_number(entry['volume_hebrew'])
+    if not entry['letter_number']:
+        entry['letter_number'] = hebrew_numeral_to_number(entry['letter_hebrew'])
+    if not entry['hebrew_date_key']:
+        entry['hebrew_date_key'] = hebrew_date_key(entry['year_numeric'], month_number(entry['month_hebrew']),
+                                                   entry['day_numeric'])
+    return {field: value for field, value in entry.items() if value not in (None, '')}
+
+
+def _words(text):
+    """מילים מנורמלות וייחודיות מתוכן המכתב"""
+    return {word for word in WORD_RE.findall(normalize_hebrew(text)) if len(word) >= MIN_WORD_LENGTH}
+
+
+def build_shards(letters):
+    """
+    חלוקת המכתבים לקבצים
+    
+    Returns:
+        dict: {'volumes': {מספר: נתונים}, 'years': {שנה: נתונים}, 'words': {תחילית: נתונים}}
+    """
+    volumes = defaultdict(list)
+    years = defaultdict(list)
+    words = defaultdict(lambda: defaultdict(list))
+    
+    for letter in letters:
+        entry = _letter_entry(letter)
+        ref = [entry['volume_number'], entry['letter_number']]
+        volumes[entry['volume_number']].append(entry)
+        if entry.get('year_numeric'):
+            years[entry['year_numeric']].append(entry)
+        for word in _words(letter.get('content')):
+            words[word[:WORD_PREFIX_LENGTH]][word].append(ref)
+    
+    ref_key = lambda e: (e['volume_number'], e['letter_number'])
+    date_key = lambda e: (e.get('hebrew_date_key') or 0, ref_key(e))
+    
+    return {
+        'volumes': {
+            number: {'volume_number': number, 'volume_hebrew': items[0].get('volume_hebrew', ''),
+                     'letters': sorted(items, key=ref_key)}
+            for number, items in volumes.items()
+        },
+        'years': {
+            year: {'year_numeric': year, 'letters': sorted(items, key=date_key)}
+            for year, items in years.items()
+        },
+        'words': {
+            prefix: {word: sorted(refs) for word, refs in sorted(index.items())}
+            for prefix, index in words.items()
+        }
+    }
+
+
+def _serialize(data):
+    """JSON קומפקטי ויציב - אותו תוכן נותן אותו hash"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _write_shard(out_dir, kind, name, data, stats):
+    """כתיבת קובץ עם hash בשם - רק אם הוא עוד לא קיים"""
+    body = _serialize(data)
+    digest = hashlib.sha1(body).hexdigest()[:HASH_LENGTH]
+    relative = f"{kind}/{name}.{digest}.json"
+    path = os.path.join(out_dir, relative)
+    
+    if os.path.exists(path):
+        stats['unchanged'] += 1
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+        stats['written'] += 1
+    return relative
+
+
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_static_api(letters, out_dir='docs/api'):
+    """
+    בניית ה-API הסטטי
+    
+    Args:
+        letters: רשימת מכתבים (מילונים בפורמט database_setup / CSV)
+        out_dir: תיקיית היעד
+    
+    Returns:
+        dict: סטטיסטיקה - written, unchanged, removed, manifest_changed
+    """
+    letters = list(letters)
+    shards = build_shards(letters)
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0, 'manifest_changed': False}
+    os.makedirs(out_dir, exist_ok=True)
+    
+    manifest = {
+        'title': 'אגרות קודש',
+        'source': 'https://github.com/israweb/igrot-kodesh-parser',
+        'total_letters': len(letters),
+        'word_prefix_length': WORD_PREFIX_LENGTH,
+        'min_word_length': MIN_WORD_LENGTH,
+        'volumes': {
+            str(number): {
+                'hebrew': data['volume_hebrew'],
+                'letters': len(data['letters']),
+                'file': _write_shard(out_dir, 'volumes', f'volume-{number}', data, stats)
+            }
+            for number, data in sorted(shards['volumes'].items())
+        },
+        'years': {
+            str(year): {
+                'letters': len(data['letters']),
+                'file': _write_shard(out_dir, 'years', str(year), data, stats)
+            }
+            for year, data in sorted(shards['years'].items())
+        },
+        'words': {
+            prefix: _write_shard(out_dir, 'words', prefix, data, stats)
+            for prefix, data in sorted(shards['words'].items())
+        }
+    }
+    
+    # manifest נכתב מחדש רק אם משהו השתנה, כדי לא לשבור את המטמון של הדפדפן
+    previous = _load_manifest(out_dir)
+    if previous:
+        previous.pop('last_updated', None)
+    if previous != manifest:
+        manifest['last_updated'] = datetime.now().isoformat()
+        with open(os.path.join(out_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        stats['manifest_changed'] = True
+    
+    # מחיקת קבצים ישנים שה-manifest כבר לא מצביע עליהם
+    referenced = {v['file'] for v in manifest['volumes'].values()}
+    referenced |= {y['file'] for y in manifest['years'].values()}
+    referenced |= set(manifest['words'].values())
+    for kind in ('volumes', 'years', 'words'):
+        kind_dir = os.path.join(out_dir, kind)
+        if not os.path.isdir(kind_dir):
+            continue
+        for name in os.listdir(kind_dir):
+            if f"{kind}/{name}" not in referenced:
+                os.remove(os.path.join(kind_dir, name))
+                stats['removed'] += 1
+    
+    return stats
+
+
+def build_from_db(db_file='igrot_kodesh.db', out_dir='docs/api'):
+    """בניית ה-API הסטטי מבסיס הנתונים המקומי"""
+    from database_setup import IgrotKodeshDB
+    
+    db = IgrotKodeshDB(db_file, read_only=True)
+    try:
+        return build_static_api((dict(row) for row in db.get_all_letters()), out_dir)
+    finally:
+        db.conn.close()
+
+
+def main():
+    """פונקציה ראשית"""
+    parser = argparse.ArgumentParser(description='בניית API סטטי מפוצל ל-GitHub Pages')
+    parser.add_argument('--db', default='igrot_kodesh.db', help='קובץ בסיס הנתונים')
+    parser.add_argument('--out', default='docs/api', help='תיקיית היעד')
+    
+    args = parser.parse_args()
+    
+    print("🏗️ בניית API סטטי")
+    print("=" * 50)
+    
+    stats = build_from_db(args.db, args.out)
+    print(f"✅ נכתבו {stats['written']} קבצים, ללא שינוי {stats['unchanged']}, נמחקו {stats['removed']}")
+    print(f"📋 manifest {'עודכן' if stats['manifest_changed'] else 'ללא שינוי'}: {os.path.join(args.out, MANIFEST_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,12 +19,32 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from supabase import create_client, Client
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # הוספת נתיב לתיקיות הפרויקט
 sys.path.append(os.path.join(os.path.dirname(__file__), 'main'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'tests'))
 
 from test_10_letters import HebrewDateParser
+from hebrew_calendar import hebrew_date_key, hebrew_to_gregorian
+from stage_timer import StageTimer
+from profiling import add_profile_arguments, letter_limit, profiled
+from driver_manager import DriverManager
+from change_detection import ChangeDetector, FINGERPRINT_COLUMNS, record_hash
+from letter_content import pack_letter, split_packed
+from letter_refetch import letter_aid, listing_page, interpolate_urls, match_listing, parse_targets, gap_targets
+
+# RPC שלא קיים: PGRST202 - PostgREST לא מצא את הפונקציה במטמון הסכמה, 42883 - undefined_function
+MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
+# ניסיונות לשמירת פקטה לפני שהכרך נכשל (שגיאות רשת / RPC חולפות)
+BATCH_SAVE_ATTEMPTS = 3
+
+
+def is_missing_function(error: Exception) -> bool:
+    """האם השגיאה היא RPC שלא קיים (ולא שגיאה חולפת או שגיאת נתונים)"""
+    code = getattr(error, 'code', None)
+    return code in MISSING_FUNCTION_CODES or any(c in str(error) for c in MISSING_FUNCTION_CODES)
 
 class SupabaseConfig:
     """הגדרות Supabase"""
@@ -41,11 +61,20 @@ class SupabaseConfig:
 class FixedIgrotParser:
     """פרסר אגרות קודש מתוקן"""
     
-    def __init__(self, supabase_url: str, supabase_key: str):
-        """אתחול הפרסר"""
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+    def __init__(self, supabase_url: str, supabase_key: str, supabase_client=None, full_refresh: bool = False):
+        """
+        אתחול הפרסר (supabase_client - לקוח מוכן, למשל תחליף מקומי לבנצ'מרק;
+        full_refresh - פרסור וכתיבה של כל מכתב גם אם לא השתנה)
+        """
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.supabase: Client = supabase_client or create_client(supabase_url, supabase_key)
         self.date_parser = HebrewDateParser()
+        self.timer = StageTimer()
+        self.change_detector = ChangeDetector(force=full_refresh)
         self.setup_logging()
+        # דרייבר חם אחד לכל הכרכים, עם מיחזור והפעלה מחדש
+        self.driver_manager = DriverManager(self.setup_driver, logger=self.logger, timer=self.timer)
         
         # URLs מהמבנה האמיתי של האתר
         self.base_urls = {
@@ -53,10 +82,13 @@ class FixedIgrotParser:
             'volume_1': 'https://www.chabad.org/therebbe/article_cdo/aid/4643805/jewish/page.htm',
             'first_letter': 'https://www.chabad.org/therebbe/article_cdo/aid/4645943/jewish/page.htm'
         }
+        # מספר כרך -> כתובת דף הכרך, מעמוד הכרכים בפעם הראשונה שצריך (מצב השלמה)
+        self._volume_urls = None
         
         self.session_stats = {
             'letters_processed': 0,
             'letters_with_dates': 0,
+            'letters_unchanged': 0,
             'errors': 0,
             'start_time': datetime.now()
         }
@@ -90,11 +122,14 @@ class FixedIgrotParser:
         except Exception as e:
             self.logger.error(f"שגיאה ברישום לוג ל-Supabase: {e}")
 
-    def get_last_processed_entry(self) -> dict | None:
-        """מחזיר את הרשומה האחרונה שנשמרה (לפי created_at)"""
+    def get_last_processed_entry(self, volume_number: int = None) -> dict | None:
+        """מחזיר את הרשומה האחרונה שנשמרה (לפי created_at), בכרך volume_number אם צוין"""
         try:
-            res = self.supabase.table('letters') \
-                .select('tom_number,letter_number,letter_hebrew,url,created_at') \
+            query = self.supabase.table('letters') \
+                .select('tom_number,letter_number,letter_hebrew,url,created_at')
+            if volume_number is not None:
+                query = query.eq('tom_number', volume_number)
+            res = query \
                 .order('created_at', desc=True) \
                 .limit(1) \
                 .execute()
@@ -104,6 +139,64 @@ class FixedIgrotParser:
             self.logger.warning(f"⚠️ לא ניתן לשלוף רשומה אחרונה: {e}")
         return None
     
+    def get_checkpoint(self, volume_number: int) -> dict | None:
+        """נקודת החידוש של כרך מטבלת parse_checkpoints (None אם אין, או שהטבלה לא נוצרה)"""
+        try:
+            res = self.supabase.table('parse_checkpoints') \
+                .select('volume_number,last_page,last_aid,last_url,letters_saved,status') \
+                .eq('volume_number', volume_number) \
+                .limit(1) \
+                .execute()
+            if res.data:
+                return res.data[0]
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לשלוף נקודת חידוש: {e}")
+        return None
+    
+    def load_fingerprints(self, volume_id: int) -> int:
+        """טביעות האצבע של מכתבי הכרך (hash, ETag, Last-Modified) לזיהוי שינויים"""
+        try:
+            res = self.supabase.table('letters').select(FINGERPRINT_COLUMNS).eq('volume_id', volume_id).execute()
+            return self.change_detector.load(res.data)
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לשלוף טביעות אצבע, כל המכתבים ייפרסרו: {e}")
+            return 0
+    
+    def save_validators(self, volume_id: int, url: str, validators: dict):
+        """עדכון ETag / Last-Modified בלבד למכתב שלא השתנה"""
+        try:
+            with self.timer.stage('db_write'):
+                self.supabase.table('letters').update(validators).eq('volume_id', volume_id).eq('url', url).execute()
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לעדכן ETag / Last-Modified: {e}")
+    
+    def set_checkpoint_status(self, volume_number: int, status: str):
+        """סימון כרך כ-done / failed בלי לגעת בעמוד ובמכתב האחרונים"""
+        try:
+            self.supabase.table('parse_checkpoints').update({
+                'status': status,
+                'updated_at': datetime.now().isoformat()
+            }).eq('volume_number', volume_number).execute()
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לעדכן סטטוס נקודת חידוש: {e}")
+    
+    def save_checkpoint(self, volume_id: int, volume_number: int, page_num: int, last_url: str | None, saved: int):
+        """נקודת חידוש בלי ה-RPC (שמירה מכתב-מכתב) - כמו סוף save_letters_batch ב-SQL"""
+        try:
+            previous = self.get_checkpoint(volume_number) or {}
+            self.supabase.table('parse_checkpoints').upsert({
+                'volume_number': volume_number,
+                'volume_id': volume_id,
+                'last_page': page_num,
+                'last_aid': letter_aid(last_url),
+                'last_url': last_url,
+                'letters_saved': (previous.get('letters_saved') or 0) + saved,
+                'status': 'running',
+                'updated_at': datetime.now().isoformat()
+            }, on_conflict='volume_number').execute()
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לשמור נקודת חידוש: {e}")
+    
     def setup_driver(self):
         """הגדרת WebDriver עם אפשרויות מתקדמות"""
         chrome_options = Options()
@@ -248,23 +341,24 @@ class FixedIgrotParser:
             ]
             
             content = ""
-            for selector in content_selectors:
-                try:
-                    content_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    content = content_element.text.strip()
-                    if content:
-                        self.logger.info(f"📄 תוכן נמצא עם סלקטור: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not content:
-                # נסיון אחרון - לוקח את כל הטקסט מהגוף
-                body = driver.find_element(By.TAG_NAME, 'body')
-                content = body.text.strip()
-                self.logger.warning("⚠️ נלקח תוכן כללי מהגוף")
+            with self.timer.stage('extraction'):
+                for selector in content_selectors:
+                    try:
+                        content_element = WebDriverWait(driver, 5).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                        )
+                        content = content_element.text.strip()
+                        if content:
+                            self.logger.info(f"📄 תוכן נמצא עם סלקטור: {selector}")
+                            break
+                    except:
+                        continue
+                
+                if not content:
+                    # נסיון אחרון - לוקח את כל הטקסט מהגוף
+                    body = driver.find_element(By.TAG_NAME, 'body')
+                    content = body.text.strip()
+                    self.logger.warning("⚠️ נלקח תוכן כללי מהגוף")
             
             # חילוץ התאריך מהשורה הראשונה
             if content:
@@ -274,7 +368,8 @@ class FixedIgrotParser:
                 self.logger.info(f"📅 שורה ראשונה לפרסור תאריך: '{first_line}'")
                 
                 # פרסור התאריך
-                date_info = self.date_parser.extract_date_from_text(first_line)
+                with self.timer.stage('date_parse'):
+                    date_info = self.date_parser.extract_date_from_text(first_line)
                 
                 return content, date_info
             
@@ -287,18 +382,31 @@ class FixedIgrotParser:
     def save_letter_to_supabase(self, volume_id: int, letter_data: dict) -> bool:
         """שמירת מכתב ל-Supabase"""
         try:
-            # בדיקה אם המכתב כבר קיים
-            existing = self.supabase.table('letters').select('id').eq('volume_id', volume_id).eq('letter_number', letter_data['letter_number']).execute()
-            
-            if existing.data:
-                # עדכון מכתב קיים
-                result = self.supabase.table('letters').update(letter_data).eq('id', existing.data[0]['id']).execute()
-                self.logger.info(f"🔄 עודכן מכתב קיים: {letter_data['letter_hebrew']}")
-            else:
-                # הוספת מכתב חדש
-                letter_data['volume_id'] = volume_id
-                result = self.supabase.table('letters').insert(letter_data).execute()
-                self.logger.info(f"✅ נוסף מכתב חדש: {letter_data['letter_hebrew']}")
+            letter_data.setdefault('content_hash', record_hash(letter_data))
+            with self.timer.stage('db_write'):
+                # בדיקה אם המכתב כבר קיים
+                existing = self.supabase.table('letters').select('id,content_hash').eq('volume_id', volume_id).eq('letter_number', letter_data['letter_number']).execute()
+                
+                if existing.data and existing.data[0].get('content_hash') == letter_data['content_hash'] \
+                        and not self.change_detector.force:
+                    # הרשומה לא השתנתה - אין UPDATE
+                    self.logger.info(f"⏭️ מכתב ללא שינוי: {letter_data['letter_hebrew']}")
+                    self.session_stats['letters_unchanged'] += 1
+                    return True
+                # שורת letters בלי טקסט; הטקסט המלא (דחוס) ומילות החיפוש - ב-letter_contents
+                row, contents = split_packed(pack_letter(letter_data))
+                if existing.data:
+                    # עדכון מכתב קיים
+                    letter_id = existing.data[0]['id']
+                    result = self.supabase.table('letters').update(row).eq('id', letter_id).execute()
+                    self.logger.info(f"🔄 עודכן מכתב קיים: {letter_data['letter_hebrew']}")
+                else:
+                    # הוספת מכתב חדש
+                    row['volume_id'] = volume_id
+                    result = self.supabase.table('letters').insert(row).execute()
+                    letter_id = result.data[0]['id'] if result.data else None
+                    self.logger.info(f"✅ נוסף מכתב חדש: {letter_data['letter_hebrew']}")
+                self.save_letter_content(letter_id, contents)
             
             self.session_stats['letters_processed'] += 1
             if letter_data.get('date_parsed'):
@@ -313,18 +421,33 @@ class FixedIgrotParser:
             self.session_stats['errors'] += 1
             return False
     
-    def find_volume_letters_on_page(self, driver, volume_url: str, page_num: int) -> list:
-        """מציאת קישורי מכתבים בכרך. מחזיר רשימת אובייקטים: {url, text, hebrew_letter, number_guess}"""
+    def save_letter_content(self, letter_id: int, contents: dict):
+        """שמירת הטקסט המלא הדחוס ב-letter_contents (לפני add_letter_contents.sql - רק אזהרה)"""
+        if not letter_id:
+            return
+        try:
+            self.supabase.table('letter_contents').upsert(dict(contents, letter_id=letter_id)).execute()
+        except Exception as e:
+            self.logger.warning(f"⚠️ לא ניתן לשמור תוכן מלא למכתב {letter_id}: {e}")
+    
+    def find_volume_letters_on_page(self, driver, volume_url: str, page_num: int) -> list | None:
+        """
+        מציאת קישורי מכתבים בכרך. מחזיר רשימת אובייקטים: {url, text, hebrew_letter, number_guess}
+        
+        רשימה ריקה - אין מכתבים בעמוד (אחרי העמוד האחרון); None - העמוד לא נטען
+        """
         try:
             page_url = volume_url if page_num == 1 else f"{volume_url}?page={page_num}"
             self.logger.info(f"🔍 סורק כרך: {page_url}")
-            driver.get(page_url)
-            time.sleep(3)
+            driver = self.driver_manager.get(page_url)
+            with self.timer.stage('wait'):
+                time.sleep(3)
             
             # נסיון למצוא קישורים למכתבים בדרכים שונות
             letter_links: list[dict] = []
             
             # שיטה 1: חיפוש קישורים עם טקסט "מכתב" או מספרים
+            extraction_start = time.perf_counter()
             text_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'מכתב') or contains(text(), 'Letter') or contains(@href, '4645')]")
             for link in text_links:
                 href = link.get_attribute('href')
@@ -348,8 +471,11 @@ class FixedIgrotParser:
                         if 4645940 <= aid_number <= 4646200:  # טווח סביר למכתבים
                             letter_links.append({'url': href, 'text': link.text.strip(), 'hebrew_letter': None, 'number_guess': None})
             
-            # שיטה 3: אם לא מצאנו כלום, ננסה ליצור רשימה ידנית של המכתבים הראשונים
-            if not letter_links:
+            self.timer.observe('extraction', time.perf_counter() - extraction_start)
+            
+            # שיטה 3: אם לא מצאנו כלום בעמוד הראשון, ננסה ליצור רשימה ידנית של המכתבים הראשונים
+            # (בעמודים הבאים עמוד ריק הוא סוף הכרך)
+            if not letter_links and page_num == 1:
                 self.logger.warning("⚠️ לא נמצאו קישורים בדף, יוצר רשימה ידנית")
                 # המכתבים הראשונים שאנחנו יודעים עליהם
                 known_letters = [
@@ -378,26 +504,91 @@ class FixedIgrotParser:
             
         except Exception as e:
             self.logger.error(f"❌ שגיאה בחיפוש מכתבים בכרך: {e}")
-            return []
+            return None
+    
+    def save_letters_batch(self, volume_id: int, volume_number: int, letters: list, page_num: int,
+                           last_url: str = None) -> int:
+        """
+        שמירת מכתבי עמוד ועדכון נקודת החידוש בקריאת RPC אחת (טרנזקציה אחת)
+        
+        Args:
+            last_url: המכתב האחרון שטופל בעמוד - נשמר או דולג כי לא השתנה
+                      (None - האחרון בפקטה, או תחילת העמוד כשהיא ריקה)
+        
+        Returns:
+            מספר המכתבים שנשמרו
+        """
+        if not last_url and letters:
+            last_url = letters[-1]['url']
+        params = {
+            'p_volume_id': volume_id,
+            'p_volume_number': volume_number,
+            'p_letters': [pack_letter(letter_data) for letter_data in letters],
+            'p_page': page_num,
+            'p_last_aid': letter_aid(last_url),
+            'p_last_url': last_url
+        }
+        for attempt in range(1, BATCH_SAVE_ATTEMPTS + 1):
+            try:
+                with self.timer.stage('db_write'):
+                    result = self.supabase.rpc('save_letters_batch', params).execute()
+                break
+            except Exception as e:
+                if is_missing_function(e):
+                    # ה-RPC לא קיים (add_parse_checkpoints.sql לא הורץ, או שמטמון הסכמה של PostgREST
+                    # לא רוענן) - שמירה מכתב-מכתב. היא עדיין דורשת את העמודות של add_date_keys.sql
+                    # ו-add_change_detection.sql; נקודת החידוש נכתבת ישירות לטבלה אם היא קיימת
+                    self.logger.warning(f"⚠️ RPC save_letters_batch לא קיים, שמירה מכתב-מכתב: {e}")
+                    saved = sum(1 for letter_data in letters if self.save_letter_to_supabase(volume_id, letter_data))
+                    self.save_checkpoint(volume_id, volume_number, page_num, last_url, saved)
+                    return saved
+                if attempt == BATCH_SAVE_ATTEMPTS:
+                    # הכרך נכשל; נקודת החידוש נשארת בעמוד הקודם והעמוד ייפרסר שוב בהרצה הבאה
+                    raise
+                self.logger.warning(f"⚠️ RPC save_letters_batch נכשל (ניסיון {attempt}/{BATCH_SAVE_ATTEMPTS}): {e}")
+                time.sleep(2 ** attempt)
+        saved = result.data if isinstance(result.data, int) else len(letters)
+        
+        self.session_stats['letters_processed'] += saved
+        self.session_stats['letters_with_dates'] += sum(1 for letter_data in letters if letter_data.get('date_parsed'))
+        if letters:
+            self.logger.info(f"✅ נשמרו {saved} מכתבים מעמוד {page_num}")
+            self.log_to_supabase('INFO', f'נשמרו {saved} מכתבים מעמוד {page_num}',
+                               volume_number=volume_number, url=last_url)
+        return saved
+    
+    def parse_single_letter(self, driver, letter_url: str, volume_id: int, volume_hebrew: str,
+                            volume_number: int = 1) -> bool:
+        """פרסור ושמירה של מכתב יחיד"""
+        letter_data = self.build_letter_data(driver, letter_url, volume_hebrew, volume_number)
+        if not letter_data:
+            return False
+        
+        success = self.save_letter_to_supabase(volume_id, letter_data)
+        if success:
+            self.log_to_supabase('INFO', f'נשמר מכתב {letter_data["letter_hebrew"]} בהצלחה',
+                               volume_number=volume_number, letter_number=letter_data['letter_number'], url=letter_url)
+        return success
     
-    def parse_single_letter(self, driver, letter_url: str, volume_id: int, volume_hebrew: str) -> bool:
-        """פרסור מכתב יחיד"""
+    def build_letter_data(self, driver, letter_url: str, volume_hebrew: str, volume_number: int = 1) -> dict | None:
+        """פרסור מכתב יחיד לרשומת letters (None בשגיאה)"""
         try:
             self.logger.info(f"📖 מפרסר מכתב: {letter_url}")
             
             # מעבר לדף המכתב
-            driver.get(letter_url)
-            time.sleep(2)
+            driver = self.driver_manager.get(letter_url)
+            with self.timer.stage('wait'):
+                time.sleep(2)
             
             # חילוץ מספר המכתב מהכותרת
-            letter_number, letter_hebrew = self.extract_letter_number_from_title(driver)
+            with self.timer.stage('extraction'):
+                letter_number, letter_hebrew = self.extract_letter_number_from_title(driver)
             
             if not letter_number or not letter_hebrew:
                 # נסיון לחלץ מה-URL כגיבוי
-                aid_match = re.search(r'/aid/(\d+)/', letter_url)
-                if aid_match:
+                aid_id = letter_aid(letter_url)
+                if aid_id:
                     # נשתמש ב-ID כמספר זמני
-                    aid_id = int(aid_match.group(1))
                     letter_number = aid_id - 4645942  # התאמה לסדרה (המכתב הראשון הוא 4645943)
                     if letter_number <= 0:
                         letter_number = 1
@@ -414,11 +605,11 @@ class FixedIgrotParser:
             # הכנת נתוני המכתב
             letter_data = {
                 'tom_hebrew': volume_hebrew,
-                'tom_number': 1,  # כרך א
+                'tom_number': volume_number,
                 'letter_hebrew': letter_hebrew,
                 'letter_number': letter_number,
                 'url': letter_url,
-                'content': content[:2000],  # מגביל את האורך
+                'content': content,  # טקסט מלא; בשמירה - דחוס ב-letter_contents בלבד
                 'date_parsed': date_info is not None
             }
             
@@ -429,8 +620,14 @@ class FixedIgrotParser:
                     'day_hebrew': date_info.get('day_hebrew', ''),
                     'month_hebrew': date_info.get('month_hebrew', ''),
                     'year_hebrew': date_info.get('year_hebrew', ''),
-                    'year_number': date_info.get('year_numeric', 0)  # שנה בספרים
+                    'year_number': date_info.get('year_numeric', 0),  # שנה בספרים
+                    'hebrew_date_key': hebrew_date_key(date_info.get('year'), date_info.get('month'), date_info.get('day'))
                 })
+                try:
+                    gregorian = hebrew_to_gregorian(date_info.get('year'), date_info.get('month'), date_info.get('day'))
+                    letter_data['gregorian_date'] = gregorian.isoformat() if gregorian else None
+                except ValueError:
+                    letter_data['gregorian_date'] = None
                 self.logger.info(f"📅 נמצא תאריך: {date_info.get('full_date_hebrew')} ({date_info.get('year_numeric', 0)})")
             else:
                 self.logger.warning(f"❓ לא נמצא תאריך במכתב {letter_number}")
@@ -440,23 +637,18 @@ class FixedIgrotParser:
                     'day_hebrew': '',
                     'month_hebrew': '',
                     'year_hebrew': '',
-                    'year_number': 0
+                    'year_number': 0,
+                    'hebrew_date_key': None,
+                    'gregorian_date': None
                 })
             
-            # שמירה ל-Supabase
-            success = self.save_letter_to_supabase(volume_id, letter_data)
-            
-            if success:
-                self.log_to_supabase('INFO', f'נשמר מכתב {letter_hebrew} בהצלחה', 
-                                   volume_number=1, letter_number=letter_number, url=letter_url)
-            
-            return success
+            return letter_data
                 
         except Exception as e:
             self.logger.error(f"❌ שגיאה בפרסור מכתב {letter_url}: {e}")
-            self.log_to_supabase('ERROR', f'שגיאה בפרסור מכתב: {e}', 
+            self.log_to_supabase('ERROR', f'שגיאה בפרסור מכתב: {e}', volume_number,
                                url=letter_url, error_details={'error': str(e)})
-            return False
+            return None
     
     def parse_volume(self, volume_hebrew: str = 'א', volume_number: int | None = None, volume_url: str | None = None, max_letters: int = None, resume: bool = True):
         """פרסור כרך שלם"""
@@ -474,41 +666,73 @@ class FixedIgrotParser:
             self.logger.error("❌ לא ניתן ליצור או למצוא כרך")
             return False
         
-        # הגדרת WebDriver
-        driver = self.setup_driver()
+        # WebDriver חם מהמנהל - נשאר פתוח לכרך הבא
+        driver = self.driver_manager.driver
         if not driver:
             self.logger.error("❌ לא ניתן להגדיר WebDriver")
             return False
         
         try:
+            known = self.load_fingerprints(volume_id)
+            if known:
+                self.logger.info(f"🔎 {known} מכתבים שמורים - מכתבים שלא השתנו ידולגו")
+            
             # מציאת מכתבים בכרך על פני עמודים
             if not volume_url:
                 # ברירת מחדל לכרך א
                 volume_url = self.base_urls.get('volume_1', '')
 
-            # נקודת חידוש
+            # נקודת חידוש: קודם parse_checkpoints - קפיצה ישירה לעמוד,
+            # ובלעדיה (לפני הרצת add_parse_checkpoints.sql) הרשומה האחרונה של הכרך
             resume_url = None
-            if resume:
-                last_entry = self.get_last_processed_entry()
-                if last_entry and last_entry.get('tom_number') == volume_number:
+            page_num = 1
+            checkpoint = self.get_checkpoint(volume_number) if resume else None
+            if checkpoint:
+                if checkpoint.get('status') == 'done':
+                    self.logger.info(f"⏭️ כרך {volume_hebrew} כבר הושלם ({checkpoint.get('letters_saved', 0)} מכתבים)")
+                    return True
+                page_num = checkpoint.get('last_page') or 1
+                resume_url = checkpoint.get('last_url')
+                self.logger.info(f"🔁 חידוש מעמוד {page_num} אחרי: {resume_url or 'תחילת העמוד'}")
+            elif resume:
+                last_entry = self.get_last_processed_entry(volume_number)
+                if last_entry:
                     resume_url = last_entry.get('url')
                     self.logger.info(f"🔁 חידוש מפרסר אחרי: {resume_url}")
 
             total_pages = 0
             successful_letters = 0
             letters_processed_this_run = 0
-            page_num = 1
             reached_resume = False if resume_url else True
+            completed = False
+            previous_urls = None
 
             while True:
                 page_links = self.find_volume_letters_on_page(driver, volume_url, page_num)
-                if not page_links:
+                if page_links is None:
+                    # שגיאת טעינה אינה סוף הכרך - הנקודה נשארת לחידוש
+                    raise RuntimeError(f"עמוד {page_num} של הכרך לא נטען")
+                page_urls = [item['url'] for item in page_links]
+                # סוף הכרך: עמוד בלי מכתבים, או שהאתר מחזיר שוב את העמוד הקודם
+                if not page_urls or set(page_urls) == previous_urls:
+                    self.logger.info(f"🏁 סוף הכרך אחרי עמוד {page_num - 1}")
+                    completed = True
                     break
+                previous_urls = set(page_urls)
                 total_pages += 1
+                page_last_url = None
 
-                # אם יש נקודת חידוש, לדלג עד שאנו עוברים את ה-URL האחרון
-                for item in page_links:
-                    url = item['url']
+                # בעמוד של נקודת החידוש - דילוג עד המכתב האחרון שנשמר;
+                # אם הוא כבר לא בעמוד (העמוד השתנה) - העמוד כולו נפרסר שוב, השמירה אידמפוטנטית
+                if checkpoint and not reached_resume:
+                    if resume_url in page_urls:
+                        page_urls = page_urls[page_urls.index(resume_url) + 1:]
+                        page_last_url = resume_url
+                    reached_resume = True
+                
+                batch = []
+                for url in page_urls:
+                    # בלי נקודת חידוש - דילוג עד שאנו עוברים את ה-URL האחרון
                     if not reached_resume:
                         if url == resume_url:
                             reached_resume = True
@@ -518,16 +742,46 @@ class FixedIgrotParser:
                     if max_letters and letters_processed_this_run >= max_letters:
                         break
 
-                    self.logger.info(f"📝 מכתב: {url}")
-                    if self.parse_single_letter(driver, url, volume_id, volume_hebrew):
-                        successful_letters += 1
                     letters_processed_this_run += 1
+                    with self.timer.stage('change_check'):
+                        changed, validators = self.change_detector.check(url)
+                    if not changed:
+                        # בקשה מותנית: הדף לא השתנה - בלי דפדפן ובלי כתיבה
+                        self.logger.info(f"⏭️ ללא שינוי (HTTP): {url}")
+                        self.session_stats['letters_unchanged'] += 1
+                        page_last_url = url
+                        continue
+                    
+                    self.logger.info(f"📝 מכתב: {url}")
+                    letter_data = self.build_letter_data(driver, url, volume_hebrew, volume_number)
                     time.sleep(1)
+                    if not letter_data:
+                        continue
+                    letter_data['content_hash'] = record_hash(letter_data)
+                    letter_data.update(validators)
+                    page_last_url = url
+                    if self.change_detector.same_hash(url, letter_data['content_hash']):
+                        self.logger.info(f"⏭️ ללא שינוי (hash): {url}")
+                        self.session_stats['letters_unchanged'] += 1
+                        # אותה רשומה, אבל מזהי HTTP חדשים - נשמרים כדי שבסריקה הבאה יתקבל 304
+                        fresh = self.change_detector.new_validators(url, validators)
+                        if fresh:
+                            self.save_validators(volume_id, url, fresh)
+                        continue
+                    batch.append(letter_data)
 
+                # מכתבי העמוד ונקודת החידוש נשמרים יחד
+                if reached_resume:
+                    successful_letters += self.save_letters_batch(volume_id, volume_number, batch, page_num,
+                                                                  last_url=page_last_url)
+                
                 if max_letters and letters_processed_this_run >= max_letters:
                     break
                 page_num += 1
             
+            if completed:
+                self.set_checkpoint_status(volume_number, 'done')
+            
             # עדכון סטטיסטיקות הכרך
             self.update_volume_stats(volume_id, successful_letters)
             try:
@@ -545,17 +799,113 @@ class FixedIgrotParser:
         except Exception as e:
             self.logger.error(f"❌ שגיאה כללית בפרסור כרך: {e}")
             self.log_to_supabase('ERROR', f'שגיאה כללית בפרסור כרך {volume_hebrew}: {e}', volume_number, error_details={'error': str(e)})
+            self.set_checkpoint_status(volume_number, 'failed')
             return False
+    
+    def load_letter_urls(self, volume_number: int) -> dict:
+        """{letter_number: url} של המכתבים השמורים בכרך"""
+        res = self.supabase.table('letters').select('letter_number,url').eq('tom_number', volume_number).execute()
+        return {row['letter_number']: row['url'] for row in res.data or []}
+    
+    def failed_letter_urls(self) -> list:
+        """כתובות מכתבים שנכשלו (שגיאות ב-parse_logs) ועדיין לא נשמרו - [(volume_number, url)]"""
+        res = self.supabase.table('parse_logs').select('volume_number,url').eq('log_level', 'ERROR').execute()
+        failed = {}
+        for row in res.data or []:
+            if letter_aid(row.get('url')) and row.get('volume_number'):
+                failed[row['url']] = row['volume_number']
+        saved = {}
+        for volume_number in set(failed.values()):
+            saved.update({url: volume_number for url in self.load_letter_urls(volume_number).values()})
+        return sorted((volume_number, url) for url, volume_number in failed.items() if url not in saved)
+    
+    def volume_url(self, volume_number: int) -> str | None:
+        """כתובת דף הכרך (כרך א ידוע; אחרים - מעמוד הכרכים, טעינה אחת לכל הריצה)"""
+        if volume_number == 1:
+            return self.base_urls['volume_1']
+        if self._volume_urls is None:
+            self._volume_urls = {v['number']: v['url'] for v in self.find_all_volumes(self.driver_manager.driver)}
+        return self._volume_urls.get(volume_number)
+    
+    def resolve_letter_urls(self, volume_number: int, wanted: list, stored: dict) -> dict:
+        """
+        כתובות למכתבים חסרים: לפי aid של השכנים השמורים, ואז עמוד רשימה אחד לכל עמוד נדרש
+        
+        Returns:
+            dict: {letter_number: url}
+        """
+        resolved = interpolate_urls(wanted, stored)
+        remaining = [number for number in wanted if number not in resolved]
+        if remaining:
+            volume_url = self.volume_url(volume_number)
+            if not volume_url:
+                self.logger.warning(f"⚠️ לא נמצאה כתובת לכרך {volume_number}")
+                return resolved
+            for page_num in sorted({listing_page(number) for number in remaining}):
+                page_wanted = [number for number in remaining if listing_page(number) == page_num]
+                links = self.find_volume_letters_on_page(self.driver_manager.driver, volume_url, page_num)
+                resolved.update(match_listing(links or [], page_wanted, stored))
+        return resolved
+    
+    def refetch_letters(self, targets=(), urls=()) -> dict:
+        """
+        השלמת מכתבים חסרים בלבד - בלי לסרוק את הכרך
+        
+        Args:
+            targets: [(volume_number, letter_number)] - פערים (completeness_audit / ידני)
+            urls: [(volume_number, url)] - כתובות שנכשלו (failed_letter_urls)
+        
+        Returns:
+            dict: requested, saved, unresolved [(volume, letter)], mismatched [(volume, expected, got)]
+        """
+        by_volume = {}
+        for volume_number, letter_number in targets:
+            by_volume.setdefault(volume_number, []).append(letter_number)
+        for volume_number, _ in urls:
+            by_volume.setdefault(volume_number, [])
+        
+        result = {'requested': len(targets) + len(urls), 'saved': 0, 'unresolved': [], 'mismatched': []}
+        for volume_number in sorted(by_volume):
+            volume_hebrew = self.number_to_hebrew_letter(volume_number)
+            volume_id = self.get_or_create_volume(volume_number, volume_hebrew)
+            if not volume_id:
+                continue
+            stored = self.load_letter_urls(volume_number)
+            wanted = sorted(number for number in set(by_volume[volume_number]) if number not in stored)
+            resolved = self.resolve_letter_urls(volume_number, wanted, stored) if wanted else {}
+            result['unresolved'].extend((volume_number, number) for number in wanted if number not in resolved)
             
-        finally:
-            driver.quit()
+            fetch = sorted(resolved.items()) + [(None, url) for v, url in urls if v == volume_number]
+            self.logger.info(f"🎯 כרך {volume_hebrew}: {len(fetch)} מכתבים להשלמה")
+            for expected_number, url in fetch:
+                letter_data = self.build_letter_data(self.driver_manager.driver, url, volume_hebrew, volume_number)
+                if not letter_data:
+                    continue
+                if expected_number and letter_data['letter_number'] != expected_number:
+                    # הכתובת הובילה למכתב אחר - נשמר לפי המספר האמיתי שלו
+                    self.logger.warning(f"⚠️ ציפינו למכתב {expected_number}, נמצא {letter_data['letter_number']}: {url}")
+                    result['mismatched'].append((volume_number, expected_number, letter_data['letter_number']))
+                letter_data['content_hash'] = record_hash(letter_data)
+                if self.save_letter_to_supabase(volume_id, letter_data):
+                    result['saved'] += 1
+                    self.log_to_supabase('INFO', f'הושלם מכתב {letter_data["letter_hebrew"]}', volume_number,
+                                         letter_number=letter_data['letter_number'], url=url)
+        
+        for volume_number, letter_number in result['unresolved']:
+            self.logger.warning(f"❓ לא נמצאה כתובת למכתב {letter_number} בכרך {volume_number}")
+        return result
+    
+    def close(self):
+        """סגירת הדפדפן בסוף הריצה"""
+        self.driver_manager.quit()
+        self.logger.info(f"🧹 WebDriver נסגר: {self.driver_manager.summary()}")
 
     def find_all_volumes(self, driver) -> list:
         """איתור כל הכרכים מהעמוד הראשי"""
         try:
             main_url = self.base_urls['main']
             self.logger.info(f"🔎 סורק עמוד כרכים: {main_url}")
-            driver.get(main_url)
+            driver = self.driver_manager.get(main_url)
             time.sleep(3)
 
             volumes = []
@@ -587,6 +937,43 @@ class FixedIgrotParser:
             self.logger.error(f"❌ שגיאה באיתור כרכים: {e}")
             return []
     
+    def parse_volumes_parallel(self, volumes: list, workers: int, max_letters: int = None, resume: bool = True) -> list:
+        """
+        פרסור כרכים בתהליכים עובדים - לכל תהליך דרייבר ולקוח Supabase משלו
+        
+        נקודת החידוש נשמרת לכל כרך בנפרד, והסטטיסטיקות וזמני השלבים
+        של העובדים מתמזגים לפרסר הזה בסוף כל כרך.
+        
+        Returns:
+            list: תוצאה לכל כרך {volume, success, stats}
+        """
+        self.logger.info(f"🚀 פרסור {len(volumes)} כרכים ב-{workers} תהליכים")
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(parse_volume_worker, self.supabase_url, self.supabase_key, volume, max_letters,
+                            resume, self.change_detector.force): volume
+                for volume in volumes
+            }
+            for future in as_completed(futures):
+                volume = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"❌ תהליך כרך {volume['hebrew']} נכשל: {e}")
+                    self.session_stats['errors'] += 1
+                    results.append({'volume': volume, 'success': False, 'stats': {}})
+                    continue
+                
+                for key, value in result['stats'].items():
+                    self.session_stats[key] += value
+                self.timer.merge(result.pop('histograms'))
+                results.append(result)
+                done = sum(1 for r in results if r['success'])
+                self.logger.info(f"✅ כרך {volume['hebrew']}: {result['stats'].get('letters_processed', 0)} מכתבים "
+                                 f"({len(results)}/{len(volumes)} כרכים, {done} הצליחו)")
+        return results
+    
     def update_volume_stats(self, volume_id: int, total_letters: int):
         """עדכון סטטיסטיקות הכרך"""
         try:
@@ -652,10 +1039,34 @@ class FixedIgrotParser:
         print(f"⏱️  זמן ריצה: {duration}")
         print(f"📝 מכתבים שעובדו: {self.session_stats['letters_processed']}")
         print(f"📅 מכתבים עם תאריכים: {self.session_stats['letters_with_dates']}")
+        print(f"⏭️ מכתבים ללא שינוי: {self.session_stats['letters_unchanged']}")
         print(f"❌ שגיאות: {self.session_stats['errors']}")
         print(f"💾 נתונים נשמרו ב-Supabase")
+        self.timer.print_summary()
         print("="*50)
 
+def parse_volume_worker(supabase_url: str, supabase_key: str, volume: dict, max_letters: int = None,
+                        resume: bool = True, full_refresh: bool = False) -> dict:
+    """פרסור כרך אחד בתהליך עובד (parse_volumes_parallel)"""
+    worker = FixedIgrotParser(supabase_url, supabase_key, full_refresh=full_refresh)
+    try:
+        success = worker.parse_volume(
+            volume_hebrew=volume['hebrew'],
+            volume_number=volume['number'],
+            volume_url=volume['url'],
+            max_letters=max_letters,
+            resume=resume
+        )
+    finally:
+        worker.close()
+    return {
+        'volume': volume,
+        'success': bool(success),
+        'stats': {key: worker.session_stats[key] for key in ('letters_processed', 'letters_with_dates', 'letters_unchanged', 'errors')},
+        'histograms': worker.timer.histograms
+    }
+
+
 def main():
     """פונקציה ראשית"""
     parser = argparse.ArgumentParser(description='פרסר אגרות קודש מתוקן עם Supabase')
@@ -663,6 +1074,17 @@ def main():
     parser.add_argument('--max-letters', type=int, help='מספר מכתבים מקסימלי לפרסור')
     parser.add_argument('--test', action='store_true', help='מצב בדיקה (3 מכתבים בלבד)')
     parser.add_argument('--all-volumes', action='store_true', help='פרסור כל הכרכים ברצף עם חידוש אוטומטי')
+    parser.add_argument('--workers', type=int, default=1, help='מספר תהליכים לפרסור כרכים במקביל (עם --all-volumes)')
+    parser.add_argument('--recrawl', action='store_true', help='סריקה חוזרת מהעמוד הראשון (מכתבים שלא השתנו מדולגים)')
+    parser.add_argument('--full-refresh', action='store_true', help='פרסור וכתיבה של כל מכתב, גם אם לא השתנה')
+    parser.add_argument('--refetch', nargs='+', metavar='VOLUME:LETTERS',
+                        help='השלמת מכתבים חסרים בלבד, למשל 1:12 1:50-52')
+    parser.add_argument('--refetch-gaps', action='store_true',
+                        help='השלמת הפערים שמוצאת audit_volume_completeness (add_completeness_audit.sql)')
+    parser.add_argument('--refetch-failed', action='store_true', help='השלמת מכתבים שנכשלו לפי parse_logs')
+    parser.add_argument('--metrics-prom', help='קובץ לייצוא זמני השלבים בפורמט Prometheus')
+    parser.add_argument('--metrics-json', help='קובץ לייצוא זמני השלבים כפרופיל JSON')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -678,34 +1100,62 @@ def main():
     config = SupabaseConfig()
     
     # יצירת פרסר מתוקן
-    fixed_parser = FixedIgrotParser(config.url, config.key)
+    fixed_parser = FixedIgrotParser(config.url, config.key, full_refresh=args.full_refresh)
     
     # הגדרת פרמטרים
-    max_letters = 3 if args.test else args.max_letters
+    max_letters = letter_limit(args, 3 if args.test else args.max_letters)
+    
+    with profiled(args.profile, 'supabase_parser_fixed'):
+        run_parser(fixed_parser, args, max_letters)
+
+
+def run_refetch(fixed_parser, args):
+    """מצב השלמה: רק המכתבים החסרים / שנכשלו"""
+    targets = parse_targets(args.refetch or [])
+    if args.refetch_gaps:
+        from completeness_audit import audit_supabase
+        targets = sorted(set(targets) | set(gap_targets(audit_supabase(fixed_parser.supabase))))
+    urls = fixed_parser.failed_letter_urls() if args.refetch_failed else []
     
+    print(f"🎯 השלמה: {len(targets)} מכתבים חסרים, {len(urls)} כתובות שנכשלו")
+    result = fixed_parser.refetch_letters(targets, urls)
+    print(f"✅ נשמרו {result['saved']}/{result['requested']} מכתבים "
+          f"(טעינות דף: {fixed_parser.driver_manager.stats['pages']})")
+    if result['unresolved']:
+        print(f"❓ לא נמצאה כתובת: {', '.join(f'{v}:{n}' for v, n in result['unresolved'])}")
+    return True
+
+
+def run_parser(fixed_parser, args, max_letters):
+    """הרצת הפרסר לפי הארגומנטים"""
     try:
-        if args.all_volumes:
+        if args.refetch or args.refetch_gaps or args.refetch_failed:
+            success = run_refetch(fixed_parser, args)
+        elif args.all_volumes:
             # איתור כל הכרכים ופרסור מדורג
-            driver = fixed_parser.setup_driver()
+            driver = fixed_parser.driver_manager.driver
             volumes = fixed_parser.find_all_volumes(driver) if driver else []
-            if driver:
-                driver.quit()
-            for v in volumes:
-                print(f"\n===== כרך {v['hebrew']} ({v['number']}) =====")
-                fixed_parser.parse_volume(
-                    volume_hebrew=v['hebrew'],
-                    volume_number=v['number'],
-                    volume_url=v['url'],
-                    max_letters=max_letters,
-                    resume=True
-                )
+            if args.workers > 1:
+                # כל כרך בתהליך משלו - הדרייבר של התהליך הראשי לא נחוץ יותר
+                fixed_parser.close()
+                fixed_parser.parse_volumes_parallel(volumes, args.workers, max_letters, resume=not args.recrawl)
+            else:
+                for v in volumes:
+                    print(f"\n===== כרך {v['hebrew']} ({v['number']}) =====")
+                    fixed_parser.parse_volume(
+                        volume_hebrew=v['hebrew'],
+                        volume_number=v['number'],
+                        volume_url=v['url'],
+                        max_letters=max_letters,
+                        resume=not args.recrawl
+                    )
             success = True
         else:
             # פרסור כרך בודד
             success = fixed_parser.parse_volume(
                 volume_hebrew=args.volume,
                 max_letters=max_letters,
-                resume=True
+                resume=not args.recrawl
             )
         
         if success:
@@ -719,11 +1169,16 @@ def main():
             print("🌐 תוכל לראות את הנתונים ב-Supabase Dashboard")
         else:
             print("\n❌ פרסור נכשל")
+            fixed_parser.print_session_summary()
             
     except KeyboardInterrupt:
         print("\n⚠️ פרסור הופסק על ידי המשתמש")
+        fixed_parser.print_session_summary()
     except Exception as e:
         print(f"\n❌ שגיאה כללית: {e}")
+    finally:
+        fixed_parser.close()
+        fixed_parser.timer.export(prom_file=args.metrics_prom, json_file=args.metrics_json)
 
 if __name__ == "__main__":
     main()
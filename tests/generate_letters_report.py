@@ -11,10 +11,14 @@ import json
 import re
 from datetime import datetime
 sys.path.append('../main')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from letters_downloader import LettersDownloader
+from report_renderer import ReportRenderer
 import argparse
 
+START_URL = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
+
 
 class LettersReportGenerator:
     def __init__(self):
@@ -47,19 +51,18 @@ class LettersReportGenerator:
         # Формат: אגרות קודש - כרך א - מכתב פד
         return f"אגרות קודש - {volume_part} - {letter_part}"
     
-    def generate_volume_report(self, volume_title="כרך א", output_format="csv"):
+    def generate_volume_report(self, volume_title="כרך א", output_format="csv", start_url=START_URL):
         """
         Генерация отчета для одного тома
         
         Args:
             volume_title (str): Название тома
             output_format (str): Формат вывода (csv, json, html)
+            start_url (str): Главная страница с томами
         """
         print(f"📊 גילוי דוח לטובת טובה {volume_title}")
         print("=" * 60)
         
-        start_url = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
-        
         try:
             # Получаем главную страницу
             print("🔍 טעינת דף הראשי...")
@@ -202,136 +205,37 @@ class LettersReportGenerator:
             return None
     
     def generate_html_report(self, data, filename):
-        """Генерация HTML отчета"""
+        """Генерация HTML отчета (по страницам через ReportRenderer)"""
         try:
             os.makedirs('reports', exist_ok=True)
             filepath = os.path.join('reports', filename)
             
             volume_name = data[0]['volume'] if data else 'טובה לא ידועה'
             
-            html_content = f"""<!DOCTYPE html>
-<html lang="he" dir="rtl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>דוח מכתבי אגרות קודש - {volume_name}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        .summary {{
-            background-color: #ecf0f1;
-            padding: 15px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 12px;
-            text-align: right;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-            font-weight: bold;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f9f9f9;
-        }}
-        tr:hover {{
-            background-color: #e8f4f8;
-        }}
-        .letter-link {{
-            color: #2980b9;
-            text-decoration: none;
-        }}
-        .letter-link:hover {{
-            text-decoration: underline;
-        }}
-        .letter-number {{
-            font-weight: bold;
-            color: #8e44ad;
-        }}
-        .footer {{
-            margin-top: 30px;
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📚 דוח מכתבי אגרות קודש</h1>
-        
-        <div class="summary">
-            <h3>📊 סיכום:</h3>
-            <p><strong>טובה:</strong> {volume_name}</p>
-            <p><strong>כל המכתבים:</strong> {len(data)}</p>
-            <p><strong>תאריך יצירה:</strong> {datetime.now().strftime("%d.%m.%Y %H:%M:%S")}</p>
-        </div>
-        
-        <table>
-            <thead>
-                <tr>
-                    <th>№ פ/פ</th>
-                    <th>טובה</th>
-                    <th>מספר מכתב</th>
-                    <th>שם</th>
-                    <th>קישור</th>
-                    <th>דף</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
-            
-            for row in data:
-                html_content += f"""
-                <tr>
-                    <td>{row['sequence_number']}</td>
-                    <td>{row['volume']}</td>
-                    <td class="letter-number">{row['letter_number']}</td>
-                    <td>{row['title']}</td>
-                    <td><a href="{row['url']}" class="letter-link" target="_blank">פתוח מכתב</a></td>
-                    <td>{row['page']}</td>
-                </tr>
-"""
-            
-            html_content += """
-            </tbody>
-        </table>
-        
-        <div class="footer">
-            <p>דוח יוצר על ידי מערכת הורדת מכתבי אגרות קודש</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            
-            with open(filepath, 'w', encoding='utf-8') as htmlfile:
-                htmlfile.write(html_content)
+            renderer = ReportRenderer(
+                f'📚 דוח מכתבי אגרות קודש - {volume_name}',
+                columns=[
+                    ('№ פ/פ', 'sequence_number', ''),
+                    ('טובה', 'volume', ''),
+                    ('מספר מכתב', 'letter_number', 'letter-number'),
+                    ('שם', 'title', ''),
+                    ('קישור', 'url', '', 'פתוח מכתב'),
+                    ('דף', 'page', '')
+                ],
+                filters=[
+                    ('🔍 טובה', ['volume']),
+                    ('🔍 מספר מכתב', ['letter_number']),
+                    ('🔍 שם', ['title'])
+                ],
+                footer=['דוח יוצר על ידי מערכת הורדת מכתבי אגרות קודש'],
+                group_by='volume',
+                group_label='📚 {volume}'
+            )
+            renderer.render(data, filepath, summary=[
+                ('טובה', volume_name),
+                ('כל המכתבים', len(data)),
+                ('תאריך יצירה', datetime.now().strftime("%d.%m.%Y %H:%M:%S"))
+            ])
             
             print(f"✅ דוח HTML נשמר: {filepath}")
             print(f"📊 רשומות: {len(data)}")
@@ -376,7 +280,7 @@ class LettersReportGenerator:
     
     def generate_volume_data(self, volume_title):
         """Получение данных для одного тома (без сохранения файла)"""
-        start_url = "https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm"
+        start_url = START_URL
         
         try:
             # Получаем главную страницу
@@ -19,8 +19,10 @@ except ImportError:
     hebrew = None
 
 sys.path.append('../main')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from letters_downloader import LettersDownloader
+from report_renderer import ReportRenderer
 import argparse
 
 
@@ -468,241 +470,44 @@ class LinksIndexGenerator:
             return None
     
     def generate_html_index(self, data, filename):
-        """יצירת מפתח HTML"""
+        """יצירת מפתח HTML - בדפים דרך ReportRenderer"""
         try:
             os.makedirs('reports', exist_ok=True)
             filepath = os.path.join('reports', filename)
             
             volumes_count = len(set(item['volume_arabic'] for item in data))
             
-            html_content = f"""<!DOCTYPE html>
-<html lang="he" dir="rtl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>מפתח קישורים - מכתבי אגרות קודש</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        .summary {{
-            background-color: #ecf0f1;
-            padding: 15px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-        }}
-        .search-box {{
-            margin-bottom: 20px;
-            padding: 10px;
-            background-color: #e8f6f3;
-            border-radius: 5px;
-        }}
-        .search-box input {{
-            width: 45%;
-            padding: 10px;
-            border: 1px solid #bdc3c7;
-            border-radius: 4px;
-            font-size: 16px;
-            margin: 0 2.5%;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: center;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-            font-weight: bold;
-            position: sticky;
-            top: 0;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f9f9f9;
-        }}
-        tr:hover {{
-            background-color: #e8f4f8;
-        }}
-        .letter-link {{
-            color: #2980b9;
-            text-decoration: none;
-            font-weight: bold;
-        }}
-        .letter-link:hover {{
-            text-decoration: underline;
-        }}
-        .volume-header {{
-            background-color: #2c3e50 !important;
-            color: white !important;
-        }}
-        .hebrew-number {{
-            font-weight: bold;
-            color: #8e44ad;
-        }}
-        .arabic-number {{
-            font-weight: bold;
-            color: #27ae60;
-        }}
-        .footer {{
-            margin-top: 30px;
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 12px;
-        }}
-    </style>
-    <script>
-        function searchTable() {{
-            var volumeInput = document.getElementById("volumeSearch").value.toLowerCase();
-            var letterInput = document.getElementById("letterSearch").value.toLowerCase();
-            var dayInput = document.getElementById("daySearch").value.toLowerCase();
-            var monthInput = document.getElementById("monthSearch").value.toLowerCase();
-            var yearInput = document.getElementById("yearSearch").value.toLowerCase();
-            var table = document.getElementById("indexTable");
-            var tr = table.getElementsByTagName("tr");
-            
-            for (var i = 1; i < tr.length; i++) {{
-                if (tr[i].classList.contains('volume-header')) {{
-                    tr[i].style.display = "";  // Всегда показываем заголовки томов
-                    continue;
-                }}
-                
-                var td = tr[i].getElementsByTagName("td");
-                if (td.length < 8) continue;  // Пропускаем неполные строки
-                
-                var volumeMatch = true;
-                var letterMatch = true;
-                var dayMatch = true;
-                var monthMatch = true;
-                var yearMatch = true;
-                
-                if (volumeInput) {{
-                    var volumeText = (td[0].innerHTML + td[1].innerHTML).toLowerCase();
-                    volumeMatch = volumeText.indexOf(volumeInput) > -1;
-                }}
-                
-                if (letterInput) {{
-                    var letterText = (td[2].innerHTML + td[3].innerHTML).toLowerCase();
-                    letterMatch = letterText.indexOf(letterInput) > -1;
-                }}
-                
-                if (dayInput) {{
-                    dayMatch = td[4].innerHTML.toLowerCase().indexOf(dayInput) > -1;
-                }}
-                
-                if (monthInput) {{
-                    monthMatch = td[5].innerHTML.toLowerCase().indexOf(monthInput) > -1;
-                }}
-                
-                if (yearInput) {{
-                    yearMatch = td[6].innerHTML.toLowerCase().indexOf(yearInput) > -1;
-                }}
-                
-                if (volumeMatch && letterMatch && dayMatch && monthMatch && yearMatch) {{
-                    tr[i].style.display = "";
-                }} else {{
-                    tr[i].style.display = "none";
-                }}
-            }}
-        }}
-    </script>
-</head>
-<body>
-    <div class="container">
-        <h1>📇 מפתח קישורים - מכתבי אגרות קודש</h1>
-        
-        <div class="summary">
-            <div><strong>📚 כרכים:</strong> {volumes_count}</div>
-            <div><strong>📝 סה\"כ מכתבים:</strong> {len(data)}</div>
-            <div><strong>🕐 תאריך יצירה:</strong> {datetime.now().strftime("%d.%m.%Y %H:%M:%S")}</div>
-        </div>
-        
-        <div class="search-box">
-            <input type="text" id="volumeSearch" onkeyup="searchTable()" placeholder="🔍 חיפוש לפי מספר כרך (מספר או אותיות)">
-            <input type="text" id="letterSearch" onkeyup="searchTable()" placeholder="🔍 חיפוש לפי מספר מכתב (מספר או אותיות)">
-            <input type="text" id="daySearch" onkeyup="searchTable()" placeholder="🔍 חיפוש לפי יום">
-            <input type="text" id="monthSearch" onkeyup="searchTable()" placeholder="🔍 חיפוש לפי חודש">
-            <input type="text" id="yearSearch" onkeyup="searchTable()" placeholder="🔍 חיפוש לפי שנה">
-        </div>
-        
-        <table id="indexTable">
-            <thead>
-                <tr>
-                    <th>מס\' כרך</th>
-                    <th>כרך</th>
-                    <th>מס\' מכתב</th>
-                    <th>מכתב</th>
-                    <th>יום</th>
-                    <th>חודש</th>
-                    <th>שנה</th>
-                    <th>קישור</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
-
-            current_volume = None
-            for entry in data:
-                if current_volume != entry['volume_arabic']:
-                    current_volume = entry['volume_arabic']
-                    # מפריד בין כרכים
-                    html_content += f"""
-                    <tr class="volume-header">
-                        <td colspan="8">📚 כרך {current_volume} ({entry['volume_hebrew']})</td>
-                    </tr>
-"""
-
-                html_content += f"""
-                    <tr>
-                        <td class="arabic-number">{entry['volume_arabic']}</td>
-                        <td class="hebrew-number">{entry['volume_hebrew']}</td>
-                        <td class="arabic-number">{entry['letter_arabic']}</td>
-                        <td class="hebrew-number">{entry['letter_hebrew']}</td>
-                        <td class="hebrew-number">{entry.get('day_hebrew', '')}</td>
-                        <td class="hebrew-number">{entry.get('month_hebrew', '')}</td>
-                        <td class="hebrew-number">{entry.get('year_hebrew', '')}</td>
-                        <td><a href="{entry['url']}" class="letter-link" target="_blank">פתח מכתב</a></td>
-                    </tr>
-"""
-
-            html_content += """
-                </tbody>
-            </table>
-            
-            <div class="footer">
-                <p>📇 מפתח קישורים נוצר אוטומטית על ידי מערכת פרסינג מכתבי אגרות קודש</p>
-                <p>🔗 כל הקישורים מובילים לאתר הרשמי chabad.org</p>
-            </div>
-        </div>
-    </body>
-    </html>
-"""
-            
-            with open(filepath, 'w', encoding='utf-8') as htmlfile:
-                htmlfile.write(html_content)
+            renderer = ReportRenderer(
+                '📇 מפתח קישורים - מכתבי אגרות קודש',
+                columns=[
+                    ("מס' כרך", 'volume_arabic', 'arabic-number'),
+                    ('כרך', 'volume_hebrew', 'hebrew-number'),
+                    ("מס' מכתב", 'letter_arabic', 'arabic-number'),
+                    ('מכתב', 'letter_hebrew', 'hebrew-number'),
+                    ('יום', 'day_hebrew', 'hebrew-number'),
+                    ('חודש', 'month_hebrew', 'hebrew-number'),
+                    ('שנה', 'year_hebrew', 'hebrew-number'),
+                    ('קישור', 'url', '', 'פתח מכתב')
+                ],
+                filters=[
+                    ('🔍 חיפוש לפי מספר כרך (מספר או אותיות)', ['volume_arabic', 'volume_hebrew']),
+                    ('🔍 חיפוש לפי מספר מכתב (מספר או אותיות)', ['letter_arabic', 'letter_hebrew']),
+                    ('🔍 חיפוש לפי יום', ['day_hebrew']),
+                    ('🔍 חיפוש לפי חודש', ['month_hebrew']),
+                    ('🔍 חיפוש לפי שנה', ['year_hebrew'])
+                ],
+                footer=[
+                    '📇 מפתח קישורים נוצר אוטומטית על ידי מערכת פרסינג מכתבי אגרות קודש',
+                    '🔗 כל הקישורים מובילים לאתר הרשמי chabad.org'
+                ],
+                group_by='volume_arabic',
+                group_label='📚 כרך {volume_arabic} ({volume_hebrew})'
+            )
+            renderer.render(data, filepath, summary=[
+                ('📚 כרכים', volumes_count),
+                ('📝 סה"כ מכתבים', len(data)),
+                ('🕐 תאריך יצירה', datetime.now().strftime("%d.%m.%Y %H:%M:%S"))
+            ])
             
             print(f"✅ מפתח HTML נשמר: {filepath}")
             return filepath
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Параллельный запуск тестов томов с общим кэшем страниц
+Каждый тест - отдельный процесс (свой браузер, поднимается только при промахе кэша);
+все процессы делят один каталог PageCache, поэтому страницы загружаются один раз.
+
+Общего пула драйверов нет - его заменяет схема "записать один раз / воспроизводить":
+в replay браузер не запускается вовсе, а в record/live, где каждый процесс поднимает
+свой Chrome, по умолчанию работают только BROWSER_WORKERS процессов одновременно.
+
+    python run_parallel_tests.py --mode record    # первый проход: браузер + запись кэша
+    python run_parallel_tests.py                  # replay: офлайн, без браузера
+    python run_parallel_tests.py --only quick report_csv --workers 2
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(TESTS_DIR, '..', 'main'))
+
+from page_cache import CACHE_ENV, MODE_ENV
+
+DEFAULT_CACHE_DIR = os.path.join(TESTS_DIR, '.page_cache')
+LOG_DIR = os.path.join(TESTS_DIR, '.parallel_logs')
+# одновременных браузеров по умолчанию в record / live
+BROWSER_WORKERS = 2
+
+# те же команды, что и в пунктах меню run_volume_tests.py
+SUITE = {
+    'quick': ["test_volume_quick.py", "--volume", "א", "--expected", "169", "--pages", "3"],
+    'completeness': ["test_volume_completeness.py"],
+    '10_letters': ["test_10_letters.py"],
+    'report_csv': ["generate_letters_report.py", "--volume", "א", "--format", "csv"],
+    'report_html': ["generate_letters_report.py", "--volume", "א", "--format", "html"],
+    'report_json': ["generate_letters_report.py", "--volume", "א", "--format", "json"],
+}
+
+
+def run_test(name, args, env):
+    """Запуск одного теста; вывод - в .parallel_logs/<name>.log"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{name}.log")
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run([sys.executable] + args, cwd=TESTS_DIR, env=env,
+                                stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+    return name, result.returncode, time.perf_counter() - start, log_path
+
+
+def run_suite(names=None, workers=None, mode='replay', cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Параллельный запуск набора тестов
+    
+    Args:
+        names (list): Имена тестов из SUITE (None - все)
+        workers (int): Число одновременных процессов (None - все сразу в replay,
+                       BROWSER_WORKERS в record / live)
+        mode (str): 'replay' - офлайн из кэша, 'record' - дописывать кэш, 'live' - без кэша
+        cache_dir (str): Общий каталог кэша страниц
+    
+    Returns:
+        list: [(name, returncode, seconds, log_path)] в порядке SUITE
+    """
+    names = names or list(SUITE)
+    env = dict(os.environ)
+    env.pop(CACHE_ENV, None)
+    env.pop(MODE_ENV, None)
+    if mode != 'live':
+        env[CACHE_ENV] = os.path.abspath(cache_dir)
+        env[MODE_ENV] = mode
+    
+    if not workers:
+        workers = len(names) if mode == 'replay' else min(BROWSER_WORKERS, len(names))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_test, name, SUITE[name], env) for name in names]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Главная функция"""
+    parser = argparse.ArgumentParser(description='הרצה מקבילית של בדיקות הכרכים עם מטמון דפים משותף')
+    parser.add_argument('--only', nargs='+', choices=list(SUITE), help='בדיקות להרצה (ברירת מחדל - כולן)')
+    parser.add_argument('--workers', type=int,
+                        help=f'מספר תהליכים (ודפדפנים) במקביל (ברירת מחדל: כולם ב-replay, {BROWSER_WORKERS} ב-record/live)')
+    parser.add_argument('--mode', choices=['replay', 'record', 'live'], default='replay',
+                        help='replay - ללא רשת מהמטמון, record - הקלטת דפים חסרים, live - בלי מטמון')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='תיקיית מטמון הדפים')
+    args = parser.parse_args()
+    
+    if args.mode == 'replay' and not os.path.isdir(args.cache_dir):
+        print(f"❌ מטמון הדפים לא קיים: {args.cache_dir}. הרץ קודם עם --mode record")
+        sys.exit(1)
+    
+    print(f"🧪 הרצה מקבילית ({args.mode}): {', '.join(args.only or SUITE)}")
+    start = time.perf_counter()
+    results = run_suite(args.only, args.workers, args.mode, args.cache_dir)
+    total = time.perf_counter() - start
+    
+    print("=" * 60)
+    for name, returncode, seconds, log_path in results:
+        status = '✅' if returncode == 0 else '❌'
+        print(f"{status} {name:<14} {seconds:7.1f} ש' ({os.path.relpath(log_path, TESTS_DIR)})")
+    print("-" * 60)
+    print(f"⏱️ סה\"כ: {total:.1f} ש' (סכום הבדיקות: {sum(r[2] for r in results):.1f} ש')")
+    
+    failed = [r[0] for r in results if r[1] != 0]
+    if failed:
+        print(f"❌ נכשלו: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ כל הבדיקות עברו")
+
+
+if __name__ == "__main__":
+    main()
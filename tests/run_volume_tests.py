@@ -34,6 +34,10 @@ def print_menu():
     print("12. 👀 תצוגה מקדימה של מכתבים")
     print("13. 🆕 בדיקה של פורמט חדש")
     print()
+    print("⚡ מקבילי:")
+    print("14. 🚀 כל הבדיקות והדוחות במקביל (מטמון דפים משותף)")
+    print("15. 🗄️ בדיקת שלמות מבסיס הנתונים (בלי דפדפן)")
+    print()
     print("0. 🚪 יציאה")
     print("-" * 60)
 
@@ -205,13 +209,31 @@ def run_new_format_test():
     return result.returncode == 0
 
 
+def run_parallel_suite():
+    """Параллельный запуск всех тестов с общим кэшем страниц"""
+    mode = input("מצב מטמון (replay/record/live) [replay]: ").strip().lower() or "replay"
+    print(f"\n🚀 הרצה מקבילית ({mode})...")
+    result = subprocess.run([sys.executable, "run_parallel_tests.py", "--mode", mode])
+    return result.returncode == 0
+
+
+def run_database_audit():
+    """Проверка полноты по сохранённым письмам (completeness_audit.py)"""
+    volume = input("מספר כרך (לחץ Enter לכל הכרכים): ").strip()
+    volume_arg = ["--volume", volume] if volume.isdigit() else []
+    print("\n🗄️ בדיקת שלמות מבסיס הנתונים...")
+    result = subprocess.run([sys.executable, os.path.join("..", "completeness_audit.py"),
+                             "--db", os.path.join("..", "igrot_kodesh.db")] + volume_arg)
+    return result.returncode == 0
+
+
 def main():
     """Главная функция"""
     while True:
         print_menu()
         
         try:
-            choice = input("בחר פעולה (0-13): ").strip()
+            choice = input("בחר פעולה (0-15): ").strip()
             
             if choice == '0':
                 print("👋 ביי!")
@@ -242,6 +264,10 @@ def main():
                 success = run_preview()
             elif choice == '13':
                 success = run_new_format_test()
+            elif choice == '14':
+                success = run_parallel_suite()
+            elif choice == '15':
+                success = run_database_audit()
             else:
                 print("❌ בחירה לא תקינה")
                 continue
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת שרת ה-API המקומי מול בסיס נתונים זמני - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+import json
+import gzip
+import threading
+import urllib.request
+import urllib.error
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from database_setup import IgrotKodeshDB
+from api_server import create_server
+
+
+@pytest.fixture(scope='module')
+def api_url(tmp_path_factory):
+    """שרת API על פורט פנוי מול 120 מכתבים בשני כרכים"""
+    db_file = str(tmp_path_factory.mktemp('api') / 'api.db')
+    db = IgrotKodeshDB(db_file)
+    db.bulk_import_letters(
+        {'volume_number': 1 + i // 60, 'volume_hebrew': 'אב'[i // 60], 'letter_number': i % 60 + 1,
+         'letter_hebrew': '', 'day_numeric': i % 29 + 1, 'month_hebrew': 'אדר' if i % 2 else 'ניסן',
+         'year_numeric': 5688, 'url': f'https://example.org/{i}', 'content': f'שלום מכתב {i}'}
+        for i in range(120)
+    )
+    db.close()
+    
+    server = create_server(db_file, port=0, pool_size=2, host='127.0.0.1')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_paginated_listing(api_url):
+    """עמוד שני של 50 ושל כרך מסוים"""
+    status, _, body = _get(f'{api_url}/api/letters?page=2&per_page=50')
+    data = json.loads(body)
+    assert status == 200
+    assert data['total'] == 120
+    assert len(data['letters']) == 50
+    assert data['letters'][0]['volume']['number'] == 1
+    assert data['letters'][0]['letter']['number'] == 51
+    
+    data = json.loads(_get(f'{api_url}/api/letters?volume=2&per_page=5')[2])
+    assert data['total'] == 60
+    assert {l['volume']['number'] for l in data['letters']} == {2}
+
+
+def test_date_filters_and_lookup(api_url):
+    """סינון לפי חודש ושנה, ושליפת מכתב יחיד עם תוכן"""
+    data = json.loads(_get(f'{api_url}/api/letters?year=5688&month=%D7%90%D7%93%D7%A8&per_page=200')[2])
+    assert data['total'] == 60
+    assert all(l['date']['month_hebrew'] == 'אדר' for l in data['letters'])
+    
+    status, _, body = _get(f'{api_url}/api/letters/2/5')
+    letter = json.loads(body)
+    assert status == 200
+    assert letter['content'] == 'שלום מכתב 64'
+    
+    assert _get(f'{api_url}/api/letters/9/9')[0] == 404
+
+
+def test_search(api_url):
+    """חיפוש מלא דרך ה-API"""
+    data = json.loads(_get(f'{api_url}/api/search?q=64')[2])
+    assert [r['letter_number'] for r in data['results']] == [5]
+    assert _get(f'{api_url}/api/search')[0] == 400
+
+
+def test_etag_and_gzip(api_url):
+    """תשובה דחוסה, ו-304 כשה-ETag לא השתנה"""
+    status, headers, body = _get(f'{api_url}/api/letters', {'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(body))['total'] == 120
+    
+    assert headers['Vary'] == 'Accept-Encoding'
+    
+    status, _, body = _get(f'{api_url}/api/letters', {'If-None-Match': headers['ETag'], 'Accept-Encoding': 'gzip'})
+    assert status == 304
+    assert body == b''
+    
+    # לגרסה הלא דחוסה ETag אחר - ETag של הדחוסה לא מחזיר 304
+    status, plain_headers, body = _get(f'{api_url}/api/letters', {'If-None-Match': headers['ETag']})
+    assert status == 200 and 'Content-Encoding' not in plain_headers
+    assert plain_headers['ETag'] != headers['ETag']
+    assert _get(f'{api_url}/api/letters', {'If-None-Match': plain_headers['ETag']})[0] == 304
+
+
+def test_no_files_from_working_directory(api_url):
+    """רק דף הדפדפן מוגש - לא .env, לא קובץ בסיס הנתונים ולא קבצי קוד"""
+    assert _get(f'{api_url}/')[0] == 200
+    for path in ('/.env', '/igrot_kodesh.db', '/api_server.py', '/../database_setup.py'):
+        assert _get(f'{api_url}{path}')[0] == 404
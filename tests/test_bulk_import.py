@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת טעינה מרוכזת ל-SQLite - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+import csv
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from database_setup import IgrotKodeshDB, CSV_COLUMNS, LETTER_INDEXES
+
+LETTERS_COUNT = 20000
+
+
+def _write_corpus_csv(csv_file):
+    """קובץ CSV בפורמט דוחות הבדיקה עם כמה כרכים"""
+    columns = list(CSV_COLUMNS.values())
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(columns)
+        for i in range(LETTERS_COUNT):
+            volume = i // 1000 + 1
+            writer.writerow([volume, 'א', i % 1000 + 1, 'א', 21, 'כא', 'אדר', 5688, 'תרפח', 'כא אדר תרפח',
+                             f'https://example.org/{i}', f'מכתב מספר {i} שלום וברכה'])
+
+
+def test_bulk_import_csv(tmp_path):
+    """יבוא CSV גדול: כל השורות, כל הכרכים, אינדקסים וחיפוש פעילים"""
+    csv_file = tmp_path / 'corpus.csv'
+    _write_corpus_csv(csv_file)
+    
+    db = IgrotKodeshDB(str(tmp_path / 'bulk.db'))
+    start = time.time()
+    assert db.import_from_csv(str(csv_file))
+    elapsed = time.time() - start
+    print(f"⏱️ {LETTERS_COUNT} מכתבים ב-{elapsed:.2f} שניות")
+    
+    assert db.conn.execute('SELECT COUNT(*) FROM letters').fetchone()[0] == LETTERS_COUNT
+    assert db.conn.execute('SELECT COUNT(*) FROM volumes').fetchone()[0] == LETTERS_COUNT // 1000
+    assert db.conn.execute('SELECT COUNT(*) FROM letters WHERE hebrew_date_key = 56880621').fetchone()[0] == LETTERS_COUNT
+    
+    indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(LETTER_INDEXES) | {'idx_letters_volume_letter'} <= indexes
+    
+    assert len(db.search_content('12345', limit=5)) == 1
+    
+    # הטריגר חזר - מכתב שנוסף אחר כך נכנס לאינדקס החיפוש
+    db.add_letter(1, {'letter_number': 1001, 'letter_hebrew': 'תתרא', 'content': 'מילה ייחודית'})
+    assert len(db.search_content('ייחודית')) == 1
+    db.close()
+
+
+def test_bulk_import_reuses_volumes(tmp_path):
+    """יבוא חוזר לא יוצר כרכים כפולים ולא מכתבים כפולים"""
+    db = IgrotKodeshDB(str(tmp_path / 'bulk.db'))
+    letters = [{'volume_number': 2, 'volume_hebrew': 'ב', 'letter_number': n, 'letter_hebrew': ''} for n in range(1, 4)]
+    assert db.bulk_import_letters(letters) == 3
+    assert db.bulk_import_letters(letters, batch_size=2) == 3
+    assert db.conn.execute('SELECT COUNT(*) FROM volumes').fetchone()[0] == 1
+    assert db.conn.execute('SELECT COUNT(*) FROM letters').fetchone()[0] == 3
+    db.close()
+
+
+def test_unique_index_migration_removes_duplicates(tmp_path):
+    """בסיס ישן עם אינדקס לא ייחודי ומכתבים כפולים - נשאר העותק האחרון"""
+    db_file = str(tmp_path / 'old.db')
+    db = IgrotKodeshDB(db_file)
+    db.add_volume(1, 'א')
+    db.conn.execute('DROP INDEX idx_letters_volume_letter')
+    db.conn.execute('CREATE INDEX idx_letters_volume_letter ON letters (volume_id, letter_number)')
+    for content in ('ישן', 'חדש'):
+        db.add_letter(1, {'letter_number': 7, 'letter_hebrew': 'ז', 'content': content})
+    db.close()
+    
+    db = IgrotKodeshDB(db_file)
+    rows = db.conn.execute('SELECT content FROM letters').fetchall()
+    assert rows == [('חדש',)]
+    assert db.search_content('ישן') == []
+    db.add_letter(1, {'letter_number': 7, 'letter_hebrew': 'ז', 'content': 'שלישי'})
+    assert db.conn.execute('SELECT COUNT(*) FROM letters').fetchone()[0] == 1
+    db.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_bulk_import_csv(pathlib.Path(tmp))
+        test_unique_index_migration_removes_duplicates(pathlib.Path(tmp))
+        print("✅ כל הבדיקות עברו")
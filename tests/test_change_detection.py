@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת זיהוי שינויים - hash של רשומה, בקשות HEAD מותנות ודילוג על כתיבה
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from change_detection import ChangeDetector, record_hash
+from mock_chabad import MockChabadSite, page_path, letter_aid
+from local_supabase import LocalSupabase
+
+
+def test_record_hash():
+    letter = {'letter_number': 3, 'content': 'ב"ה, שלום וברכה', 'gregorian_date': '1928-03-13'}
+    assert record_hash(letter) == record_hash(dict(reversed(list(letter.items()))))
+    # מזהים ושדות HTTP לא משנים את ה-hash
+    assert record_hash(letter) == record_hash(dict(letter, id=7, etag='"x"', content_hash='abc'))
+    assert record_hash(letter) != record_hash(dict(letter, content='ב"ה, שלום'))
+
+
+def test_conditional_requests():
+    with MockChabadSite(volumes=1, letters_per_volume=3) as site:
+        url = site.base_url + page_path(letter_aid(1, 2))
+        
+        detector = ChangeDetector()
+        # מכתב שלא נשמר - בלי בקשת HEAD
+        assert detector.check(url) == (True, {})
+        assert sum(site.statuses.values()) == 0
+        
+        # מכתב שנשמר בלי מזהי HTTP: HEAD אוסף אותם, ואחרי פרסור עם אותו hash הם נשמרים
+        detector.load([{'url': url, 'content_hash': 'h1', 'etag': None, 'last_modified': None}])
+        changed, validators = detector.check(url)
+        assert changed and validators['etag']
+        assert detector.same_hash(url, 'h1')
+        assert detector.new_validators(url, validators) == validators
+        assert detector.new_validators(url, validators) == {}
+        
+        # מכתב שמור עם אותו ETag - 304 ודילוג
+        assert detector.check(url) == (False, validators)
+        assert site.statuses[304] == 1
+        
+        # ETag ישן - הדף נחשב שהשתנה
+        detector.load([{'url': url, 'content_hash': 'h1', 'etag': '"old"', 'last_modified': None}])
+        assert detector.check(url)[0]
+        
+        # רענון מלא - לעולם לא מדלג
+        forced = ChangeDetector(force=True)
+        forced.load([{'url': url, 'content_hash': 'h1', **validators}])
+        assert forced.check(url)[0] and not forced.same_hash(url, 'h1')
+        
+        # אחרי פרסור: hash שונה נכתב, זהה מדולג
+        assert detector.same_hash(url, 'h2') is False
+        assert detector.same_hash(url, 'h1')
+        assert detector.summary() == {'changed': 2, 'unchanged_http': 1, 'unchanged_hash': 2, 'validators_updated': 1}
+
+
+def test_unreachable_page_counts_as_changed():
+    detector = ChangeDetector(timeout=1)
+    detector.load([{'url': 'http://127.0.0.1:9/aid/1/', 'content_hash': 'h1', 'etag': '"e"'}])
+    assert detector.check('http://127.0.0.1:9/aid/1/') == (True, {})
+    assert detector.stats['check_errors'] == 1
+
+
+def test_batch_skips_unchanged_rows():
+    client = LocalSupabase()
+    letter = {'letter_number': 1, 'url': '/aid/4645943/', 'content': 'א'}
+    letter['content_hash'] = record_hash(letter)
+    params = {'p_volume_id': 1, 'p_volume_number': 1, 'p_letters': [letter],
+              'p_page': 1, 'p_last_aid': 4645943, 'p_last_url': '/aid/4645943/'}
+    assert client.rpc('save_letters_batch', params).execute().data == 1
+    assert client.rpc('save_letters_batch', params).execute().data == 0
+    
+    changed = dict(letter, content='ב')
+    changed['content_hash'] = record_hash(changed)
+    assert client.rpc('save_letters_batch', dict(params, p_letters=[changed])).execute().data == 1
+    # הטקסט עצמו נשמר רק ב-letter_contents - בשורה מתעדכן ה-hash
+    assert client.tables['letters'][0]['content_hash'] == changed['content_hash']
+    assert client.tables['parse_checkpoints'][0]['letters_saved'] == 2
+
+
+if __name__ == "__main__":
+    test_record_hash()
+    test_conditional_requests()
+    test_unreachable_page_counts_as_changed()
+    test_batch_skips_unchanged_rows()
+    print("✅ כל הבדיקות עברו")
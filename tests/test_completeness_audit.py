@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת בודק השלמות - טווחים חסרים, כפילויות, aid לא בסדר ומספרים צפויים שמורים
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from database_setup import IgrotKodeshDB
+from completeness_audit import CompletenessAuditor, format_ranges
+
+
+def _letter(volume, number, aid=None):
+    aid = aid or 4645000 + volume * 1000 + number
+    return {'volume_number': volume, 'volume_hebrew': '', 'letter_number': number, 'letter_hebrew': '',
+            'url': f'https://www.chabad.org/library/article_cdo/aid/{aid}/jewish/Letter.htm', 'content': ''}
+
+
+def test_gaps_duplicates_and_order(tmp_path):
+    # כרך 1: 169 צפויים, חסרים 1, 50-52 ו-169; כרך 2: בלי מספר צפוי
+    letters = [_letter(1, n) for n in range(2, 169) if n not in (50, 51, 52)]
+    # מכתב 7 שנטען פעמיים מחליף את עצמו (אינדקס ייחודי) - לא כפילות
+    letters.append(_letter(1, 7))
+    # מכתב 80 נשמר שוב עם הכתובת של מכתב 40; aid של מכתב 12 קטן מזה של 11
+    letters.append(_letter(1, 80, aid=4646040))
+    letters[10] = _letter(1, 12, aid=4645500)
+    letters += [_letter(2, n) for n in range(1, 11)]
+    db = IgrotKodeshDB(str(tmp_path / 'audit.db'))
+    db.bulk_import_letters(letters)
+    auditor = CompletenessAuditor(db.conn)
+    
+    first, second = auditor.audit()
+    assert first['expected'] == 169 and first['has_expected']
+    assert first['missing'] == [(1, 1), (50, 52), (169, 169)] and first['missing_count'] == 5
+    assert format_ranges(first['missing']) == '1, 50-52, 169'
+    assert first['duplicates'] == []
+    assert first['duplicate_aids'] == [(4646040, [40, 80])]
+    assert [letter for letter, *_ in first['out_of_order']] == [12, 80]
+    assert not first['complete']
+    
+    assert second['expected'] == 10 and not second['has_expected']
+    assert second['missing'] == [] and not second['complete']
+    auditor.set_expected(2, 12)
+    assert auditor.audit(2)[0]['missing'] == [(11, 12)]
+    auditor.set_expected(2, 10)
+    assert auditor.audit(2)[0]['complete']
+    
+    # כרך צפוי שלא נשמר ממנו כלום
+    auditor.set_expected(3, 40)
+    assert auditor.audit(3)[0]['missing'] == [(1, 40)]
+    db.close()
+
+
+def test_audit_all_volumes_fast(tmp_path):
+    letters = [_letter(volume, n) for volume in range(1, 24) for n in range(1, 1001)]
+    db = IgrotKodeshDB(str(tmp_path / 'large.db'))
+    db.bulk_import_letters(letters)
+    auditor = CompletenessAuditor(db.conn)
+    start = time.perf_counter()
+    reports = auditor.audit()
+    assert time.perf_counter() - start < 1
+    assert len(reports) == 23
+    assert reports[0]['extra'] == 1000 - 169
+    assert all(report['complete'] for report in reports[1:] if report['has_expected'])
+    db.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_gaps_duplicates_and_order, test_audit_all_volumes_fast):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
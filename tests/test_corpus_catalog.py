@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת קטלוג הקורפוס - מונים מצטברים, טווח שנים, בנייה מתיקיות קיימות וניקוי
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from corpus_catalog import CorpusCatalog, CATALOG_PATH, content_year
+from letter_archive import LetterArchive
+
+
+def test_content_year():
+    assert content_year('ב"ה, ח"י אלול, תש"ה\nשלום וברכה') == 5705
+    assert content_year('ב"ה, י"ג אדר, תרפ"ח') == 5688
+    assert content_year("ב\"ה, ה'תשי\"א") == 5711
+    assert content_year('תשובה לשאלתו') is None
+    assert content_year('') is None
+
+
+def test_incremental_counts(tmp_path):
+    with CorpusCatalog(str(tmp_path / 'catalog.sqlite')) as catalog:
+        catalog.record('igrot_kodesh', 'א', 'א', 'a.txt', 100, year=5705)
+        catalog.record('igrot_kodesh', 'א', 'ב', 'b.txt', 50, year=5688)
+        catalog.record('igrot_kodesh', 'ב', 'א', 'c.txt', 10)
+        # שמירה חוזרת של אותו מכתב - גודל מתעדכן, לא נספר פעמיים
+        catalog.record('igrot_kodesh', 'א', 'ב', 'b.txt', 70, year=5690)
+        
+        volume = {row['volume']: row for row in catalog.volumes()}['א']
+        assert (volume['volume'], volume['letters'], volume['bytes']) == ('א', 2, 170)
+        assert (volume['first_year'], volume['last_year']) == (5688, 5705)
+        assert catalog.letter_count('igrot_kodesh', 'א') == 2
+        assert catalog.letter_count('igrot_kodesh/', 'ב') == 1
+        assert catalog.letter_count('igrot_kodesh', 'ג') == 0
+        assert catalog.totals() == {'letters': 3, 'bytes': 180}
+        
+        catalog.forget('igrot_kodesh')
+        assert catalog.totals() == {'letters': 0, 'bytes': 0}
+
+
+def test_rebuild_and_files(tmp_path):
+    txt_dir = tmp_path / 'igrot_kodesh_single'
+    txt_dir.mkdir()
+    (txt_dir / 'אק - כרך ג - מכתב יב.txt').write_text('אגרות קודש - כרך ג - מכתב יב\n\nב"ה, תש"ה\nתוכן', encoding='utf-8')
+    (txt_dir / 'הערות.txt').write_text('לא מכתב', encoding='utf-8')
+    archive_dir = tmp_path / 'igrot_kodesh'
+    with LetterArchive(str(archive_dir)) as archive:
+        archive.put('א', 'פד', 'ב"ה, תרפ"ח\nתוכן')
+        archive.put('א', 'פה', 'תוכן')
+    
+    with CorpusCatalog(str(tmp_path / 'catalog.sqlite')) as catalog:
+        assert catalog.rebuild([str(txt_dir), str(archive_dir), str(tmp_path / 'missing')]) == 3
+        rows = {row['volume']: row for row in catalog.volumes()}
+        assert rows['ג']['letters'] == 1 and rows['ג']['first_year'] == 5705
+        assert rows['א']['letters'] == 2 and rows['א']['first_year'] == 5688
+        
+        files = catalog.files()
+        assert str(txt_dir / 'אק - כרך ג - מכתב יב.txt') in files
+        assert str(archive_dir / 'volume_א.pack') in files
+        assert str(archive_dir / 'index.sqlite') in files
+        assert str(txt_dir / 'הערות.txt') not in files
+
+
+def test_letter_text_files_and_forget_paths(tmp_path):
+    """הניקוי מקבל רק קבצי .txt של מכתבים; ארכיונים וקבצים מצורפים נשארים בקטלוג"""
+    assert os.path.isabs(CATALOG_PATH)
+    with CorpusCatalog(str(tmp_path / 'catalog.sqlite')) as catalog:
+        letters = str(tmp_path / 'igrot_kodesh_single')
+        catalog.record(letters, 'ג', 'יב', os.path.join(letters, 'יב.txt'), 100, year=5705)
+        catalog.record(letters, 'ג', 'יג', os.path.join(letters, 'יג.txt'), 50, year=5706)
+        catalog.record(str(tmp_path / 'igrot_kodesh'), 'א', 'פד', str(tmp_path / 'igrot_kodesh' / 'volume_א.pack'), 30)
+        catalog.record(str(tmp_path / 'downloads'), '', 'notes.txt', str(tmp_path / 'downloads' / 'notes.txt'), 20)
+        
+        files = catalog.letter_text_files()
+        assert files == [os.path.join(letters, 'יב.txt'), os.path.join(letters, 'יג.txt')]
+        
+        catalog.forget_paths(files[:1])
+        volume = catalog.volumes(letters)[0]
+        assert (volume['letters'], volume['bytes'], volume['first_year']) == (1, 50, 5706)
+        catalog.forget_paths(files[1:])
+        assert catalog.volumes(letters) == []
+        assert catalog.totals() == {'letters': 2, 'bytes': 50}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_content_year()
+    for test in (test_incremental_counts, test_rebuild_and_files, test_letter_text_files_and_forget_paths):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מפתח תאריך עברי, המרה ללועזי ושאילתות טווח - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import date
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from hebrew_calendar import hebrew_date_key, hebrew_to_gregorian, month_number, hebrew_numeral_to_number
+from database_setup import IgrotKodeshDB
+
+
+def test_hebrew_to_gregorian():
+    """תאריכים ידועים"""
+    assert hebrew_to_gregorian(5688, 6, 21) == date(1928, 3, 13)   # כ"א אדר תרפ"ח
+    assert hebrew_to_gregorian(5662, 8, 11) == date(1902, 4, 18)   # י"א ניסן תרס"ב
+    assert hebrew_to_gregorian(5710, 5, 10) == date(1950, 1, 28)   # י' שבט תש"י
+    assert hebrew_to_gregorian(5785, 1, 1) == date(2024, 10, 3)    # ראש השנה תשפ"ה
+    # שנה מעוברת: אדר א ואדר ב
+    assert hebrew_to_gregorian(5784, 6, 14) == date(2024, 2, 23)
+    assert hebrew_to_gregorian(5784, 7, 14) == date(2024, 3, 24)
+
+
+def test_date_key_parts():
+    """מפתח ממוין וזיהוי חודשים/ימים"""
+    assert hebrew_date_key(5688, 6, 21) == 56880621
+    assert hebrew_date_key(5688, None, 21) is None
+    assert month_number('אד"ר') == 6
+    assert month_number('מנחם אב') == 12
+    assert hebrew_numeral_to_number('כ"א') == 21
+    assert hebrew_numeral_to_number('טו') == 15
+
+
+def test_month_range_query(tmp_path):
+    """שאילתת חודש ושנה משתמשת באינדקס מפתח התאריך"""
+    db = IgrotKodeshDB(str(tmp_path / 'dates.db'))
+    volume_id = db.add_volume(1, 'א')
+    db.add_letter(volume_id, {'letter_number': 1, 'letter_hebrew': 'א', 'day_numeric': 21,
+                              'month_hebrew': 'אדר', 'year_numeric': 5688})
+    db.add_letter(volume_id, {'letter_number': 2, 'letter_hebrew': 'ב', 'day_numeric': 5,
+                              'month_hebrew': 'טבת', 'year_numeric': 5689})
+    db.add_letter(volume_id, {'letter_number': 3, 'letter_hebrew': 'ג', 'day_hebrew': 'ג',
+                              'month_hebrew': 'אדר', 'year_numeric': 5688})
+
+    rows = db.letters_in_month(5688, 'אדר')
+    assert [row['letter_number'] for row in rows] == [3, 1]
+    assert rows[1]['gregorian_date'] == '1928-03-13'
+    assert [row['letter_number'] for row in db.search_letters(year=5688, month='אדר')] == [1, 3]
+
+    plan = db.conn.execute(
+        'EXPLAIN QUERY PLAN SELECT id FROM letters WHERE hebrew_date_key BETWEEN ? AND ?',
+        (56880600, 56880699)
+    ).fetchall()
+    assert any('idx_letters_date_key' in row[-1] for row in plan)
+    db.close()
+
+
+def test_migration_and_backfill(tmp_path):
+    """בסיס נתונים ישן ללא עמודות התאריך מקבל אותן ונמלא"""
+    db_file = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(db_file)
+    conn.execute('CREATE TABLE volumes (id INTEGER PRIMARY KEY, volume_number INTEGER UNIQUE, volume_hebrew TEXT, '
+                 'total_letters INTEGER, total_pages INTEGER, created_at TIMESTAMP)')
+    conn.execute('CREATE TABLE letters (id INTEGER PRIMARY KEY, volume_id INTEGER, letter_number INTEGER, '
+                 'letter_hebrew TEXT, day_numeric INTEGER, day_hebrew TEXT, month_hebrew TEXT, year_numeric INTEGER, '
+                 'year_hebrew TEXT, full_date_hebrew TEXT, url TEXT, content TEXT, parsed_at TIMESTAMP)')
+    conn.execute("INSERT INTO volumes (id, volume_number, volume_hebrew) VALUES (1, 1, 'א')")
+    conn.execute("INSERT INTO letters (volume_id, letter_number, letter_hebrew, day_numeric, month_hebrew, year_numeric) "
+                 "VALUES (1, 1, 'א', 21, 'אדר', 5688)")
+    conn.commit()
+    conn.close()
+
+    db = IgrotKodeshDB(db_file)
+    # ההגירה ממלאת את המפתחות מיד
+    row = db.conn.execute('SELECT hebrew_date_key, gregorian_date FROM letters').fetchone()
+    assert row == (56880621, '1928-03-13')
+    assert db.backfill_date_keys() == 0
+    assert [row['letter_number'] for row in db.search_letters(year=5688, month='אדר')] == [1]
+    db.close()
+
+
+def test_adar_in_leap_year(tmp_path):
+    """"אדר" סתם בשנה מעוברת כולל אדר א ואדר ב, "אדר ב" רק את אדר ב"""
+    db = IgrotKodeshDB(str(tmp_path / 'adar.db'))
+    volume_id = db.add_volume(1, 'א')
+    db.add_letter(volume_id, {'letter_number': 1, 'letter_hebrew': 'א', 'day_numeric': 10,
+                              'month_hebrew': 'אדר א', 'year_numeric': 5784})
+    db.add_letter(volume_id, {'letter_number': 2, 'letter_hebrew': 'ב', 'day_numeric': 10,
+                              'month_hebrew': 'אדר ב', 'year_numeric': 5784})
+    
+    assert [row['letter_number'] for row in db.search_letters(year=5784, month='אדר')] == [1, 2]
+    assert [row['letter_number'] for row in db.letters_in_month(5784, 'אדר')] == [1, 2]
+    assert [row['letter_number'] for row in db.letters_in_month(5784, 'אדר ב')] == [2]
+    assert [row['letter_number'] for row in db.letters_in_month(5784, 6)] == [1]
+    db.close()
+
+
+def test_adar_in_non_leap_year(tmp_path):
+    """"אדר" סתם כולל גם מכתב שכתוב בו "אדר ב" בשנה שהלוח מחשב כפשוטה"""
+    db = IgrotKodeshDB(str(tmp_path / 'adar_plain.db'))
+    volume_id = db.add_volume(1, 'א')
+    db.add_letter(volume_id, {'letter_number': 1, 'letter_hebrew': 'א', 'day_numeric': 10,
+                              'month_hebrew': 'אדר', 'year_numeric': 5688})
+    db.add_letter(volume_id, {'letter_number': 2, 'letter_hebrew': 'ב', 'day_numeric': 10,
+                              'month_hebrew': 'אדר ב', 'year_numeric': 5688})
+    
+    assert [row['letter_number'] for row in db.search_letters(year=5688, month='אדר')] == [1, 2]
+    assert [row['letter_number'] for row in db.letters_in_month(5688, 'אדר')] == [1, 2]
+    assert [row['letter_number'] for row in db.letters_in_month(5688, 'ניסן')] == []
+    db.close()
+
+
+def test_letters_without_date_key(tmp_path):
+    """מכתב בלי מפתח תאריך נמצא לפי השדות העבריים"""
+    db = IgrotKodeshDB(str(tmp_path / 'nokey.db'))
+    volume_id = db.add_volume(1, 'א')
+    db.add_letter(volume_id, {'letter_number': 1, 'letter_hebrew': 'א', 'day_numeric': 21,
+                              'month_hebrew': 'אדר', 'year_numeric': 5688})
+    db.conn.execute('UPDATE letters SET hebrew_date_key = NULL')
+    
+    assert [row['letter_number'] for row in db.search_letters(year=5688, month='אדר')] == [1]
+    assert db.count_letters(year=5688, month='אדר') == 1
+    assert [row['letter_number'] for row in db.letters_in_month(5688, 6)] == [1]
+    assert db.letters_in_month(5688, 'ניסן') == []
+    db.close()
+
+
+if __name__ == "__main__":
+    test_hebrew_to_gregorian()
+    test_date_key_parts()
+    print("✅ כל הבדיקות עברו")
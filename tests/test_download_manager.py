@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מנהל ההורדות - הורדה בזרימה, המשך עם Range ודילוג על קבצים שלא השתנו
+"""
+
+import sys
+import os
+import hashlib
+import http.server
+import threading
+from collections import Counter
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+
+from download_manager import DownloadManager, PART_SUFFIX
+
+
+class FileHandler(http.server.BaseHTTPRequestHandler):
+    """שרת קבצים מינימלי עם ETag, 304 ו-Range"""
+    
+    def do_HEAD(self):
+        self._respond(send_body=False)
+    
+    def do_GET(self):
+        self._respond(send_body=True)
+    
+    def _respond(self, send_body):
+        files = self.server.files
+        name = self.path.lstrip('/')
+        if name not in files:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = files[name]
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        status, start = 200, 0
+        range_header = self.headers.get('Range')
+        if self.headers.get('If-None-Match') == etag:
+            status, data = 304, b''
+        elif range_header and self.headers.get('If-Range') == etag:
+            start = int(range_header.split('=')[1].rstrip('-'))
+            status, data = 206, data[start:]
+        self.server.requests[(self.command, status)] += 1
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data)))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{start + len(data) - 1}/{len(files[name])}')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _server(files):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FileHandler)
+    server.files = files
+    server.requests = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_stream_skip_and_change(tmp_path):
+    files = {'big.pdf': os.urandom(3 * 1024 * 1024), 'a.txt': 'שלום'.encode('utf-8')}
+    server, base = _server(files)
+    try:
+        manager = DownloadManager(str(tmp_path), workers=2, chunk_size=64 * 1024)
+        results = manager.download_all([f'{base}/big.pdf', f'{base}/a.txt', f'{base}/big.pdf'])
+        assert [r['status'] for r in results] == ['downloaded', 'downloaded']
+        assert (tmp_path / 'big.pdf').read_bytes() == files['big.pdf']
+        
+        # מנהל חדש על אותה תיקייה - המניפסט נטען, והקבצים לא הורדו שוב
+        manager = DownloadManager(str(tmp_path))
+        assert [r['status'] for r in manager.download_all([f'{base}/big.pdf', f'{base}/a.txt'])] == ['skipped', 'skipped']
+        assert server.requests[('HEAD', 304)] == 2
+        
+        files['a.txt'] = 'שלום וברכה'.encode('utf-8')
+        assert manager.download(f'{base}/a.txt')['status'] == 'downloaded'
+        assert (tmp_path / 'a.txt').read_bytes() == files['a.txt']
+        assert sorted(os.listdir(tmp_path)) == ['.downloads.json', 'a.txt', 'big.pdf']
+    finally:
+        server.shutdown()
+
+
+def test_resume_partial_file(tmp_path):
+    files = {'volume.pdf': os.urandom(1024 * 1024)}
+    server, base = _server(files)
+    try:
+        url = f'{base}/volume.pdf'
+        manager = DownloadManager(str(tmp_path))
+        assert manager.download(url)['status'] == 'downloaded'
+        
+        # הורדה שנקטעה באמצע: רק החלק הראשון על הדיסק
+        path = tmp_path / 'volume.pdf'
+        os.replace(path, str(path) + PART_SUFFIX)
+        with open(str(path) + PART_SUFFIX, 'r+b') as f:
+            f.truncate(300 * 1024)
+        manager._update_manifest(url, complete=False)
+        
+        result = manager.download(url)
+        assert result['status'] == 'resumed' and result['bytes'] == len(files['volume.pdf']) - 300 * 1024
+        assert path.read_bytes() == files['volume.pdf']
+        assert server.requests[('GET', 206)] == 1
+    finally:
+        server.shutdown()
+
+
+def test_name_collisions(tmp_path):
+    (tmp_path / 'file.txt').write_text('קיים')
+    manager = DownloadManager(str(tmp_path))
+    first = manager.target_path('http://a.example/x/file.txt')
+    second = manager.target_path('http://b.example/y/file.txt')
+    assert os.path.basename(first) == 'file_1.txt' and os.path.basename(second) == 'file_2.txt'
+    assert manager.target_path('http://a.example/x/file.txt') == first
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_stream_skip_and_change, test_resume_partial_file, test_name_collisions):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת ניהול מחזור החיים של הדרייבר - שימוש חוזר, מיחזור והפעלה מחדש
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from driver_manager import DriverManager, WebDriverException, process_tree_rss_mb
+
+
+class FakeDriver:
+    """דרייבר מינימלי: נכשל ב-URL-ים שב-fail_urls, ובבדיקת תקינות כש-hung"""
+    
+    def __init__(self, fail_urls=(), hung=False):
+        self.fail_urls = set(fail_urls)
+        self.hung = hung
+        self.visited = []
+        self.closed = False
+    
+    def get(self, url):
+        if url in self.fail_urls:
+            raise WebDriverException(f"renderer crashed: {url}")
+        self.visited.append(url)
+    
+    def execute_script(self, script):
+        if self.hung:
+            raise WebDriverException("timeout")
+        return 1
+    
+    def quit(self):
+        self.closed = True
+
+
+def _factory(drivers, **kwargs):
+    def create():
+        drivers.append(FakeDriver(**kwargs))
+        return drivers[-1]
+    return create
+
+
+def test_warm_reuse_and_page_recycling():
+    drivers = []
+    manager = DriverManager(_factory(drivers), max_pages=4, max_rss_mb=None)
+    for i in range(10):
+        manager.get(f'/page/{i}')
+    assert len(drivers) == 3
+    assert [len(d.visited) for d in drivers] == [4, 4, 2]
+    assert drivers[0].closed and not drivers[2].closed
+    manager.quit()
+    assert drivers[2].closed
+    assert manager.summary() == {'starts': 3, 'pages': 10, 'recycle_pages': 2}
+
+
+def test_restart_on_webdriver_exception():
+    drivers = []
+    create = _factory(drivers, fail_urls=['/crash'])
+    
+    def factory():
+        driver = create()
+        if len(drivers) > 1:
+            driver.fail_urls = set()
+        return driver
+    
+    manager = DriverManager(factory, max_rss_mb=None)
+    driver = manager.get('/crash')
+    assert driver is drivers[1] and driver.visited == ['/crash']
+    assert drivers[0].closed
+    assert manager.stats['restarts'] == 1
+    
+    # כישלון כפול - החריגה עוברת הלאה
+    manager = DriverManager(_factory([], fail_urls=['/crash']), max_rss_mb=None)
+    try:
+        manager.get('/crash')
+        assert False, "ציפינו ל-WebDriverException"
+    except WebDriverException:
+        pass
+
+
+def test_health_check_recycles_hung_driver():
+    drivers = []
+    manager = DriverManager(_factory(drivers, hung=True), max_rss_mb=None, health_check_every=3)
+    for i in range(4):
+        manager.get(f'/page/{i}')
+    assert len(drivers) == 2
+    assert manager.stats['health_failures'] == 1
+
+
+def test_failed_start_returns_none():
+    manager = DriverManager(lambda: None)
+    assert manager.driver is None
+    try:
+        manager.get('/page')
+        assert False, "ציפינו ל-WebDriverException"
+    except WebDriverException:
+        pass
+
+
+def test_process_tree_rss():
+    rss = process_tree_rss_mb(os.getpid())
+    if rss is not None:
+        assert rss > 1
+
+
+if __name__ == "__main__":
+    test_warm_reuse_and_page_recycling()
+    test_restart_on_webdriver_exception()
+    test_health_check_recycles_hung_driver()
+    test_failed_start_returns_none()
+    test_process_tree_rss()
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת חיפוש מלא בתוכן המכתבים (FTS5) - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from database_setup import IgrotKodeshDB, normalize_hebrew
+
+
+def _sample_db(db_file):
+    """בסיס נתונים קטן עם שלושה מכתבים"""
+    db = IgrotKodeshDB(str(db_file))
+    volume_id = db.add_volume(1, 'א')
+    db.add_letter(volume_id, {
+        'letter_number': 1, 'letter_hebrew': 'א', 'url': 'https://example.org/1',
+        'content': 'ב"ה, כ"א אדר, ה\'תרפ"ח\nשָׁלוֹם וּבְרָכָה לְכָל אַנְשֵׁי הַמָּקוֹם'
+    })
+    db.add_letter(volume_id, {
+        'letter_number': 2, 'letter_hebrew': 'ב', 'url': 'https://example.org/2',
+        'content': 'ב"ה, כח טבת תרפ"ט\nבדבר הספרים שנשלחו'
+    })
+    db.add_letter(volume_id, {
+        'letter_number': 3, 'letter_hebrew': 'ג', 'url': 'https://example.org/3',
+        'content': 'מכתבו הגיע, ובדבר השלום - שלום שלום'
+    })
+    return db
+
+
+def test_normalize_hebrew():
+    """ניקוד, גרשיים ואותיות סופיות מנורמלים"""
+    assert normalize_hebrew('שָׁלוֹם') == 'שלומ'
+    assert normalize_hebrew('כ"א') == 'כא'
+    assert normalize_hebrew('ה\'תרפ"ח') == 'התרפח'
+    assert normalize_hebrew(None) == ''
+    # מקף עברי מפריד בין מילים
+    assert normalize_hebrew('בית־הכנסת') == 'בית הכנסת'
+
+
+def test_search_ignores_niqqud_and_final_letters(tmp_path):
+    """חיפוש ללא ניקוד מוצא טקסט מנוקד, וחיפוש עם אות רגילה מוצא אות סופית"""
+    db = _sample_db(tmp_path / 'fts.db')
+    
+    results = db.search_content('שלום')
+    assert {r['letter_number'] for r in results} == {1, 3}
+    # המכתב עם שלוש הופעות מדורג ראשון
+    assert results[0]['letter_number'] == 3
+    assert '[' in results[0]['snippet']
+    
+    assert [r['letter_number'] for r in db.search_content('הספר*')] == [2]
+    assert db.search_content('') == []
+    db.close()
+
+
+def test_snippet_shows_original_text(tmp_path):
+    """הקטע נלקח מהטקסט המקורי - עם ניקוד, אותיות סופיות ומקף"""
+    db = _sample_db(tmp_path / 'fts.db')
+    db.add_letter(1, {'letter_number': 4, 'letter_hebrew': 'ד', 'content': 'נתקבל מכתבו אודות בית־הכנסת החדש'})
+    
+    [first] = db.search_content('וברכה')
+    assert first['snippet'].startswith('ב"ה, כ"א אדר')
+    assert '[וּבְרָכָה]' in first['snippet'] and 'שָׁלוֹם' in first['snippet']
+    
+    [synagogue] = db.search_content('הכנסת')
+    assert synagogue['letter_number'] == 4
+    assert synagogue['snippet'] == 'נתקבל מכתבו אודות בית־[הכנסת] החדש'
+    assert [r['letter_number'] for r in db.search_content('בית־הכנסת')] == [4]
+    assert '[הספרים]' in db.search_content('הספר*')[0]['snippet']
+    db.close()
+
+
+def test_long_snippet_window(tmp_path):
+    """בטקסט ארוך - חלון סביב ההתאמות עם … בקצוות"""
+    db = IgrotKodeshDB(str(tmp_path / 'long.db'))
+    db.add_volume(1, 'א')
+    words = [f'מילה{n}' for n in range(100)]
+    words[50] = 'שלום'
+    db.add_letter(1, {'letter_number': 1, 'letter_hebrew': 'א', 'content': ' '.join(words)})
+    snippet = db.search_content('שלום')[0]['snippet']
+    assert snippet.startswith('…') and snippet.endswith('…') and '[שלום]' in snippet
+    assert len(snippet.strip('…').split()) == 12
+    db.close()
+
+
+def test_index_stays_in_sync(tmp_path):
+    """עדכון ומחיקה של מכתבים מתעדכנים באינדקס"""
+    db = _sample_db(tmp_path / 'fts.db')
+    
+    db.conn.execute("UPDATE letters SET content = 'תוכן חדש לגמרי' WHERE letter_number = 2")
+    db.conn.execute("DELETE FROM letters WHERE letter_number = 3")
+    db.conn.commit()
+    
+    assert db.search_content('ספרים') == []
+    assert [r['letter_number'] for r in db.search_content('חדש')] == [2]
+    assert [r['letter_number'] for r in db.search_content('שלום')] == [1]
+    assert [row[2] for row in db.search_letters(text='לגמרי')] == [2]
+    db.close()
+
+
+def test_punctuation_only_query(tmp_path):
+    """שאילתה של סימני פיסוק בלבד - אין תוצאות ואין שגיאת FTS5"""
+    db = _sample_db(tmp_path / 'fts.db')
+    for query in ('*', '"', '- ? !'):
+        assert db.search_letters(text=query) == []
+        assert db.count_letters(text=query) == 0
+        assert db.search_content(query) == []
+    assert db.count_letters(text='שלום') == 2
+    db.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_normalize_hebrew()
+        test_search_ignores_niqqud_and_final_letters(pathlib.Path(tmp))
+        test_long_snippet_window(pathlib.Path(tmp))
+        test_punctuation_only_query(pathlib.Path(tmp))
+        print("✅ כל הבדיקות עברו")
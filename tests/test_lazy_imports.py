@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת טעינה עצלה - פעולות שאינן הורדה לא טוענות Selenium, BeautifulSoup או requests
+"""
+
+import sys
+import os
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _loaded_modules(code, cwd):
+    """מריץ קוד בתהליך נקי ומחזיר את המודולים הכבדים שנטענו"""
+    probe = code + "\nimport sys\nprint('loaded:' + ','.join(m for m in ('selenium', 'bs4', 'requests', 'letters_downloader') if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=cwd, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.rsplit('loaded:', 1)[1].strip()
+    return [m for m in loaded.split(',') if m]
+
+
+def test_manager_menu_actions_stay_light():
+    code = "import sys; sys.path.insert(0, '.')\nimport igrot_kodesh_manager\nigrot_kodesh_manager.show_help()"
+    assert _loaded_modules(code, os.path.join(ROOT, 'main')) == []
+
+
+def test_web_integrations_import_is_light():
+    code = "import web_integrations\nweb_integrations.WebIntegrations().setup_airtable()"
+    assert _loaded_modules(code, ROOT) == []
+
+
+if __name__ == "__main__":
+    test_manager_menu_actions_stay_light()
+    test_web_integrations_import_is_light()
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת ארכיון המכתבים הארוז - כתיבה, קריאה אקראית, כפילויות, שחזור וייצוא
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from letter_archive import LetterArchive, is_archive, INDEX_NAME
+
+
+def test_put_get_and_duplicates(tmp_path):
+    with LetterArchive(str(tmp_path)) as archive:
+        assert is_archive(str(tmp_path))
+        assert archive.put('א', 'פד', 'ב"ה, שלום וברכה', title='אגרות קודש - כרך א - מכתב פד') == 'פד'
+        assert archive.put('א', 'פה', 'מכתב שני') == 'פה'
+        assert archive.put('ב', 'א', 'כרך אחר') == 'א'
+        
+        # מכתב זהה לא נכתב שוב, מכתב שונה עם אותו מפתח מקבל סיומת
+        assert archive.put('א', 'פד', 'ב"ה, שלום וברכה') is None
+        assert archive.put('א', 'פד', 'נוסח אחר') == 'פד_1'
+        
+        assert archive.get('א', 'פד') == 'ב"ה, שלום וברכה'
+        assert archive.get('א', 'פד_1') == 'נוסח אחר'
+        assert archive.get('א', 'לא') is None
+        assert len(archive) == 4
+        assert archive.stats()[0] == {'volume': 'א', 'letters': 3,
+                                      'bytes': len('ב"ה, שלום וברכהמכתב שנינוסח אחר'.encode('utf-8'))}
+    
+    # קובץ pack אחד לכל כרך במקום קובץ לכל מכתב
+    assert sorted(os.listdir(tmp_path)) == sorted([INDEX_NAME, 'volume_א.pack', 'volume_ב.pack'] +
+                                                  [n for n in os.listdir(tmp_path) if n.startswith(INDEX_NAME + '-')])
+
+
+def test_recover_after_crash(tmp_path):
+    with LetterArchive(str(tmp_path)) as archive:
+        archive.put('א', 'א', 'מכתב ראשון')
+        archive.put('א', 'ב', 'מכתב שני')
+        # קריסה: הרשומה נכתבה ל-pack אבל לא לאינדקס
+        archive.db.execute("DELETE FROM letters WHERE letter = 'ב'")
+        archive.db.commit()
+    pack = tmp_path / 'volume_א.pack'
+    # ורשומה שלישית שנכתבה רק בחלקה
+    with open(pack, 'ab') as f:
+        f.write('{"volume": "א", "letter": "ג", "length": 100}\nחלקי'.encode('utf-8'))
+    
+    with LetterArchive(str(tmp_path)) as archive:
+        assert archive.get('א', 'ב') == 'מכתב שני'
+        assert archive.get('א', 'ג') is None
+        assert len(archive) == 2
+        assert archive.put('א', 'ג', 'מכתב שלישי') == 'ג'
+        assert archive.get('א', 'ג') == 'מכתב שלישי'
+
+
+def test_export(tmp_path):
+    root = tmp_path / 'archive'
+    with LetterArchive(str(root)) as archive:
+        archive.put('א', 'פד', 'תוכן', title='אגרות קודש - כרך א - מכתב פד')
+        archive.put('ב', 'ג', 'תוכן אחר', title='אגרות קודש - כרך ב - מכתב ג')
+        assert archive.export(str(tmp_path / 'out'), volume='א') == 1
+    text = (tmp_path / 'out' / 'אק - כרך א - מכתב פד.txt').read_text(encoding='utf-8')
+    assert text == 'אגרות קודש - כרך א - מכתב פד\n\nתוכן'
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_put_get_and_duplicates, test_recover_after_crash, test_export):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת שמירת התוכן המלא - דחיסה, שורת letters בלי טקסט, מילות חיפוש ופתיחה לפי דרישה
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from letter_content import (compress_content, decompress_content, pack_letter, split_packed,
+                            fetch_content, search_terms, search_content)
+from change_detection import record_hash
+from local_supabase import LocalSupabase
+
+LONG_LETTER = 'ב"ה, ח"י אלול, תש"ה\n' + 'שלום וברכה לכל אנשי המקום. ' * 400 + 'בענין בית־הכנסת'
+
+
+def test_compress_roundtrip():
+    encoding, data = compress_content(LONG_LETTER)
+    assert len(data) < len(LONG_LETTER.encode('utf-8')) // 10
+    assert decompress_content(encoding, data) == LONG_LETTER
+    assert decompress_content('gzip', compress_content(LONG_LETTER, 'gzip')[1]) == LONG_LETTER
+    # אותו טקסט - אותם בייטים
+    assert compress_content(LONG_LETTER) == compress_content(LONG_LETTER)
+
+
+def test_search_terms():
+    assert search_terms('שָׁלוֹם, שלום וּבְרָכָה! בית־הכנסת כ"א') == 'בית הכנסת וברכה כא שלומ'
+    assert search_terms('') == ''
+
+
+def test_pack_sends_compressed_text_only():
+    letter = {'letter_number': 5, 'content': LONG_LETTER}
+    packed = pack_letter(letter)
+    assert 'content' not in packed
+    assert packed['content_length'] == len(LONG_LETTER)
+    assert letter['content'] == LONG_LETTER
+    assert decompress_content(packed['content_encoding'], packed['content_compressed']) == LONG_LETTER
+    # מילת החיפוש מסוף המכתב (אחרי 2000 התווים הראשונים) נכללת
+    assert 'הכנסת' in packed['search_terms'].split()
+    # המטען קטן בהרבה מהטקסט
+    assert len(json.dumps(packed)) < len(json.dumps(letter)) // 5
+    
+    # שורה לטבלה: bytea בפורמט hex של PostgREST, content ריק מוחק תקציר ישן
+    row, contents = split_packed(packed)
+    assert 'content_compressed' not in row and 'search_terms' not in row and row['content'] is None
+    assert contents['content'].startswith('\\x')
+    assert contents['content_tsv'] == packed['search_terms']
+    assert decompress_content(contents['encoding'], contents['content']) == LONG_LETTER
+    
+    # שינוי בסוף הטקסט משנה את ה-hash
+    assert record_hash(letter) != record_hash(dict(letter, content=LONG_LETTER + 'בברכה'))
+
+
+def test_batch_rpc_and_fetch():
+    client = LocalSupabase()
+    letter = {'letter_number': 1, 'url': '/aid/4645943/', 'content': LONG_LETTER}
+    letter['content_hash'] = record_hash(letter)
+    params = {'p_volume_id': 1, 'p_volume_number': 1, 'p_letters': [pack_letter(letter)],
+              'p_page': 1, 'p_last_aid': 4645943, 'p_last_url': '/aid/4645943/'}
+    assert client.rpc('save_letters_batch', params).execute().data == 1
+    
+    row = client.tables['letters'][0]
+    assert row['content'] is None and 'content_compressed' not in row
+    assert fetch_content(client, row['id']) == LONG_LETTER
+    assert fetch_content(client, 999) is None
+    
+    # חיפוש בכל הטקסט - הקטע נבנה בצד הלקוח מהטקסט המלא
+    [result] = search_content(client, 'הכנסת')
+    assert result['letter_number'] == 1
+    assert result['snippet'].endswith('בענין בית־[הכנסת]')
+    assert search_content(client, 'מילה שאינה') == []
+
+
+if __name__ == "__main__":
+    test_compress_roundtrip()
+    test_search_terms()
+    test_pack_sends_compressed_text_only()
+    test_batch_rpc_and_fetch()
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מצב ההשלמה - פענוח פערים, כתובות לפי aid של השכנים והתאמה מעמוד רשימה
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from letter_refetch import (letter_aid, with_aid, parse_targets, gap_targets, listing_page,
+                            interpolate_urls, match_listing)
+
+BASE = 'https://www.chabad.org/therebbe/article_cdo/aid/{}/jewish/page.htm'
+
+
+def _url(number):
+    # כרך א: aid - 4645942 == מספר המכתב
+    return BASE.format(4645942 + number)
+
+
+def test_targets():
+    assert parse_targets(['1:12', '1:50-52', '2:7,9', '1:12']) == [(1, 12), (1, 50), (1, 51), (1, 52), (2, 7), (2, 9)]
+    reports = [{'volume': 1, 'missing': [(1, 1), (50, 52)]}, {'volume': 3, 'missing': []}]
+    assert gap_targets(reports) == [(1, 1), (1, 50), (1, 51), (1, 52)]
+    assert [listing_page(n) for n in (1, 50, 51, 169)] == [1, 1, 2, 4]
+    assert letter_aid(with_aid(_url(1), 4646000)) == 4646000
+    try:
+        parse_targets(['1:x'])
+        assert False
+    except ValueError:
+        pass
+
+
+def test_interpolate_from_stored_neighbours():
+    stored = {n: _url(n) for n in range(1, 170) if n not in (12, 50, 51, 52, 169)}
+    resolved = interpolate_urls([12, 50, 51, 52, 169], stored)
+    assert resolved == {12: _url(12), 50: _url(50), 51: _url(51), 52: _url(52)}
+    
+    # מאמר שאינו מכתב בין השכנים - ה-aid לא רצופים, הכתובת לא מנוחשת
+    stored[53] = BASE.format(4645942 + 54)
+    assert 52 not in interpolate_urls([52], stored)
+
+
+def test_match_listing_page():
+    # עמוד 2 (מכתבים 51-100); 60-62 חסרים, ל-61 ול-62 אין מספר בטקסט הקישור
+    stored = {n: _url(n) for n in range(51, 101) if n not in (60, 61, 62)}
+    links = [{'url': _url(n), 'number_guess': None if n in (61, 62) else n} for n in range(51, 101)]
+    links.append({'url': BASE.format(4646200), 'number_guess': None})
+    assert match_listing(links, [60, 61, 62], stored) == {60: _url(60), 61: _url(61), 62: _url(62)}
+    assert match_listing(links, [101], stored) == {}
+
+
+if __name__ == "__main__":
+    test_targets()
+    test_interpolate_from_stored_neighbours()
+    test_match_listing_page()
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת האתר המדומה ותחליף ה-Supabase של בנצ'מרק הסריקה
+"""
+
+import sys
+import os
+import urllib.error
+import urllib.request
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from mock_chabad import MockChabadSite, number_to_hebrew, letter_aid
+from local_supabase import LocalSupabase
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, ''
+
+
+def test_number_to_hebrew():
+    assert number_to_hebrew(1) == 'א'
+    assert number_to_hebrew(15) == 'טו'
+    assert number_to_hebrew(21, True) == 'כ"א'
+    assert number_to_hebrew(5688, True) == 'תרפ"ח'
+    assert letter_aid(1, 7) - 4645942 == 7
+
+
+def test_site_pages():
+    """אינדקס כרכים, דפדוף בכרך ו-404 אחרי הדף האחרון"""
+    with MockChabadSite(volumes=2, letters_per_volume=5, per_page=2) as site:
+        status, index = _get(site.start_url)
+        assert status == 200 and index.count('אגרות קודש - כרך') == 2
+        
+        status, first = _get(site.volume_url(1))
+        assert first.count('article-item') == 2 and 'Paginator_NextPage' in first
+        status, last = _get(site.volume_url(1) + '?page=3')
+        assert last.count('article-item') == 1 and 'Paginator_NextPage' not in last
+        assert _get(site.volume_url(1) + '/page/4')[0] == 404
+        
+        status, letter = _get(site.base_url + '/therebbe/article_cdo/aid/4645945/jewish/page.htm')
+        assert 'אגרות קודש - מכתב ג' in letter and '<div class="article-body"><p>ב"ה' in letter
+        assert site.statuses[200] == 4 and site.statuses[404] == 1
+
+
+def test_failure_injection():
+    with MockChabadSite(volumes=1, letters_per_volume=1, failure_rate=1.0) as site:
+        assert _get(site.start_url)[0] == 503
+
+
+def test_local_supabase():
+    client = LocalSupabase()
+    client.table('letters').insert([{'volume_id': 1, 'letter_number': n} for n in (3, 1, 2)]).execute()
+    client.table('letters').upsert({'volume_id': 1, 'letter_number': 2, 'title': 'ב'},
+                                   on_conflict='volume_id,letter_number').execute()
+    client.table('letters').update({'title': 'א'}).eq('letter_number', 1).execute()
+    
+    result = client.table('letters').select('letter_number,title', count='exact') \
+        .eq('volume_id', 1).order('letter_number', desc=True).limit(2).execute()
+    assert result.count == 3
+    assert result.data == [{'letter_number': 3, 'title': None}, {'letter_number': 2, 'title': 'ב'}]
+    assert client.table('letters').select('id').is_('title', 'null').execute().data == [{'id': 1}]
+    assert client.calls['letters.select'] == 2
+
+
+def test_local_save_letters_batch():
+    """מכתבי העמוד ונקודת החידוש נשמרים יחד; מכתב כפול בפקטה נספר פעם אחת"""
+    client = LocalSupabase()
+    page = [{'letter_number': n, 'url': f'/aid/{4645942 + n}/'} for n in (1, 2, 2)]
+    saved = client.rpc('save_letters_batch', {
+        'p_volume_id': 7, 'p_volume_number': 1, 'p_letters': page,
+        'p_page': 1, 'p_last_aid': 4645944, 'p_last_url': '/aid/4645944/'
+    }).execute().data
+    assert saved == 2
+    assert [r['letter_number'] for r in client.tables['letters']] == [1, 2]
+    
+    client.rpc('save_letters_batch', {
+        'p_volume_id': 7, 'p_volume_number': 1, 'p_letters': [{'letter_number': 2, 'url': '/aid/4645944/'}],
+        'p_page': 2, 'p_last_aid': None, 'p_last_url': None
+    }).execute()
+    checkpoint = client.table('parse_checkpoints').select('*').eq('volume_number', 1).execute().data[0]
+    assert checkpoint['last_page'] == 2 and checkpoint['last_url'] is None
+    assert checkpoint['letters_saved'] == 3 and checkpoint['status'] == 'running'
+    assert len(client.tables['letters']) == 2
+    assert client.calls['rpc.save_letters_batch'] == 2
+
+
+if __name__ == "__main__":
+    test_number_to_hebrew()
+    test_site_pages()
+    test_failure_injection()
+    test_local_supabase()
+    test_local_save_letters_batch()
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מטמון הדפים - הקלטה, השמעה ללא רשת, מפתח לפי כתובת מנורמלת ושיתוף בין תהליכים
+"""
+
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+
+from page_cache import PageCache, CACHE_ENV, MODE_ENV
+
+PAGE = '<html><body><a href="/aid/4645943/">מכתב א</a></body></html>'
+URL = 'https://www.chabad.org/library/article_cdo/aid/4645943/jewish/Letter-1.htm'
+
+
+def test_record_and_replay(tmp_path):
+    cache = PageCache(str(tmp_path), mode='record')
+    assert cache.get(URL) is None
+    cache.put(URL, PAGE)
+    assert cache.get(URL) == PAGE
+    # אותו דף בכתובת עם פרגמנט
+    assert cache.get(URL + '#top') == PAGE
+    assert cache.summary() == {'misses': 1, 'stored': 1, 'hits': 2}
+    
+    replay = PageCache(str(tmp_path), mode='replay')
+    assert replay.offline and replay.get(URL) == PAGE
+    replay.put(URL.replace('4645943', '1'), PAGE)
+    assert replay.get(URL.replace('4645943', '1')) is None
+    assert not [p for p in tmp_path.rglob('*.tmp')]
+
+
+def test_from_env(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    assert PageCache.from_env() is None
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    monkeypatch.setenv(MODE_ENV, 'replay')
+    cache = PageCache.from_env()
+    assert cache.cache_dir == str(tmp_path) and cache.offline
+
+
+def _record(args):
+    cache_dir, worker = args
+    cache = PageCache(cache_dir)
+    for i in range(20):
+        cache.put(f'https://www.chabad.org/aid/{i}/', PAGE * (worker + 1))
+    return worker
+
+
+def test_shared_between_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        assert sorted(pool.map(_record, [(str(tmp_path), w) for w in range(4)])) == [0, 1, 2, 3]
+    cache = PageCache(str(tmp_path), mode='replay')
+    for i in range(20):
+        html = cache.get(f'https://www.chabad.org/aid/{i}/')
+        # דף שלם של אחד התהליכים - לא קובץ חצוי
+        assert html in {PAGE * (w + 1) for w in range(4)}
+    assert not [p for p in tmp_path.rglob('*.tmp')]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_record_and_replay, test_shared_between_processes):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מיקרו-בנצ'מרק הפרסור - fixtures, מדידה והשוואה ל-baseline
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from parse_benchmark import (first_lines, gematria_tokens, load_html, time_case, run_suite, compare,
+                             comparable_baseline, main)
+
+
+def test_fixtures():
+    lines = first_lines()
+    assert lines[0] == 'ב"ה, כ"א אדר, פ"ח'
+    assert 'ב"ה, כ"ח טבת תרפ"ט' in lines
+    assert 'כ"א' in gematria_tokens()
+    html, source = load_html('volume_page.html')
+    assert source in ('recorded', 'mock') and 'מכתב' in html
+
+
+def test_time_case():
+    result = time_case(lambda: sum(range(100)), items=100, min_time=0.01, rounds=3)
+    assert result['rounds'] == 3 and result['loops'] >= 1
+    assert 0 < result['min_us'] <= result['median_us'] <= result['max_us']
+
+
+def test_compare_flags_regression():
+    results = run_suite('hebrew_calendar', min_time=0.01, rounds=3)
+    assert 'gematria/hebrew_calendar.hebrew_numeral_to_number' in results
+    faster = {name: dict(result, median_us=result['median_us'] / 2) for name, result in results.items()}
+    assert compare(results, faster, 0.2) == list(results)
+    assert compare(results, results, 0.2) == []
+
+
+def test_comparable_baseline():
+    """מקרי HTML לא מושווים כשמקור ה-fixtures שונה"""
+    doc = {'fixtures': {'volume_page.html': 'recorded'},
+           'cases': {'soup/lxml': {'median_us': 1.0}, 'date/x': {'median_us': 1.0}}}
+    assert list(comparable_baseline(doc, {'volume_page.html': 'recorded'})) == ['soup/lxml', 'date/x']
+    assert list(comparable_baseline(doc, {'volume_page.html': 'mock'})) == ['date/x']
+
+
+def test_first_compare_writes_baseline(tmp_path, monkeypatch):
+    """--compare בלי baseline שומר את הריצה הנוכחית, והריצה הבאה מושווית אליה"""
+    baseline = tmp_path / 'baseline.json'
+    argv = ['parse_benchmark.py', '--filter', 'hebrew_calendar', '--min-time', '0.01', '--rounds', '3',
+            '--output', str(tmp_path / 'run.json'), '--compare', str(baseline), '--threshold', '100']
+    monkeypatch.setattr(sys, 'argv', argv)
+    main()
+    with open(baseline, encoding='utf-8') as f:
+        assert 'gematria/hebrew_calendar.hebrew_numeral_to_number' in json.load(f)['cases']
+    main()
+
+
+if __name__ == "__main__":
+    test_fixtures()
+    test_time_case()
+    test_compare_flags_regression()
+    test_comparable_baseline()
+    print("✅ כל הבדיקות עברו")
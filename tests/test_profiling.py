@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת דגל --profile - מגבלת מכתבים וקבצי הפלט
+"""
+
+import sys
+import os
+import argparse
+import pstats
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from profiling import add_profile_arguments, letter_limit, profiled
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    return parser.parse_args(list(argv))
+
+
+def test_letter_limit():
+    assert letter_limit(_args(), 3) == 3
+    assert letter_limit(_args()) is None
+    assert letter_limit(_args('--profile')) == 20
+    assert letter_limit(_args('--profile', '--profile-letters', '5'), 3) == 3
+    assert letter_limit(_args('--profile', 'pyinstrument', '--profile-letters', '5'), 50) == 5
+
+
+def test_profiled_writes_output(tmp_path):
+    with profiled(None, 'noop', output_dir=str(tmp_path)) as profiler:
+        assert profiler is None
+    assert os.listdir(tmp_path) == []
+    
+    with profiled('cprofile', 'sample', output_dir=str(tmp_path)):
+        sum(i * i for i in range(10000))
+    files = sorted(os.listdir(tmp_path))
+    assert [os.path.splitext(f)[1] for f in files] == ['.prof', '.txt']
+    assert files[0].startswith('profile_sample_')
+    assert pstats.Stats(str(tmp_path / files[0])).total_calls > 0
+
+
+def test_pyinstrument_mode(tmp_path):
+    """pyinstrument אם מותקן, אחרת נפילה חזרה ל-cProfile"""
+    with profiled('pyinstrument', 'sampled', output_dir=str(tmp_path)):
+        sum(i * i for i in range(10000))
+    files = os.listdir(tmp_path)
+    assert any(f.endswith('.speedscope.json') or f.endswith('.prof') for f in files)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_letter_limit()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_profiled_writes_output(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_pyinstrument_mode(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מחולל הדוחות המשותף - דפים, אינדקס וכתיבה זורמת
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from report_renderer import ReportRenderer
+
+COLUMNS = [
+    ("מס' כרך", 'volume_arabic', 'arabic-number'),
+    ('מכתב', 'letter_hebrew', 'hebrew-number'),
+    ('תאריך מלא', 'full_date_hebrew', 'date-cell'),
+    ('קישור', 'url', '', 'פתח מכתב')
+]
+FILTERS = [('🔍 חיפוש כרך', ['volume_arabic', 'volume_hebrew']), ('🔍 חיפוש שנה', ['year_hebrew'])]
+
+
+def _rows(count):
+    for i in range(count):
+        yield {'volume_arabic': 1 + i // 1500, 'volume_hebrew': 'אבגדהוזחטיכלמנ'[i // 1500], 'letter_hebrew': str(i),
+               'full_date_hebrew': 'כ"א אדר <תרפ"ח>', 'year_hebrew': 'תרפ"ח', 'url': f'https://example.org/{i}'}
+
+
+def _load_js(path, name):
+    with open(path, encoding='utf-8') as f:
+        return json.loads(f.read()[len(f'window.{name} = '):].rstrip().rstrip(';'))
+
+
+def test_paginated_report(tmp_path):
+    """2500 שורות -> 3 דפים, כותרת כרך בכל דף, אינדקס לכל השורות"""
+    renderer = ReportRenderer('דוח בדיקה', COLUMNS, FILTERS, footer=['תחתית'],
+                              group_by='volume_arabic', group_label='📚 כרך {volume_arabic} ({volume_hebrew})')
+    files = renderer.render(_rows(2500), str(tmp_path / 'report.html'), summary=[('📝 סה"כ מכתבים', 2500)])
+    
+    assert [os.path.basename(f) for f in files] == ['report.html', 'report_p2.html', 'report_p3.html']
+    pages = []
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    
+    assert pages[0].count('<tr data-search') == 1000
+    assert pages[2].count('<tr data-search') == 500
+    assert 'report_p2.html' in pages[0] and 'report_p2.html' in pages[2]
+    assert 'report_p3.html' not in pages[2].split('</table>')[1]
+    # כרך 1 נמשך לדף 2 וכרך 2 מתחיל בו
+    assert pages[1].count('class="volume-header"') == 2
+    assert '&lt;תרפ&quot;ח&gt;' in pages[0]
+    assert 'href="https://example.org/0"' in pages[0]
+    
+    # האינדקס שנטען עם כל דף - רק רשימת הדפים; שורות החיפוש בקובץ נפרד שנטען בחיפוש
+    index = _load_js(tmp_path / 'report_index.js', 'REPORT_INDEX')
+    assert index['total'] == 2500
+    assert [p['count'] for p in index['pages']] == [1000, 1000, 500]
+    assert 'rows' not in index
+    assert '<script src="report_index.js">' in pages[0]
+    assert '<script src="report_search.js">' not in pages[0]
+    search = _load_js(tmp_path / 'report_search.js', 'REPORT_SEARCH')
+    assert len(search) == 2500
+    assert search[1600] == [2, '2 ב', 'תרפ"ח']
+
+
+def test_shrinking_report_removes_stale_pages(tmp_path):
+    """דוח שהתקצר לא משאיר דפים ישנים"""
+    renderer = ReportRenderer('דוח', COLUMNS, FILTERS, rows_per_page=100)
+    renderer.render(_rows(450), str(tmp_path / 'report.html'))
+    assert (tmp_path / 'report_p5.html').exists()
+    
+    files = renderer.render(_rows(150), str(tmp_path / 'report.html'))
+    assert [os.path.basename(f) for f in files] == ['report.html', 'report_p2.html']
+    assert sorted(p.name for p in tmp_path.glob('report*.html')) == ['report.html', 'report_p2.html']
+
+
+def test_render_time_is_linear(tmp_path):
+    """זמן יצירה לשורה לא גדל עם גודל הדוח"""
+    renderer = ReportRenderer('דוח', COLUMNS, FILTERS)
+    timings = []
+    for count in (2000, 20000):
+        start = time.perf_counter()
+        renderer.render(_rows(count), str(tmp_path / f'r{count}.html'))
+        timings.append((time.perf_counter() - start) / count)
+    assert timings[1] < timings[0] * 3
+
+
+def test_empty_report(tmp_path):
+    """דוח ריק נותן דף אחד"""
+    files = ReportRenderer('ריק', COLUMNS).render([], str(tmp_path / 'empty.html'))
+    assert len(files) == 1 and os.path.exists(files[0])
+
+
+def test_zero_values_are_rendered(tmp_path):
+    """0 מוצג בתא ובטקסט החיפוש, None ריק"""
+    files = ReportRenderer('אפס', COLUMNS, FILTERS).render(
+        [{'volume_arabic': 0, 'letter_hebrew': None, 'url': 'https://example.org/0'}], str(tmp_path / 'zero.html'))
+    with open(files[0], encoding='utf-8') as f:
+        html = f.read()
+    assert '<td class="arabic-number">0</td><td class="hebrew-number"></td>' in html
+    assert _load_js(tmp_path / 'zero_search.js', 'REPORT_SEARCH') == [[1, '0 ', '']]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_paginated_report(pathlib.Path(tmp))
+        test_empty_report(pathlib.Path(tmp))
+        test_shrinking_report_removes_stale_pages(pathlib.Path(tmp))
+        test_zero_values_are_rendered(pathlib.Path(tmp))
+        print("✅ כל הבדיקות עברו")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת אינדקס הדמיון - MinHash, דליים של LSH, מכתבים דומים וכפולים, ונתיב ה-API
+"""
+
+import sys
+import os
+import json
+import random
+import threading
+import time
+import urllib.request
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from database_setup import IgrotKodeshDB
+from similarity_index import SimilarityIndex, minhash, shingles, signature_similarity
+from api_server import create_server
+
+WORDS = ('שלום ברכה מכתבו הגיע בדבר הספרים שנשלחו התורה והמצוה עבודה תפילה לימוד חסידות '
+         'בית הכנסת קהל עדה צדקה חינוך ילדים בריאות פרנסה שמחה ביטחון אמונה').split()
+
+
+def _letter(rng, words=120):
+    return ' '.join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(words))
+
+
+def _corpus(db_file, count=400):
+    """count מכתבים שונים + הדפסה חוזרת עם שינוי קל (כרך 2) + אותו מכתב בכתובת נוספת"""
+    rng = random.Random(7)
+    letters = [{'volume_number': 1, 'volume_hebrew': 'א', 'letter_number': i + 1, 'letter_hebrew': '',
+                'url': f'https://example.org/{i}', 'content': _letter(rng)} for i in range(count)]
+    original = letters[10]['content']
+    words = original.split()
+    words[60] = 'בשינוי'
+    letters.append({'volume_number': 2, 'volume_hebrew': 'ב', 'letter_number': 1, 'letter_hebrew': '',
+                    'url': 'https://example.org/reprint', 'content': ' '.join(words)})
+    letters.append({'volume_number': 2, 'volume_hebrew': 'ב', 'letter_number': 2, 'letter_hebrew': '',
+                    'url': 'https://example.org/other-url', 'content': letters[20]['content']})
+    letters.append({'volume_number': 2, 'volume_hebrew': 'ב', 'letter_number': 3, 'letter_hebrew': '',
+                    'url': 'https://example.org/empty', 'content': ''})
+    letters.append({'volume_number': 2, 'volume_hebrew': 'ב', 'letter_number': 4, 'letter_hebrew': '',
+                    'url': 'https://example.org/empty-2', 'content': ''})
+    db = IgrotKodeshDB(db_file)
+    db.bulk_import_letters(letters)
+    return db
+
+
+def test_signature_estimates_jaccard():
+    rng = random.Random(1)
+    text = _letter(rng, 200)
+    words = text.split()
+    edited = ' '.join(words[:150] + ['אחר'] * 50)
+    first, second = shingles(text), shingles(edited)
+    jaccard = len(first & second) / len(first | second)
+    assert abs(signature_similarity(minhash(first), minhash(second)) - jaccard) < 0.15
+    # ניקוד וסופיות לא משנים את החתימה
+    assert shingles('שָׁלוֹם וּבְרָכָה לכם') == shingles('שלום וברכה לכמ')
+
+
+def test_similar_and_duplicates(tmp_path):
+    db = _corpus(str(tmp_path / 'similar.db'))
+    index = SimilarityIndex(db.conn)
+    assert index.update() == 404
+    assert index.update() == 0
+    
+    original = db.get_letter(1, 11)['id']
+    reprint = db.get_letter(2, 1)['id']
+    similar = index.similar(original)
+    assert similar[0][0] == reprint and similar[0][1] > 0.8
+    assert len(similar) == 1
+    
+    start = time.perf_counter()
+    pairs = index.duplicates()
+    assert time.perf_counter() - start < 1
+    found = {(a, b) for a, b, _ in pairs}
+    assert found == {(original, reprint), (db.get_letter(1, 21)['id'], db.get_letter(2, 2)['id'])}
+    
+    # תוכן שהשתנה מאונדקס מחדש
+    db.conn.execute('UPDATE letters SET content = ? WHERE id = ?', (_letter(random.Random(99)), original))
+    assert index.update() == 1
+    assert index.similar(original) == []
+    
+    # מכתב שנמחק יוצא מהאינדקס
+    db.conn.execute('DELETE FROM letters WHERE id = ?', (reprint,))
+    index.update()
+    assert index.similar(reprint) == []
+    assert all(reprint not in pair[:2] for pair in index.duplicates())
+    db.close()
+
+
+def test_similar_api(tmp_path):
+    db_file = str(tmp_path / 'api.db')
+    db = _corpus(db_file, count=50)
+    SimilarityIndex(db.conn).update()
+    db.close()
+    
+    server = create_server(db_file, port=0, pool_size=1, host='127.0.0.1')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/api/letters/1/11/similar'
+        with urllib.request.urlopen(url) as response:
+            payload = json.loads(response.read())
+        assert payload['letter']['letter']['number'] == 11
+        assert [(s['volume']['number'], s['letter']['number']) for s in payload['similar']] == [(2, 1)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_signature_estimates_jaccard()
+    for test in (test_similar_and_duplicates, test_similar_api):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ כל הבדיקות עברו")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת מדידת הזמנים לפי שלב - היסטוגרמות, Prometheus ו-JSON
+"""
+
+import sys
+import os
+import json
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from stage_timer import StageTimer, Histogram
+
+
+def test_histogram_quantiles():
+    h = Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+        h.observe(seconds)
+    assert h.counts == [50, 45, 5, 0]
+    assert h.quantile(0.5) <= 0.01
+    assert 0.01 < h.quantile(0.95) <= 0.1
+    assert h.quantile(1.0) == 0.5
+
+
+def test_stage_timer_exports(tmp_path):
+    timer = StageTimer(buckets=(0.01, 0.1))
+    for _ in range(3):
+        timer.observe('db_write', 0.05)
+    timer.observe('navigate', 0.2)
+    try:
+        with timer.stage('date_parse'):
+            raise ValueError
+    except ValueError:
+        pass
+    
+    assert timer.stages() == ['navigate', 'date_parse', 'db_write']
+    
+    prom = timer.to_prometheus()
+    assert '# TYPE igrot_stage_duration_seconds histogram' in prom
+    assert 'igrot_stage_duration_seconds_bucket{stage="db_write",le="0.1"} 3' in prom
+    assert 'igrot_stage_duration_seconds_bucket{stage="navigate",le="+Inf"} 1' in prom
+    assert 'igrot_stage_duration_seconds_count{stage="date_parse"} 1' in prom
+    
+    timer.export(prom_file=str(tmp_path / 'stages.prom'), json_file=str(tmp_path / 'stages.json'))
+    with open(tmp_path / 'stages.json', encoding='utf-8') as f:
+        profile = json.load(f)
+    assert profile['stages']['db_write']['count'] == 3
+    assert profile['stages']['db_write']['total_sec'] == 0.15
+    assert len(timer.summary_lines()) == 4
+
+
+def test_merge_worker_timers():
+    """איחוד זמני שלבים מתהליכים עובדים"""
+    main, worker = StageTimer(), StageTimer()
+    main.observe('navigate', 0.2)
+    worker.observe('navigate', 1.5)
+    worker.observe('db_write', 0.01)
+    main.merge(worker.histograms)
+    
+    assert main.histograms['navigate'].count == 2
+    assert main.histograms['navigate'].max == 1.5 and main.histograms['navigate'].min == 0.2
+    assert main.histograms['db_write'].count == 1
+    assert worker.histograms['navigate'].count == 1
+
+
+def test_thread_safety():
+    timer = StageTimer()
+    
+    def work():
+        for _ in range(1000):
+            timer.observe('extraction', 0.001)
+    
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timer.histograms['extraction'].count == 8000
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_histogram_quantiles()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stage_timer_exports(pathlib.Path(tmp))
+    test_merge_worker_timers()
+    test_thread_safety()
+    print("✅ כל הבדיקות עברו")
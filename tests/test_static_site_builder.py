@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת בניית ה-API הסטטי המפוצל - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from static_site_builder import build_static_api, MANIFEST_FILE
+
+
+def _letters():
+    return [
+        {'volume_number': 1 + i // 10, 'volume_hebrew': 'אב'[i // 10], 'letter_number': i % 10 + 1,
+         'letter_hebrew': '', 'day_numeric': 21, 'month_hebrew': 'אדר', 'year_numeric': 5688 + i % 2,
+         'url': f'https://example.org/{i}', 'content': f'שלום וברכה מכתב{"ים" if i == 3 else ""}'}
+        for i in range(20)
+    ]
+
+
+def _manifest(out_dir):
+    with open(os.path.join(out_dir, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_sharded_layout(tmp_path):
+    """קובץ לכל כרך ושנה, ואינדקס מילים לפי תחילית"""
+    out_dir = str(tmp_path / 'api')
+    build_static_api(_letters(), out_dir)
+    manifest = _manifest(out_dir)
+    
+    assert manifest['total_letters'] == 20
+    assert set(manifest['volumes']) == {'1', '2'}
+    assert set(manifest['years']) == {'5688', '5689'}
+    assert manifest['min_word_length'] == 2
+    
+    with open(os.path.join(out_dir, manifest['volumes']['1']['file']), encoding='utf-8') as f:
+        volume = json.load(f)
+    assert [l['letter_number'] for l in volume['letters']] == list(range(1, 11))
+    assert 'content' not in volume['letters'][0]
+    assert volume['letters'][0]['hebrew_date_key'] == 56880621
+    
+    with open(os.path.join(out_dir, manifest['words']['מכ']), encoding='utf-8') as f:
+        words = json.load(f)
+    assert words['מכתבימ'] == [[1, 4]]
+    assert len(words['מכתב']) == 19
+
+
+def test_incremental_rebuild(tmp_path):
+    """בנייה חוזרת כותבת רק את הקבצים שהשתנו ומוחקת את הישנים"""
+    out_dir = str(tmp_path / 'api')
+    letters = _letters()
+    first = build_static_api(letters, out_dir)
+    assert first['written'] > 0 and first['manifest_changed']
+    
+    again = build_static_api(letters, out_dir)
+    assert again == {'written': 0, 'unchanged': first['written'], 'removed': 0, 'manifest_changed': False}
+    
+    before = _manifest(out_dir)
+    letters[15]['url'] = 'https://example.org/changed'
+    changed = build_static_api(letters, out_dir)
+    after = _manifest(out_dir)
+    
+    # כרך 2 ושנת 5689 (מכתב 15 אי-זוגי) בלבד
+    assert changed['written'] == 2 and changed['removed'] == 2
+    assert after['volumes']['1'] == before['volumes']['1']
+    assert after['volumes']['2'] != before['volumes']['2']
+    assert after['years']['5688'] == before['years']['5688']
+    assert after['words'] == before['words']
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sharded_layout(pathlib.Path(tmp) / 'a')
+        test_incremental_rebuild(pathlib.Path(tmp) / 'b')
+        print("✅ כל הבדיקות עברו")
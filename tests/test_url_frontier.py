@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת גבול הסריקה - נרמול URL, בדיקת "כבר נראה" ותורים לפי עומק
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'main'))
+
+from url_frontier import UrlFrontier, normalize_url
+
+
+def test_normalize_url():
+    base = 'https://www.chabad.org/therebbe/article_cdo/aid/4643797/jewish/page.htm'
+    assert normalize_url(base + '#top') == base
+    assert normalize_url('HTTPS://WWW.Chabad.org:443/therebbe//article_cdo/aid/4643797/jewish/page.htm') == base
+    assert normalize_url(base + '?page=2&b=1') == normalize_url(base + '?b=1&page=2&utm_source=mail#x')
+    assert normalize_url('http://example.com:8080') == 'http://example.com:8080/'
+    # נתיב בעברית - מקודד ולא מקודד הם אותו דף
+    assert normalize_url('https://example.com/אגרות') == normalize_url('https://example.com/%D7%90%D7%92%D7%A8%D7%95%D7%AA')
+    assert normalize_url(base + '?page=2') != normalize_url(base + '?page=3')
+
+
+def test_frontier_levels():
+    frontier = UrlFrontier(max_depth=2, allowed_netloc='www.chabad.org')
+    assert frontier.add('https://www.chabad.org/a', 0)
+    assert not frontier.add('https://www.chabad.org/a#section', 0)
+    assert frontier.add('https://www.chabad.org/b?y=2&x=1', 1)
+    assert not frontier.add('https://www.chabad.org/b?x=1&y=2', 1)
+    assert not frontier.add('https://other.org/c', 1)
+    assert not frontier.add('https://www.chabad.org/d', 2)
+    assert len(frontier) == 2 and 'https://www.chabad.org/a#x' in frontier
+    
+    assert frontier.pop_level(0) == ['https://www.chabad.org/a']
+    # דף שכבר נסרק לא חוזר לתור גם מעומק אחר
+    assert not frontier.add('https://www.chabad.org/a', 1)
+    assert frontier.pop_level(1) == ['https://www.chabad.org/b?x=1&y=2']
+    assert frontier.pop_level(1) == [] and frontier.pop_level(5) == []
+
+
+def test_frontier_scales_linearly():
+    """20,000 קישורים עם כפילויות - בדיקת חברות O(1), בלי ריבועיות"""
+    frontier = UrlFrontier(max_depth=2)
+    links = [f'https://www.chabad.org/page/{i % 5000}?b=1&a={i % 3}#f{i}' for i in range(20000)]
+    started = time.perf_counter()
+    added = sum(frontier.add(link, 1) for link in links)
+    assert added == 15000
+    assert time.perf_counter() - started < 5
+
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_frontier_levels()
+    test_frontier_scales_linearly()
+    print("✅ כל הבדיקות עברו")
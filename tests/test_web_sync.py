@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בדיקת סנכרון Google Sheets / Airtable מול שרת מדומה מקומי - ללא חיבור לאינטרנט
+"""
+
+import sys
+import os
+import json
+import re
+import threading
+import http.server
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import urlparse, parse_qs, unquote
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from web_sync import GoogleSheetsBackend, AirtableBackend, sync_letters, retry_after_seconds, SYNC_HEADERS
+
+
+class MockRemoteHandler(http.server.BaseHTTPRequestHandler):
+    """Sheets API v4 ו-Airtable במינימום הנדרש, עם 429 לפי דרישה"""
+    
+    def _reply(self, status, payload=None, headers=None):
+        body = json.dumps(payload or {}).encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _handle(self):
+        state = self.server.state
+        state['calls'].append(self.command)
+        if state['fail_next']:
+            state['fail_next'] -= 1
+            return self._reply(429, {'error': 'quota'}, {'Retry-After': state['retry_after']})
+        
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        if url.path.startswith('/sheets/'):
+            return self._sheets(url, body)
+        return self._airtable(url, body)
+    
+    def _sheets(self, url, body):
+        rows = self.server.state['sheet']
+        if '/values/' in url.path and not url.path.endswith(':batchUpdate'):
+            # הטווח מגיע מקודד: '/' ורווח לא מופיעים גלויים בנתיב
+            encoded = url.path.split('/values/', 1)[1]
+            assert ' ' not in encoded and '!' not in encoded
+            self.server.state['ranges'].append(unquote(encoded))
+        if url.path.endswith(':batchUpdate'):
+            for item in body['data']:
+                self.server.state['ranges'].append(item['range'])
+                first, last = map(int, re.findall(r'[A-Z](\d+)', item['range'].rsplit('!', 1)[1]))
+                assert last - first + 1 == len(item['values'])
+                for offset, values in enumerate(item['values']):
+                    rows[first - 1 + offset] = [str(v) for v in values]
+        elif url.path.endswith(':append'):
+            rows.extend([str(v) for v in values] for values in body['values'])
+        elif self.command == 'PUT':
+            rows[:1] = [body['values'][0]]
+        return self._reply(200, {'values': rows})
+    
+    def _airtable(self, url, body):
+        records = self.server.state['records']
+        if self.command == 'GET':
+            params = parse_qs(url.query)
+            start = int(params.get('offset', ['0'])[0])
+            size = int(params['pageSize'][0])
+            page = {'records': records[start:start + size]}
+            if start + size < len(records):
+                page['offset'] = str(start + size)
+            return self._reply(200, page)
+        
+        assert len(body['records']) <= 10
+        if self.command == 'POST':
+            for record in body['records']:
+                records.append({'id': f'rec{len(records)}', 'fields': record['fields']})
+        else:
+            by_id = {r['id']: r for r in records}
+            for record in body['records']:
+                by_id[record['id']]['fields'] = record['fields']
+        return self._reply(200, {'records': body['records']})
+    
+    do_GET = do_POST = do_PUT = do_PATCH = _handle
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def remote():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), MockRemoteHandler)
+    server.state = {'calls': [], 'fail_next': 0, 'retry_after': '0', 'sheet': [], 'records': [], 'ranges': []}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _letters(count):
+    return [{'volume_number': 1 + i // 500, 'volume_hebrew': 'אבג'[i // 500], 'letter_number': i % 500 + 1,
+             'letter_hebrew': str(i % 500 + 1), 'full_date_hebrew': 'כא אדר תרפח', 'year_numeric': 5688,
+             'url': f'https://example.org/{i}'} for i in range(count)]
+
+
+def test_google_sheets_diff_sync(remote):
+    """סנכרון ראשון בבקשה אחת להוספה, שני שולח רק את השורות ששונו"""
+    base_url = f'http://127.0.0.1:{remote.server_port}/sheets'
+    letters = _letters(1200)
+    
+    backend = GoogleSheetsBackend('S', 'token', base_url=base_url)
+    stats = sync_letters(backend, letters)
+    assert stats == {'created': 1200, 'updated': 0, 'unchanged': 0, 'requests': 3}
+    assert remote.state['sheet'][0] == SYNC_HEADERS
+    assert len(remote.state['sheet']) == 1201
+    
+    letters[10]['url'] = 'https://example.org/new-10'
+    letters[11]['year_numeric'] = 5689
+    letters[700]['full_date_hebrew'] = 'ב ניסן תרפח'
+    letters.append({'volume_number': 4, 'volume_hebrew': 'ד', 'letter_number': 1, 'letter_hebrew': '1'})
+    
+    backend = GoogleSheetsBackend('S', 'token', base_url=base_url)
+    stats = sync_letters(backend, letters)
+    assert stats == {'created': 1, 'updated': 3, 'unchanged': 1200 - 3, 'requests': 3}
+    assert remote.state['sheet'][11][4] == 'https://example.org/new-10'
+    assert remote.state['sheet'][12][3] == '5689'
+    assert remote.state['sheet'][701][2] == 'ב ניסן תרפח'
+    assert len(remote.state['sheet']) == 1202
+
+
+def test_google_sheets_quoted_sheet_name(remote):
+    """שם גיליון עם רווח וגרש - מצוטט בטווחי A1 ומקודד בכתובת"""
+    base_url = f'http://127.0.0.1:{remote.server_port}/sheets'
+    letters = _letters(3)
+    
+    backend = GoogleSheetsBackend('S', 'token', sheet_name="Rebbe's letters", base_url=base_url)
+    sync_letters(backend, letters)
+    letters[0]['url'] = 'https://example.org/changed'
+    sync_letters(GoogleSheetsBackend('S', 'token', sheet_name="Rebbe's letters", base_url=base_url), letters)
+    
+    assert remote.state['ranges'][0] == "'Rebbe''s letters'"
+    assert "'Rebbe''s letters'!A1:E1" in remote.state['ranges']
+    assert "'Rebbe''s letters'!A1:append" in remote.state['ranges']
+    assert "'Rebbe''s letters'!A2:E2" in remote.state['ranges']
+    assert remote.state['sheet'][1][4] == 'https://example.org/changed'
+
+
+def test_google_sheets_refuses_foreign_data(remote):
+    """שורה 1 שאינה כותרת - אין כתיבה לגיליון"""
+    base_url = f'http://127.0.0.1:{remote.server_port}/sheets'
+    remote.state['sheet'] = [['שם', 'טלפון'], ['משה', '050']]
+    
+    with pytest.raises(ValueError):
+        sync_letters(GoogleSheetsBackend('S', 'token', base_url=base_url), _letters(2))
+    assert remote.state['calls'] == ['GET']
+    assert remote.state['sheet'] == [['שם', 'טלפון'], ['משה', '050']]
+
+
+def test_retry_after_http_date():
+    """Retry-After כמספר שניות או כתאריך HTTP; ערך לא תקין - המתנה אקספוננציאלית"""
+    assert retry_after_seconds('3') == 3.0
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds('soon') is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(later) <= 30
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+def test_airtable_diff_sync_with_retry(remote):
+    """Airtable: 10 רשומות לבקשה, ניסיון חוזר אחרי 429"""
+    base_url = f'http://127.0.0.1:{remote.server_port}/airtable'
+    letters = _letters(250)
+    
+    backend = AirtableBackend('key', 'B', base_url=base_url, requests_per_second=0, backoff=0.01)
+    stats = sync_letters(backend, letters)
+    assert stats == {'created': 250, 'updated': 0, 'unchanged': 0, 'requests': 1 + 25}
+    assert len(remote.state['records']) == 250
+    
+    letters[5]['url'] = 'https://example.org/changed'
+    remote.state['fail_next'] = 1
+    remote.state['retry_after'] = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    remote.state['calls'].clear()
+    
+    backend = AirtableBackend('key', 'B', base_url=base_url, requests_per_second=0, backoff=0.01)
+    stats = sync_letters(backend, letters)
+    assert stats == {'created': 0, 'updated': 1, 'unchanged': 249, 'requests': 3 + 1}
+    assert remote.state['calls'].count('GET') == 4   # 3 עמודים + ניסיון חוזר אחד
+    assert remote.state['records'][5]['fields']['קישור'] == 'https://example.org/changed'
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -4,7 +4,6 @@
 אינטגרציות רשת לפרסר אגרות קודש
 """
 
-import requests
 import json
 import os
 from datetime import datetime
@@ -24,45 +23,21 @@ class WebIntegrations:
         print("4. קבל API Key מ-Account Settings")
         
     def upload_to_airtable(self, data):
-        """העלאה ל-Airtable"""
+        """סנכרון ל-Airtable - רק רשומות חדשות או ששונו, 10 רשומות לבקשה"""
         if not self.airtable_api_key:
             print("❌ חסר Airtable API Key")
             return False
         
-        headers = {
-            'Authorization': f'Bearer {self.airtable_api_key}',
-            'Content-Type': 'application/json'
-        }
-        
-        url = f'https://api.airtable.com/v0/{self.airtable_base_id}/Letters'
-        
-        # מגביל ל-10 רשומות (limit של Airtable API)
-        batch_data = {
-            "records": []
-        }
-        
-        for item in data[:10]:
-            record = {
-                "fields": {
-                    "כרך": item.get('volume_hebrew', ''),
-                    "מכתב": item.get('letter_hebrew', ''),
-                    "תאריך": item.get('full_date_hebrew', ''),
-                    "שנה": item.get('year_numeric', 0),
-                    "קישור": item.get('url', '')
-                }
-            }
-            batch_data["records"].append(record)
-        
         try:
-            response = requests.post(url, headers=headers, json=batch_data)
-            if response.status_code == 200:
-                print("✅ הועלה ל-Airtable בהצלחה")
-                return True
-            else:
-                print(f"❌ שגיאה ב-Airtable: {response.text}")
-                return False
+            # web_sync מושך את requests - נטען רק בסנכרון בפועל
+            from web_sync import AirtableBackend, sync_letters
+            backend = AirtableBackend(self.airtable_api_key, self.airtable_base_id)
+            stats = sync_letters(backend, data)
+            print(f"✅ סונכרן ל-Airtable: {stats['created']} חדשים, {stats['updated']} עודכנו, "
+                  f"{stats['unchanged']} ללא שינוי ({stats['requests']} בקשות)")
+            return True
         except Exception as e:
-            print(f"❌ שגיאת חיבור ל-Airtable: {e}")
+            print(f"❌ שגיאה ב-Airtable: {e}")
             return False
     
     def setup_google_sheets(self):
@@ -72,50 +47,21 @@ class WebIntegrations:
         print("2. אפשר Google Sheets API")
         print("3. צור Service Account")
         print("4. הורד credentials.json")
-        print("5. התקן: pip install gspread")
+        print("5. התקן: pip install google-auth")
         
-    def upload_to_google_sheets(self, data, sheet_id):
-        """העלאה ל-Google Sheets"""
+    def upload_to_google_sheets(self, data, sheet_id, sheet_name='Sheet1'):
+        """סנכרון ל-Google Sheets - קריאה אחת של הגיליון ועדכון מרוכז של השורות ששונו"""
         try:
-            import gspread
-            from google.oauth2.service_account import Credentials
-            
-            # הגדרת אישורים
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            creds = Credentials.from_service_account_file(
-                'credentials.json', scopes=scopes
-            )
-            
-            client = gspread.authorize(creds)
-            sheet = client.open_by_key(sheet_id).sheet1
-            
-            # מחיקת תוכן קיים
-            sheet.clear()
-            
-            # הוספת כותרות
-            headers = ['כרך', 'מכתב', 'תאריך', 'שנה', 'קישור']
-            sheet.append_row(headers)
-            
-            # הוספת נתונים
-            for item in data:
-                row = [
-                    item.get('volume_hebrew', ''),
-                    item.get('letter_hebrew', ''),
-                    item.get('full_date_hebrew', ''),
-                    item.get('year_numeric', 0),
-                    item.get('url', '')
-                ]
-                sheet.append_row(row)
-            
-            print("✅ הועלה ל-Google Sheets בהצלחה")
+            from web_sync import GoogleSheetsBackend, google_sheets_token, sync_letters
+            token = google_sheets_token('credentials.json')
+            backend = GoogleSheetsBackend(sheet_id, token, sheet_name)
+            stats = sync_letters(backend, data)
+            print(f"✅ סונכרן ל-Google Sheets: {stats['created']} חדשים, {stats['updated']} עודכנו, "
+                  f"{stats['unchanged']} ללא שינוי ({stats['requests']} בקשות)")
             return True
             
         except ImportError:
-            print("❌ חסר gspread. התקן: pip install gspread")
+            print("❌ חסר google-auth. התקן: pip install google-auth")
             return False
         except Exception as e:
             print(f"❌ שגיאה ב-Google Sheets: {e}")
@@ -162,23 +108,11 @@ class WebIntegrations:
             return False
     
     def create_github_pages_data(self, data):
-        """יצירת נתונים ל-GitHub Pages"""
+        """יצירת נתונים ל-GitHub Pages - API סטטי מפוצל (static_site_builder)"""
+        from static_site_builder import build_static_api
         
-        # יצירת קובץ נתונים עבור האתר
-        website_data = {
-            'metadata': {
-                'title': 'אגרות קודש - פרסר',
-                'description': 'מאגר נתונים של אגרות קודש',
-                'total_letters': len(data),
-                'last_updated': datetime.now().isoformat(),
-                'source': 'https://github.com/israweb/igrot-kodesh-parser'
-            },
-            'letters': data
-        }
-        
-        # שמירת הנתונים
-        with open('docs/data.json', 'w', encoding='utf-8') as f:
-            json.dump(website_data, f, ensure_ascii=False, indent=2)
+        # קובץ לכל כרך, אינדקס שנים ואינדקס מילים - רק קבצים שהשתנו נכתבים מחדש
+        stats = build_static_api(data, 'docs/api')
         
         # יצירת קובץ HTML לאתר
         html_content = f"""<!DOCTYPE html>
@@ -190,6 +124,7 @@ class WebIntegrations:
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
         .container {{ max-width: 1200px; margin: 0 auto; }}
+        .controls {{ display: flex; gap: 10px; margin-bottom: 15px; }}
         table {{ width: 100%; border-collapse: collapse; }}
         th, td {{ padding: 8px; border: 1px solid #ddd; text-align: center; }}
         th {{ background: #f4f4f4; }}
@@ -198,9 +133,16 @@ class WebIntegrations:
 <body>
     <div class="container">
         <h1>📚 אגרות קודש - פרסר נתונים</h1>
-        <p>סה"כ מכתבים: {len(data)}</p>
+        <p>סה"כ מכתבים: <span id="total"></span></p>
         <p>עדכון אחרון: {datetime.now().strftime('%d/%m/%Y %H:%M')}</p>
         
+        <div class="controls">
+            <select id="volume" onchange="showVolume(this.value)"></select>
+            <select id="year" onchange="showYear(this.value)"><option value="">לפי שנה</option></select>
+            <input id="word" placeholder="חיפוש מילה">
+            <button onclick="searchWord()">חפש</button>
+        </div>
+        
         <table id="lettersTable">
             <thead>
                 <tr>
@@ -218,22 +160,65 @@ class WebIntegrations:
     </div>
     
     <script>
-        fetch('data.json')
+        // כל קובץ נטען פעם אחת בלבד - השם כולל hash של התוכן
+        const cache = {{}};
+        const load = file => cache[file] ??= fetch('api/' + file).then(r => r.json());
+        let manifest;
+        
+        function render(letters) {{
+            document.querySelector('#lettersTable tbody').innerHTML = letters.map(letter => `
+                <tr>
+                    <td>${{letter.volume_hebrew ?? ''}}</td>
+                    <td>${{letter.letter_hebrew ?? ''}}</td>
+                    <td>${{letter.full_date_hebrew ?? ''}}</td>
+                    <td>${{letter.year_numeric ?? ''}}</td>
+                    <td><a href="${{letter.url}}" target="_blank">פתח</a></td>
+                </tr>`).join('');
+        }}
+        
+        async function showVolume(number) {{
+            if (number) render((await load(manifest.volumes[number].file)).letters);
+        }}
+        
+        async function showYear(year) {{
+            if (year) render((await load(manifest.years[year].file)).letters);
+        }}
+        
+        async function searchWord() {{
+            // כמו normalize_hebrew: מקף עליון -> רווח, הסרת ניקוד וגרשיים, איחוד אותיות סופיות
+            const words = document.getElementById('word').value
+                .replace(/\u05BE/g, ' ')
+                .replace(/[\u0591-\u05BD\u05BF-\u05C7"'\u05F3\u05F4]/g, '')
+                .replace(/[ךםןףץ]/g, c => ({{'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}})[c])
+                .split(/[^א-ת]+/)
+                .filter(w => w.length >= (manifest.min_word_length || 1));
+            // מכתבים שמכילים את כל המילים
+            let refs = null;
+            for (const word of words) {{
+                const shard = manifest.words[word.slice(0, manifest.word_prefix_length)];
+                const found = shard ? ((await load(shard))[word] || []) : [];
+                const keys = new Set(found.map(ref => ref.join(':')));
+                refs = refs === null ? found : refs.filter(ref => keys.has(ref.join(':')));
+            }}
+            refs = refs || [];
+            const letters = [];
+            for (const [volume, letter] of refs) {{
+                const data = await load(manifest.volumes[volume].file);
+                letters.push(...data.letters.filter(l => l.letter_number === letter));
+            }}
+            render(letters);
+        }}
+        
+        fetch('api/manifest.json')
             .then(response => response.json())
             .then(data => {{
-                const tbody = document.querySelector('#lettersTable tbody');
-                data.letters.forEach(letter => {{
-                    const row = `
-                        <tr>
-                            <td>${{letter.volume_hebrew}}</td>
-                            <td>${{letter.letter_hebrew}}</td>
-                            <td>${{letter.full_date_hebrew}}</td>
-                            <td>${{letter.year_numeric}}</td>
-                            <td><a href="${{letter.url}}" target="_blank">פתח</a></td>
-                        </tr>
-                    `;
-                    tbody.innerHTML += row;
-                }});
+                manifest = data;
+                document.getElementById('total').textContent = data.total_letters;
+                const volumes = document.getElementById('volume');
+                Object.entries(data.volumes).forEach(([number, v]) => volumes.add(new Option(`כרך ${{v.hebrew}} (${{v.letters}})`, number)));
+                const years = document.getElementById('year');
+                Object.entries(data.years).forEach(([year, y]) => years.add(new Option(`${{year}} (${{y.letters}})`, year)));
+                showVolume(volumes.value);
             }});
     </script>
 </body>
@@ -246,7 +231,7 @@ class WebIntegrations:
             f.write(html_content)
         
         print("✅ נוצרו קבצים ל-GitHub Pages:")
-        print("   📄 docs/data.json")
+        print(f"   📋 docs/api/manifest.json ({stats['written']} קבצים נכתבו, {stats['unchanged']} ללא שינוי)")
         print("   🌐 docs/index.html")
         
         return True
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+סנכרון מכתבים ל-Google Sheets ול-Airtable לפי הבדלים
+משווה למצב הקיים בצד המרוחק לפי מפתח יציב (כרך, מכתב) ושולח רק שורות חדשות או ששונו,
+בבקשות מרוכזות עם ניסיון חוזר והמתנה במקרה של מכסה (429) או שגיאת שרת.
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+
+import requests
+
+from hebrew_calendar import hebrew_numeral_to_number
+
+# שדה מקומי -> כותרת העמודה / שם השדה בצד המרוחק
+SYNC_FIELDS = [
+    ('volume_hebrew', 'כרך'),
+    ('letter_hebrew', 'מכתב'),
+    ('full_date_hebrew', 'תאריך'),
+    ('year_numeric', 'שנה'),
+    ('url', 'קישור')
+]
+SYNC_HEADERS = [header for _, header in SYNC_FIELDS]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def request_with_retry(session, method, url, max_retries=5, backoff=1.0, max_backoff=60, **kwargs):
+    """בקשת HTTP עם ניסיון חוזר והמתנה אקספוננציאלית (מכבד Retry-After)"""
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.request(method, url, timeout=60, **kwargs)
+        except requests.ConnectionError:
+            if attempt == max_retries:
+                raise
+            response = None
+        
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            response.raise_for_status()
+            return response
+        if attempt == max_retries:
+            response.raise_for_status()
+        
+        retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+        delay = retry_after if retry_after is not None else min(backoff * 2 ** attempt, max_backoff)
+        print(f"⏳ {response.status_code if response is not None else 'שגיאת חיבור'} - ממתין {delay:.1f} שניות (ניסיון {attempt + 1})")
+        time.sleep(delay + random.uniform(0, backoff / 10))
+
+
+def retry_after_seconds(value):
+    """Retry-After בשניות - מספר שניות או תאריך HTTP; None אם הערך חסר או לא תקין"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def letter_key(volume, letter):
+    """מפתח יציב (כרך, מכתב) - ממספר או מאותיות עבריות"""
+    def number(value):
+        if isinstance(value, int):
+            return value
+        value = str(value or '').strip()
+        return int(value) if value.isdigit() else hebrew_numeral_to_number(value)
+    return number(volume), number(letter)
+
+
+def letter_row(item):
+    """ערכי השורה לסנכרון לפי SYNC_FIELDS"""
+    return [item.get(field) if item.get(field) is not None else '' for field, _ in SYNC_FIELDS]
+
+
+def diff_rows(letters, remote):
+    """
+    השוואת המכתבים המקומיים למצב המרוחק
+    
+    Args:
+        letters: רשימת מכתבים מקומיים
+        remote: {מפתח: (מזהה מרוחק, ערכים)}
+    
+    Returns:
+        tuple: (עדכונים [(מזהה, ערכים)], חדשים [ערכים], מספר ללא שינוי)
+    """
+    updates, creates, unchanged = [], [], 0
+    seen = set()
+    for item in letters:
+        key = letter_key(item.get('volume_number') or item.get('volume_hebrew'),
+                         item.get('letter_number') or item.get('letter_hebrew'))
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        values = letter_row(item)
+        if key not in remote:
+            creates.append(values)
+            continue
+        ref, remote_values = remote[key]
+        # הצד המרוחק מחזיר טקסט - משווים כטקסט
+        if [str(v) for v in values] != [str(v) for v in remote_values]:
+            updates.append((ref, values))
+        else:
+            unchanged += 1
+    return updates, creates, unchanged
+
+
+class GoogleSheetsBackend:
+    """Google Sheets דרך Sheets API v4 - קריאה אחת של הגיליון, batchUpdate ו-append"""
+    
+    API_URL = 'https://sheets.googleapis.com/v4'
+    MAX_RANGES_PER_REQUEST = 500
+    MAX_ROWS_PER_APPEND = 5000
+    
+    def __init__(self, sheet_id, token, sheet_name='Sheet1', base_url=None, session=None, **retry):
+        self.url = f"{base_url or self.API_URL}/spreadsheets/{sheet_id}/values"
+        self.sheet_name = sheet_name
+        self.session = session or requests.Session()
+        self.session.headers['Authorization'] = f'Bearer {token}'
+        self.retry = retry
+        self.requests_count = 0
+    
+    def _request(self, method, url, **kwargs):
+        self.requests_count += 1
+        return request_with_retry(self.session, method, url, **self.retry, **kwargs)
+    
+    def _a1(self, cells=''):
+        """טווח A1 - שם הגיליון בגרשיים (רווחים, מקפים וגרש כפול)"""
+        sheet = "'" + self.sheet_name.replace("'", "''") + "'"
+        return f"{sheet}!{cells}" if cells else sheet
+    
+    def _range(self, first_row, last_row):
+        last_column = chr(ord('A') + len(SYNC_HEADERS) - 1)
+        return self._a1(f"A{first_row}:{last_column}{last_row}")
+    
+    def _values_url(self, a1_range, method=''):
+        """כתובת values/{range} - הטווח מקודד ל-URL"""
+        return f"{self.url}/{quote(a1_range, safe='')}{method}"
+    
+    def fetch_rows(self):
+        """
+        כל השורות הקיימות: {מפתח: (מספר שורה, ערכים)}
+        בגיליון ריק נכתבת כותרת; גיליון עם נתונים אחרים בשורה 1 לא מסונכרן (ValueError)
+        """
+        values = self._request('GET', self._values_url(self._a1())).json().get('values', [])
+        if not values:
+            self._request('PUT', self._values_url(self._range(1, 1)), params={'valueInputOption': 'RAW'},
+                          json={'values': [SYNC_HEADERS]})
+            values = [SYNC_HEADERS]
+        elif values[0][:len(SYNC_HEADERS)] != SYNC_HEADERS:
+            raise ValueError(f"שורה 1 בגיליון '{self.sheet_name}' אינה כותרת הסנכרון ({', '.join(SYNC_HEADERS)}) - "
+                             f"יש לבחור גיליון ריק או גיליון שסונכרן בעבר")
+        
+        remote = {}
+        for row_number, row in enumerate(values[1:], start=2):
+            row = (row + [''] * len(SYNC_HEADERS))[:len(SYNC_HEADERS)]
+            remote[letter_key(row[0], row[1])] = (row_number, row)
+        return remote
+    
+    def update_rows(self, updates):
+        """עדכון שורות - שורות רצופות מאוחדות לטווח אחד, מאות טווחים בבקשה"""
+        ranges = []
+        for row_number, values in sorted(updates, key=lambda u: u[0]):
+            if ranges and ranges[-1][1] == row_number - 1:
+                ranges[-1][1] = row_number
+                ranges[-1][2].append(values)
+            else:
+                ranges.append([row_number, row_number, [values]])
+        
+        for i in range(0, len(ranges), self.MAX_RANGES_PER_REQUEST):
+            data = [{'range': self._range(first, last), 'values': rows}
+                    for first, last, rows in ranges[i:i + self.MAX_RANGES_PER_REQUEST]]
+            self._request('POST', f"{self.url}:batchUpdate", json={'valueInputOption': 'RAW', 'data': data})
+    
+    def create_rows(self, rows):
+        """הוספת שורות חדשות בסוף הגיליון"""
+        for i in range(0, len(rows), self.MAX_ROWS_PER_APPEND):
+            self._request('POST', self._values_url(self._a1('A1'), ':append'),
+                          params={'valueInputOption': 'RAW', 'insertDataOption': 'INSERT_ROWS'},
+                          json={'values': rows[i:i + self.MAX_ROWS_PER_APPEND]})
+
+
+class AirtableBackend:
+    """Airtable - קריאה בעמודים של 100 וכתיבה ב-10 רשומות לבקשה (מגבלת ה-API)"""
+    
+    API_URL = 'https://api.airtable.com/v0'
+    RECORDS_PER_REQUEST = 10
+    
+    def __init__(self, api_key, base_id, table='Letters', base_url=None, session=None,
+                 requests_per_second=5, **retry):
+        self.url = f"{base_url or self.API_URL}/{base_id}/{table}"
+        self.session = session or requests.Session()
+        self.session.headers['Authorization'] = f'Bearer {api_key}'
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0
+        self.retry = retry
+        self.requests_count = 0
+        self._last_request = 0
+    
+    def _request(self, method, **kwargs):
+        # Airtable מגביל ל-5 בקשות בשנייה לבסיס
+        wait = self._last_request + self.min_interval - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.time()
+        self.requests_count += 1
+        return request_with_retry(self.session, method, self.url, **self.retry, **kwargs)
+    
+    def fetch_rows(self):
+        """כל הרשומות: {מפתח: (מזהה רשומה, ערכים)}"""
+        remote = {}
+        params = {'pageSize': 100}
+        while True:
+            page = self._request('GET', params=params).json()
+            for record in page.get('records', []):
+                fields = record.get('fields', {})
+                values = [fields.get(header, '') for header in SYNC_HEADERS]
+                remote[letter_key(values[0], values[1])] = (record['id'], values)
+            if not page.get('offset'):
+                return remote
+            params['offset'] = page['offset']
+    
+    def _fields(self, values):
+        return dict(zip(SYNC_HEADERS, values))
+    
+    def update_rows(self, updates):
+        for i in range(0, len(updates), self.RECORDS_PER_REQUEST):
+            records = [{'id': ref, 'fields': self._fields(values)}
+                       for ref, values in updates[i:i + self.RECORDS_PER_REQUEST]]
+            self._request('PATCH', json={'records': records, 'typecast': True})
+    
+    def create_rows(self, rows):
+        for i in range(0, len(rows), self.RECORDS_PER_REQUEST):
+            records = [{'fields': self._fields(values)} for values in rows[i:i + self.RECORDS_PER_REQUEST]]
+            self._request('POST', json={'records': records, 'typecast': True})
+
+
+def sync_letters(backend, letters):
+    """
+    סנכרון לפי הבדלים
+    
+    Returns:
+        dict: created, updated, unchanged, requests
+    """
+    remote = backend.fetch_rows()
+    updates, creates, unchanged = diff_rows(letters, remote)
+    if updates:
+        backend.update_rows(updates)
+    if creates:
+        backend.create_rows(creates)
+    return {
+        'created': len(creates),
+        'updated': len(updates),
+        'unchanged': unchanged,
+        'requests': backend.requests_count
+    }
+
+
+def google_sheets_token(credentials_file='credentials.json'):
+    """access token מ-Service Account של Google"""
+    from google.oauth2.service_account import Credentials
+    from google.auth.transport.requests import Request
+    
+    creds = Credentials.from_service_account_file(
+        credentials_file, scopes=['https://www.googleapis.com/auth/spreadsheets']
+    )
+    creds.refresh(Request())
+    return creds.token